@@ -0,0 +1,112 @@
+# dosya: benchmarks/bench_backup_store.py
+# Kullanım: python -m benchmarks.bench_backup_store [satış_sayısı] [yedek_sayısı]
+# Bir günlük kasa trafiğini taklit eder: her "saat" birkaç yüz satış kaydedilir ve yedek deposuna
+# bir yedek noktası alınır. Her yedek noktasının diske yazdırdığı yeni bayt, tam dosya kopyasıyla
+# karşılaştırılır. Rastgele seçilen bir yedek noktası geri yüklenip o andaki satış sayısıyla
+# karşılaştırılır; saklama politikasının eski noktaları ve kullanılmayan parçaları sildiği doğrulanır.
+
+import os
+import sys
+import json
+import time
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers
+from benchmarks.bench_date_keys import _seed_sales
+from benchmarks.bench_online_backup import _sale_count
+from database import connection
+from database import database_manager as db
+from database import backup_store
+
+DEFAULT_SALE_COUNT = 300_000
+DEFAULT_SNAPSHOT_COUNT = 12
+SALES_PER_HOUR = 300
+# Ölçüm sırasında tüm yedek noktaları aynı saatte alındığından hepsi korunur; politika sonda ayrıca sınanır.
+KEEP_ALL = {'son': 1000}
+
+def _simulate_hour(rng, product_ids, customer_ids):
+    for _ in range(SALES_PER_HOUR):
+        lines = [{'urun_id': rng.choice(product_ids), 'miktar': rng.randint(1, 3), 'birim_fiyat': 25.0} for _ in range(rng.randint(1, 4))]
+        total = sum(l['miktar'] * 25.0 for l in lines)
+        db.commit_sale({'musteri_id': rng.choice(customer_ids), 'toplam_tutar': total, 'odenen_tutar': total}, lines)
+
+def _redate_manifests(manifests_dir):
+    # Saklama politikasını sınamak için yedek noktaları, en yenisi dün olacak şekilde birer gün arayla geçmişe taşınır.
+    names = sorted(os.listdir(manifests_dir))
+    start = datetime.now() - timedelta(days=len(names))
+    for i, name in enumerate(names):
+        path = os.path.join(manifests_dir, name)
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest['olusturma_tarihi'] = (start + timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    snapshot_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SNAPSHOT_COUNT
+    random.seed(31)
+    rng = random.Random(37)
+    with temporary_database("backup_store.db") as db_path:
+        store_dir = os.path.join(os.path.dirname(db_path), "depo")
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        db.checkpoint_database('TRUNCATE')
+
+        start = time.perf_counter()
+        first = db.create_backup_snapshot('Zamanlanmış', store_dir=store_dir, policy=KEEP_ALL)
+        print(f"--- İlk yedek noktası: {first['boyut_bayt'] / 1024 / 1024:.1f} MB veritabanı → "
+              f"{first['yeni_bayt'] / 1024 / 1024:.1f} MB sıkıştırılmış ({(time.perf_counter() - start) * 1000:.0f} ms) ---")
+
+        counts = {first['id']: _sale_count(db_path)}
+        for hour in range(1, snapshot_count + 1):
+            _simulate_hour(rng, product_ids, customer_ids)
+            start = time.perf_counter()
+            snapshot = db.create_backup_snapshot('Zamanlanmış', store_dir=store_dir, pause=db.SCHEDULED_BACKUP_PAUSE, policy=KEEP_ALL)
+            elapsed = time.perf_counter() - start
+            counts[snapshot['id']] = _sale_count(db_path)
+            print(f"Saat {hour:>2}: +{SALES_PER_HOUR} satış | {snapshot['yeni_parca']:>5}/{snapshot['parca_sayisi']} sayfa yeni, "
+                  f"{snapshot['yeni_bayt'] / 1024:>7.1f} KB yazıldı (tam kopya {snapshot['boyut_bayt'] / 1024:,.0f} KB, "
+                  f"%{snapshot['yeni_bayt'] * 100 / snapshot['boyut_bayt']:.1f}) | {elapsed * 1000:.0f} ms")
+
+        unchanged = db.create_backup_snapshot('Zamanlanmış', store_dir=store_dir, policy=KEEP_ALL)
+        stats = db.get_backup_store_stats(store_dir)
+        print(f"Toplam: {stats['yedek_sayisi']} yedek noktası, {stats['mantiksal_bayt'] / 1024 / 1024:,.1f} MB veri için "
+              f"depoda {stats['depolanan_bayt'] / 1024 / 1024:.1f} MB ({stats['parca_sayisi']} benzersiz sayfa)")
+
+        errors = []
+        if not unchanged.get('degisiklik_yok'):
+            errors.append("Değişmeyen veritabanı için yeni yedek noktası yazıldı.")
+        chosen = random.choice(list(counts)[1:])
+        restored_path = os.path.join(os.path.dirname(db_path), "geri_yuklenen.db")
+        db.restore_backup_snapshot(chosen, restored_path, store_dir=store_dir)
+        if _sale_count(restored_path) != counts[chosen]:
+            errors.append(f"Geri yüklenen yedek noktasındaki ({chosen}) satış sayısı o andaki sayıyla uyuşmuyor.")
+
+        manifests_dir = os.path.join(store_dir, "manifestler")
+        _redate_manifests(manifests_dir)
+        removed = db.apply_backup_retention(store_dir, {'gunluk': 3}, datetime.now())
+        remaining = backup_store._load_manifests(manifests_dir)
+        referenced = {chunk_id for manifest in remaining for chunk_id in backup_store._decode_ids(manifest['parcalar'])}
+        live_packs = {pack_id for chunk_id, (_, pack_id, _, _) in backup_store._load_index(os.path.join(store_dir, "paketler")).items() if chunk_id in referenced}
+        all_packs = {name[:-len(".pak")] for name in os.listdir(os.path.join(store_dir, "paketler")) if name.endswith(".pak")}
+        after = db.get_backup_store_stats(store_dir)
+        print(f"Saklama politikası (son 3 gün): {removed} yedek noktası silindi, depo {stats['depolanan_bayt'] / 1024 / 1024:.1f} → "
+              f"{after['depolanan_bayt'] / 1024 / 1024:.1f} MB ({after['parca_sayisi']} parça, {len(referenced)} kullanımda)")
+        if len(remaining) != 3 or all_packs != live_packs:
+            errors.append("Saklama politikası beklenen yedek noktalarını bırakmadı veya kullanılmayan paket kaldı.")
+        for manifest in remaining:
+            db.restore_backup_snapshot(manifest['id'], restored_path, store_dir=store_dir)
+        connection.close_all_connections()
+
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Yedek noktaları doğru geri yüklendi; saklama politikası ve parça temizliği çalışıyor.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
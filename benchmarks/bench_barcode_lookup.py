@@ -0,0 +1,43 @@
+# dosya: benchmarks/bench_barcode_lookup.py
+# Kullanım: python -m benchmarks.bench_barcode_lookup [ürün_sayısı]
+# Barkod okutulduğunda sepete eklemeye kadar geçen veritabanı + fiyat hesaplama süresini
+# ölçer: get_product_by_code (tam eşleşme, benzersiz indeks) + calculate_prices, eski yol olan
+# LIKE araması ve FTS araması ile karşılaştırılır. Qt olay döngüsü ve çizim bu ölçüme dahil değildir.
+
+import sys
+import random
+
+from benchmarks.common import temporary_database, seed_products, measure, summarize, print_row
+from benchmarks.bench_product_search import LEGACY_SEARCH_SQL
+from database import connection
+from database import database_manager as db
+from models import price_calculator
+
+DEFAULT_PRODUCT_COUNT = 200_000
+REPEAT = 500
+
+def _legacy_search(code):
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_SEARCH_SQL, [f"%{code}%"] * 3).fetchall()
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    random.seed(29)
+    with temporary_database("barcode_lookup.db"):
+        seed_products(product_count)
+        settings = db.get_all_settings()
+        barcodes = [f"869{random.randrange(product_count):010d}" for _ in range(REPEAT)]
+        codes = iter(barcodes * 2)
+
+        def scan():
+            product = db.get_product_by_code(next(codes))
+            return price_calculator.calculate_prices(dict(product), settings)
+
+        print(f"--- Barkod okutma ({product_count:,} ürün) ---")
+        print_row("get_product_by_code + fiyat hesaplama", summarize(measure(scan, REPEAT)))
+        print_row("Stok koduyla (barkod yok)", summarize(measure(lambda: db.get_product_by_code("SKU-0000042"), REPEAT)))
+        print_row("Eski / LIKE '%barkod%'", summarize(measure(lambda: _legacy_search(barcodes[0]), 5)))
+        print_row("FTS5 / search_products", summarize(measure(lambda: db.search_products(barcodes[0]), 20)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# dosya: benchmarks/bench_batch_pricing.py
+# Kullanım: python -m benchmarks.bench_batch_pricing [ürün_sayısı]
+# Fiyat listesi senaryosu: tüm ürünlerin üç satış fiyatını (kâr dahil, nakit, kredi kartı)
+# hesaplar. Eski hâliyle ürün başına ayar ayrıştırma + kategori/vergi sorgusu yapan hesaplama,
+# önbellekli tekil calculate_prices ve derlenmiş bağlamla çalışan calculate_prices_batch
+# karşılaştırılır; üçünün de kuruşu kuruşuna aynı sonucu verdiği doğrulanır.
+
+import sys
+import random
+
+from benchmarks.common import temporary_database, seed_products, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+from models import price_calculator
+
+DEFAULT_PRODUCT_COUNT = 100_000
+REPEAT = 3
+
+def _legacy_calculate_prices(product_data, settings):
+    # Toplu hesaplamadan önceki calculate_prices: her çağrıda ayarları metinden ayrıştırır,
+    # kategori ve vergi satırlarını veritabanından okur.
+    try:
+        purchase_price = float(str(product_data.get('alis_fiyati', 0)).replace(',', '.'))
+        currency = product_data.get('alis_para_birimi', 'TL')
+        purchase_price_tl = purchase_price
+        if currency != 'TL':
+            rate = float((settings.get(f"{currency.lower()}_tl_kuru") or '0').replace(',', '.'))
+            purchase_price_tl = purchase_price_tl * rate if rate > 0 else 0
+    except (ValueError, TypeError):
+        return {}
+    kar_yontemi = settings.get('kar_yontemi', 'Yüzdesel Kâr (%)')
+    kar_degeri = float((settings.get('kar_degeri') or '50.0').replace(',', '.'))
+    with connection.get_db_connection() as conn:
+        if category_id := product_data.get('kategori_id'):
+            details = conn.execute("SELECT * FROM kategoriler WHERE id = ?", (category_id,)).fetchone()
+            if details and details['kar_tipi'] is not None and details['kar_degeri'] is not None:
+                kar_yontemi, kar_degeri = details['kar_tipi'], details['kar_degeri']
+        vat_percent = float((settings.get('kdv_orani') or '20.0').replace(',', '.'))
+        if tax_id := product_data.get('vergi_id'):
+            if tax_row := conn.execute("SELECT * FROM vergi_oranlari WHERE id = ?", (tax_id,)).fetchone():
+                vat_percent = tax_row['oran']
+    cc_commission_percent = float((settings.get('kk_komisyonu') or '2.5').replace(',', '.'))
+    profit_amount = 0.0
+    if kar_yontemi == 'Yüzdesel Kâr (%)':
+        profit_amount = purchase_price_tl * (kar_degeri / 100)
+    elif kar_yontemi == 'Sabit Tutar (TL)':
+        profit_amount = kar_degeri
+    price_with_profit_no_vat = purchase_price_tl + profit_amount
+    return {
+        "karli_fiyat_kdv_haric": round(price_with_profit_no_vat, 2),
+        "kdvli_fiyat": round(price_with_profit_no_vat * (1 + vat_percent / 100), 2),
+        "kkli_fiyat": round(price_with_profit_no_vat * (1 + cc_commission_percent / 100) * (1 + vat_percent / 100), 2)
+    }
+
+def _seed_pricing_rules(product_count):
+    random.seed(17)
+    seed_products(product_count)
+    db.save_settings({'kar_yontemi': 'Yüzdesel Kâr (%)', 'kar_degeri': '45,5', 'kdv_orani': '20', 'kk_komisyonu': '2,75',
+                      'usd_tl_kuru': '34,1234', 'eur_tl_kuru': '37,0551'})
+    for name, rate in (("KDV %1", 1.0), ("KDV %10", 10.0), ("KDV %20", 20.0)):
+        db.add_vergi_orani(name, rate)
+    categories = db.get_all_kategoriler()
+    db.update_category_profit(categories[0]['id'], 'Sabit Tutar (TL)', 12.5)
+    db.update_category_profit(categories[1]['id'], 'Yüzdesel Kâr (%)', 30.0)
+    tax_ids = [None] + [row['id'] for row in db.get_all_vergi_oranlari()]
+    with connection.get_db_connection() as conn:
+        conn.executemany(
+            "UPDATE urunler SET alis_para_birimi = ?, vergi_id = ?, alis_fiyati = ? WHERE id = ?",
+            [(random.choice(('TL', 'TL', 'USD', 'EUR')), random.choice(tax_ids), random.randrange(1, 500_000), row['id'])
+             for row in conn.execute("SELECT id FROM urunler")]
+        )
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    with temporary_database("batch_pricing.db"):
+        _seed_pricing_rules(product_count)
+        products = [dict(row) for row in db.get_products()]
+        settings = db.get_all_settings()
+
+        legacy = [_legacy_calculate_prices(product, settings) for product in products]
+        single = [price_calculator.calculate_prices(product) for product in products]
+        batch = price_calculator.calculate_prices_batch(products)
+        mismatches = sum(1 for a, b, c in zip(legacy, single, batch) if not a == b == c)
+
+        print(f"--- {len(products):,} ürünün fiyat listesi ---")
+        print_row("Eski / ürün başına ayrıştırma + sorgu", summarize(measure(lambda: [_legacy_calculate_prices(p, settings) for p in products], REPEAT)))
+        print_row("calculate_prices (tekil, önbellekli)", summarize(measure(lambda: [price_calculator.calculate_prices(p) for p in products], REPEAT)))
+        print_row("calculate_prices_batch", summarize(measure(lambda: price_calculator.calculate_prices_batch(products), REPEAT)))
+        print_row("get_products + calculate_prices_batch", summarize(measure(lambda: price_calculator.calculate_prices_batch(db.get_products()), REPEAT)))
+        if mismatches:
+            print(f"[HATA] {mismatches} ürünün fiyatı eski hesaplamayla uyuşmuyor.")
+            return 1
+        print("[OK] Üç yöntem tüm ürünlerde aynı fiyatları verdi.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# dosya: benchmarks/bench_checkout.py
+# Kullanım: python -m benchmarks.bench_checkout
+
+import random
+from datetime import datetime
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+
+CART_SIZES = (1, 10, 50, 200)
+REPEAT = 100
+
+def _legacy_create_sale(sale_data, sale_details):
+    # Toplu yazma öncesi create_sale(): her sepet satırı için INSERT + UPDATE + SELECT + INSERT.
+    with connection.get_db_connection() as conn:
+        satis_tarihi = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        satis_id = conn.execute(
+            "INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)",
+            (sale_data['musteri_id'], satis_tarihi, sale_data['toplam_tutar'], sale_data['odenen_tutar'])
+        ).lastrowid
+        for detail in sale_details:
+            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", (satis_id, detail['urun_id'], detail['miktar'], detail['birim_fiyat']))
+            conn.execute("UPDATE urunler SET stok_miktari = stok_miktari + ? WHERE id = ?", (-detail['miktar'], detail['urun_id']))
+            new_stock = conn.execute("SELECT stok_miktari FROM urunler WHERE id = ?", (detail['urun_id'],)).fetchone()[0]
+            conn.execute("INSERT INTO stok_hareketleri (urun_id, tarih, hareket_tipi, miktar, aciklama, son_stok) VALUES (?, ?, ?, ?, ?, ?)", (detail['urun_id'], satis_tarihi, "Satış", -detail['miktar'], f"Satış No: {satis_id}", new_stock))
+        return satis_id
+
+def main():
+    random.seed(3)
+    with temporary_database("checkout.db"):
+        product_ids = seed_products(5000)
+        customer_ids = seed_customers(100)
+        print(f"--- Satış Tamamlama Süresi (sepet boyutuna göre, {REPEAT} tekrar) ---")
+        for size in CART_SIZES:
+            def make_cart():
+                lines = [{'urun_id': random.choice(product_ids), 'miktar': random.randint(1, 3), 'birim_fiyat': 12.5} for _ in range(size)]
+                total = sum(line['miktar'] * line['birim_fiyat'] for line in lines)
+                return {'musteri_id': random.choice(customer_ids), 'toplam_tutar': total, 'odenen_tutar': 0}, lines
+            print_row(f"{size:>4} satır / eski (satır başına 4 ifade)", summarize(measure(lambda: _legacy_create_sale(*make_cart()), REPEAT)))
+            print_row(f"{size:>4} satır / toplu (executemany + RETURNING)", summarize(measure(lambda: db.create_sale(*make_cart()), REPEAT)))
+
+if __name__ == "__main__":
+    main()
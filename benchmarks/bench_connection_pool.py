@@ -0,0 +1,68 @@
+# dosya: benchmarks/bench_connection_pool.py
+# Kullanım: python -m benchmarks.bench_connection_pool
+
+import os
+import sqlite3
+import threading
+
+from benchmarks.common import temporary_database, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+
+QUERY_COUNT = 2000
+WORKER_THREADS = 8
+
+def _legacy_connection():
+    # Havuz öncesi get_db_connection() davranışı: her çağrıda yeni bağlantı.
+    os.makedirs(os.path.dirname(connection.DATABASE_PATH), exist_ok=True)
+    conn = sqlite3.connect(connection.DATABASE_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def _legacy_query():
+    with _legacy_connection() as conn:
+        conn.execute("SELECT deger FROM ayarlar WHERE anahtar = ?", ('company_name',)).fetchone()
+
+def _pooled_query():
+    with connection.get_db_connection() as conn:
+        conn.execute("SELECT deger FROM ayarlar WHERE anahtar = ?", ('company_name',)).fetchone()
+
+def _run_threaded(fn, per_thread):
+    durations = []
+    lock = threading.Lock()
+
+    def work():
+        local = measure(fn, per_thread)
+        with lock:
+            durations.extend(local)
+
+    threads = [threading.Thread(target=work) for _ in range(WORKER_THREADS)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return durations
+
+def main():
+    with temporary_database():
+        db.save_setting('company_name', 'Benchmark A.Ş.')
+
+        print(f"--- Bağlantı Havuzu Karşılaştırması ({QUERY_COUNT} sorgu) ---")
+        print_row("Ana iş parçacığı / eski (her sorguda bağlan)", summarize(measure(_legacy_query, QUERY_COUNT)))
+        print_row("Ana iş parçacığı / havuzlu", summarize(measure(_pooled_query, QUERY_COUNT)))
+
+        per_thread = QUERY_COUNT // WORKER_THREADS
+        print_row(f"{WORKER_THREADS} işçi iş parçacığı / eski", summarize(_run_threaded(_legacy_query, per_thread)))
+        print_row(f"{WORKER_THREADS} işçi iş parçacığı / havuzlu", summarize(_run_threaded(_pooled_query, per_thread)))
+
+        dashboard_calls = [
+            db.get_dashboard_stats, db.get_low_stock_products, db.get_recent_sales,
+            db.get_sales_by_day_for_month, db.get_sales_by_category, lambda: db.get_setting('sms_credit'),
+        ]
+        print_row("Dashboard yenileme (6 sorgu) / havuzlu", summarize(measure(lambda: [f() for f in dashboard_calls], 200)))
+
+        print("\nHavuz istatistikleri:")
+        for key, value in db.get_pool_stats().items():
+            print(f"  {key}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# dosya: benchmarks/bench_cost_snapshot.py
+# Kullanım: python -m benchmarks.bench_cost_snapshot [satış_sayısı]
+# Kâr raporlarının maliyeti urunler.alis_fiyati üzerinden (detay satırı başına JOIN) okuyan
+# eski hâlini, satis_detaylari.birim_maliyet anlık değerini okuyan güncel hâliyle karşılaştırır.
+# Sonuçların aynı olduğunu ve alış fiyatı değişince geçmiş kârın artık değişmediğini doğrular.
+
+import sys
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from database import connection
+from database import database_manager as db
+from database.queries.date_keys import epoch_key
+
+DEFAULT_SALE_COUNT = 300_000
+REPEAT = 5
+
+LEGACY_SALES_WITH_PROFIT_SQL = """
+    WITH SaleCosts AS (
+        SELECT s.id, s.satis_tarihi, s.satis_zamani, s.musteri_id, s.toplam_tutar,
+               (SELECT COALESCE(SUM(sd.miktar * u.alis_fiyati), 0) FROM satis_detaylari sd
+                JOIN urunler u ON sd.urun_id = u.id WHERE sd.satis_id = s.id) as toplam_maliyet
+        FROM satislar s WHERE s.satis_zamani BETWEEN ? AND ?
+    )
+    SELECT sc.id, sc.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi,
+           sc.toplam_tutar / 100.0 as toplam_tutar, sc.toplam_maliyet / 100.0 as toplam_maliyet,
+           (sc.toplam_tutar - sc.toplam_maliyet) / 100.0 as kar
+    FROM SaleCosts sc LEFT JOIN musteriler m ON sc.musteri_id = m.id ORDER BY sc.satis_zamani DESC
+"""
+LEGACY_SALES_TOTALS_SQL = """
+    SELECT (SELECT COALESCE(SUM(s.toplam_tutar), 0) FROM satislar s WHERE s.satis_zamani BETWEEN ? AND ?),
+           (SELECT COALESCE(SUM(sd.miktar * u.alis_fiyati), 0) FROM satislar s
+            JOIN satis_detaylari sd ON sd.satis_id = s.id JOIN urunler u ON sd.urun_id = u.id WHERE s.satis_zamani BETWEEN ? AND ?)
+"""
+LEGACY_PRODUCT_REPORT_SQL = """
+    SELECT u.id as urun_id, u.stok_kodu, u.ad as urun_adi, SUM(sd.miktar) as toplam_satilan_adet,
+           SUM(sd.miktar * sd.birim_fiyat) / 100.0 as toplam_ciro, SUM(sd.miktar * u.alis_fiyati) / 100.0 as toplam_maliyet,
+           (SUM(sd.miktar * sd.birim_fiyat) - SUM(sd.miktar * u.alis_fiyati)) / 100.0 as toplam_kar
+    FROM satis_detaylari sd JOIN urunler u ON sd.urun_id = u.id JOIN satislar s ON sd.satis_id = s.id
+    WHERE s.satis_zamani BETWEEN ? AND ? GROUP BY u.id, u.ad, u.stok_kodu ORDER BY toplam_ciro DESC
+"""
+LEGACY_CUSTOMER_REPORT_SQL = """
+    SELECT m.id as musteri_id, m.ad || ' ' || m.soyad as musteri_adi,
+           SUM(sd.miktar * sd.birim_fiyat) / 100.0 as toplam_ciro, SUM(sd.miktar * u.alis_fiyati) / 100.0 as toplam_maliyet,
+           (SUM(sd.miktar * sd.birim_fiyat) - SUM(sd.miktar * u.alis_fiyati)) / 100.0 as toplam_kar
+    FROM musteriler m JOIN satislar s ON m.id = s.musteri_id JOIN satis_detaylari sd ON s.id = sd.satis_id
+    JOIN urunler u ON sd.urun_id = u.id WHERE s.satis_zamani BETWEEN ? AND ? AND m.id != 1
+    GROUP BY m.id, musteri_adi HAVING toplam_ciro > 0 ORDER BY toplam_kar DESC
+"""
+
+def _legacy_sales_with_profit(start, end):
+    params = (epoch_key(start), epoch_key(end))
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_SALES_WITH_PROFIT_SQL, params).fetchall(), conn.execute(LEGACY_SALES_TOTALS_SQL, params * 2).fetchone()
+
+def _legacy(sql, start, end):
+    with connection.get_db_connection() as conn:
+        return conn.execute(sql, (epoch_key(start), epoch_key(end))).fetchall()
+
+def _snapshot_costs():
+    with connection.get_db_connection() as conn:
+        conn.execute("UPDATE satis_detaylari SET birim_maliyet = (SELECT alis_fiyati FROM urunler u WHERE u.id = satis_detaylari.urun_id)")
+        conn.execute("ANALYZE")
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(23)
+    with temporary_database("cost_snapshot.db"):
+        product_ids = seed_products(2000)
+        _seed_sales(sale_count, product_ids, seed_customers(5000))
+        _snapshot_costs()
+        now = datetime.now()
+        periods = {"son 30 gün": (now - timedelta(days=30), now), "tüm dönem": (now - timedelta(days=4 * 365), now)}
+
+        for label, (start, end) in periods.items():
+            start_str, end_str = start.strftime("%Y-%m-%d 00:00:00"), end.strftime("%Y-%m-%d 23:59:59")
+            print(f"--- Kâr raporları, {label} ({sale_count:,} satış) ---")
+            print_row("Eski / satış kârı (JOIN urunler)", summarize(measure(lambda: _legacy_sales_with_profit(start_str, end_str), REPEAT)))
+            print_row("Yeni / get_sales_with_profit_by_date_range", summarize(measure(lambda: db.get_sales_with_profit_by_date_range(start_str, end_str), REPEAT)))
+            print_row("Eski / ürün bazlı", summarize(measure(lambda: _legacy(LEGACY_PRODUCT_REPORT_SQL, start_str, end_str), REPEAT)))
+            print_row("Yeni / get_product_sales_report", summarize(measure(lambda: db.get_product_sales_report(start_str, end_str), REPEAT)))
+            print_row("Eski / müşteri bazlı", summarize(measure(lambda: _legacy(LEGACY_CUSTOMER_REPORT_SQL, start_str, end_str), REPEAT)))
+            print_row("Yeni / get_customer_sales_report", summarize(measure(lambda: db.get_customer_sales_report(start_str, end_str), REPEAT)))
+
+        start_str, end_str = (now - timedelta(days=4 * 365)).strftime("%Y-%m-%d 00:00:00"), now.strftime("%Y-%m-%d 23:59:59")
+        legacy_cost = {row['urun_id']: row['toplam_maliyet'] for row in _legacy(LEGACY_PRODUCT_REPORT_SQL, start_str, end_str)}
+        report_cost = {row['urun_id']: row['toplam_maliyet'] for row in db.get_product_sales_report(start_str, end_str)}
+        if legacy_cost != report_cost:
+            print("[HATA] Anlık maliyetle hesaplanan ürün raporu eski raporla uyuşmuyor.")
+            return 1
+        _, totals_before = db.get_sales_with_profit_by_date_range(start_str, end_str)
+        with connection.get_db_connection() as conn:
+            conn.execute("UPDATE urunler SET alis_fiyati = alis_fiyati * 2")
+        _, totals_after = db.get_sales_with_profit_by_date_range(start_str, end_str)
+        if totals_before != totals_after:
+            print("[HATA] Alış fiyatı değişikliği geçmiş satışların kârını değiştirdi.")
+            return 1
+        print("[OK] Raporlar eskisiyle aynı; alış fiyatı değişince geçmiş kâr değişmiyor.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
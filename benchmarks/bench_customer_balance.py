@@ -0,0 +1,62 @@
+# dosya: benchmarks/bench_customer_balance.py
+# Kullanım: python -m benchmarks.bench_customer_balance [satış_sayısı]
+# Müşteri seçildiğinde gösterilen bakiyeyi eski yöntemle (satislar + odeme_gecmisi üzerinde iki
+# SUM) ve musteri_bakiye_ozet tablosundan okuyarak karşılaştırır. Ardından karışık satış, iptal ve
+# ödeme işlemleri sonrası verify_customer_balances ile özetin ham kayıtlarla tutarlılığını doğrular.
+
+import sys
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from database import connection
+from database import database_manager as db
+
+DEFAULT_SALE_COUNT = 500_000
+REPEAT = 200
+
+LEGACY_BALANCE_SQL = """
+    SELECT ((SELECT COALESCE(SUM(toplam_tutar), 0) FROM satislar WHERE musteri_id = :id) -
+            (SELECT COALESCE(SUM(tutar), 0) FROM odeme_gecmisi WHERE musteri_id = :id)) / 100.0 AS balance
+"""
+
+def _legacy_balance(customer_id):
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_BALANCE_SQL, {"id": customer_id}).fetchone()['balance']
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(17)
+    with temporary_database("customer_balance.db"):
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(50)
+        print(f"[...] {sale_count:,} satış oluşturuluyor...")
+        _seed_sales(sale_count, product_ids, customer_ids)
+        db.rebuild_customer_balances()
+
+        busiest = customer_ids[1]
+        print(f"\n--- Müşteri bakiyesi ({sale_count:,} satış, {len(customer_ids)} müşteri) ---")
+        print_row("Eski / iki SUM alt sorgusu", summarize(measure(lambda: _legacy_balance(busiest), REPEAT // 10)))
+        print_row("musteri_bakiye_ozet", summarize(measure(lambda: db.get_customer_balance(busiest), REPEAT)))
+        print_row("Müşteri listesi (bakiye dahil)", summarize(measure(lambda: db.search_customers(""), REPEAT)))
+
+        sale_ids = []
+        for i in range(300):
+            customer_id = random.choice(customer_ids)
+            lines = [{'urun_id': random.choice(product_ids), 'miktar': 1, 'birim_fiyat': 12.5}]
+            sale_date = (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d %H:%M:%S")
+            sale_ids.append(db.create_sale({'musteri_id': customer_id, 'toplam_tutar': 12.5, 'odenen_tutar': random.choice([0, 5.0, 12.5])}, lines, sale_date))
+            if i % 3 == 0:
+                db.add_payment(customer_id, 3.33, "Test ödemesi")
+        for sale_id in random.sample(sale_ids, 100):
+            db.delete_sale_by_id(sale_id)
+
+        if _legacy_balance(busiest) != db.get_customer_balance(busiest)['balance'] or db.verify_customer_balances():
+            print("[HATA] Bakiye özeti ham kayıtlarla uyuşmuyor.")
+            return 1
+        print("[OK] Satış, iptal ve ödemeler sonrası tüm bakiyeler tutarlı.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
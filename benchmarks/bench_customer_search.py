@@ -0,0 +1,39 @@
+# dosya: benchmarks/bench_customer_search.py
+# Kullanım: python -m benchmarks.bench_customer_search [müşteri_sayısı]
+# search_customers'ın normalleştirilmiş anahtar sütunları (arama_ad, arama_telefon, ...)
+# üzerinden yaptığı aramayı eski dört LIKE '%q%' koşullu sorguyla karşılaştırır.
+
+import sys
+
+from benchmarks.common import temporary_database, seed_customers, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+
+DEFAULT_CUSTOMER_COUNT = 100_000
+REPEAT = 20
+QUERIES = ("müşteri1234", "MÜŞTERİ12 soyad12", "0532 000 12", "4567", "musteri99@")
+
+LEGACY_SEARCH_SQL = """
+    SELECT m.id, m.ad, m.soyad, m.telefon, m.eposta, g.ad as grup_adi FROM musteriler m LEFT JOIN musteri_gruplari g ON m.grup_id = g.id
+    WHERE m.aktif_mi = 1 AND m.id != 1 AND (m.ad LIKE :query OR m.soyad LIKE :query OR m.telefon LIKE :query OR m.eposta LIKE :query)
+    ORDER BY m.ad, m.soyad
+"""
+
+def _legacy(query):
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_SEARCH_SQL, {'query': f"%{query}%"}).fetchall()
+
+def main():
+    customer_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CUSTOMER_COUNT
+    with temporary_database("customer_search.db"):
+        seed_customers(customer_count)
+        with connection.get_db_connection() as conn:
+            conn.execute("ANALYZE")
+        for query in QUERIES:
+            print(f"\n--- '{query}' ({customer_count:,} müşteri) ---")
+            print_row("Eski / LIKE '%q%'", summarize(measure(lambda: _legacy(query), REPEAT)))
+            print_row("Arama anahtarları", summarize(measure(lambda: db.search_customers(query), REPEAT)))
+            print(f"Sonuç sayısı: eski {len(_legacy(query))}, yeni {len(db.search_customers(query))}")
+
+if __name__ == "__main__":
+    main()
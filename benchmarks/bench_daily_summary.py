@@ -0,0 +1,73 @@
+# dosya: benchmarks/bench_daily_summary.py
+# Kullanım: python -m benchmarks.bench_daily_summary [satış_sayısı]
+# Gün/ay bazlı ciro, kâr ve satış adedi sorgularını ham satislar/satis_detaylari toplamı ile
+# gunluk_satis_ozet tablosu üzerinden karşılaştırır; özetin satış başına güncelleme maliyetini
+# ve tam yeniden oluşturma süresini ölçer, sonunda iki yolun aynı sonucu verdiğini doğrular.
+
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from database import connection
+from database import database_manager as db
+from database.queries.date_keys import day_key
+
+DEFAULT_SALE_COUNT = 1_000_000
+REPEAT = 5
+
+RAW_DAILY_SQL = "SELECT satis_gunu, SUM(toplam_tutar) FROM satislar WHERE satis_gunu BETWEEN ? AND ? GROUP BY satis_gunu ORDER BY satis_gunu"
+SUMMARY_DAILY_SQL = "SELECT gun, SUM(ciro) FROM gunluk_satis_ozet WHERE gun BETWEEN ? AND ? GROUP BY gun ORDER BY gun"
+RAW_TOTALS_SQL = """
+    SELECT SUM(s.toplam_tutar), SUM((SELECT SUM(sd.miktar * sd.birim_maliyet) FROM satis_detaylari sd
+           WHERE sd.satis_id = s.id)), COUNT(*)
+    FROM satislar s WHERE s.satis_gunu BETWEEN ? AND ?
+"""
+SUMMARY_TOTALS_SQL = "SELECT SUM(ciro), SUM(maliyet), SUM(satis_adedi) FROM gunluk_satis_ozet WHERE gun BETWEEN ? AND ?"
+
+def _run(sql, params):
+    with connection.get_db_connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+def _seed_unit_costs():
+    # commit_sale'in yaptığı gibi satış anındaki maliyet, ürünün alış fiyatından satır başına yazılır.
+    with connection.get_db_connection() as conn:
+        conn.execute("UPDATE satis_detaylari SET birim_maliyet = (SELECT alis_fiyati FROM urunler WHERE id = satis_detaylari.urun_id)")
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(13)
+    with temporary_database("daily_summary.db"):
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(500)
+        print(f"[...] {sale_count:,} satış oluşturuluyor...")
+        _seed_sales(sale_count, product_ids, customer_ids)
+        _seed_unit_costs()
+
+        start = time.perf_counter()
+        row_count = db.rebuild_daily_sales_summary()
+        print(f"Özet yeniden oluşturma: {time.perf_counter() - start:.2f} s ({row_count:,} satır)")
+
+        today = datetime.now()
+        end_key = day_key(today)
+        for label, days in (("30 gün", 30), ("1 yıl", 365)):
+            params = (day_key(today - timedelta(days=days)), end_key)
+            print(f"\n--- {label} aralığı ({sale_count:,} satış) ---")
+            print_row("Günlük ciro / ham satislar", summarize(measure(lambda: _run(RAW_DAILY_SQL, params), REPEAT)))
+            print_row("Günlük ciro / gunluk_satis_ozet", summarize(measure(lambda: _run(SUMMARY_DAILY_SQL, params), REPEAT)))
+            print_row("Ciro + maliyet + adet / ham", summarize(measure(lambda: _run(RAW_TOTALS_SQL, params), REPEAT)))
+            print_row("Ciro + maliyet + adet / özet", summarize(measure(lambda: _run(SUMMARY_TOTALS_SQL, params), REPEAT)))
+            if tuple(_run(RAW_TOTALS_SQL, params)[0]) != tuple(_run(SUMMARY_TOTALS_SQL, params)[0]):
+                print("[HATA] Özet tablosu ham toplamlarla uyuşmuyor.")
+                return 1
+
+        lines = [{'urun_id': product_ids[0], 'miktar': 1, 'birim_fiyat': 10.0}]
+        sale = {'musteri_id': customer_ids[5], 'toplam_tutar': 10.0, 'odenen_tutar': 10.0}
+        print_row("\nSatış kaydı (özet güncellemesi dahil)", summarize(measure(lambda: db.create_sale(sale, lines), 200)))
+        print("[OK] Özet tablosu ham verilerle aynı sonucu veriyor.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# dosya: benchmarks/bench_database_writer.py
+# Kullanım: python -m benchmarks.bench_database_writer [satış_sayısı]
+# Başka bir bağlantı (ikinci kasa, yedekleme) yazma kilidini aralıklarla tutarken satışlar önce
+# eski yöntemle (ana iş parçacığında doğrudan commit_sale), sonra yazıcı iş parçacığına gönderilerek
+# kaydedilir. Ana iş parçacığının her satışta ne kadar bloklandığı, toplam verim ve yazıcının kuyruk
+# derinliği / commit gecikmesi ölçülür. Stok yetersizliğinden reddedilen satışların toplu işlemde iz
+# bırakmadığı ve stok hareketlerinin satılan adetle birebir tuttuğu doğrulanır.
+
+import sys
+import time
+import random
+import sqlite3
+import threading
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, summarize, print_row
+from database import connection
+from database import database_manager as db
+
+DEFAULT_SALE_COUNT = 600
+HOT_PRODUCT_COUNT = 5
+INITIAL_STOCK = 800
+PRODUCER_COUNT = 4
+LOCK_HOLD = 0.2
+LOCK_PAUSE = 0.3
+
+class _LockHolder(threading.Thread):
+    # Yazma kilidini LOCK_HOLD saniye tutup LOCK_PAUSE saniye bırakan ayrı bağlantı.
+    def __init__(self, db_path):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.stop_event = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=connection.CONNECTION_TIMEOUT, isolation_level=None)
+        try:
+            while not self.stop_event.is_set():
+                conn.execute("BEGIN IMMEDIATE")
+                time.sleep(LOCK_HOLD)
+                conn.execute("COMMIT")
+                time.sleep(LOCK_PAUSE)
+        finally:
+            conn.close()
+
+def _sales(rng, product_ids, customer_id, count):
+    result = []
+    for _ in range(count):
+        lines = [{'urun_id': rng.choice(product_ids), 'miktar': rng.randint(1, 3), 'birim_fiyat': 10.0} for _ in range(rng.randint(1, 3))]
+        result.append(({'musteri_id': customer_id, 'toplam_tutar': sum(l['miktar'] * 10.0 for l in lines), 'odenen_tutar': 0}, lines))
+    return result
+
+def _tally(results, sales, totals):
+    for (satis_id, shortages), (_, lines) in zip(results, sales):
+        if satis_id:
+            totals['committed'] += 1
+            totals['sold_units'] += sum(l['miktar'] for l in lines)
+        elif shortages:
+            totals['rejected'] += 1
+        else:
+            totals['failed'] += 1
+
+def _run_producers(sales, submit):
+    # PRODUCER_COUNT iş parçacığı satışları paylaşarak kaydeder; submit sonucu beklenmiş (satis_id, eksikler) döndürür.
+    results = [None] * len(sales)
+
+    def produce(offset):
+        for i in range(offset, len(sales), PRODUCER_COUNT):
+            results[i] = submit(*sales[i])
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(PRODUCER_COUNT)]
+    start = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return results, time.perf_counter() - start
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    rng = random.Random(43)
+    totals = {'committed': 0, 'rejected': 0, 'failed': 0, 'sold_units': 0}
+    with temporary_database("database_writer.db") as db_path:
+        product_ids = seed_products(HOT_PRODUCT_COUNT, stock=INITIAL_STOCK)
+        customer_id = seed_customers(1)[0]
+        print(f"--- {sale_count} satış, başka bir bağlantı yazma kilidini {LOCK_HOLD * 1000:.0f} ms tutup {LOCK_PAUSE * 1000:.0f} ms bırakıyor ---")
+
+        holder = _LockHolder(db_path)
+        holder.start()
+        direct_sales = _sales(rng, product_ids, customer_id, sale_count // 2)
+        blocked, results = [], []
+        for sale_data, lines in direct_sales:
+            start = time.perf_counter()
+            results.append(db.commit_sale(sale_data, lines))
+            blocked.append(time.perf_counter() - start)
+        _tally(results, direct_sales, totals)
+        print_row("Eski / ana iş parçacığında commit_sale", summarize(blocked))
+        print(f"{'':<45} en uzun donma: {max(blocked) * 1000:.0f} ms, toplam {sum(blocked):.2f} s")
+
+        writer_sales = _sales(rng, product_ids, customer_id, sale_count // 2)
+        blocked, futures = [], []
+        start = time.perf_counter()
+        for sale_data, lines in writer_sales:
+            submit_start = time.perf_counter()
+            futures.append(db.submit_write(db.commit_sale, sale_data, lines))
+            blocked.append(time.perf_counter() - submit_start)
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        _tally(results, writer_sales, totals)
+        print_row("Yeni / submit_write (ana iş parçacığı)", summarize(blocked))
+        print(f"{'':<45} en uzun donma: {max(blocked) * 1000:.2f} ms, tüm satışlar {elapsed:.2f} s içinde commit edildi")
+        holder.stop_event.set()
+        holder.join()
+
+        throughput_sales = _sales(rng, product_ids, customer_id, sale_count)
+        direct_results, direct_elapsed = _run_producers(throughput_sales[:sale_count // 2], db.commit_sale)
+        writer_results, writer_elapsed = _run_producers(throughput_sales[sale_count // 2:], lambda sale_data, lines: db.submit_write(db.commit_sale, sale_data, lines).result())
+        _tally(direct_results, throughput_sales[:sale_count // 2], totals)
+        _tally(writer_results, throughput_sales[sale_count // 2:], totals)
+        print(f"{PRODUCER_COUNT} iş parçacığı, kilit yokken: doğrudan {len(direct_results) / direct_elapsed:,.0f} satış/s, "
+              f"yazıcı {len(writer_results) / writer_elapsed:,.0f} satış/s")
+
+        stats = db.get_writer_stats()
+        print(f"Yazıcı: {stats['commands']} komut, {stats['batches']} toplu işlem (ort. {stats['avg_batch_size']} komut), "
+              f"en yüksek kuyruk {stats['max_queue_depth']}, commit p50/p95 {stats['commit_p50_ms']}/{stats['commit_p95_ms']} ms, "
+              f"bekleme p50/p95 {stats['wait_p50_ms']}/{stats['wait_p95_ms']} ms")
+        db.stop_database_writer()
+
+        with connection.get_db_connection() as conn:
+            stocks = [row['stok_miktari'] for row in conn.execute("SELECT stok_miktari FROM urunler")]
+            sale_rows = conn.execute("SELECT COUNT(*) FROM satislar").fetchone()[0]
+            sold_in_db = conn.execute("SELECT COALESCE(SUM(miktar), 0) FROM satis_detaylari").fetchone()[0]
+            moved = conn.execute("SELECT COALESCE(-SUM(miktar), 0) FROM stok_hareketleri WHERE hareket_tipi = 'Satış'").fetchone()[0]
+        connection.close_all_connections()
+
+    print(f"Kaydedilen: {totals['committed']}   stok yetersiz: {totals['rejected']}   hata: {totals['failed']}")
+    checks = [
+        ("Hiçbir stok eksiye düşmedi", min(stocks) >= 0),
+        ("Reddedilen satışlar iz bırakmadı", sale_rows == totals['committed']),
+        ("Satılan adet = stok düşüşü = stok hareketleri", totals['sold_units'] == HOT_PRODUCT_COUNT * INITIAL_STOCK - sum(stocks) == sold_in_db == moved),
+        ("Veritabanı hatası yok", totals['failed'] == 0 and stats['failed_batches'] == 0),
+    ]
+    for label, ok in checks:
+        print(f"[{'OK' if ok else 'HATA'}] {label}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# dosya: benchmarks/bench_date_keys.py
+# Kullanım: python -m benchmarks.bench_date_keys [satış_sayısı]
+# 1M satışlık veri setinde TEXT satis_tarihi üzerinden BETWEEN/strftime ile çalışan eski
+# sorguları, satis_zamani/satis_gunu tamsayı anahtarlarını kullanan güncel sorgularla karşılaştırır.
+
+import sys
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+from database.queries.date_keys import day_key, epoch_key
+
+DEFAULT_SALE_COUNT = 1_000_000
+REPEAT = 5
+
+LEGACY_QUERIES = {
+    "gunluk": "SELECT strftime('%Y-%m-%d', satis_tarihi) as gun, SUM(toplam_tutar) / 100.0 as toplam_satis FROM satislar WHERE satis_tarihi BETWEEN ? AND ? GROUP BY gun ORDER BY gun ASC",
+    "aralik": "SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id WHERE s.satis_tarihi BETWEEN ? AND ? ORDER BY s.satis_tarihi DESC",
+    "urun": """SELECT u.id as urun_id, u.stok_kodu, u.ad as urun_adi, SUM(sd.miktar) as toplam_satilan_adet,
+               SUM(sd.miktar * sd.birim_fiyat) / 100.0 as toplam_ciro, SUM(sd.miktar * u.alis_fiyati) / 100.0 as toplam_maliyet,
+               (SUM(sd.miktar * sd.birim_fiyat) - SUM(sd.miktar * u.alis_fiyati)) / 100.0 as toplam_kar
+               FROM satis_detaylari sd JOIN urunler u ON sd.urun_id = u.id JOIN satislar s ON sd.satis_id = s.id
+               WHERE s.satis_tarihi BETWEEN ? AND ? GROUP BY u.id, u.ad, u.stok_kodu ORDER BY toplam_ciro DESC""",
+}
+
+def _seed_sales(sale_count, product_ids, customer_ids):
+    start = datetime.now() - timedelta(days=3 * 365)
+    step = (3 * 365 * 86400) / sale_count
+    with connection.get_db_connection() as conn:
+        batch, details = [], []
+        for i in range(sale_count):
+            moment = (start + timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S")
+            total = random.randint(1_000, 500_000)
+            batch.append((i + 1, random.choice(customer_ids), moment, total, total, day_key(moment), epoch_key(moment)))
+            details.append((i + 1, random.choice(product_ids), random.randint(1, 3), total))
+            if len(batch) == 50_000:
+                conn.executemany("INSERT INTO satislar (id, musteri_id, satis_tarihi, toplam_tutar, odenen_tutar, satis_gunu, satis_zamani) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                conn.executemany("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", details)
+                batch, details = [], []
+        if batch:
+            conn.executemany("INSERT INTO satislar (id, musteri_id, satis_tarihi, toplam_tutar, odenen_tutar, satis_gunu, satis_zamani) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            conn.executemany("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", details)
+        # Eski sorgular için eski TEXT indeksi de oluşturulur ki karşılaştırma adil olsun.
+        conn.execute("CREATE INDEX idx_satislar_tarih_eski ON satislar (satis_tarihi, musteri_id, toplam_tutar)")
+        conn.execute("ANALYZE")
+
+def _legacy(name, start, end):
+    with connection.get_db_connection() as conn:
+        rows = conn.execute(LEGACY_QUERIES[name], (start, end)).fetchall()
+        if name == "aralik":
+            return rows, sum(row['toplam_tutar'] for row in rows)
+        return rows
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(11)
+    with temporary_database("date_keys.db"):
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(500)
+        print(f"[...] {sale_count:,} satış oluşturuluyor...")
+        _seed_sales(sale_count, product_ids, customer_ids)
+        db.rebuild_daily_sales_summary()
+
+        today = datetime.now()
+        periods = {
+            "30 gün": (today - timedelta(days=30)).strftime("%Y-%m-%d 00:00:00"),
+            "1 yıl": (today - timedelta(days=365)).strftime("%Y-%m-%d 00:00:00"),
+        }
+        end = today.strftime("%Y-%m-%d 23:59:59")
+        for label, start in periods.items():
+            print(f"\n--- {label} aralığı ({sale_count:,} satış) ---")
+            print_row("Günlük toplam / eski (strftime)", summarize(measure(lambda: _legacy("gunluk", start, end), REPEAT)))
+            print_row("Günlük toplam / gunluk_satis_ozet", summarize(measure(lambda: db.get_daily_sales_for_period(start, end), REPEAT)))
+            print_row("Satış listesi / eski (TEXT BETWEEN)", summarize(measure(lambda: _legacy("aralik", start, end), REPEAT)))
+            print_row("Satış listesi / satis_zamani", summarize(measure(lambda: db.get_sales_by_date_range(start, end), REPEAT)))
+            print_row("Ürün raporu / eski", summarize(measure(lambda: _legacy("urun", start, end), REPEAT)))
+            print_row("Ürün raporu / satis_zamani", summarize(measure(lambda: db.get_product_sales_report(start, end), REPEAT)))
+        print_row("\nBu ayın günlük grafiği", summarize(measure(db.get_sales_by_day_for_month, REPEAT)))
+
+if __name__ == "__main__":
+    main()
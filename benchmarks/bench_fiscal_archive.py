@@ -0,0 +1,184 @@
+# dosya: benchmarks/bench_fiscal_archive.py
+# Kullanım: python -m benchmarks.bench_fiscal_archive [satış_sayısı]
+# Üç yıla yayılmış satış, ödeme ve stok hareketi verisinde kapanmış mali yıllar, kasa arka planda
+# satış kaydederken arşivlenir. Arşivleme süresi, bu sırada commit_sale gecikmesi, canlı veritabanının
+# boyutu ve sıcak sorguların (son 30 günün raporu, satış geçmişi, müşteri bakiyesi) hızı önce/sonra
+# ölçülür. Tüm dönemi kapsayan raporların arşivden önceki sonuçlarla birebir aynı olduğu, müşteri
+# bakiyelerinin ve hesap ekstresi toplamlarının korunduğu, arşiv dosyasına yazılamadığı ve
+# arşivlenmiş yıla geriye dönük satış eklenemediği doğrulanır.
+
+import os
+import sys
+import time
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from benchmarks.bench_online_backup import _Checkout
+from database import connection
+from database import database_manager as db
+from database.queries import archive_sources
+
+DEFAULT_SALE_COUNT = 300_000
+PAYMENT_COUNT = 30_000
+MOVEMENT_COUNT = 30_000
+HOT_REPEAT = 20
+HISTORY_CUSTOMERS = 25
+
+def _seed_payments_and_movements(customer_ids, product_ids):
+    start = datetime.now() - timedelta(days=3 * 365)
+    with connection.get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO odeme_gecmisi (musteri_id, tarih, tutar, aciklama) VALUES (?, ?, ?, 'Tahsilat')",
+            [(random.choice(customer_ids), (start + timedelta(seconds=i * 3 * 365 * 86400 / PAYMENT_COUNT)).strftime("%Y-%m-%d %H:%M:%S"),
+              random.randint(1_000, 200_000)) for i in range(PAYMENT_COUNT)]
+        )
+        conn.executemany(
+            "INSERT INTO stok_hareketleri (urun_id, tarih, hareket_tipi, miktar, aciklama, son_stok) VALUES (?, ?, 'Giriş', ?, 'Alış', 0)",
+            [(random.choice(product_ids), (start + timedelta(seconds=i * 3 * 365 * 86400 / MOVEMENT_COUNT)).strftime("%Y-%m-%d %H:%M:%S"),
+              random.randint(1, 50)) for i in range(MOVEMENT_COUNT)]
+        )
+
+def _full_reports(start, end, customer_ids):
+    sales, total = db.get_sales_by_date_range(start, end)
+    profit_rows, totals = db.get_sales_with_profit_by_date_range(start, end)
+    customer_sales, customer_total = db.get_sales_by_date_range(start, end, customer_ids[5])
+    return {
+        'satışlar': (len(sales), round(total, 2), sales[0]['id'], sales[-1]['id']),
+        'kârlı satışlar': (len(profit_rows), totals['total_revenue'], totals['total_cost']),
+        'müşteri satışları': (len(customer_sales), round(customer_total, 2)),
+        'ürün raporu': [tuple(row) for row in db.get_product_sales_report(start, end)],
+        'müşteri raporu': [tuple(row) for row in db.get_customer_sales_report(start, end)],
+        'dönem özeti': dict(db.get_sales_summary_for_period(start, end)),
+    }
+
+def _customer_state(customer_ids):
+    history = {}
+    for customer_id in customer_ids[1:HISTORY_CUSTOMERS + 1]:
+        rows = db.get_customer_transaction_history(customer_id)
+        history[customer_id] = (round(sum(row['borc'] for row in rows), 2), round(sum(row['alacak'] for row in rows), 2))
+    balances = {customer_id: db.get_customer_balance(customer_id)['balance'] for customer_id in customer_ids}
+    return history, balances
+
+def _hot_queries(customer_id):
+    # Kasanın ölçüm sırasında eklediği bugünkü satışlar önce/sonra karşılaştırmasını bozmasın diye dünle biter.
+    yesterday = datetime.now() - timedelta(days=1)
+    start, end = (yesterday - timedelta(days=30)).strftime("%Y-%m-%d 00:00:00"), yesterday.strftime("%Y-%m-%d 23:59:59")
+    return {
+        'Son 30 gün kârlı satış raporu': lambda: db.get_sales_with_profit_by_date_range(start, end),
+        'Son 30 gün ürün raporu': lambda: db.get_product_sales_report(start, end),
+        'Satış geçmişi (ilk sayfa)': lambda: db.get_sales_history_page(),
+        'Müşteri hesap ekstresi': lambda: db.get_customer_transaction_history(customer_id),
+    }
+
+def _database_size(path):
+    return sum(os.path.getsize(path + suffix) for suffix in ('', '-wal') if os.path.exists(path + suffix))
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(61)
+    with temporary_database("fiscal_archive.db") as db_path:
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        _seed_payments_and_movements(customer_ids, product_ids)
+        db.rebuild_daily_sales_summary()
+        db.rebuild_customer_balances()
+        connection.checkpoint_database('TRUNCATE')
+
+        first_year, this_year = (datetime.now() - timedelta(days=3 * 365)).year, datetime.now().year
+        # Dönem özeti gün bazında olduğundan karşılaştırma dünün sonunda biter; kasanın bugünkü satışları girmez.
+        full_start, full_end = f"{first_year}-01-01 00:00:00", (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d 23:59:59")
+        print(f"--- {sale_count:,} satış, {PAYMENT_COUNT:,} ödeme, {MOVEMENT_COUNT:,} stok hareketi ({first_year}-{this_year}); "
+              f"{first_year}-{this_year - 1} arşivleniyor ---")
+        started = time.perf_counter()
+        before_reports = _full_reports(full_start, full_end, customer_ids)
+        full_before = time.perf_counter() - started
+        before_history, before_balances = _customer_state(customer_ids)
+        hot_before = {label: summarize(measure(fn, HOT_REPEAT)) for label, fn in _hot_queries(customer_ids[5]).items()}
+        size_before = _database_size(db_path)
+
+        checkout = _Checkout(product_ids, customer_ids[0])
+        checkout.start()
+        time.sleep(0.5)
+        checkout.recording = True
+        time.sleep(2)
+        checkout.recording = False
+        print_row("Arşivleme yokken commit_sale", summarize(checkout.durations))
+        checkout.durations.clear()
+        checkout.recording = True
+        archived = []
+        for year in range(first_year, this_year):
+            started = time.perf_counter()
+            info = db.archive_fiscal_year(year)
+            archived.append(info)
+            print(f"{year}: {info['satis_adedi']:>8,} satış, {info['detay_adedi']:>8,} detay, {info['odeme_adedi']:>6,} ödeme, "
+                  f"{info['hareket_adedi']:>6,} hareket -> {info['boyut_bayt'] / 1024 / 1024:6.1f} MB, {time.perf_counter() - started:6.2f} s")
+        checkout.recording = False
+        checkout.stop_event.set()
+        checkout.join()
+        print_row("Arşivleme sırasında commit_sale", summarize(checkout.durations))
+        print(f"{'':<45} satış kaydı: {len(checkout.durations)}, en uzun: {max(checkout.durations) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        after_reports = _full_reports(full_start, full_end, customer_ids)
+        full_after = time.perf_counter() - started
+        after_history, after_balances = _customer_state(customer_ids)
+        snapshot_reports = db.run_in_snapshot(_full_reports, full_start, full_end, customer_ids)[0]
+        size_unvacuumed = _database_size(db_path)
+        compact_started = time.perf_counter()
+        db.compact_database()
+        compact_elapsed = time.perf_counter() - compact_started
+        size_after = _database_size(db_path)
+        hot_after = {label: summarize(measure(fn, HOT_REPEAT)) for label, fn in _hot_queries(customer_ids[5]).items()}
+
+        print("\nSıcak sorgular (arşivden önce -> sonra):")
+        for label in hot_before:
+            print(f"  {label:<32} p50 {hot_before[label]['p50_us'] / 1000:8.2f} ms -> {hot_after[label]['p50_us'] / 1000:8.2f} ms")
+        print(f"  {'Tüm dönem raporları (arşivlerle)':<32}     {full_before * 1000:8.0f} ms -> {full_after * 1000:8.0f} ms")
+        print(f"Canlı veritabanı: {size_before / 1024 / 1024:.1f} MB -> {size_unvacuumed / 1024 / 1024:.1f} MB (VACUUM öncesi) -> "
+              f"{size_after / 1024 / 1024:.1f} MB (VACUUM {compact_elapsed:.2f} s); arşivler toplam {sum(i['boyut_bayt'] for i in archived) / 1024 / 1024:.1f} MB")
+
+        errors = []
+        for name, value in before_reports.items():
+            if after_reports[name] != value:
+                errors.append(f"Tüm dönem raporu değişti: {name}")
+            if snapshot_reports[name] != value:
+                errors.append(f"Anlık görüntüdeki tüm dönem raporu değişti: {name}")
+        if after_history != before_history:
+            errors.append("Müşteri hesap ekstresi toplamları değişti.")
+        changed = [customer_id for customer_id in customer_ids if customer_id != customer_ids[0] and abs(after_balances[customer_id] - before_balances[customer_id]) > 0.005]
+        if changed:
+            errors.append(f"{len(changed)} müşterinin bakiyesi değişti.")
+        if db.verify_customer_balances():
+            errors.append("Müşteri bakiyeleri devreden bakiyelerle tutarsız.")
+        with connection.get_db_connection() as conn:
+            remaining = conn.execute("SELECT COUNT(*) FROM satislar WHERE satis_gunu < ?", (this_year * 10000 + 101,)).fetchone()[0]
+            if remaining:
+                errors.append(f"Arşivlenen yıllara ait {remaining} satış canlı veritabanında kaldı.")
+            schema = archive_sources.archive_schema(first_year)
+            connection.attach_databases(conn, [schema])
+            try:
+                conn.execute(f"DELETE FROM {schema}.satislar WHERE id = 1")
+                errors.append("Arşiv dosyasına yazılabildi.")
+            except sqlite3.OperationalError as e:
+                print(f"Arşive yazma denemesi reddedildi: {e}")
+        satis_id, _ = db.commit_sale({'musteri_id': customer_ids[1], 'toplam_tutar': 10.0, 'odenen_tutar': 0},
+                                     [{'urun_id': product_ids[0], 'miktar': 1, 'birim_fiyat': 10.0}], f"{first_year}-06-01 12:00:00")
+        if satis_id:
+            errors.append("Arşivlenmiş yıla geriye dönük satış eklenebildi.")
+        if not all(row['durum'] == 'tamam' for row in db.get_archive_periods()):
+            errors.append("Arşiv dönemlerinden biri tamamlanmadı.")
+        connection.close_all_connections()
+
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Tüm dönem raporları, bakiyeler ve hesap ekstreleri arşivlemeden sonra aynı; arşiv dosyaları salt okunur.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
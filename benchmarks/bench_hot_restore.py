@@ -0,0 +1,151 @@
+# dosya: benchmarks/bench_hot_restore.py
+# Kullanım: python -m benchmarks.bench_hot_restore [satış_sayısı]
+# Kasa arka planda sürekli satış kaydederken bir yedek program kapatılmadan geri yüklenir.
+# Geri yükleme süresi, dosya değiştirilirken kasanın en uzun bekleme süresi ve bu
+# sırada commit_sale gecikmesi ölçülür. Geri yüklenen veritabanının yedekteki satışları içerdiği,
+# havuzun yeni dosyayla açıldığı, eski şemalı yedeğe geçişlerin uygulandığı, bozuk veya daha yeni
+# şemalı dosyaların reddedildiği ve önceki veritabanının .onceki olarak saklandığı doğrulanır.
+# Eski şemalı ve bozuk yedekler adında '#', '?' ve '%' geçen bir klasörden geri yüklenir: dosya
+# yolu URI'de kaçışlanmazsa SQLite gerçek dosya yerine boş bir dosyayı kontrol ederdi.
+
+import os
+import sys
+import time
+import random
+import sqlite3
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from benchmarks.bench_online_backup import _Checkout, _sale_count
+from database import connection, backup
+from database import database_manager as db
+from database.migrations import latest_version
+
+DEFAULT_SALE_COUNT = 300_000
+SPECIAL_DIR_NAME = "yedek #1 ?%41"
+
+class _CountingCheckout(_Checkout):
+    # Kaydedilen satışları sayar; dosya değiştirildiği anda kaç satış kaydedilmiş olduğu bilinsin diye.
+    def __init__(self, product_ids, customer_id):
+        super().__init__(product_ids, customer_id)
+        self.committed = 0
+        self.failed = 0
+
+    def run(self):
+        rng = random.Random(7)
+        while not self.stop_event.is_set():
+            lines = [{'urun_id': rng.choice(self.product_ids), 'miktar': 1, 'birim_fiyat': 10.0}]
+            start = time.perf_counter()
+            sale_id, _ = db.commit_sale({'musteri_id': self.customer_id, 'toplam_tutar': 10.0, 'odenen_tutar': 10.0}, lines)
+            if sale_id:
+                self.committed += 1
+            else:
+                self.failed += 1
+            if self.recording:
+                self.durations.append(time.perf_counter() - start)
+            time.sleep(0.002)
+
+def _make_variant(source_path, target_path, sql):
+    conn = sqlite3.connect(source_path)
+    try:
+        conn.execute("VACUUM INTO ?", (target_path,))
+    finally:
+        conn.close()
+    conn = sqlite3.connect(target_path)
+    try:
+        conn.executescript(sql)
+    finally:
+        conn.close()
+
+def _corrupt(source_path, target_path):
+    with open(source_path, 'rb') as f:
+        data = bytearray(f.read())
+    for offset in range(len(data) // 2, len(data) // 2 + 64 * 4096, 4096):
+        data[offset + 8:offset + 200] = os.urandom(192)
+    with open(target_path, 'wb') as f:
+        f.write(data)
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(41)
+    with temporary_database("hot_restore.db") as db_path:
+        work_dir = os.path.dirname(db_path)
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        backup_path = os.path.join(work_dir, "yedek.db")
+        db.backup_database(backup_path)
+        backup_count = _sale_count(backup_path)
+        print(f"--- {os.path.getsize(backup_path) / 1024 / 1024:.1f} MB yedek ({backup_count:,} satış), kasa arka planda satış kaydediyor ---")
+
+        checkout = _CountingCheckout(product_ids, customer_ids[0])
+        checkout.start()
+        time.sleep(1.0)
+        swap = {}
+
+        def after_swap():
+            swap['committed'] = checkout.committed
+            db.create_tables()
+
+        steps = []
+        checkout.durations.clear()
+        checkout.recording = True
+        start = time.perf_counter()
+        backup.restore_database(backup_path, progress=lambda copied, total: steps.append(copied), after_swap=after_swap)
+        db.apply_performance_profile()
+        elapsed = time.perf_counter() - start
+        time.sleep(0.5)
+        checkout.recording = False
+        checkout.stop_event.set()
+        checkout.join()
+        committed_after = checkout.committed - swap['committed']
+        print(f"Geri yükleme: {elapsed * 1000:.0f} ms ({len(steps)} adım), kasanın beklediği en uzun kayıt: {max(checkout.durations) * 1000:.0f} ms")
+        print_row("  bu sırada commit_sale", summarize(checkout.durations))
+
+        errors = []
+        live_count = _sale_count(db_path)
+        print(f"Canlı: {live_count:,} satış = yedek {backup_count:,} + geri yükleme sonrası {committed_after} (başarısız kayıt: {checkout.failed})")
+        if live_count != backup_count + committed_after:
+            errors.append("Geri yüklenen veritabanı yedekteki satışlarla uyuşmuyor.")
+        if checkout.failed:
+            errors.append("Geri yükleme sırasında satış kaydı başarısız oldu.")
+        if not os.path.exists(f"{db_path}.onceki") or _sale_count(f"{db_path}.onceki") != backup_count + swap['committed']:
+            errors.append("Önceki veritabanı .onceki olarak saklanmadı.")
+        if os.path.exists(f"{db_path}.geri_yukleme"):
+            errors.append("Geri yükleme sonrası geçici dosya kaldı.")
+
+        special_dir = os.path.join(work_dir, SPECIAL_DIR_NAME)
+        os.makedirs(special_dir)
+        old_schema_path = os.path.join(special_dir, "eski_sema.db")
+        _make_variant(backup_path, old_schema_path, "DROP TABLE yedekler; PRAGMA user_version = 12;")
+        db.restore_database(old_schema_path)
+        with connection.get_db_connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != latest_version() or not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'yedekler'").fetchone():
+                errors.append("Eski şemalı yedeğe geçişler uygulanmadı.")
+
+        before = _sale_count(db_path)
+        newer_path = os.path.join(work_dir, "yeni_sema.db")
+        _make_variant(backup_path, newer_path, f"PRAGMA user_version = {latest_version() + 1};")
+        corrupt_path = os.path.join(special_dir, "bozuk.db")
+        _corrupt(backup_path, corrupt_path)
+        for label, path in (("daha yeni şema", newer_path), ("bozuk dosya", corrupt_path)):
+            try:
+                db.restore_database(path)
+                errors.append(f"{label.capitalize()} geri yüklemesi reddedilmedi.")
+            except db.BackupVerificationError as e:
+                print(f"Reddedildi ({label}): {str(e)[:90]}")
+        if _sale_count(db_path) != before:
+            errors.append("Reddedilen geri yükleme canlı veritabanını değiştirdi.")
+        if os.path.exists(os.path.join(work_dir, SPECIAL_DIR_NAME.split('#')[0])):
+            errors.append("Özel karakterli yol yanlış çözümlendi: boş bir başıboş dosya oluştu.")
+        connection.close_all_connections()
+
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Yedek program kapatılmadan geri yüklendi; hatalı dosyalar reddedildi, kasa kayıtları kaybolmadı.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
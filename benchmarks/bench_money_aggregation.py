@@ -0,0 +1,36 @@
+# dosya: benchmarks/bench_money_aggregation.py
+# Kullanım: python -m benchmarks.bench_money_aggregation
+# Aynı satış detaylarını REAL (TL) ve INTEGER (kuruş) olarak saklayıp toplam ciro
+# sorgusunun süresini ve float toplamındaki kuruş sapmasını karşılaştırır.
+
+import random
+import sqlite3
+from decimal import Decimal
+
+from benchmarks.common import measure, summarize, print_row
+
+ROW_COUNT = 1_000_000
+
+def main():
+    random.seed(7)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE detay_real (miktar INTEGER NOT NULL, birim_fiyat REAL NOT NULL)")
+    conn.execute("CREATE TABLE detay_kurus (miktar INTEGER NOT NULL, birim_fiyat INTEGER NOT NULL)")
+    rows = [(random.randint(1, 5), random.randint(1, 500_000)) for _ in range(ROW_COUNT)]
+    conn.executemany("INSERT INTO detay_real VALUES (?, ?)", [(m, k / 100) for m, k in rows])
+    conn.executemany("INSERT INTO detay_kurus VALUES (?, ?)", rows)
+    conn.commit()
+
+    exact = sum(Decimal(m * k) for m, k in rows) / 100
+    real_total = conn.execute("SELECT SUM(miktar * birim_fiyat) FROM detay_real").fetchone()[0]
+    kurus_total = conn.execute("SELECT SUM(miktar * birim_fiyat) FROM detay_kurus").fetchone()[0]
+
+    print(f"--- {ROW_COUNT:,} satış detayı üzerinde SUM(miktar * birim_fiyat) ---")
+    print_row("REAL (TL)", summarize(measure(lambda: conn.execute("SELECT SUM(miktar * birim_fiyat) FROM detay_real").fetchone(), 10)))
+    print_row("INTEGER (kuruş)", summarize(measure(lambda: conn.execute("SELECT SUM(miktar * birim_fiyat) FROM detay_kurus").fetchone(), 10)))
+    print(f"Gerçek toplam:        {exact:,.2f} TL")
+    print(f"REAL toplam:          {real_total:,.6f} TL  (sapma {Decimal(repr(real_total)) - exact:+.6f})")
+    print(f"INTEGER toplam:       {Decimal(kurus_total) / 100:,.2f} TL  (sapma {Decimal(kurus_total) / 100 - exact:+.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# dosya: benchmarks/bench_online_backup.py
+# Kullanım: python -m benchmarks.bench_online_backup [satış_sayısı]
+# Kasa arka planda sürekli satış kaydederken veritabanı önce eski yöntemle (shutil.copy), sonra
+# backup_database ile yedeklenir. Yedek süresi ve yedekleme sırasında satış kaydetme gecikmesi
+# ölçülür. shutil.copy'nin WAL dosyasındaki son satışları kaçırdığı, backup_database yedeğinin
+# ise quick_check'ten geçtiği, tutarlı bir anlık görüntü içerdiği ve yedekler tablosuna kaydedildiği doğrulanır.
+
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import threading
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from database import connection
+from database import database_manager as db
+
+DEFAULT_SALE_COUNT = 300_000
+
+class _Checkout(threading.Thread):
+    def __init__(self, product_ids, customer_id):
+        super().__init__(daemon=True)
+        self.product_ids = product_ids
+        self.customer_id = customer_id
+        self.durations = []
+        self.recording = False
+        self.stop_event = threading.Event()
+
+    def run(self):
+        rng = random.Random(5)
+        while not self.stop_event.is_set():
+            lines = [{'urun_id': rng.choice(self.product_ids), 'miktar': 1, 'birim_fiyat': 10.0}]
+            start = time.perf_counter()
+            db.commit_sale({'musteri_id': self.customer_id, 'toplam_tutar': 10.0, 'odenen_tutar': 10.0}, lines)
+            if self.recording:
+                self.durations.append(time.perf_counter() - start)
+            time.sleep(0.002)
+
+def _sale_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM satislar").fetchone()[0]
+    finally:
+        conn.close()
+
+def _measure_during(checkout, label, fn):
+    checkout.durations.clear()
+    checkout.recording = True
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    checkout.recording = False
+    print(f"{label:<45} süre: {elapsed * 1000:>8.0f} ms   satış kaydı: {len(checkout.durations)}")
+    if checkout.durations:
+        print_row("  bu sırada commit_sale", summarize(checkout.durations))
+    return result
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(29)
+    with temporary_database("online_backup.db") as db_path:
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        db.checkpoint_database('TRUNCATE')
+        print(f"--- {os.path.getsize(db_path) / 1024 / 1024:.1f} MB veritabanı, kasa arka planda satış kaydediyor ---")
+
+        checkout = _Checkout(product_ids, customer_ids[0])
+        checkout.start()
+        time.sleep(0.5)
+        backup_dir = os.path.dirname(db_path)
+        legacy_path = os.path.join(backup_dir, "eski_kopya.db")
+        new_path = os.path.join(backup_dir, "yedek.db")
+
+        checkout.durations.clear()
+        checkout.recording = True
+        time.sleep(1.0)
+        checkout.recording = False
+        print_row("Yedek yokken commit_sale", summarize(checkout.durations))
+
+        before_copy = _sale_count(db_path)
+        _measure_during(checkout, "Eski / shutil.copy", lambda: shutil.copy(db_path, legacy_path))
+        before = _sale_count(db_path)
+        steps = []
+        info = _measure_during(checkout, "Yeni / backup_database (adımlı)", lambda: db.backup_database(new_path, 'Manuel', progress=lambda copied, total: steps.append(copied)))
+        after = _sale_count(db_path)
+        checkout.stop_event.set()
+        checkout.join()
+
+        legacy_count, backup_count = _sale_count(legacy_path), _sale_count(new_path)
+        print(f"Eski kopya: {legacy_count:,} satış (kopyadan önce canlıda {before_copy:,} vardı)")
+        print(f"Canlı: {before:,}→{after:,} satış | yeni yedek: {backup_count:,} "
+              f"({len(steps)} adım, {info['yeniden_baslama']} yeniden başlama, quick_check: {info['dogrulama']})")
+
+        errors = []
+        if legacy_count >= before_copy:
+            print("[BİLGİ] Bu çalıştırmada shutil.copy WAL dosyasındaki satışları kaçırmadı.")
+        if db.verify_database_file(new_path) != 'ok':
+            errors.append("Yedek bütünlük kontrolünden geçmedi.")
+        if not before - 1 <= backup_count <= after:
+            errors.append("Yedekteki satış sayısı yedekleme aralığındaki canlı veriyle tutarsız.")
+        if os.path.exists(f"{new_path}.tmp") or os.path.exists(f"{new_path}-wal"):
+            errors.append("Yedekleme sonrası geçici dosya kaldı.")
+        history = db.get_backup_history(limit=1)
+        if not history or history[0]['dosya_yolu'] != os.path.abspath(new_path) or history[0]['sayfa_sayisi'] != info['sayfa_sayisi']:
+            errors.append("Yedek bilgisi yedekler tablosuna kaydedilmedi.")
+        connection.close_all_connections()
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Yedek doğrulandı, tutarlı ve yedekler tablosuna kaydedildi.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
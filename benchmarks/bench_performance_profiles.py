@@ -0,0 +1,67 @@
+# dosya: benchmarks/bench_performance_profiles.py
+# Kullanım: python -m benchmarks.bench_performance_profiles
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+
+SALE_COUNT = 1000
+LINES_PER_SALE = 3
+
+def _make_sale(product_ids, customer_ids, sale_date):
+    lines = [{'urun_id': random.choice(product_ids), 'miktar': 1, 'birim_fiyat': 25.0} for _ in range(LINES_PER_SALE)]
+    total = sum(line['miktar'] * line['birim_fiyat'] for line in lines)
+    return {'musteri_id': random.choice(customer_ids), 'toplam_tutar': total, 'odenen_tutar': total}, lines, sale_date
+
+def _run_profile(profile_name):
+    random.seed(42)
+    connection.set_performance_profile(profile_name)
+    with temporary_database(f"profil_{profile_name.replace(' ', '_')}.db"):
+        product_ids = seed_products(500)
+        customer_ids = seed_customers(50)
+        start = datetime.now() - timedelta(days=30)
+
+        read_durations = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                db.get_recent_sales()
+                read_durations.append(time.perf_counter() - t0)
+                time.sleep(0.001)
+
+        reader_thread = threading.Thread(target=reader)
+        reader_thread.start()
+        t0 = time.perf_counter()
+        for i in range(SALE_COUNT):
+            sale_date = (start + timedelta(minutes=i * 40)).strftime("%Y-%m-%d %H:%M:%S")
+            db.create_sale(*_make_sale(product_ids, customer_ids, sale_date))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        reader_thread.join()
+
+        range_start = start.strftime("%Y-%m-%d 00:00:00")
+        range_end = datetime.now().strftime("%Y-%m-%d 23:59:59")
+        report = summarize(measure(lambda: db.get_sales_with_profit_by_date_range(range_start, range_end), 50))
+
+        print(f"\n[{profile_name}] satış/sn: {SALE_COUNT / elapsed:,.0f}")
+        print_row("  Eşzamanlı okuma (get_recent_sales)", summarize(read_durations or [0.0]))
+        print_row("  Kârlı satış raporu", report)
+
+def main():
+    print(f"--- Veritabanı Performans Profilleri ({SALE_COUNT} satış x {LINES_PER_SALE} satır) ---")
+    original = connection.get_performance_profile()
+    try:
+        for profile_name in db.PERFORMANCE_PROFILES:
+            _run_profile(profile_name)
+    finally:
+        connection.set_performance_profile(original)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# dosya: benchmarks/bench_product_search.py
+# Kullanım: python -m benchmarks.bench_product_search [ürün_sayısı]
+# Satış ekranında yazılan her harf için ürün aramasının süresini ölçer: eski LIKE '%q%'
+# sorgusu, FTS5 kullanan get_products (ürünler sayfası) ve LIMIT'li bm25 sıralı
+# search_products (satış ekranı açılır listesi).
+
+import sys
+import random
+
+from benchmarks.common import temporary_database, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+from database.queries.product_queries import PRODUCT_COLUMNS
+
+DEFAULT_PRODUCT_COUNT = 200_000
+REPEAT = 5
+TYPED_TEXTS = ("kırmızı gömlek", "ŞAL 12", "8690001234")
+
+NOUNS = ["Gömlek", "Pantolon", "Şal", "Çanta", "Ayakkabı", "Kazak", "Ceket", "Etek", "Tişört", "Kemer", "Çorap", "Şapka"]
+ADJECTIVES = ["Kırmızı", "Mavi", "Yeşil", "Siyah", "Beyaz", "Işıklı", "İnce", "Kalın", "Keten", "Yünlü", "Deri", "Örgü"]
+
+LEGACY_SEARCH_SQL = f"""
+    SELECT {PRODUCT_COLUMNS}, k.ad as kategori_ad FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id
+    WHERE u.aktif_mi = 1 AND (u.ad LIKE ? OR u.stok_kodu LIKE ? OR u.barkod LIKE ?) ORDER BY u.ad
+"""
+
+def _seed(count):
+    with connection.get_db_connection() as conn:
+        conn.executemany("INSERT INTO kategoriler (ad) VALUES (?)", [(f"Kategori {i}",) for i in range(10)])
+        category_ids = [row['id'] for row in conn.execute("SELECT id FROM kategoriler")]
+        conn.executemany(
+            "INSERT INTO urunler (ad, stok_kodu, barkod, kategori_id, alis_fiyati, alis_para_birimi, stok_miktari) VALUES (?, ?, ?, ?, 1000, 'TL', 10)",
+            [(f"{random.choice(ADJECTIVES)} {random.choice(NOUNS)} {i % 1000}", f"STK-{i:07d}", f"869{i:07d}", random.choice(category_ids)) for i in range(count)]
+        )
+
+def _legacy(text):
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_SEARCH_SQL, [f"%{text}%"] * 3).fetchall()
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    random.seed(19)
+    with temporary_database("product_search.db"):
+        print(f"[...] {product_count:,} ürün oluşturuluyor...")
+        _seed(product_count)
+        for typed in TYPED_TEXTS:
+            print(f"\n--- '{typed}' harf harf yazılırken ({product_count:,} ürün) ---")
+            prefixes = [typed[:i] for i in range(2, len(typed) + 1)]
+            per_key = lambda fn: summarize([d / len(prefixes) for d in measure(lambda: [fn(p) for p in prefixes], REPEAT)])
+            print_row("Eski / LIKE '%q%'", per_key(_legacy))
+            print_row("get_products / FTS5", per_key(db.get_products))
+            print_row("search_products / FTS5 + bm25 LIMIT 50", per_key(db.search_products))
+            print(f"Sonuç sayısı ('{typed}'): eski {len(_legacy(typed))}, FTS5 {len(db.get_products(typed))}, ilk: {[row['ad'] for row in db.search_products(typed, limit=3)]}")
+
+if __name__ == "__main__":
+    main()
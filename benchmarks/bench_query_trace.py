@@ -0,0 +1,110 @@
+# dosya: benchmarks/bench_query_trace.py
+# Kullanım: python -m benchmarks.bench_query_trace [satış_sayısı]
+# Tipik bir kasa iş yükü (barkod arama, ürün arama, satış kaydı, rapor) SQL izleme kapalıyken ve
+# açıkken çalıştırılır; izlemenin ek yükü ölçülür. Özetin en çok zaman harcayan sorguları doğru
+# çağıran fonksiyonla gösterdiği, eşiği aşan sorguların yavaş sorgu dosyasına yazıldığı, CSV
+# dışa aktarımının ve izleme kapatılınca bağlantıların düz sqlite3.Connection'a döndüğü doğrulanır.
+
+import os
+import sys
+import csv
+import time
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers
+from benchmarks.bench_date_keys import _seed_sales
+from database import connection, query_trace
+from database import database_manager as db
+
+DEFAULT_SALE_COUNT = 100_000
+ROUNDS = 3
+ITERATIONS = 200
+SLOW_THRESHOLD_MS = 20
+
+def _workload(rng, product_ids, customer_id, start, end):
+    for _ in range(ITERATIONS):
+        product_id = rng.choice(product_ids)
+        db.get_product_by_code(f"869{product_id - 1:010d}")
+        db.search_products("Ürün 1")
+        db.commit_sale({'musteri_id': customer_id, 'toplam_tutar': 20.0, 'odenen_tutar': 20.0}, [{'urun_id': product_id, 'miktar': 1, 'birim_fiyat': 20.0}])
+    db.get_sales_with_profit_by_date_range(start, end)
+    db.get_product_sales_report(start, end)
+
+def _timed(rng, product_ids, customer_id, start, end):
+    durations = []
+    for _ in range(ROUNDS):
+        began = time.perf_counter()
+        _workload(rng, product_ids, customer_id, start, end)
+        durations.append(time.perf_counter() - began)
+    return min(durations)
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(47)
+    rng = random.Random(53)
+    with temporary_database("query_trace.db") as db_path:
+        log_path = os.path.join(os.path.dirname(db_path), "yavas_sorgular.log")
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        now = datetime.now()
+        start, end = (now - timedelta(days=365)).strftime("%Y-%m-%d 00:00:00"), now.strftime("%Y-%m-%d 23:59:59")
+        print(f"--- {sale_count:,} satış; iş yükü: {ITERATIONS}x (barkod + arama + satış) + 2 yıllık rapor, {ROUNDS} turun en iyisi ---")
+
+        _workload(rng, product_ids, customer_ids[0], start, end)
+        plain = _timed(rng, product_ids, customer_ids[0], start, end)
+        query_trace.configure(True, SLOW_THRESHOLD_MS, log_path=log_path)
+        traced = _timed(rng, product_ids, customer_ids[0], start, end)
+        print(f"İzleme kapalı: {plain * 1000:8.1f} ms")
+        print(f"İzleme açık:   {traced * 1000:8.1f} ms  (ek yük %{(traced - plain) * 100 / plain:.1f})")
+
+        stats = db.get_query_stats()
+        print(f"\n{len(stats)} farklı (fonksiyon, sorgu); toplam süreye göre ilk 8:")
+        for row in stats[:8]:
+            print(f"  {row['toplam_ms']:>9.1f} ms  {row['adet']:>5}x  p50 {row['p50_ms']:>7.3f}  p95 {row['p95_ms']:>8.3f}  "
+                  f"satır {row['ort_satir']:>8.1f}  {row['cagiran']:<42} {row['sorgu'][:60]}")
+
+        errors = []
+        callers = {row['cagiran'] for row in stats}
+        for expected in ('product_queries.get_product_by_code', 'sale_queries.commit_sale', 'product_queries.apply_stock_changes'):
+            if expected not in callers:
+                errors.append(f"Özette {expected} çağıranı yok.")
+        if any(caller.startswith(('connection.', 'query_trace.')) for caller in callers):
+            errors.append("Çağıran olarak izleme katmanının kendisi kaydedildi.")
+        lookup = next((row for row in stats if row['cagiran'] == 'product_queries.get_product_by_code'), None)
+        if not lookup or lookup['adet'] != ROUNDS * ITERATIONS or lookup['ort_satir'] != 1.0:
+            errors.append("Barkod sorgusunun adedi veya satır sayısı beklenenle uyuşmuyor.")
+        if not any(row['sorgu'] == 'COMMIT' for row in stats):
+            errors.append("COMMIT süreleri ölçülmedi.")
+
+        with open(log_path, encoding='utf-8') as f:
+            slow_lines = f.read().splitlines()
+        print(f"\nYavaş sorgu dosyası ({SLOW_THRESHOLD_MS} ms üzeri): {len(slow_lines)} satır, ör. {slow_lines[0][:130] if slow_lines else '-'}")
+        slowest = max(row['en_uzun_ms'] for row in stats)
+        if slowest >= SLOW_THRESHOLD_MS and not slow_lines:
+            errors.append("Eşiği aşan sorgular yavaş sorgu dosyasına yazılmadı.")
+
+        csv_path = os.path.join(os.path.dirname(db_path), "ozet.csv")
+        exported = db.export_query_stats(csv_path)
+        with open(csv_path, encoding='utf-8-sig') as f:
+            if len(list(csv.DictReader(f, delimiter=';'))) != exported:
+                errors.append("CSV dışa aktarımındaki satır sayısı özetle uyuşmuyor.")
+
+        query_trace.configure(False)
+        with connection.get_db_connection() as conn:
+            if type(conn._lease.raw) is not sqlite3.Connection:
+                errors.append("İzleme kapatıldıktan sonra bağlantılar düz sqlite3.Connection olarak açılmadı.")
+        db.reset_query_stats()
+        connection.close_all_connections()
+
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Sorgu özeti, yavaş sorgu dosyası ve CSV dışa aktarımı doğru; izleme kapatılınca ek yük kalmıyor.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
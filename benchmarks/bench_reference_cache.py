@@ -0,0 +1,86 @@
+# dosya: benchmarks/bench_reference_cache.py
+# Kullanım: python -m benchmarks.bench_reference_cache [ürün_sayısı]
+# Ayar ve referans veri (kategori, vergi oranı) okumalarını önbellekli hâliyle ve her çağrıda
+# SQLite'a giden eski hâliyle karşılaştırır; ürün listesinin fiyatlarını hesaplar, çoklu ayar
+# kaydını tek işlemle ve ayrı ayrı kaydetmeyi ölçer. Son olarak yerel yazmanın hemen, başka bir
+# bağlantıdan yapılan yazmanın ise REFERENCE_CACHE_CHECK_INTERVAL içinde görüldüğünü doğrular.
+
+import sys
+import time
+import sqlite3
+
+from benchmarks.common import temporary_database, seed_products, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+from database.queries import reference_cache
+from models import price_calculator
+
+DEFAULT_PRODUCT_COUNT = 2_000
+REPEAT = 2_000
+PROFILE_SETTINGS = {f'company_{key}': f'Değer {key}' for key in ('name', 'address', 'phone', 'email', 'website', 'tax_office', 'tax_id')}
+
+def _legacy_get_setting(anahtar, varsayilan=None):
+    with connection.get_db_connection() as conn:
+        row = conn.execute("SELECT deger FROM ayarlar WHERE anahtar = ?", (anahtar,)).fetchone()
+        return row['deger'] if row else varsayilan
+
+def _legacy_get_all_settings():
+    with connection.get_db_connection() as conn:
+        return {row['anahtar']: row['deger'] for row in conn.execute("SELECT anahtar, deger FROM ayarlar")}
+
+def _legacy_calculate_prices(product, settings):
+    # Eski yol: her üründe kategori ve vergi satırı veritabanından okunur.
+    with connection.get_db_connection() as conn:
+        conn.execute("SELECT * FROM kategoriler WHERE id = ?", (product['kategori_id'],)).fetchone()
+        conn.execute("SELECT * FROM vergi_oranlari WHERE id = ?", (product['vergi_id'],)).fetchone()
+    return price_calculator.calculate_prices(product, settings)
+
+def _legacy_save_settings(settings):
+    for key, value in settings.items():
+        with connection.get_db_connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO ayarlar (anahtar, deger) VALUES (?, ?)", (key, str(value)))
+
+def _verify_invalidation(db_path):
+    db.save_setting('kdv_orani', '18')
+    assert db.get_setting_float('kdv_orani', 20.0) == 18.0, "Yerel yazma önbellekte görünmedi"
+    other = sqlite3.connect(db_path)
+    with other:
+        other.execute("UPDATE ayarlar SET deger = '10,5' WHERE anahtar = 'kdv_orani'")
+    other.close()
+    deadline = time.monotonic() + reference_cache.REFERENCE_CACHE_CHECK_INTERVAL + 1
+    while db.get_setting_float('kdv_orani', 20.0) != 10.5:
+        assert time.monotonic() < deadline, "Başka bağlantıdan yapılan yazma önbellekte görünmedi"
+        time.sleep(0.05)
+    print("[OK] Yerel yazma hemen, başka bağlantıdan yapılan yazma aralık içinde görüldü.")
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    with temporary_database("reference_cache.db") as db_path:
+        seed_products(product_count)
+        db.add_vergi_orani("Standart KDV", 20.0)
+        vergi_id = db.get_all_vergi_oranlari()[0]['id']
+        db.save_settings({'kar_degeri': '45,5', 'kdv_orani': '20', 'kk_komisyonu': '2,5', 'usd_tl_kuru': '34,1234'} | PROFILE_SETTINGS)
+        with connection.get_db_connection() as conn:
+            conn.execute("UPDATE urunler SET vergi_id = ?", (vergi_id,))
+            products = [dict(row) for row in conn.execute("SELECT * FROM urunler ORDER BY id")]
+        settings = db.get_all_settings()
+
+        print("--- Ayar okuma ---")
+        print_row("Eski / get_setting", summarize(measure(lambda: _legacy_get_setting('company_name'), REPEAT)))
+        print_row("Önbellek / get_setting", summarize(measure(lambda: db.get_setting('company_name'), REPEAT)))
+        print_row("Önbellek / get_setting_float", summarize(measure(lambda: db.get_setting_float('kar_degeri', 50.0), REPEAT)))
+        print_row("Eski / get_all_settings", summarize(measure(_legacy_get_all_settings, REPEAT)))
+        print_row("Önbellek / get_all_settings", summarize(measure(db.get_all_settings, REPEAT)))
+
+        print(f"--- {product_count:,} ürünün fiyatını hesaplama ---")
+        print_row("Eski / ürün başına kategori + vergi sorgusu", summarize(measure(lambda: [_legacy_calculate_prices(p, settings) for p in products], 5)))
+        print_row("Önbellek / calculate_prices", summarize(measure(lambda: [price_calculator.calculate_prices(p) for p in products], 5)))
+
+        print(f"--- {len(PROFILE_SETTINGS)} ayarı kaydetme (firma bilgileri) ---")
+        print_row("Eski / ayrı ayrı save_setting", summarize(measure(lambda: _legacy_save_settings(PROFILE_SETTINGS), 50)))
+        print_row("Yeni / tek işlemde save_settings", summarize(measure(lambda: db.save_settings(PROFILE_SETTINGS), 50)))
+
+        _verify_invalidation(db_path)
+
+if __name__ == "__main__":
+    main()
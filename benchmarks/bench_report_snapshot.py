@@ -0,0 +1,89 @@
+# dosya: benchmarks/bench_report_snapshot.py
+# Kullanım: python -m benchmarks.bench_report_snapshot [satış_sayısı]
+# Kasa arka planda sürekli satış kaydederken yıllık satış raporu (satır listesi + dönem özeti) önce
+# eski yöntemle (her sorgu ayrı okuma), sonra salt okunur anlık görüntüde (run_in_snapshot) tekrar
+# tekrar alınır. Rapor süresi ve bu sırada commit_sale gecikmesi ölçülür; satır listesiyle dönem
+# özetinin anlık görüntüde her zaman tutarlı olduğu ve anlık görüntü bağlantısının yazamadığı doğrulanır.
+
+import sys
+import time
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, summarize, print_row
+from benchmarks.bench_date_keys import _seed_sales
+from benchmarks.bench_online_backup import _Checkout
+from database import connection
+from database import database_manager as db
+
+DEFAULT_SALE_COUNT = 300_000
+REPORT_COUNT = 15
+
+def _sales_report(start, end):
+    sales, totals = db.get_sales_with_profit_by_date_range(start, end)
+    summary = db.get_sales_summary_for_period(start, end)
+    return len(sales), totals['total_revenue'], summary['satis_adedi'], summary['ciro']
+
+def _run(checkout, label, fn):
+    checkout.durations.clear()
+    checkout.recording = True
+    durations, mismatches = [], 0
+    for _ in range(REPORT_COUNT):
+        start = time.perf_counter()
+        rows, revenue, summary_count, summary_revenue = fn()
+        durations.append(time.perf_counter() - start)
+        if rows != summary_count or abs(revenue - summary_revenue) > 0.005:
+            mismatches += 1
+    checkout.recording = False
+    print_row(f"{label} / rapor", summarize(durations))
+    print_row(f"{label} / bu sırada commit_sale", summarize(checkout.durations))
+    print(f"{'':<45} satış kaydı: {len(checkout.durations)}, en uzun: {max(checkout.durations) * 1000:.1f} ms, "
+          f"liste-özet tutarsızlığı: {mismatches}/{REPORT_COUNT}")
+    return mismatches
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+    random.seed(59)
+    with temporary_database("report_snapshot.db"):
+        product_ids = seed_products(2000)
+        customer_ids = seed_customers(1000)
+        _seed_sales(sale_count, product_ids, customer_ids)
+        db.rebuild_daily_sales_summary()
+        now = datetime.now()
+        start, end = (now - timedelta(days=365)).strftime("%Y-%m-%d 00:00:00"), now.strftime("%Y-%m-%d 23:59:59")
+        print(f"--- {sale_count:,} satış, son 1 yılın satış raporu; kasa arka planda satış kaydediyor ---")
+
+        checkout = _Checkout(product_ids, customer_ids[0])
+        checkout.start()
+        time.sleep(0.5)
+        legacy_mismatches = _run(checkout, "Eski / ayrı okumalar", lambda: _sales_report(start, end))
+        snapshot_mismatches = _run(checkout, "Yeni / run_in_snapshot", lambda: db.run_in_snapshot(_sales_report, start, end)[0])
+        checkout.stop_event.set()
+        checkout.join()
+
+        errors = []
+        if snapshot_mismatches:
+            errors.append("Anlık görüntüde satır listesi ile dönem özeti tutarsız.")
+        with db.read_snapshot() as taken_at:
+            with connection.get_db_connection() as conn:
+                try:
+                    conn.execute("UPDATE ayarlar SET deger = deger WHERE anahtar = 'kdv_orani'")
+                    errors.append("Anlık görüntü bağlantısı yazabildi.")
+                except sqlite3.OperationalError as e:
+                    print(f"Anlık görüntüde yazma denemesi reddedildi ({taken_at}): {e}")
+        if legacy_mismatches == 0:
+            print("[BİLGİ] Bu çalıştırmada ayrı okumalar arasında tutarsızlık yakalanmadı.")
+        print(f"Havuz: {connection.get_pool_stats()['snapshots']} anlık görüntü, "
+              f"{connection.get_pool_stats()['idle_readonly_connections']} boşta salt okunur bağlantı")
+        connection.close_all_connections()
+
+        for error in errors:
+            print(f"[HATA] {error}")
+        if errors:
+            return 1
+        print("[OK] Raporlar tutarlı bir anlık görüntüden okundu; anlık görüntü bağlantısı salt okunur.")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
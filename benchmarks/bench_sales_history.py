@@ -0,0 +1,46 @@
+# dosya: benchmarks/bench_sales_history.py
+# Kullanım: python -m benchmarks.bench_sales_history [satış_sayısı ...]
+# Satış geçmişi sayfasının açılış maliyetini ölçer: tüm satışları yükleyen eski
+# get_all_sales_history ile anahtar tabanlı get_sales_history_page (ilk sayfa ve
+# kaydırma sonrası derin bir sayfa) farklı veri boyutlarında karşılaştırılır. Ardından
+# yapılandırılmış arama (satış no, tarih, tutar, müşteri) eski LIKE aramasıyla karşılaştırılır.
+
+import sys
+import random
+
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from database import connection
+from benchmarks.bench_date_keys import _seed_sales
+from database import database_manager as db
+
+DEFAULT_SALE_COUNTS = (100, 1_000_000)
+REPEAT = 5
+
+LEGACY_SEARCH_SQL = "SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id WHERE musteri_adi LIKE ? OR s.id LIKE ? ORDER BY s.id DESC LIMIT 200"
+
+def _legacy_search(query):
+    with connection.get_db_connection() as conn:
+        return conn.execute(LEGACY_SEARCH_SQL, (f"%{query}%", f"%{query}%")).fetchall()
+
+def main():
+    sale_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SALE_COUNTS
+    random.seed(23)
+    for sale_count in sale_counts:
+        with temporary_database("sales_history.db"):
+            product_ids = seed_products(200)
+            customer_ids = seed_customers(100)
+            _seed_sales(sale_count, product_ids, customer_ids)
+            print(f"\n--- {sale_count:,} satış ---")
+            print_row("Eski / get_all_sales_history", summarize(measure(db.get_all_sales_history, REPEAT)))
+            print_row("İlk sayfa / get_sales_history_page", summarize(measure(db.get_sales_history_page, REPEAT * 20)))
+            deep_id = max(sale_count // 2, 1)
+            print_row("Orta sayfa (id < n/2)", summarize(measure(lambda: db.get_sales_history_page(deep_id), REPEAT * 20)))
+            last_week = (datetime.now() - timedelta(days=7)).strftime("%d.%m.%Y")
+            for query in (f"#{deep_id}", last_week, "4000-4010 TL", "Müşteri17", f"Müşteri17 {datetime.now():%m.%Y}"):
+                print_row(f"Eski LIKE / '{query}'", summarize(measure(lambda: _legacy_search(query), REPEAT)))
+                print_row(f"Yapılandırılmış / '{query}'", summarize(measure(lambda: db.get_sales_history_page(query=query), REPEAT * 4)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# dosya: benchmarks/bench_startup_migrations.py
+# Kullanım: python -m benchmarks.bench_startup_migrations
+
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers, measure, summarize, print_row
+from database import connection
+from database import database_manager as db
+from database.migrations import get_registered_migrations
+
+SALE_COUNT = 200_000
+REPEAT = 50
+# user_version öncesi açılışta çalışan adımlar: temel şema + eski sütun yükseltmeleri, indeksler, varsayılan veriler.
+# Sonraki geçişler (tablo yeniden oluşturma, ADD COLUMN) yalnızca bir kez çalışacak şekilde yazıldı.
+LEGACY_STARTUP_VERSIONS = (1, 2, 3)
+
+def _seed_large_database():
+    random.seed(7)
+    product_ids = seed_products(20_000)
+    customer_ids = seed_customers(2_000)
+    start = datetime.now() - timedelta(days=730)
+    with connection.get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)",
+            ((random.choice(customer_ids), (start + timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S"), 100.0, 100.0) for i in range(SALE_COUNT))
+        )
+        conn.executemany(
+            "INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, 1, 50.0)",
+            ((sale_id, random.choice(product_ids)) for sale_id in range(1, SALE_COUNT + 1) for _ in range(2))
+        )
+
+def _legacy_startup():
+    # user_version öncesi create_tables(): her açılışta tüm adımlar yeniden çalışırdı.
+    with connection.get_db_connection() as conn:
+        # apply_pending_migrations gibi yabancı anahtarlar işlem dışında kapatılır.
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            cursor = conn.cursor()
+            for step in get_registered_migrations():
+                if step.version in LEGACY_STARTUP_VERSIONS:
+                    step.apply(cursor)
+            conn.commit()
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+def main():
+    with temporary_database("startup.db"):
+        _seed_large_database()
+        with connection.get_db_connection() as conn:
+            print(f"--- Açılış Şema Kontrolü ({SALE_COUNT:,} satış, şema sürümü {db.get_schema_version(conn)}) ---")
+        print_row("Eski: tüm CREATE/PRAGMA/INSERT adımları", summarize(measure(_legacy_startup, REPEAT)))
+        print_row("Yeni: PRAGMA user_version kontrolü", summarize(measure(db.create_tables, REPEAT)))
+
+if __name__ == "__main__":
+    main()
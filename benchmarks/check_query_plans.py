@@ -0,0 +1,211 @@
+# dosya: benchmarks/check_query_plans.py
+# Kullanım: python -m benchmarks.check_query_plans
+# database/queries altındaki fonksiyonları örnek verilerle çalıştırır, çalışan her
+# SELECT/INSERT/UPDATE/DELETE ifadesinin EXPLAIN QUERY PLAN çıktısını inceler ve indekssiz
+# tam tablo taraması (SCAN <tablo>) bulunursa sıfırdan farklı kodla çıkar.
+
+import re
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import temporary_database, seed_products, seed_customers
+from database import connection
+from database import database_manager as db
+
+FULL_SCAN_PATTERN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+CHECKED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Doğası gereği tüm tabloyu okuyan sorgular: (fonksiyon, tablo)
+FULL_SCAN_ALLOWED = {
+    ("get_setting", "ayarlar"),
+    ("get_setting_float", "ayarlar"),
+    ("get_all_settings", "ayarlar"),
+    ("get_all_vergi_oranlari", "vergi_oranlari"),
+    ("get_vergi_orani_by_id", "vergi_oranlari"),
+    ("get_all_roller", "roller"),
+    ("get_all_yetkiler", "yetkiler"),
+    ("get_sales_by_category", "sd"),
+    ("get_dashboard_stats", "sd"),
+    ("get_inventory_value_by_category", "u"),
+    ("get_inventory_report", "u"),
+    ("get_all_users", "u"),
+    ("get_recent_sales", "s"),
+    ("get_all_sales_history", "s"),
+    ("get_sales_history_page", "s"),
+    ("rebuild_daily_sales_summary", "s"),
+    ("rebuild_customer_balances", "m"),
+    ("rebuild_customer_balances", "musteri_bakiye_ozet"),
+    ("verify_customer_balances", "m"),
+    ("get_product_sales_report", "t"),
+    ("get_product_sales_report_category", "t"),
+    # Satış, maliyet anlık değeri için ayar önbelleğini yükleyebilir (tek seferlik).
+    ("create_sale", "ayarlar"),
+    # Arşivlenmiş yıla uzanan raporlarda kaynakların UNION ALL sonucu (her kol kendi indeksini kullanır).
+    ("get_sales_by_date_range_arsiv", "s"),
+    ("get_sales_with_profit_by_date_range_arsiv", "sc"),
+    ("get_product_sales_report_arsiv", "t"),
+    ("get_customer_sales_report_arsiv", "t"),
+}
+# Her fonksiyonda tamamı okunabilecek tablolar: arşiv dönemleri (yılda bir satır) önbelleğe yüklenirken.
+FULL_SCAN_ALLOWED_TABLES = {"arsiv_donemleri"}
+
+def _sample_calls(ids):
+    today = datetime.now()
+    start = (today - timedelta(days=30)).strftime("%Y-%m-%d 00:00:00")
+    end = today.strftime("%Y-%m-%d 23:59:59")
+    archive_start = f"{ids['archived_year']}-11-01 00:00:00"
+    product_id, customer_id, sale_id = ids['product'], ids['customer'], ids['sale']
+    category_id = ids['category']
+    return [
+        ("get_setting", lambda: db.get_setting('company_name')),
+        ("get_setting_float", lambda: db.get_setting_float('kdv_orani', 20.0)),
+        ("save_settings", lambda: db.save_settings({'company_name': 'Örnek', 'kdv_orani': '20'})),
+        ("get_all_settings", db.get_all_settings),
+        ("get_all_kategoriler", db.get_all_kategoriler),
+        ("check_kategori_in_use", lambda: db.check_kategori_in_use(category_id)),
+        ("get_category_details", lambda: db.get_category_details(category_id)),
+        ("get_all_varyant_tipleri", db.get_all_varyant_tipleri),
+        ("get_all_musteri_gruplari", db.get_all_musteri_gruplari),
+        ("check_musteri_grup_in_use", lambda: db.settings_queries.check_musteri_grup_in_use(1)),
+        ("get_all_vergi_oranlari", db.get_all_vergi_oranlari),
+        ("check_vergi_orani_in_use", lambda: db.settings_queries.check_vergi_orani_in_use(1)),
+        ("get_vergi_orani_by_id", lambda: db.get_vergi_orani_by_id(1)),
+        ("get_message_templates", lambda: db.get_message_templates('SMS')),
+        ("get_inventory_value_by_category", db.get_inventory_value_by_category),
+        ("get_dashboard_stats", db.get_dashboard_stats),
+        ("get_all_users", db.get_all_users),
+        ("get_user_by_id", lambda: db.get_user_by_id(1)),
+        ("get_kullanici_rol_adi", lambda: db.get_kullanici_rol_adi(1)),
+        ("get_all_roller", db.get_all_roller),
+        ("is_last_admin_role", lambda: db.is_last_admin_role(1)),
+        ("get_all_yetkiler", db.get_all_yetkiler),
+        ("get_yetkiler_for_rol", lambda: db.get_yetkiler_for_rol(1)),
+        ("get_product_by_id", lambda: db.get_product_by_id(product_id)),
+        ("get_product_by_code", lambda: db.get_product_by_code("8690000000001")),
+        ("get_product_by_code_stok_kodu", lambda: db.get_product_by_code("SKU-0000001")),
+        ("get_products_by_stok_codes", lambda: db.get_products_by_stok_codes(['SKU-0000001', 'SKU-0000002'])),
+        ("get_variants_by_main_code", lambda: db.get_variants_by_main_code('SKU-0000001')),
+        ("get_products", lambda: db.get_products()),
+        ("get_products_category", lambda: db.get_products(category_id=category_id)),
+        ("get_products_search", lambda: db.get_products(search_query="Ürün 12")),
+        ("search_products", lambda: db.search_products("urun 12")),
+        ("search_products_empty", lambda: db.search_products("")),
+        ("check_product_in_use", lambda: db.check_product_in_use(product_id)),
+        ("check_varyant_tipi_in_use", lambda: db.product_queries.check_varyant_tipi_in_use(1)),
+        ("get_low_stock_products", db.get_low_stock_products),
+        ("get_inventory_report", lambda: db.get_inventory_report()),
+        ("archive_variant_group", lambda: db.archive_variant_group('SKU-YOK')),
+        ("get_customer_by_id", lambda: db.get_customer_by_id(customer_id)),
+        ("search_customers", lambda: db.search_customers("")),
+        ("search_customers_group", lambda: db.search_customers("", group_id=1)),
+        ("search_customers_name", lambda: db.search_customers("müşteri1 soy")),
+        ("search_customers_phone", lambda: db.search_customers("0532 000")),
+        ("search_customers_name_phone", lambda: db.search_customers("müşteri1 532")),
+        ("search_customers_email", lambda: db.search_customers("musteri1@")),
+        ("get_customer_balance", lambda: db.get_customer_balance(customer_id)),
+        ("add_payment", lambda: db.add_payment(customer_id, 10.0, "Test ödemesi")),
+        ("rebuild_customer_balances", db.rebuild_customer_balances),
+        ("verify_customer_balances", db.verify_customer_balances),
+        ("get_customer_transaction_history", lambda: db.get_customer_transaction_history(customer_id)),
+        ("get_customer_sales_report", lambda: db.get_customer_sales_report(start, end)),
+        ("get_sales_by_day_for_month", db.get_sales_by_day_for_month),
+        ("get_sales_by_category", db.get_sales_by_category),
+        ("get_recent_sales", db.get_recent_sales),
+        ("get_sale_details_for_report", lambda: db.get_sale_details_for_report(sale_id)),
+        ("get_sales_by_date_range", lambda: db.get_sales_by_date_range(start, end)),
+        ("get_sales_by_date_range_customer", lambda: db.get_sales_by_date_range(start, end, customer_id)),
+        ("get_sales_with_profit_by_date_range", lambda: db.get_sales_with_profit_by_date_range(start, end)),
+        ("get_sales_with_profit_by_date_range_customer", lambda: db.get_sales_with_profit_by_date_range(start, end, customer_id)),
+        ("get_all_sales_history", db.get_all_sales_history),
+        ("get_sales_history_page", lambda: db.get_sales_history_page()),
+        ("get_sales_history_page_next", lambda: db.get_sales_history_page(sale_id)),
+        ("get_sales_history_page_id", lambda: db.get_sales_history_page(query=f"#{sale_id}")),
+        ("get_sales_history_page_date", lambda: db.get_sales_history_page(query=today.strftime("%d.%m.%Y"))),
+        ("get_sales_history_page_amount", lambda: db.get_sales_history_page(query="50-70 TL")),
+        ("get_sales_history_page_customer", lambda: db.get_sales_history_page(query="müşteri1")),
+        ("search_sales_history", lambda: db.search_sales_history("müşteri1 >10")),
+        ("get_product_sales_report", lambda: db.get_product_sales_report(start, end)),
+        ("get_product_sales_report_category", lambda: db.get_product_sales_report(start, end, category_id)),
+        # Aralık arşivlenmiş yıla uzandığında arşiv dosyasındaki indeksler de kullanılmalı.
+        ("get_sales_by_date_range_arsiv", lambda: db.get_sales_by_date_range(archive_start, end)),
+        ("get_sales_with_profit_by_date_range_arsiv", lambda: db.get_sales_with_profit_by_date_range(archive_start, end, customer_id)),
+        ("get_product_sales_report_arsiv", lambda: db.get_product_sales_report(archive_start, end)),
+        ("get_customer_sales_report_arsiv", lambda: db.get_customer_sales_report(archive_start, end)),
+        ("get_daily_sales_for_period", lambda: db.get_daily_sales_for_period(start, end)),
+        ("get_daily_sales_for_period_customer", lambda: db.get_daily_sales_for_period(start, end, customer_id)),
+        ("get_sales_summary_for_period", lambda: db.get_sales_summary_for_period(start, end)),
+        ("get_sales_summary_for_period_customer", lambda: db.get_sales_summary_for_period(start, end, customer_id)),
+        ("create_sale", lambda: db.create_sale({'musteri_id': customer_id, 'toplam_tutar': 20.0, 'odenen_tutar': 0}, [{'urun_id': product_id, 'miktar': 1, 'birim_fiyat': 20.0}])),
+        ("delete_sale_by_id", lambda: db.delete_sale_by_id(sale_id)),
+        ("rebuild_daily_sales_summary", db.rebuild_daily_sales_summary),
+        ("get_all_suspended_sales", db.get_all_suspended_sales),
+        ("get_suspended_sale_by_id", lambda: db.get_suspended_sale_by_id(1)),
+    ]
+
+def _seed():
+    product_ids = seed_products(2000)
+    customer_ids = seed_customers(200)
+    now = datetime.now()
+    sale_id = None
+    for i in range(300):
+        lines = [{'urun_id': product_ids[(i * 7 + j) % len(product_ids)], 'miktar': 1, 'birim_fiyat': 20.0} for j in range(3)]
+        sale_date = (now - timedelta(hours=i * 5)).strftime("%Y-%m-%d %H:%M:%S")
+        sale_id = db.create_sale({'musteri_id': customer_ids[i % len(customer_ids)], 'toplam_tutar': 60.0, 'odenen_tutar': 30.0}, lines, sale_date)
+    # Geçen yılın son iki ayına da satış eklenip o yıl arşivlenir.
+    archived_year = now.year - 1
+    for i in range(40):
+        lines = [{'urun_id': product_ids[i], 'miktar': 1, 'birim_fiyat': 20.0}]
+        sale_date = f"{archived_year}-{11 + i % 2}-{1 + i % 28:02d} 12:00:00"
+        db.create_sale({'musteri_id': customer_ids[i % len(customer_ids)], 'toplam_tutar': 20.0, 'odenen_tutar': 20.0}, lines, sale_date)
+    with connection.get_db_connection() as conn:
+        conn.execute("UPDATE stok_hareketleri SET tarih = ? WHERE aciklama IN (SELECT 'Satış No: ' || id FROM satislar WHERE satis_gunu < ?)",
+                     (f"{archived_year}-12-31 12:00:00", (archived_year + 1) * 10000 + 101))
+    db.archive_fiscal_year(archived_year)
+    with connection.get_db_connection() as conn:
+        category_id = conn.execute("SELECT id FROM kategoriler LIMIT 1").fetchone()[0]
+    return {'product': product_ids[1], 'customer': customer_ids[3], 'sale': sale_id, 'category': category_id, 'archived_year': archived_year}
+
+def _plan_details(conn, sql):
+    return [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+def check_query_plans(verbose=False):
+    ids = _seed()
+    failures = []
+    checked = 0
+
+    for name, call in _sample_calls(ids):
+        statements = []
+        # Önbellekten dönen okumalar SQL çalıştırmaz; her örnekte yükleme sorgusu da incelensin.
+        db.invalidate_reference_cache()
+        with connection.get_db_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                conn.set_trace_callback(None)
+
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(CHECKED_STATEMENTS):
+                    continue
+                checked += 1
+                for detail in _plan_details(conn, sql):
+                    match = FULL_SCAN_PATTERN.match(detail)
+                    if verbose:
+                        print(f"  {name}: {detail}")
+                    if match and (name, match.group(1)) not in FULL_SCAN_ALLOWED and match.group(1) not in FULL_SCAN_ALLOWED_TABLES:
+                        failures.append((name, detail, " ".join(sql.split())[:160]))
+    return checked, failures
+
+def main():
+    with temporary_database("query_plans.db"):
+        checked, failures = check_query_plans(verbose="-v" in sys.argv)
+    print(f"--- {checked} ifadenin sorgu planı incelendi ---")
+    if not failures:
+        print("[OK] İndekssiz tam tablo taraması bulunmadı.")
+        return 0
+    for name, detail, sql in failures:
+        print(f"[HATA] {name}: {detail}\n        {sql}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# dosya: benchmarks/common.py
+
+import os
+import sys
+import shutil
+import tempfile
+import statistics
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database.queries import customer_queries
+
+@contextmanager
+def temporary_database(file_name="benchmark.db", create_schema=True):
+    temp_dir = tempfile.mkdtemp(prefix="ticari_bench_")
+    db_path = os.path.join(temp_dir, file_name)
+    original_path = connection.DATABASE_PATH
+    connection.configure_database(db_path)
+    try:
+        if create_schema:
+            from database import database_manager as db
+            db.create_tables()
+        yield db_path
+    finally:
+        connection.configure_database(original_path)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def measure(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def summarize(durations):
+    ordered = sorted(durations)
+    return {
+        "adet": len(ordered),
+        "ortalama_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+    }
+
+def print_row(label, summary):
+    print(f"{label:<45} ort: {summary['ortalama_us']:>10.1f} µs   p50: {summary['p50_us']:>10.1f} µs   p95: {summary['p95_us']:>10.1f} µs")
+
+def seed_products(count, stock=1_000_000, category_count=10):
+    with connection.get_db_connection() as conn:
+        conn.executemany("INSERT OR IGNORE INTO kategoriler (ad) VALUES (?)", [(f"Kategori {i}",) for i in range(category_count)])
+        category_ids = [row['id'] for row in conn.execute("SELECT id FROM kategoriler")]
+        conn.executemany(
+            "INSERT INTO urunler (ad, stok_kodu, barkod, kategori_id, alis_fiyati, alis_para_birimi, stok_miktari, min_stok_seviyesi) VALUES (?, ?, ?, ?, ?, 'TL', ?, 5)",
+            [(f"Ürün {i}", f"SKU-{i:07d}", f"869{i:010d}", category_ids[i % len(category_ids)], (10 + (i % 500)) * 100, stock) for i in range(count)]
+        )
+        return [row['id'] for row in conn.execute("SELECT id FROM urunler ORDER BY id")]
+
+def seed_customers(count):
+    with connection.get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO musteriler (ad, soyad, telefon, eposta) VALUES (?, ?, ?, ?)",
+            [(f"Müşteri{i}", f"Soyad{i}", f"0 (532) {i:07d}", f"musteri{i}@test.com") for i in range(count)]
+        )
+        customer_queries.refresh_customer_search_keys(conn)
+        return [row['id'] for row in conn.execute("SELECT id FROM musteriler ORDER BY id")]
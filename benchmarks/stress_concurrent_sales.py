@@ -0,0 +1,81 @@
+# dosya: benchmarks/stress_concurrent_sales.py
+# Kullanım: python -m benchmarks.stress_concurrent_sales [süreç_sayısı]
+# Aynı veritabanını paylaşan birden fazla kasayı (ayrı süreçler) aynı birkaç ürüne
+# yüklenecek şekilde çalıştırır; stoğun hiçbir zaman eksiye düşmediğini ve satılan
+# miktarların stok hareketleriyle birebir tuttuğunu doğrular.
+
+import sys
+import time
+import random
+import multiprocessing
+
+from benchmarks.common import temporary_database, seed_products, seed_customers
+from database import connection
+from database import database_manager as db
+
+HOT_PRODUCT_COUNT = 5
+INITIAL_STOCK = 2000
+SALES_PER_PROCESS = 1500
+
+def _terminal(db_path, product_ids, customer_id, seed, results):
+    connection.configure_database(db_path)
+    rng = random.Random(seed)
+    committed = rejected = failed = sold_units = 0
+    start = time.perf_counter()
+    for _ in range(SALES_PER_PROCESS):
+        lines = [{'urun_id': rng.choice(product_ids), 'miktar': rng.randint(1, 3), 'birim_fiyat': 10.0} for _ in range(rng.randint(1, 3))]
+        sale_data = {'musteri_id': customer_id, 'toplam_tutar': sum(l['miktar'] * 10.0 for l in lines), 'odenen_tutar': 0}
+        satis_id, shortages = db.commit_sale(sale_data, lines)
+        if satis_id:
+            committed += 1
+            sold_units += sum(l['miktar'] for l in lines)
+        elif shortages:
+            rejected += 1
+        else:
+            failed += 1
+    connection.close_all_connections()
+    results.put({'committed': committed, 'rejected': rejected, 'failed': failed, 'sold_units': sold_units, 'elapsed': time.perf_counter() - start})
+
+def main():
+    process_count = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    with temporary_database("stress.db") as db_path:
+        product_ids = seed_products(HOT_PRODUCT_COUNT, stock=INITIAL_STOCK)
+        customer_id = seed_customers(1)[0]
+        connection.close_all_connections()
+
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_terminal, args=(db_path, product_ids, customer_id, i, results)) for i in range(process_count)]
+        start = time.perf_counter()
+        for p in processes: p.start()
+        reports = [results.get() for _ in processes]
+        for p in processes: p.join()
+        elapsed = time.perf_counter() - start
+
+        with connection.get_db_connection() as conn:
+            stocks = {row['id']: row['stok_miktari'] for row in conn.execute("SELECT id, stok_miktari FROM urunler")}
+            sold_in_db = conn.execute("SELECT COALESCE(SUM(miktar), 0) FROM satis_detaylari").fetchone()[0]
+            moved = conn.execute("SELECT COALESCE(-SUM(miktar), 0) FROM stok_hareketleri WHERE hareket_tipi = 'Satış'").fetchone()[0]
+
+    committed = sum(r['committed'] for r in reports)
+    rejected = sum(r['rejected'] for r in reports)
+    failed = sum(r['failed'] for r in reports)
+    sold_units = sum(r['sold_units'] for r in reports)
+    expected_sold = HOT_PRODUCT_COUNT * INITIAL_STOCK - sum(stocks.values())
+
+    print(f"--- {process_count} kasa, {HOT_PRODUCT_COUNT} ortak ürün, ürün başına {INITIAL_STOCK} stok ---")
+    print(f"Kaydedilen satış: {committed}   stok yetersiz (geri alınan): {rejected}   hata: {failed}")
+    print(f"Toplam süre: {elapsed:.2f} s   verim: {(committed + rejected) / elapsed:,.0f} işlem/s   ({committed / elapsed:,.0f} satış/s)")
+    print(f"Son stoklar: {sorted(stocks.values())}")
+
+    checks = [
+        ("Hiçbir stok eksiye düşmedi", min(stocks.values()) >= 0),
+        ("Satılan adet = stok düşüşü", sold_units == expected_sold == sold_in_db),
+        ("Stok hareketleri satışlarla tutarlı", moved == sold_in_db),
+        ("Veritabanı hatası yok", failed == 0),
+    ]
+    for label, ok in checks:
+        print(f"[{'OK' if ok else 'HATA'}] {label}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 # dosya: controllers/app_controller.py
 
-from PySide6.QtCore import QThreadPool
+from PySide6.QtCore import QThreadPool, QTimer
+import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -29,6 +30,9 @@ REPORTS = "reports"
 SETTINGS = "settings"
 BULK_COMMUNICATION = "bulk_communication"
 
+# Zamanlanmış yedeğin zamanı gelip gelmediği bu aralıkla kontrol edilir.
+BACKUP_SCHEDULER_TICK_MS = 60_000
+
 PAGE_PERMISSIONS: Dict[str, Optional[str]] = {
     DASHBOARD: None,
     SALES: None,
@@ -46,6 +50,9 @@ class AppController:
         self.page_controllers: Dict[str, object] = {}
         self.thread_pool = QThreadPool()
         self.active_workers: List[BackgroundWorker] = []
+        self.backup_worker: Optional[BackgroundWorker] = None
+        self.last_backup_attempt: Optional[datetime] = None
+        self.backup_timer = QTimer()
         
         self._create_page_controllers()
         self._connect_signals()
@@ -53,6 +60,8 @@ class AppController:
 
         self.view.page_changed.emit(DASHBOARD)
         self._trigger_startup_update()
+        self.backup_timer.timeout.connect(self._trigger_scheduled_backup)
+        self.backup_timer.start(BACKUP_SCHEDULER_TICK_MS)
 
     def _create_page_controllers(self):
         self.page_controllers = {
@@ -109,9 +118,7 @@ class AppController:
     def _on_currency_update_finished(self, rates: Optional[Dict[str, float]]):
         if rates:
             now_str = datetime.now().strftime("%d.%m.%Y %H:%M")
-            db.save_setting('usd_tl_kuru', rates.get('USD', '0'))
-            db.save_setting('eur_tl_kuru', rates.get('EUR', '0'))
-            db.save_setting('kur_guncelleme_tarihi', f"{now_str} (Otomatik)")
+            db.save_settings({'usd_tl_kuru': rates.get('USD', '0'), 'eur_tl_kuru': rates.get('EUR', '0'), 'kur_guncelleme_tarihi': f"{now_str} (Otomatik)"})
             self._update_status_bar("Döviz kurları başarıyla güncellendi.", 4000)
         else:
             self._update_status_bar("Kurlar güncellenemedi. Ağ bağlantınızı kontrol edin.", 4000)
@@ -120,6 +127,32 @@ class AppController:
         print(f"Kur güncelleme hatası: {error_info[1]}")
         self._update_status_bar("Kur güncelleme hatası! Detaylar için logları kontrol edin.", 5000)
 
+    def _trigger_scheduled_backup(self):
+        # Değişiklik yoksa yeni yedek noktası yazılmaz; bu yüzden son deneme zamanı ayrıca tutulur.
+        if self.backup_worker is not None or not db.get_setting_bool(db.SCHEDULED_BACKUP_SETTING_KEY, True):
+            return
+        interval = db.get_setting_float(db.SCHEDULED_BACKUP_INTERVAL_SETTING_KEY, db.DEFAULT_SCHEDULED_BACKUP_INTERVAL)
+        if self.last_backup_attempt and (datetime.now() - self.last_backup_attempt).total_seconds() < interval * 60:
+            return
+        if not db.backup_snapshot_due(interval):
+            return
+        self.last_backup_attempt = datetime.now()
+        worker = BackgroundWorker(db.create_backup_snapshot, 'Zamanlanmış', pause=db.SCHEDULED_BACKUP_PAUSE)
+        worker.signals.error.connect(self._on_scheduled_backup_error)
+        worker.signals.finished.connect(lambda: self._on_scheduled_backup_finished(worker))
+        self.backup_worker = worker
+        self.active_workers.append(worker)
+        self.thread_pool.start(worker)
+
+    def _on_scheduled_backup_error(self, error_info: tuple):
+        _, error, traceback = error_info
+        logging.error(f"Zamanlanmış yedekleme hatası: {error}", exc_info=(type(error), error, traceback))
+        self._update_status_bar("Zamanlanmış yedekleme başarısız! Detaylar için logları kontrol edin.", 5000)
+
+    def _on_scheduled_backup_finished(self, worker: BackgroundWorker):
+        self.backup_worker = None
+        self._remove_worker(worker)
+
     def _remove_worker(self, worker_to_remove: BackgroundWorker):
         if worker_to_remove in self.active_workers:
             self.active_workers.remove(worker_to_remove)
@@ -31,16 +31,16 @@ class CustomerController:
         self.load_customers()
 
     def _setup_table_model(self):
-        headers = ["Ad", "Soyad", "Telefon", "E-posta", "İşlemler"]
-        column_keys = ["ad", "soyad", "telefon", "eposta", ""]
+        headers = ["Ad", "Soyad", "Telefon", "E-posta", "Bakiye", "İşlemler"]
+        column_keys = ["ad", "soyad", "telefon", "eposta", "bakiye", ""]
         self.table_model = GenericTableModel(headers=headers, column_keys=column_keys)
         self.view.customer_table.setModel(self.table_model)
         
         self.action_delegate = ActionDelegate(self.view)
-        self.view.customer_table.setItemDelegateForColumn(4, self.action_delegate)
+        self.view.customer_table.setItemDelegateForColumn(5, self.action_delegate)
         self.view.customer_table.setMouseTracking(True)
-        self.view.customer_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Fixed)
-        self.view.customer_table.setColumnWidth(4, 80)
+        self.view.customer_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Fixed)
+        self.view.customer_table.setColumnWidth(5, 80)
 
     def _connect_signals(self):
         self.view.add_customer_button.clicked.connect(self.open_add_dialog)
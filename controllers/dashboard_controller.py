@@ -9,7 +9,7 @@ from PySide6.QtWidgets import QDialog, QListWidgetItem
 from datetime import datetime
 from database import database_manager as db
 from models import sms_service
-from services.background_worker import BackgroundWorker
+from services.background_worker import BackgroundWorker, DatabaseWriteTask
 from utils.signals import app_signals
 from views.delegates import DashboardListDelegate
 from views.stock_movement_dialog import StockMovementDialog
@@ -26,6 +26,8 @@ class DashboardController:
         self.view = view
         self.thread_pool = QThreadPool()
         self.active_workers = []
+        self.stats_worker = None
+        self.stats_refresh_pending = False
         
         # --- DÜZELTME: Canlı renk paleti tanımlandı ---
         self.chart_colors = [
@@ -65,42 +67,67 @@ class DashboardController:
         self.refresh_stats(check_live_credit=True)
 
     def refresh_stats(self, check_live_credit: bool = False):
-        try:
-            stats = db.get_dashboard_stats()
-            today = datetime.now()
-            start_date = today.strftime('%Y-%m-01 00:00:00')
-            end_date = today.strftime('%Y-%m-%d 23:59:59')
-            sales_this_month, _ = db.get_sales_by_date_range(start_date, end_date)
-            stats['total_sales_this_month'] = len(sales_this_month)
-            stats['sms_credit'] = db.get_setting('sms_credit', 'Bilinmiyor')
-            self.view.update_stats(stats)
-            
-            self.view.low_stock_list.clear()
-            low_stock_data = db.get_low_stock_products()[:5]
-            self.view.low_stock_list.setVisible(bool(low_stock_data))
-            for product in low_stock_data:
-                item = QListWidgetItem()
-                item_data = { "main_text": product['ad'], "sub_text": str(product['stok_miktari']), "is_critical": True, "db_id": product['id'], "product_name": product['ad'] }
-                item.setData(Qt.UserRole, item_data)
-                self.view.low_stock_list.addItem(item)
-
-            self.view.recent_sales_list.clear()
-            recent_sales_data = db.get_recent_sales()
-            self.view.recent_sales_list.setVisible(bool(recent_sales_data))
-            for sale in recent_sales_data:
-                item = QListWidgetItem()
-                item_data = { "main_text": sale['musteri_adi'], "sub_text": f"{sale['toplam_tutar']:,.2f} TL", "is_critical": False, "db_id": sale['id'] }
-                item.setData(Qt.UserRole, item_data)
-                self.view.recent_sales_list.addItem(item)
-            
-            self._draw_monthly_sales_chart(db.get_sales_by_day_for_month())
-            self._draw_category_distribution_chart(db.get_sales_by_category())
+        if check_live_credit: self._check_live_credit()
+        # Bir satış üç güncelleme sinyali birden yayar; yükleme sürerken gelen istekler tek bir yenilemede birleştirilir.
+        if self.stats_worker is not None:
+            self.stats_refresh_pending = True
+            return
+        self.stats_refresh_pending = False
+        worker = BackgroundWorker(db.run_in_snapshot, self._load_dashboard_data)
+        worker.signals.result.connect(self._on_dashboard_data_loaded)
+        worker.signals.error.connect(self._on_dashboard_data_error)
+        worker.signals.finished.connect(self._on_dashboard_refresh_finished)
+        self.stats_worker = worker
+        self.thread_pool.start(worker)
 
-            if check_live_credit: self._check_live_credit()
-        
-        except Exception as e:
-            logging.error(f"Dashboard istatistikleri yüklenirken hata oluştu: {e}", exc_info=True)
-            ui_helpers.show_critical_message(self.view, f"Dashboard verileri yüklenemedi.\n\nHata: {e}")
+    def _load_dashboard_data(self):
+        # Panelin tüm sorguları aynı anlık görüntüden okunur; kartlar, listeler ve grafikler birbiriyle tutarlıdır.
+        stats = db.get_dashboard_stats()
+        today = datetime.now()
+        start_date = today.strftime('%Y-%m-01 00:00:00')
+        end_date = today.strftime('%Y-%m-%d 23:59:59')
+        stats['total_sales_this_month'] = db.get_sales_summary_for_period(start_date, end_date)['satis_adedi']
+        stats['sms_credit'] = db.get_setting('sms_credit', 'Bilinmiyor')
+        return {
+            'stats': stats,
+            'low_stock': db.get_low_stock_products()[:5],
+            'recent_sales': db.get_recent_sales(),
+            'monthly_sales': db.get_sales_by_day_for_month(),
+            'category_sales': db.get_sales_by_category(),
+        }
+
+    def _on_dashboard_data_loaded(self, result):
+        data, _ = result
+        self.view.update_stats(data['stats'])
+
+        self.view.low_stock_list.clear()
+        self.view.low_stock_list.setVisible(bool(data['low_stock']))
+        for product in data['low_stock']:
+            item = QListWidgetItem()
+            item_data = { "main_text": product['ad'], "sub_text": str(product['stok_miktari']), "is_critical": True, "db_id": product['id'], "product_name": product['ad'] }
+            item.setData(Qt.UserRole, item_data)
+            self.view.low_stock_list.addItem(item)
+
+        self.view.recent_sales_list.clear()
+        self.view.recent_sales_list.setVisible(bool(data['recent_sales']))
+        for sale in data['recent_sales']:
+            item = QListWidgetItem()
+            item_data = { "main_text": sale['musteri_adi'], "sub_text": f"{sale['toplam_tutar']:,.2f} TL", "is_critical": False, "db_id": sale['id'] }
+            item.setData(Qt.UserRole, item_data)
+            self.view.recent_sales_list.addItem(item)
+
+        self._draw_monthly_sales_chart(data['monthly_sales'])
+        self._draw_category_distribution_chart(data['category_sales'])
+
+    def _on_dashboard_data_error(self, error_info):
+        _, error, traceback = error_info
+        logging.error(f"Dashboard istatistikleri yüklenirken hata oluştu: {error}", exc_info=(type(error), error, traceback))
+        ui_helpers.show_critical_message(self.view, f"Dashboard verileri yüklenemedi.\n\nHata: {error}")
+
+    def _on_dashboard_refresh_finished(self):
+        self.stats_worker = None
+        if self.stats_refresh_pending:
+            self.refresh_stats()
 
     def _create_base_chart(self):
         chart = QChart()
@@ -201,7 +228,7 @@ class DashboardController:
 
     def _on_credit_check_finished(self, credit: str):
         if credit is not None:
-            db.save_setting('sms_credit', credit)
+            db.submit_write(db.save_setting, 'sms_credit', credit)
             self.view.credit_card.value_label.setText(str(credit))
             app_signals.status_message_updated.emit("SMS kredisi başarıyla güncellendi.", 4000)
         else:
@@ -223,8 +250,16 @@ class DashboardController:
             if not data or data.get('miktar') == 0:
                 return
             
-            if db.add_stock_movement(product_id, data['hareket_tipi'], data['miktar'], data['aciklama']):
-                app_signals.status_message_updated.emit(texts.PRODUCT_MSG_STOCK_MOVEMENT_SUCCESS.format(product_name=product_name), 4000)
-                app_signals.stock_updated.emit()
-            else:
-                ui_helpers.show_critical_message(self.view, texts.PRODUCT_MSG_STOCK_MOVEMENT_DB_ERROR)
\ No newline at end of file
+            task = DatabaseWriteTask(db.add_stock_movement, product_id, data['hareket_tipi'], data['miktar'], data['aciklama'])
+            task.signals.result.connect(lambda success: self._on_stock_correction_saved(success, product_name))
+            task.signals.error.connect(lambda _: self._on_stock_correction_saved(False, product_name))
+            task.signals.finished.connect(lambda: self.active_workers.remove(task))
+            self.active_workers.append(task)
+            task.start()
+
+    def _on_stock_correction_saved(self, success, product_name):
+        if success:
+            app_signals.status_message_updated.emit(texts.PRODUCT_MSG_STOCK_MOVEMENT_SUCCESS.format(product_name=product_name), 4000)
+            app_signals.stock_updated.emit()
+        else:
+            ui_helpers.show_critical_message(self.view, texts.PRODUCT_MSG_STOCK_MOVEMENT_DB_ERROR)
\ No newline at end of file
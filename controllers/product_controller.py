@@ -8,6 +8,7 @@ from PySide6.QtGui import QShortcut, QKeySequence
 from PySide6.QtCore import Qt
 
 from database import database_manager as db
+from services.background_worker import DatabaseWriteTask
 from views.delegates import GenericListDelegate
 from views.product_dialog import SingleProductDialog, VariantTypeSelectionDialog, VariantDetailEditDialog
 from views.stock_movement_dialog import StockMovementDialog
@@ -21,6 +22,7 @@ class ProductController:
         self.view = view
         self.selected_product_id = None
         self.category_cache = {}
+        self.pending_writes = []
         
         self._setup_list()
         self._connect_signals()
@@ -126,8 +128,17 @@ class ProductController:
         dialog = StockMovementDialog(product_name, self.view)
         if dialog.exec() == QDialog.Accepted:
             if data := dialog.get_data():
-                db.add_stock_movement(self.selected_product_id, data['hareket_tipi'], data['miktar'], data['aciklama'])
-                app_signals.products_updated.emit(); self._refresh_detail_panel()
+                task = DatabaseWriteTask(db.add_stock_movement, self.selected_product_id, data['hareket_tipi'], data['miktar'], data['aciklama'])
+                task.signals.result.connect(self._on_stock_movement_saved)
+                task.signals.error.connect(lambda _: ui_helpers.show_critical_message(self.view, texts.PRODUCT_MSG_STOCK_MOVEMENT_DB_ERROR))
+                task.signals.finished.connect(lambda: self.pending_writes.remove(task))
+                self.pending_writes.append(task)
+                task.start()
+
+    def _on_stock_movement_saved(self, success):
+        if not success:
+            return ui_helpers.show_critical_message(self.view, texts.PRODUCT_MSG_STOCK_MOVEMENT_DB_ERROR)
+        app_signals.products_updated.emit(); self._refresh_detail_panel()
 
     def open_add_product_dialog(self): self._open_product_dialog()
 
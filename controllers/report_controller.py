@@ -1,7 +1,8 @@
 # dosya: controllers/report_controller.py
 
-from PySide6.QtCore import QDate, Qt, QMargins
-from PySide6.QtWidgets import QApplication, QFileDialog
+from PySide6.QtCore import QDate, Qt, QMargins, QThreadPool
+from PySide6.QtWidgets import QFileDialog
+import logging
 import openpyxl
 from datetime import datetime
 from PySide6.QtGui import QPainter, QFont, QColor, QPen
@@ -9,7 +10,9 @@ from PySide6.QtCharts import QChart, QLineSeries, QPieSeries, QHorizontalBarSeri
 
 from views.table_models import GenericTableModel
 from database import database_manager as db
+from services.background_worker import BackgroundWorker
 from generators.generic_report_pdf import GenericReportGenerator
+from models import price_calculator
 from utils import ui_helpers
 
 class ReportController:
@@ -17,6 +20,10 @@ class ReportController:
         self.view = view
         self.current_model = None 
         self.current_report_title = ""
+        self.current_snapshot_time = None
+        self.thread_pool = QThreadPool()
+        self.active_workers = []
+        self.report_request = 0
         
         # --- DÜZELTME: Canlı ve standart renk paleti tanımlandı ---
         self.chart_colors = [
@@ -33,6 +40,7 @@ class ReportController:
         self.view.generate_inventory_report_button.clicked.connect(self.generate_inventory_report)
         self.view.generate_product_report_button.clicked.connect(self.generate_product_report)
         self.view.generate_customer_report_button.clicked.connect(self.generate_customer_report)
+        self.view.generate_price_list_button.clicked.connect(self.generate_price_list_report)
         self.view.export_excel_button.clicked.connect(self.export_to_excel)
         self.view.export_pdf_button.clicked.connect(self.export_to_pdf)
 
@@ -60,9 +68,10 @@ class ReportController:
 
     def _setup_report(self, title: str, headers: list, column_keys: list, enabled_filters: dict):
         self.view.show_loading(True)
-        QApplication.processEvents()
 
         self.current_report_title = title
+        self.current_snapshot_time = None
+        self.view.snapshot_label.setText("")
         self.view.customer_filter_combo.setEnabled(enabled_filters.get('customer', False))
         self.view.category_filter_combo.setEnabled(enabled_filters.get('category', False))
 
@@ -71,6 +80,36 @@ class ReportController:
         self.view.totals_label.setVisible(False)
         self._clear_charts()
 
+    def _run_report(self, fetch, render):
+        # Sorgular iş parçacığında, salt okunur tek bir anlık görüntüde çalışır; kasa yazmaları beklemez.
+        # Sonuç gelmeden başka bir rapor istenirse eski sonuç yok sayılır.
+        self.report_request += 1
+        request = self.report_request
+        worker = BackgroundWorker(db.run_in_snapshot, fetch)
+        worker.signals.result.connect(lambda result: self._on_report_ready(request, render, result))
+        worker.signals.error.connect(lambda error_info: self._on_report_error(request, error_info))
+        worker.signals.finished.connect(lambda: self.active_workers.remove(worker))
+        self.active_workers.append(worker)
+        self.thread_pool.start(worker)
+
+    def _on_report_ready(self, request, render, result):
+        if request != self.report_request:
+            return
+        data, snapshot_time = result
+        self.current_snapshot_time = snapshot_time
+        self.view.snapshot_label.setText(f"Veri anı: {datetime.strptime(snapshot_time, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M:%S')}")
+        rows = render(data)
+        self.view.show_loading(False)
+        self.view.set_export_buttons_enabled(len(rows) > 0)
+
+    def _on_report_error(self, request, error_info):
+        if request != self.report_request:
+            return
+        _, error, traceback = error_info
+        logging.error(f"'{self.current_report_title}' raporu oluşturulamadı: {error}", exc_info=(type(error), error, traceback))
+        self.view.show_loading(False)
+        ui_helpers.show_critical_message(self.view, f"Rapor oluşturulurken bir hata oluştu:\n{error}")
+
     def _get_common_filters(self):
         start_date = self.view.start_date_edit.date().toString("yyyy-MM-dd 00:00:00")
         end_date = self.view.end_date_edit.date().toString("yyyy-MM-dd 23:59:59")
@@ -87,9 +126,13 @@ class ReportController:
         )
         
         start_date, end_date, customer_id, _ = self._get_common_filters()
-        sales_data, totals = db.get_sales_with_profit_by_date_range(start_date, end_date, customer_id)
-        daily_data = db.get_daily_sales_for_period(start_date, end_date, customer_id)
-        
+        self._run_report(
+            lambda: (db.get_sales_with_profit_by_date_range(start_date, end_date, customer_id), db.get_daily_sales_for_period(start_date, end_date, customer_id)),
+            self._render_sales_report
+        )
+
+    def _render_sales_report(self, data):
+        (sales_data, totals), daily_data = data
         self.current_model.update_data(sales_data)
         self.view.totals_label.setText(
             f"Dönem Özeti:   Toplam Satış: {totals.get('total_revenue', 0):,.2f} TL   |   "
@@ -98,8 +141,7 @@ class ReportController:
         )
         self.view.totals_label.setVisible(True)
         self._draw_daily_sales_chart(daily_data)
-        self.view.show_loading(False)
-        self.view.set_export_buttons_enabled(len(sales_data) > 0)
+        return sales_data
 
     def generate_inventory_report(self):
         self._setup_report(
@@ -110,15 +152,15 @@ class ReportController:
         )
         
         _, _, _, category_id = self._get_common_filters()
-        report_data, total_value = db.get_inventory_report(category_id)
-        category_value_data = db.get_inventory_value_by_category()
-        
+        self._run_report(lambda: (db.get_inventory_report(category_id), db.get_inventory_value_by_category()), self._render_inventory_report)
+
+    def _render_inventory_report(self, data):
+        (report_data, total_value), category_value_data = data
         self.current_model.update_data(report_data)
         self.view.totals_label.setText(f"Toplam Envanter Değeri: {total_value:,.2f} TL")
         self.view.totals_label.setVisible(True)
         self._draw_inventory_value_chart(category_value_data)
-        self.view.show_loading(False)
-        self.view.set_export_buttons_enabled(len(report_data) > 0)
+        return report_data
 
     def generate_product_report(self):
         self._setup_report(
@@ -129,12 +171,12 @@ class ReportController:
         )
         
         start_date, end_date, _, category_id = self._get_common_filters()
-        report_data = db.get_product_sales_report(start_date, end_date, category_id)
-        
+        self._run_report(lambda: db.get_product_sales_report(start_date, end_date, category_id), self._render_product_report)
+
+    def _render_product_report(self, report_data):
         self.current_model.update_data(report_data)
         self._draw_top_products_charts(report_data)
-        self.view.show_loading(False)
-        self.view.set_export_buttons_enabled(len(report_data) > 0)
+        return report_data
 
     def generate_customer_report(self):
         self._setup_report(
@@ -145,15 +187,37 @@ class ReportController:
         )
         
         start_date, end_date, _, _ = self._get_common_filters()
-        report_data = db.get_customer_sales_report(start_date, end_date)
-        total_profit = sum(item['toplam_kar'] or 0 for item in report_data)
+        self._run_report(lambda: db.get_customer_sales_report(start_date, end_date), self._render_customer_report)
 
+    def _render_customer_report(self, report_data):
+        total_profit = sum(item['toplam_kar'] or 0 for item in report_data)
         self.current_model.update_data(report_data)
         self.view.totals_label.setText(f"Dönem Toplam Net Kârı: {total_profit:,.2f} TL")
         self.view.totals_label.setVisible(True)
         self._draw_top_customers_chart(report_data)
-        self.view.show_loading(False)
-        self.view.set_export_buttons_enabled(len(report_data) > 0)
+        return report_data
+
+    def generate_price_list_report(self):
+        self._setup_report(
+            title="Fiyat Listesi",
+            headers=["Stok Kodu", "Ürün Adı", "Kategori", "Alış Fiyatı", "Birim", "Kâr Dahil (KDV Hariç)", "Nakit Fiyatı (TL)", "Kredi Kartı Fiyatı (TL)"],
+            column_keys=["stok_kodu", "ad", "kategori_ad", "alis_fiyati", "alis_para_birimi", "karli_fiyat_kdv_haric", "kdvli_fiyat", "kkli_fiyat"],
+            enabled_filters={'customer': False, 'category': True}
+        )
+
+        _, _, _, category_id = self._get_common_filters()
+
+        def fetch():
+            products = db.get_products(category_id=category_id)
+            return [dict(product) | prices for product, prices in zip(products, price_calculator.calculate_prices_batch(products))]
+
+        self._run_report(fetch, self._render_price_list_report)
+
+    def _render_price_list_report(self, report_data):
+        self.current_model.update_data(report_data)
+        self.view.totals_label.setText(f"Listelenen Ürün Sayısı: {len(report_data):,}")
+        self.view.totals_label.setVisible(True)
+        return report_data
 
     def export_to_excel(self):
         if not self.current_model or self.current_model.rowCount() == 0:
@@ -182,7 +246,8 @@ class ReportController:
         generator = GenericReportGenerator(
             report_title=self.current_report_title, headers=self.current_model.headers, data=data_for_pdf,
             file_prefix=self.current_report_title.replace(' ', '_'), 
-            summary_line=self.view.totals_label.text() if self.view.totals_label.isVisible() else ""
+            summary_line=self.view.totals_label.text() if self.view.totals_label.isVisible() else "",
+            snapshot_time=self.current_snapshot_time
         )
         success, message = generator.generate()
         if not success:
@@ -4,9 +4,12 @@ from PySide6.QtWidgets import QDialog, QHeaderView
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 from PySide6.QtCore import QTimer, Qt, QEvent, QObject
 import json
+import time
+import logging
 from collections import defaultdict
 
 from database import database_manager as db
+from services.background_worker import DatabaseWriteTask
 from models import price_calculator
 from views.customer_dialog import CustomerDialog
 from views.quantity_dialog import QuantityDialog
@@ -18,6 +21,10 @@ from services.session_manager import session
 from utils import ui_texts as texts
 from utils import ui_helpers
 
+# Barkod okuyucular klavye gibi davranır: karakterleri birkaç ms arayla yazıp Enter gönderir.
+SCANNER_MAX_KEY_INTERVAL = 0.05
+SCANNER_MIN_LENGTH = 4
+
 class SaleController(QObject): 
     def __init__(self, view):
         super().__init__()
@@ -25,10 +32,12 @@ class SaleController(QObject):
         self.view = view
         self.cart = [] 
         self.cart_quantities = defaultdict(int)
-        self.settings = {}
         self.current_prices = {}
         self.editing_sale_id = None
+        self.pending_sale_task = None
         self.selected_product_from_popup = None
+        self.last_key_time = 0.0
+        self.is_scanner_input = False
         
         self.product_search_timer = QTimer(self.view)
         self.product_list_model = QStandardItemModel(self.view)
@@ -43,8 +52,19 @@ class SaleController(QObject):
         if watched == self.view.product_search_input and event.type() == QEvent.Type.MouseButtonPress:
             if not self.view.product_search_input.text().strip():
                 self._search_products_and_show_popup()
+        elif watched == self.view.product_search_input and event.type() == QEvent.Type.KeyPress and event.text().isprintable() and event.text():
+            self._track_scanner_input()
         return super().eventFilter(watched, event)
 
+    def _track_scanner_input(self):
+        # İlk karakterden sonra tüm tuşlar SCANNER_MAX_KEY_INTERVAL içinde geldiyse girdi okuyucudandır.
+        now = time.monotonic()
+        if not self.view.product_search_input.text():
+            self.is_scanner_input = True
+        elif now - self.last_key_time > SCANNER_MAX_KEY_INTERVAL:
+            self.is_scanner_input = False
+        self.last_key_time = now
+
     def _setup_ui(self):
         headers = ["Ürün Adı", "Miktar", "Birim Fiyat", "Toplam Fiyat", ""] 
         column_keys = ["ad", "miktar", "birim_fiyat", "toplam_fiyat", ""]
@@ -66,7 +86,7 @@ class SaleController(QObject):
         
         # --- DÜZELTME: Sinyal bağlantısı eski butondan yeni QAction'a güncellendi ---
         self.view.show_search_popup_action.triggered.connect(self._show_product_search_popup)
-        self.view.product_search_input.returnPressed.connect(self._show_product_search_popup)
+        self.view.product_search_input.returnPressed.connect(self._on_search_return_pressed)
         
         self.view.add_to_cart_button.clicked.connect(self._on_add_to_cart_clicked)
         self.view.btn_add_ozel.clicked.connect(self._add_to_cart_ozel)
@@ -103,7 +123,6 @@ class SaleController(QObject):
             self.view.show_button_feedback(self.view.add_to_cart_button)
 
     def load_initial_data(self):
-        self.settings = db.get_all_settings()
         self.populate_customers()
         self._update_dynamic_prices(None)
 
@@ -123,18 +142,39 @@ class SaleController(QObject):
         if self.view.product_search_input.hasFocus():
             self.view.product_search_popup_widget.show_popup(self.view.product_search_input)
 
+    def _on_search_return_pressed(self):
+        # Enter'da önce barkod/stok kodu tam eşleşmesi denenir; bulunursa ürün popup ve
+        # debounce beklenmeden doğrudan sepete eklenir.
+        code = self.view.product_search_input.text().strip()
+        is_scan = self.is_scanner_input and len(code) >= SCANNER_MIN_LENGTH
+        self.is_scanner_input = False
+        product = db.get_product_by_code(code) if code else None
+        if product:
+            self.view.product_search_popup_widget.hide_popup()
+            self.selected_product_from_popup = dict(product)
+            self._update_dynamic_prices(self.selected_product_from_popup)
+            self._on_add_to_cart_clicked()
+            # Sepete eklerken arama kutusu temizlenir; bunun başlattığı aramaya gerek yok.
+            self.product_search_timer.stop()
+        elif is_scan:
+            self.product_search_timer.stop()
+            self.view.product_search_input.clear()
+            ui_helpers.show_warning_message(self.view, texts.SALE_MSG_BARCODE_NOT_FOUND.format(code=code))
+        else:
+            self._show_product_search_popup()
+
     def _show_product_search_popup(self):
         self._search_products()
         self.view.product_search_popup_widget.show_popup(self.view.product_search_input)
        
     def _search_products(self):
-        products_in_db = db.get_products(search_query=self.view.product_search_input.text().strip())
+        products_in_db = db.search_products(self.view.product_search_input.text().strip())
         self._build_product_list_model(products_in_db)
         
     def _build_product_list_model(self, products):
         self.product_list_model.clear()
-        for product_data in products:
-            item = QStandardItem(f"{product_data['ad']} (Stok: {product_data['stok_miktari']})")
+        for product_data, prices in zip(products, price_calculator.calculate_prices_batch(products)):
+            item = QStandardItem(f"{product_data['ad']} (Stok: {product_data['stok_miktari']}) - {prices.get('kdvli_fiyat', 0):,.2f} TL")
             item.setData(dict(product_data), Qt.UserRole)
             is_selectable = product_data['stok_miktari'] > 0 or self.editing_sale_id is not None
             item.setEnabled(is_selectable)
@@ -167,14 +207,15 @@ class SaleController(QObject):
         if not product_data:
             self.current_prices = {}
         else:
-            self.current_prices = price_calculator.calculate_prices(product_data, self.settings)
+            self.current_prices = price_calculator.calculate_prices(product_data)
             currency = product_data.get('alis_para_birimi', 'TL')
             if (self.current_prices.get('kdvli_fiyat', 0) == 0 and currency != 'TL' and 
-                float(self.settings.get(f"{currency.lower()}_tl_kuru", '0').replace(',', '.')) <= 0):
+                db.get_setting_float(f"{currency.lower()}_tl_kuru", 0.0) <= 0):
                 is_currency_defined = False
         self.view.update_price_displays(self.current_prices, is_currency_defined)
 
     def _add_to_cart(self, sale_price: float) -> bool:
+        sale_price = db.to_tl(sale_price)
         product_data = self.selected_product_from_popup
         if not product_data: 
             ui_helpers.show_warning_message(self.view, texts.SALE_MSG_SELECT_PRODUCT)
@@ -208,12 +249,12 @@ class SaleController(QObject):
     
     def _add_to_cart_ozel(self):
         try:
-            ozel_fiyat = float(self.view.ozel_fiyat_input.text().replace(',', '.'))
+            ozel_fiyat = db.to_tl(self.view.ozel_fiyat_input.text())
             if self.view.kdv_ekle_check.isChecked():
                 product_data = self.selected_product_from_popup
                 if not product_data: return
                 tax_rate_row = db.get_vergi_orani_by_id(product_data.get('vergi_id')) if product_data.get('vergi_id') else None
-                vat_percent = tax_rate_row['oran'] if tax_rate_row else float(self.settings.get('kdv_orani', '20.0').replace(',', '.'))
+                vat_percent = tax_rate_row['oran'] if tax_rate_row else db.get_setting_float('kdv_orani', 20.0)
                 ozel_fiyat *= (1 + vat_percent / 100)
             self._add_to_cart(ozel_fiyat)
         except (ValueError, TypeError):
@@ -280,7 +321,7 @@ class SaleController(QObject):
     def update_totals(self):
         total = sum(item['miktar'] * item['birim_fiyat'] for item in self.cart)
         try:
-            deposit = float(self.view.deposit_input.text().replace(',', '.') or 0)
+            deposit = db.to_tl(self.view.deposit_input.text())
         except ValueError: deposit = 0
         self.view.total_label.setText(f"{total:,.2f} TL")
         self.view.balance_label.setText(f"{total - deposit:,.2f} TL")
@@ -290,27 +331,53 @@ class SaleController(QObject):
         else: self.view.balance_label.setStyleSheet("font-weight: bold; font-size: 18px; color: #2C3E50;")
     
     def _pay_in_full(self):
-        total_text = self.view.total_label.text().replace(' TL', '').replace('.', '').replace(',', '.')
-        self.view.deposit_input.setText(total_text)
+        total = sum(item['miktar'] * item['birim_fiyat'] for item in self.cart)
+        self.view.deposit_input.setText(f"{db.to_tl(total):.2f}")
 
     def complete_sale(self):
+        if self.pending_sale_task: return
         if self.editing_sale_id and not session.has_permission('sales:edit'):
             return ui_helpers.show_warning_message(self.view, texts.MSG_UNAUTHORIZED_ACTION_DETAIL)
         if not self.cart: return ui_helpers.show_warning_message(self.view, texts.SALE_MSG_ADD_ITEM_FIRST)
         
-        if self.editing_sale_id:
-            success, msg = db.delete_sale_by_id(self.editing_sale_id)
-            if not success:
-                return ui_helpers.show_critical_message(self.view, f"Eski satış güncellenemedi: {msg}")
-        
-        sale_data = {'musteri_id': self.view.customer_combo.currentData(), 'toplam_tutar': sum(item['miktar'] * item['birim_fiyat'] for item in self.cart), 'odenen_tutar': float(self.view.deposit_input.text().replace(',', '.') or 0)}
-        if satis_id := db.create_sale(sale_data, self.cart):
-            message = texts.SALE_MSG_UPDATE_SUCCESS.format(old_sale_id=self.editing_sale_id, new_sale_id=satis_id) if self.editing_sale_id else texts.SALE_MSG_SAVE_SUCCESS.format(sale_id=satis_id)
+        sale_data = {'musteri_id': self.view.customer_combo.currentData(), 'toplam_tutar': sum(item['miktar'] * item['birim_fiyat'] for item in self.cart), 'odenen_tutar': db.to_tl(self.view.deposit_input.text())}
+        # Satış yazıcı iş parçacığında kaydedilir; kilit beklemesi olursa ekran donmaz, yalnızca buton kilitlenir.
+        task = DatabaseWriteTask(db.commit_sale, sale_data, [dict(item) for item in self.cart], replaces_sale_id=self.editing_sale_id)
+        task.signals.result.connect(lambda result, editing_sale_id=self.editing_sale_id: self._on_sale_committed(result, editing_sale_id))
+        task.signals.error.connect(self._on_sale_commit_error)
+        task.signals.finished.connect(self._on_sale_commit_finished)
+        self.pending_sale_task = task
+        self.view.complete_sale_button.setEnabled(False)
+        app_signals.status_message_updated.emit(texts.SALE_MSG_SAVING, 0)
+        task.start()
+
+    def _on_sale_committed(self, result, editing_sale_id):
+        satis_id, shortages = result
+        if satis_id:
+            message = texts.SALE_MSG_UPDATE_SUCCESS.format(old_sale_id=editing_sale_id, new_sale_id=satis_id) if editing_sale_id else texts.SALE_MSG_SAVE_SUCCESS.format(sale_id=satis_id)
+            app_signals.status_message_updated.emit(message, 4000)
             ui_helpers.show_info_message(self.view, message)
             app_signals.stock_updated.emit(); app_signals.sales_updated.emit(); app_signals.customers_updated.emit()
             self.reset_sale_form()
+        elif shortages:
+            app_signals.status_message_updated.emit("", 0)
+            lines = "\n".join(texts.SALE_MSG_STOCK_SHORTAGE_LINE.format(**item) for item in shortages)
+            ui_helpers.show_warning_message(self.view, texts.SALE_MSG_STOCK_SHORTAGE.format(lines=lines))
+            app_signals.stock_updated.emit()
+            self._search_products()
         else:
-            ui_helpers.show_critical_message(self.view, texts.SALE_MSG_SAVE_ERROR)
+            self._on_sale_commit_error(None)
+
+    def _on_sale_commit_error(self, error_info):
+        if error_info:
+            _, error, traceback = error_info
+            logging.error(f"Satış yazıcıda kaydedilemedi: {error}", exc_info=(type(error), error, traceback))
+        app_signals.status_message_updated.emit("", 0)
+        ui_helpers.show_critical_message(self.view, texts.SALE_MSG_SAVE_ERROR)
+
+    def _on_sale_commit_finished(self):
+        self.pending_sale_task = None
+        self.view.complete_sale_button.setEnabled(True)
 
     def load_sale_for_editing(self, sale_id):
         self.reset_sale_form()
@@ -4,7 +4,7 @@ from PySide6.QtCore import QTimer, Qt
 from PySide6.QtWidgets import QListWidgetItem
 
 from database import database_manager as db
-from views.table_models import GenericTableModel
+from views.table_models import PagedTableModel
 from views.sale_detail_dialog import SaleDetailDialog
 from utils.signals import app_signals
 from utils import ui_helpers
@@ -26,7 +26,8 @@ class SaleHistoryController:
     def _setup_table(self):
         headers = ["Satış ID", "Tarih", "Müşteri Adı", "Toplam Tutar (TL)"]
         column_keys = ["id", "satis_tarihi", "musteri_adi", "toplam_tutar"]
-        self.table_model = GenericTableModel(headers=headers, column_keys=column_keys)
+        self.current_query = ""
+        self.table_model = PagedTableModel(headers=headers, column_keys=column_keys, fetch_page=self._fetch_history_page, page_size=db.SALES_HISTORY_PAGE_SIZE)
         self.view.history_table.setModel(self.table_model)
 
     def _connect_signals(self):
@@ -37,8 +38,18 @@ class SaleHistoryController:
 
     def load_history(self):
         query = self.view.search_input.text()
-        sales_data = db.search_sales_history(query) if query else db.get_all_sales_history()
-        self.table_model.update_data(sales_data)
+        try:
+            db.validate_sales_query(query)
+        except ValueError as e:
+            self.view.search_error_label.setText(str(e))
+            self.view.search_error_label.show()
+            return
+        self.view.search_error_label.hide()
+        self.current_query = query
+        self.table_model.reload()
+
+    def _fetch_history_page(self, last_row, limit):
+        return db.get_sales_history_page(last_row['id'] if last_row else None, limit, self.current_query)
 
     def open_sale_detail(self, index):
         sale_id = self.table_model.get_item_id(index)
@@ -4,7 +4,7 @@ import os
 import shutil
 import logging
 from datetime import datetime
-from PySide6.QtWidgets import QFileDialog, QInputDialog, QLineEdit, QCheckBox, QApplication
+from PySide6.QtWidgets import QFileDialog, QInputDialog, QLineEdit, QCheckBox
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt, QThreadPool
 
@@ -18,6 +18,10 @@ from views.user_dialog import UserDialog
 from views.table_models import GenericTableModel
 from utils import ui_helpers
 from views.confirmation_dialog import ConfirmationDialog
+from views.query_stats_dialog import QueryStatsDialog
+
+BACKUP_INTERVAL_OPTIONS = {"15 dakika": 15, "30 dakika": 30, "1 saat": 60, "2 saat": 120, "4 saat": 240}
+SLOW_QUERY_THRESHOLD_OPTIONS = {"25 ms": 25, "50 ms": 50, "100 ms": 100, "250 ms": 250, "500 ms": 500, "1 sn": 1000}
 
 class SettingsController:
     def __init__(self, view):
@@ -103,7 +107,13 @@ class SettingsController:
         self.view.test_email_button.clicked.connect(self._test_email_settings)
         self.view.backup_button.clicked.connect(self._backup_database)
         self.view.restore_button.clicked.connect(self._restore_database)
-        self.view.auto_backup_checkbox.stateChanged.connect(self._save_auto_backup_setting)
+        self.view.restore_point_button.clicked.connect(self._restore_snapshot)
+        self.view.auto_backup_checkbox.stateChanged.connect(self._save_backup_settings)
+        self.view.scheduled_backup_checkbox.stateChanged.connect(self._save_backup_settings)
+        self.view.backup_interval_combo.currentTextChanged.connect(self._save_backup_settings)
+        self.view.sql_trace_checkbox.stateChanged.connect(self._save_trace_settings)
+        self.view.slow_query_threshold_combo.currentTextChanged.connect(self._save_trace_settings)
+        self.view.query_stats_button.clicked.connect(self._show_query_stats)
     
     def on_user_company_card_clicked(self):
         settings = db.get_all_settings()
@@ -155,6 +165,7 @@ class SettingsController:
         self.load_financial_settings(settings)
         self.load_communication_settings(settings)
         self.load_backup_settings()
+        self.load_performance_settings(settings)
 
     def _apply_permissions(self):
         can_manage_users = session.has_permission('settings:user_management')
@@ -235,7 +246,7 @@ class SettingsController:
         
     def save_company_profile(self):
         settings_to_save = {'company_name': self.view.company_name_input.text(),'company_address': self.view.company_address_input.toPlainText(),'company_phone': self.view.company_phone_input.text(),'company_email': self.view.company_email_input.text(),'company_website': self.view.company_website_input.text(),'company_tax_office': self.view.company_tax_office_input.text(),'company_tax_id': self.view.company_tax_id_input.text(),'company_logo_path': self.company_logo_path or ""}
-        for key, value in settings_to_save.items(): db.save_setting(key, value)
+        if not db.save_settings(settings_to_save): return ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_SAVE_ERROR)
         ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_PROFILE_SAVE_SUCCESS)
         
     def select_company_logo(self):
@@ -396,9 +407,13 @@ class SettingsController:
             self.load_roles_and_permissions_tab()
             
     def save_application_settings(self):
-        self.save_financial_settings()
-        self.save_communication_settings()
-        self._save_auto_backup_setting()
+        settings_to_save = self.get_financial_settings_to_save() | self.get_communication_settings_to_save()
+        settings_to_save |= self.get_backup_settings_to_save()
+        settings_to_save |= self.get_trace_settings_to_save()
+        settings_to_save[db.PERFORMANCE_PROFILE_SETTING_KEY] = self.view.db_profile_combo.currentText()
+        if not db.save_settings(settings_to_save): return ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_SAVE_ERROR)
+        db.apply_performance_profile()
+        db.apply_query_trace_settings()
         ui_helpers.show_info_message(self.view, "Tüm uygulama ayarları başarıyla kaydedildi.")
 
     def load_financial_settings(self, settings):
@@ -413,11 +428,8 @@ class SettingsController:
         self.view.eur_rate_label.setText(f"<b>{float(eur_rate.replace(',', '.')):.4f} TL</b>" if float(eur_rate.replace(',', '.')) > 0 else "Alınamadı")
         self.view.rate_update_time_label.setText(f"<i>{update_time}</i>")
         
-    def save_financial_settings(self):
-        db.save_setting('kar_yontemi', self.view.kar_yontemi_combo.currentText())
-        db.save_setting('kar_degeri', self.view.kar_degeri_input.text())
-        db.save_setting('kdv_orani', self.view.kdv_orani_input.text())
-        db.save_setting('kk_komisyonu', self.view.kk_komisyonu_input.text())
+    def get_financial_settings_to_save(self):
+        return {'kar_yontemi': self.view.kar_yontemi_combo.currentText(), 'kar_degeri': self.view.kar_degeri_input.text(), 'kdv_orani': self.view.kdv_orani_input.text(), 'kk_komisyonu': self.view.kk_komisyonu_input.text()}
         
     def trigger_live_rate_update(self):
         self.view.manual_rate_update_button.setText("Güncelleniyor...")
@@ -433,7 +445,7 @@ class SettingsController:
     def _on_live_rate_update_finished(self, rates):
         if rates:
             now_str = datetime.now().strftime("%d.%m.%Y %H:%M")
-            db.save_setting('usd_tl_kuru', rates.get('USD', '0')); db.save_setting('eur_tl_kuru', rates.get('EUR', '0')); db.save_setting('kur_guncelleme_tarihi', f"{now_str} (Manuel)")
+            db.save_settings({'usd_tl_kuru': rates.get('USD', '0'), 'eur_tl_kuru': rates.get('EUR', '0'), 'kur_guncelleme_tarihi': f"{now_str} (Manuel)"})
             app_signals.status_message_updated.emit("Döviz kurları başarıyla güncellendi.", 4000)
             self.load_financial_settings(db.get_all_settings())
         else:
@@ -453,9 +465,9 @@ class SettingsController:
         self.view.smtp_username_input.setText(settings.get('smtp_username', ''))
         self.view.smtp_password_input.setText(settings.get('smtp_password', ''))
         
-    def save_communication_settings(self):
-        db.save_setting('sms_username', self.view.sms_username_input.text()); db.save_setting('sms_password', self.view.sms_password_input.text()); db.save_setting('sms_originator', self.view.sms_originator_input.text())
-        db.save_setting('smtp_host', self.view.smtp_host_input.text()); db.save_setting('smtp_port', self.view.smtp_port_input.text()); db.save_setting('smtp_username', self.view.smtp_username_input.text()); db.save_setting('smtp_password', self.view.smtp_password_input.text())
+    def get_communication_settings_to_save(self):
+        return {'sms_username': self.view.sms_username_input.text(), 'sms_password': self.view.sms_password_input.text(), 'sms_originator': self.view.sms_originator_input.text(),
+                'smtp_host': self.view.smtp_host_input.text(), 'smtp_port': self.view.smtp_port_input.text(), 'smtp_username': self.view.smtp_username_input.text(), 'smtp_password': self.view.smtp_password_input.text()}
         
     def _test_sms_settings(self):
         settings = {'sms_username': self.view.sms_username_input.text(),'sms_password': self.view.sms_password_input.text(),'sms_originator': self.view.sms_originator_input.text()}
@@ -490,32 +502,173 @@ class SettingsController:
         app_signals.status_message_updated.emit("Test hatası!", 4000)
         
     def load_backup_settings(self):
-        self.view.auto_backup_checkbox.setChecked(db.get_setting('auto_backup_on_exit', 'False') == 'True')
-        
-    def _save_auto_backup_setting(self):
-        is_checked = self.view.auto_backup_checkbox.isChecked()
-        db.save_setting('auto_backup_on_exit', str(is_checked))
+        backup_widgets = (self.view.auto_backup_checkbox, self.view.scheduled_backup_checkbox, self.view.backup_interval_combo)
+        for widget in backup_widgets:
+            widget.blockSignals(True)
+        self.view.auto_backup_checkbox.setChecked(db.get_setting_bool('auto_backup_on_exit'))
+        self.view.scheduled_backup_checkbox.setChecked(db.get_setting_bool(db.SCHEDULED_BACKUP_SETTING_KEY, True))
+        interval = int(db.get_setting_float(db.SCHEDULED_BACKUP_INTERVAL_SETTING_KEY, db.DEFAULT_SCHEDULED_BACKUP_INTERVAL))
+        self.view.backup_interval_combo.clear()
+        self.view.backup_interval_combo.addItems(list(BACKUP_INTERVAL_OPTIONS))
+        self.view.backup_interval_combo.setCurrentText(next((label for label, minutes in BACKUP_INTERVAL_OPTIONS.items() if minutes == interval), "1 saat"))
+        for widget in backup_widgets:
+            widget.blockSignals(False)
+        # Tam dosya yedekleri yedekler tablosunda, depodaki yedek noktaları kendi manifestlerinde tutulur.
+        candidates = [dict(row) for row in db.get_backup_history(limit=1)] + db.list_backup_snapshots()[:1]
+        if candidates:
+            last = max(candidates, key=lambda backup: backup['olusturma_tarihi'])
+            self.view.last_backup_label.setText(texts.SETTINGS_LAST_BACKUP_INFO.format(tarih=last['olusturma_tarihi'], tur=last['tur'], boyut=last['boyut_bayt'] / (1024 * 1024), dogrulama=last['dogrulama']))
+        else:
+            self.view.last_backup_label.setText(texts.SETTINGS_LAST_BACKUP_NONE)
+
+    def get_backup_settings_to_save(self):
+        return {
+            'auto_backup_on_exit': str(self.view.auto_backup_checkbox.isChecked()),
+            db.SCHEDULED_BACKUP_SETTING_KEY: str(self.view.scheduled_backup_checkbox.isChecked()),
+            db.SCHEDULED_BACKUP_INTERVAL_SETTING_KEY: str(BACKUP_INTERVAL_OPTIONS.get(self.view.backup_interval_combo.currentText(), db.DEFAULT_SCHEDULED_BACKUP_INTERVAL)),
+        }
+
+    def _save_backup_settings(self):
+        db.save_settings(self.get_backup_settings_to_save())
         
+    def load_performance_settings(self, settings):
+        self.view.db_profile_combo.blockSignals(True)
+        self.view.db_profile_combo.clear()
+        self.view.db_profile_combo.addItems(list(db.PERFORMANCE_PROFILES))
+        self.view.db_profile_combo.setCurrentText(settings.get(db.PERFORMANCE_PROFILE_SETTING_KEY, db.DEFAULT_PERFORMANCE_PROFILE))
+        self.view.db_profile_combo.blockSignals(False)
+        self.load_trace_settings()
+
+    def load_trace_settings(self):
+        trace_widgets = (self.view.sql_trace_checkbox, self.view.slow_query_threshold_combo)
+        for widget in trace_widgets:
+            widget.blockSignals(True)
+        self.view.sql_trace_checkbox.setChecked(db.get_setting_bool(db.SQL_TRACE_SETTING_KEY))
+        threshold = int(db.get_setting_float(db.SLOW_QUERY_THRESHOLD_SETTING_KEY, db.DEFAULT_SLOW_QUERY_THRESHOLD_MS))
+        self.view.slow_query_threshold_combo.clear()
+        self.view.slow_query_threshold_combo.addItems(list(SLOW_QUERY_THRESHOLD_OPTIONS))
+        self.view.slow_query_threshold_combo.setCurrentText(next((label for label, ms in SLOW_QUERY_THRESHOLD_OPTIONS.items() if ms == threshold), "100 ms"))
+        for widget in trace_widgets:
+            widget.blockSignals(False)
+
+    def get_trace_settings_to_save(self):
+        return {
+            db.SQL_TRACE_SETTING_KEY: str(self.view.sql_trace_checkbox.isChecked()),
+            db.SLOW_QUERY_THRESHOLD_SETTING_KEY: str(SLOW_QUERY_THRESHOLD_OPTIONS.get(self.view.slow_query_threshold_combo.currentText(), db.DEFAULT_SLOW_QUERY_THRESHOLD_MS)),
+        }
+
+    def _save_trace_settings(self):
+        if db.save_settings(self.get_trace_settings_to_save()):
+            db.apply_query_trace_settings()
+
+    def _show_query_stats(self):
+        model = GenericTableModel(["Çağıran", "Sorgu", "Adet", "Toplam (ms)", "Ort. (ms)", "p50 (ms)", "p95 (ms)", "En Uzun (ms)", "Ort. Satır"],
+                                  ["cagiran", "sorgu", "adet", "toplam_ms", "ort_ms", "p50_ms", "p95_ms", "en_uzun_ms", "ort_satir"])
+        dialog = QueryStatsDialog(model, self.view)
+
+        def refresh():
+            stats = db.get_query_stats()
+            model.update_data(stats)
+            dialog.info_label.setText(texts.SETTINGS_QUERY_STATS_INFO.format(adet=len(stats), durum="açık" if db.is_query_trace_enabled() else "kapalı"))
+
+        def reset():
+            db.reset_query_stats()
+            refresh()
+
+        def export():
+            default_filename = os.path.join(os.path.expanduser("~"), f"sorgu_ozeti_{datetime.now().strftime('%Y-%m-%d')}.csv")
+            save_path, _ = QFileDialog.getSaveFileName(dialog, "Sorgu Özetini Kaydet", default_filename, "CSV Dosyaları (*.csv)")
+            if not save_path:
+                return
+            try:
+                count = db.export_query_stats(save_path)
+                ui_helpers.show_info_message(dialog, texts.SETTINGS_MSG_QUERY_STATS_EXPORTED.format(adet=count, path=save_path))
+            except OSError as e:
+                ui_helpers.show_critical_message(dialog, texts.SETTINGS_MSG_QUERY_STATS_EXPORT_ERROR.format(error=e))
+
+        dialog.reset_button.clicked.connect(reset)
+        dialog.export_button.clicked.connect(export)
+        refresh()
+        dialog.exec()
+
     def _backup_database(self):
         default_filename = os.path.join(os.path.expanduser("~"), f"ticari_program_yedek_{datetime.now().strftime('%Y-%m-%d')}.db")
         save_path, _ = QFileDialog.getSaveFileName(self.view, "Veritabanı Yedeğini Kaydet", default_filename, "SQLite Veritabanı (*.db)")
-        if save_path:
-            try:
-                shutil.copy(db.DATABASE_PATH, save_path)
-                ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_BACKUP_SUCCESS.format(path=save_path))
-            except Exception as e:
-                logging.error(f"Manuel yedekleme hatası: {e}", exc_info=True)
-                ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_BACKUP_ERROR.format(error=e))
-                
+        if not save_path:
+            return
+        self.view.backup_button.setEnabled(False)
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_BACKUP_STARTED, 0)
+        worker = BackgroundWorker(db.backup_database, save_path, 'Manuel')
+        worker.kwargs['progress'] = worker.signals.progress.emit
+        worker.signals.progress.connect(self._on_backup_progress)
+        worker.signals.result.connect(self._on_backup_finished)
+        worker.signals.error.connect(self._on_backup_error)
+        worker.signals.finished.connect(lambda: (self.view.backup_button.setEnabled(True), self.active_workers.remove(worker)))
+        self.active_workers.append(worker)
+        self.thread_pool.start(worker)
+
+    def _on_backup_progress(self, copied, total):
+        if total:
+            app_signals.status_message_updated.emit(texts.SETTINGS_MSG_BACKUP_PROGRESS.format(percent=copied * 100 // total), 0)
+
+    def _on_backup_finished(self, info):
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_BACKUP_DONE, 4000)
+        ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_BACKUP_SUCCESS.format(path=info['dosya_yolu']))
+        self.load_backup_settings()
+
+    def _on_backup_error(self, error_info):
+        _, error, traceback = error_info
+        logging.error(f"Manuel yedekleme hatası: {error}", exc_info=(type(error), error, traceback))
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_BACKUP_FAILED, 5000)
+        ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_BACKUP_ERROR.format(error=error))
+
     def _restore_database(self):
         dialog = ConfirmationDialog(self.view, texts.SETTINGS_MSG_RESTORE_CONFIRM_TITLE, texts.SETTINGS_MSG_RESTORE_CONFIRM_TEXT + "\n\n" + texts.SETTINGS_MSG_RESTORE_CONFIRM_INFO, "GERİ YÜKLE", texts.SETTINGS_MSG_RESTORE_CONFIRM_BTN)
         if dialog.exec():
             open_path, _ = QFileDialog.getOpenFileName(self.view, texts.SETTINGS_MSG_RESTORE_SELECT_FILE, os.path.expanduser("~"), "SQLite Veritabanı (*.db)")
             if open_path:
-                try:
-                    shutil.copy(open_path, db.DATABASE_PATH)
-                    ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_RESTORE_SUCCESS)
-                    QApplication.instance().quit()
-                except Exception as e:
-                    logging.error(f"Geri yükleme hatası: {e}", exc_info=True)
-                    ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_RESTORE_ERROR.format(error=e))
\ No newline at end of file
+                self._start_restore(db.restore_database, open_path)
+
+    def _restore_snapshot(self):
+        snapshots = db.list_backup_snapshots()
+        if not snapshots:
+            return ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_NO_RESTORE_POINTS)
+        labels = [texts.SETTINGS_RESTORE_POINT_ITEM.format(tarih=s['olusturma_tarihi'], tur=s['tur'], boyut=s['boyut_bayt'] / (1024 * 1024)) for s in snapshots]
+        label, ok = QInputDialog.getItem(self.view, texts.SETTINGS_MSG_RESTORE_POINT_TITLE, texts.SETTINGS_MSG_RESTORE_POINT_PROMPT, labels, 0, False)
+        if not ok:
+            return
+        snapshot = snapshots[labels.index(label)]
+        dialog = ConfirmationDialog(self.view, texts.SETTINGS_MSG_RESTORE_CONFIRM_TITLE, texts.SETTINGS_MSG_RESTORE_CONFIRM_TEXT + "\n\n" + texts.SETTINGS_MSG_RESTORE_CONFIRM_INFO, "GERİ YÜKLE", texts.SETTINGS_MSG_RESTORE_CONFIRM_BTN)
+        if dialog.exec():
+            self._start_restore(db.restore_backup_snapshot_to_live, snapshot['id'])
+
+    def _start_restore(self, restore_fn, source):
+        # Doğrulama ve kopyalama arka planda yapılır; yalnızca dosya değiştirme anında bağlantılar kısa süre bekletilir.
+        self.view.restore_button.setEnabled(False)
+        self.view.restore_point_button.setEnabled(False)
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_RESTORE_STARTED, 0)
+        worker = BackgroundWorker(restore_fn, source)
+        worker.kwargs['progress'] = worker.signals.progress.emit
+        worker.signals.progress.connect(self._on_restore_progress)
+        worker.signals.result.connect(self._on_restore_finished)
+        worker.signals.error.connect(self._on_restore_error)
+        worker.signals.finished.connect(lambda: (self.view.restore_button.setEnabled(True), self.view.restore_point_button.setEnabled(True), self.active_workers.remove(worker)))
+        self.active_workers.append(worker)
+        self.thread_pool.start(worker)
+
+    def _on_restore_progress(self, copied, total):
+        if total:
+            app_signals.status_message_updated.emit(texts.SETTINGS_MSG_RESTORE_PROGRESS.format(percent=copied * 100 // total), 0)
+
+    def _on_restore_finished(self, _):
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_RESTORE_DONE, 4000)
+        for signal in (app_signals.products_updated, app_signals.customers_updated, app_signals.sales_updated, app_signals.stock_updated):
+            signal.emit()
+        self.load_backup_settings()
+        ui_helpers.show_info_message(self.view, texts.SETTINGS_MSG_RESTORE_SUCCESS)
+
+    def _on_restore_error(self, error_info):
+        _, error, traceback = error_info
+        logging.error(f"Geri yükleme hatası: {error}", exc_info=(type(error), error, traceback))
+        app_signals.status_message_updated.emit(texts.SETTINGS_MSG_RESTORE_FAILED, 5000)
+        ui_helpers.show_critical_message(self.view, texts.SETTINGS_MSG_RESTORE_ERROR.format(error=error))
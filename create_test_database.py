@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 
 from database.connection import get_db_connection, DATABASE_PATH
 from database import database_manager as db
+from database.queries.money import to_kurus
 
 def setup_test_database():
     print("--- Test Veritabanı Oluşturma Betiği ---")
@@ -67,20 +68,23 @@ def setup_test_database():
                 db.add_product(urun, conn=conn)
             musteriler = [('Ahmet', 'Yılmaz', '5551112233', 'ahmet@test.com', grup_ids['Perakende']), ('Zeynep', 'Kaya', '5448887766', 'zeynep@test.com', grup_ids['Bayi']), ('Mustafa', 'Öztürk', '5331234567', 'mustafa@test.com', grup_ids['Perakende'])]
             conn.executemany("INSERT INTO musteriler (ad, soyad, telefon, eposta, grup_id) VALUES (?, ?, ?, ?, ?)", musteriler)
+            db.refresh_customer_search_keys(conn)
             musteri_ids = {row['ad']: row['id'] for row in conn.execute("SELECT id, ad FROM musteriler")}
             satis1_tarih = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%d %H:%M:%S")
             satis1_tutar = 2 * 250.0 + 1 * 120.0
-            conn.execute("INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)", (musteri_ids['Ahmet'], satis1_tarih, satis1_tutar, satis1_tutar))
+            conn.execute("INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)", (musteri_ids['Ahmet'], satis1_tarih, to_kurus(satis1_tutar), to_kurus(satis1_tutar)))
             satis1_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
             urun_ids = {row['stok_kodu']: row['id'] for row in conn.execute("SELECT id, stok_kodu FROM urunler")}
-            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", (satis1_id, urun_ids['TSHIRT-POLO-KIRMIZI'], 2, 250.0))
-            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", (satis1_id, urun_ids['USB-C-01'], 1, 120.0))
+            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet, kdv_orani) VALUES (?, ?, ?, ?, ?, ?)", (satis1_id, urun_ids['TSHIRT-POLO-KIRMIZI'], 2, to_kurus(250.0), to_kurus(150.0), 20.0))
+            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet, kdv_orani) VALUES (?, ?, ?, ?, ?, ?)", (satis1_id, urun_ids['USB-C-01'], 1, to_kurus(120.0), to_kurus(80.0), 20.0))
             satis2_tarih = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
             satis2_tutar = 1 * 750.0
-            conn.execute("INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)", (musteri_ids['Zeynep'], satis2_tarih, satis2_tutar, 500.0))
+            conn.execute("INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)", (musteri_ids['Zeynep'], satis2_tarih, to_kurus(satis2_tutar), to_kurus(500.0)))
             satis2_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)", (satis2_id, urun_ids['JEAN-01-34'], 1, 750.0))
+            conn.execute("INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet, kdv_orani) VALUES (?, ?, ?, ?, ?, ?)", (satis2_id, urun_ids['JEAN-01-34'], 1, to_kurus(750.0), to_kurus(450.0), 20.0))
             db.add_payment(musteri_ids['Zeynep'], 500.0, f"#{satis2_id} nolu satış için ödeme", conn=conn)
+            db.rebuild_daily_sales_summary(conn)
+            db.rebuild_customer_balances(conn)
 
         print("[OK] Test verileri başarıyla eklendi.")
         
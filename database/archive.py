@@ -0,0 +1,308 @@
+# dosya: database/archive.py
+# Kapanmış mali yılların arşivlenmesi. Bir yılın satışları, satış detayları, ödemeleri ve stok
+# hareketleri arsiv/archive_YYYY.db dosyasına kopyalanır, kopya satır sayısı ve tutar toplamlarıyla
+# doğrulanır, arsiv_donemleri tablosuna kaydedilir ve ancak ondan sonra canlı veritabanından küçük
+# parçalar halinde silinir. Her parça kendi kısa işleminde silindiğinden kasa yazmaları beklemez;
+# silinen satışların ve ödemelerin müşteri toplamları aynı işlemde musteri_devir_bakiye tablosuna
+# devredilir. Silme yarıda kalırsa (durum = 'siliniyor') bir sonraki arşivlemede kaldığı yerden sürer.
+# Raporlar arşivi gerektiğinde salt okunur ekleyerek okur (bkz. queries/archive_sources.py).
+#
+# Kullanım: python db_maintenance.py arsivle <yil> [--sikistir]
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+from database import connection, backup
+from database.queries import archive_sources, reference_cache
+from database.queries.date_keys import epoch_key
+
+ARCHIVE_FILE_PATTERN = 'archive_{year}.db'
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_DELETE_BATCH = 500
+# Silme parçaları arasında beklenen süre (saniye); yazma kilidi bu sırada kasaya bırakılır.
+ARCHIVE_STEP_PAUSE = 0.005
+NEW_ARCHIVE_SCHEMA = 'arsiv_yeni'
+
+# Arşiv tablolarında yabancı anahtar yoktur: ürün ve müşteriler canlı veritabanında kalır.
+ARCHIVE_TABLES = {
+    'satislar': """
+    CREATE TABLE {schema}.satislar (
+        id INTEGER PRIMARY KEY, musteri_id INTEGER, satis_tarihi TEXT NOT NULL,
+        toplam_tutar INTEGER NOT NULL, odenen_tutar INTEGER NOT NULL,
+        satis_gunu INTEGER NOT NULL, satis_zamani INTEGER NOT NULL
+    )""",
+    'satis_detaylari': """
+    CREATE TABLE {schema}.satis_detaylari (
+        id INTEGER PRIMARY KEY, satis_id INTEGER NOT NULL, urun_id INTEGER NOT NULL,
+        miktar INTEGER NOT NULL, birim_fiyat INTEGER NOT NULL,
+        birim_maliyet INTEGER NOT NULL DEFAULT 0, kdv_orani REAL
+    )""",
+    'odeme_gecmisi': """
+    CREATE TABLE {schema}.odeme_gecmisi (
+        id INTEGER PRIMARY KEY, musteri_id INTEGER NOT NULL, tarih TEXT NOT NULL,
+        tutar INTEGER NOT NULL, aciklama TEXT
+    )""",
+    'stok_hareketleri': """
+    CREATE TABLE {schema}.stok_hareketleri (
+        id INTEGER PRIMARY KEY, urun_id INTEGER NOT NULL, tarih TEXT NOT NULL,
+        hareket_tipi TEXT NOT NULL, miktar INTEGER NOT NULL, aciklama TEXT, son_stok INTEGER NOT NULL
+    )""",
+}
+# Rapor sorgularının canlı veritabanında kullandığı indekslerin karşılıkları; kopyalamadan sonra oluşturulur.
+ARCHIVE_INDEXES = (
+    "CREATE INDEX {schema}.idx_satislar_zaman ON satislar (satis_zamani, musteri_id, toplam_tutar, satis_tarihi)",
+    "CREATE INDEX {schema}.idx_satislar_musteri ON satislar (musteri_id, satis_zamani, toplam_tutar)",
+    "CREATE INDEX {schema}.idx_satis_detaylari_satis ON satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet)",
+    "CREATE INDEX {schema}.idx_odeme_gecmisi_musteri ON odeme_gecmisi (musteri_id, tarih, tutar)",
+    "CREATE INDEX {schema}.idx_stok_hareketleri_urun ON stok_hareketleri (urun_id, tarih)",
+)
+# Tablo -> (doğrulama toplamı, canlı veritabanında yılın satırlarını seçen koşul).
+_PERIOD_ROWS = {
+    'satislar': ("COALESCE(SUM(toplam_tutar), 0)", "satis_zamani >= :start_epoch AND satis_zamani < :end_epoch"),
+    'satis_detaylari': ("COALESCE(SUM(miktar * birim_fiyat), 0)",
+                        "satis_id IN (SELECT id FROM main.satislar WHERE satis_zamani >= :start_epoch AND satis_zamani < :end_epoch)"),
+    'odeme_gecmisi': ("COALESCE(SUM(tutar), 0)", "tarih >= :start_text AND tarih < :end_text"),
+    'stok_hareketleri': ("COALESCE(SUM(miktar), 0)", "tarih >= :start_text AND tarih < :end_text"),
+}
+
+# Canlı veritabanındaki en eski kaydın yılı.
+_OLDEST_YEAR_SQL = """
+    SELECT MIN(yil) FROM (
+        SELECT MIN(satis_gunu) / 10000 AS yil FROM satislar
+        UNION ALL SELECT CAST(substr(MIN(tarih), 1, 4) AS INTEGER) FROM odeme_gecmisi
+        UNION ALL SELECT CAST(substr(MIN(tarih), 1, 4) AS INTEGER) FROM stok_hareketleri
+    )"""
+
+class ArchiveError(sqlite3.DatabaseError):
+    pass
+
+_lock = threading.Lock()
+
+def _bounds(year: int) -> dict:
+    start_text, end_text = f"{year:04d}-01-01 00:00:00", f"{year + 1:04d}-01-01 00:00:00"
+    return {'start_text': start_text, 'end_text': end_text, 'start_epoch': epoch_key(start_text), 'end_epoch': epoch_key(end_text)}
+
+def _connect():
+    # Havuz dışında ayrı bağlantı: arşiv dosyası yazılabilir eklenir, işlemler açıkça yönetilir.
+    conn = sqlite3.connect(connection.database_uri(connection.DATABASE_PATH), uri=True, timeout=connection.CONNECTION_TIMEOUT, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def _fingerprint(conn, schema: str, bounds: dict = None) -> dict:
+    # bounds verilirse canlı veritabanındaki yılın satırları, verilmezse arşivin tamamı sayılır.
+    result = {}
+    for table, (total_sql, condition) in _PERIOD_ROWS.items():
+        where = f" WHERE {condition}" if bounds else ""
+        row = conn.execute(f"SELECT COUNT(*), {total_sql} FROM {schema}.{table}{where}", bounds or {}).fetchone()
+        result[table] = (row[0], row[1])
+    return result
+
+def _archive_path(year: int) -> str:
+    return os.path.join(archive_sources.archive_directory(), ARCHIVE_FILE_PATTERN.format(year=year))
+
+def _check_preconditions(conn, year: int, bounds: dict):
+    if year >= datetime.now().year:
+        raise ValueError(f"{year} yılı henüz kapanmadı; yalnızca geçmiş mali yıllar arşivlenebilir.")
+    row = conn.execute("SELECT durum FROM arsiv_donemleri WHERE yil = ?", (year,)).fetchone()
+    if row:
+        raise ValueError(f"{year} yılı zaten arşivlendi.")
+    earlier = conn.execute(_OLDEST_YEAR_SQL).fetchone()[0]
+    if earlier is not None and earlier < year:
+        raise ValueError(f"Yıllar sırayla arşivlenir; önce {earlier} yılı arşivlenmeli.")
+
+def _build_archive(conn, path: str, bounds: dict) -> tuple:
+    # Arşiv geçici dosyada tek okuma işlemiyle (tutarlı anlık görüntüden) oluşturulur ve doğrulanır.
+    temp_path = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    conn.execute(f"ATTACH DATABASE ? AS {NEW_ARCHIVE_SCHEMA}", (temp_path,))
+    try:
+        conn.execute("BEGIN")
+        try:
+            for table, create_sql in ARCHIVE_TABLES.items():
+                conn.execute(create_sql.format(schema=NEW_ARCHIVE_SCHEMA))
+                live_columns = {row['name'] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+                columns = ", ".join(row['name'] for row in conn.execute(f"PRAGMA {NEW_ARCHIVE_SCHEMA}.table_info({table})") if row['name'] in live_columns)
+                conn.execute(f"INSERT INTO {NEW_ARCHIVE_SCHEMA}.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {_PERIOD_ROWS[table][1]}", bounds)
+            for statement in ARCHIVE_INDEXES:
+                conn.execute(statement.format(schema=NEW_ARCHIVE_SCHEMA))
+            conn.execute(f"PRAGMA {NEW_ARCHIVE_SCHEMA}.user_version = {ARCHIVE_FORMAT_VERSION}")
+            expected, copied = _fingerprint(conn, 'main', bounds), _fingerprint(conn, NEW_ARCHIVE_SCHEMA)
+            if expected != copied:
+                raise ArchiveError(f"Arşiv kopyası canlı veriyle uyuşmuyor: {expected} != {copied}")
+            sale_row = conn.execute(f"SELECT MIN(id), MAX(id), COALESCE(SUM(toplam_tutar), 0) FROM {NEW_ARCHIVE_SCHEMA}.satislar").fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    except BaseException:
+        conn.execute(f"DETACH DATABASE {NEW_ARCHIVE_SCHEMA}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    conn.execute(f"DETACH DATABASE {NEW_ARCHIVE_SCHEMA}")
+    try:
+        backup.verify_database_file(temp_path)
+    except sqlite3.DatabaseError:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+    return copied, sale_row
+
+def _register(conn, year: int, path: str, bounds: dict, copied: dict, sale_row) -> str:
+    schema = archive_sources.archive_schema(year)
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (connection.database_uri(path, 'ro'),))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Kopyalamadan sonra yıla geriye dönük bir kayıt eklendiyse arşiv eksik kalır; kayıt yapılmaz.
+            if _fingerprint(conn, 'main', bounds) != _fingerprint(conn, schema):
+                raise ArchiveError(f"{year} yılının kayıtları arşivleme sırasında değişti; arşiv kaydedilmedi, tekrar deneyin.")
+            conn.execute("""
+                INSERT INTO arsiv_donemleri (yil, dosya_adi, baslangic_zamani, bitis_zamani, ilk_satis_id, son_satis_id,
+                    satis_adedi, ciro, detay_adedi, odeme_adedi, hareket_adedi, sema_surumu, durum, arsivlenme_tarihi)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'siliniyor', ?)""",
+                (year, os.path.basename(path), bounds['start_epoch'], bounds['end_epoch'], sale_row[0], sale_row[1],
+                 copied['satislar'][0], sale_row[2], copied['satis_detaylari'][0], copied['odeme_gecmisi'][0],
+                 copied['stok_hareketleri'][0], ARCHIVE_FORMAT_VERSION, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    except BaseException:
+        conn.execute(f"DETACH DATABASE {schema}")
+        os.remove(path)
+        raise
+    conn.execute(f"DETACH DATABASE {schema}")
+    # Bu süreçte geriye dönük satış engeli hemen, diğer süreçlerde referans_surum üzerinden devreye girer.
+    reference_cache.invalidate()
+    return schema
+
+# Silme adımları: (tablo, parça koşulu, parçadan önce çalışan devir sorgusu). Yalnızca arşivde bulunan
+# satırlar silinir; devir ve silme aynı işlemde olduğundan yarıda kalan silme tekrarlandığında çift sayılmaz.
+_DELETE_STEPS = (
+    ('satislar', """
+        INSERT INTO musteri_devir_bakiye (musteri_id, devir_borc, devir_alacak)
+        SELECT musteri_id, SUM(toplam_tutar), 0 FROM main.satislar
+        WHERE id IN (SELECT id FROM {schema}.satislar WHERE id BETWEEN ? AND ?) AND musteri_id IN (SELECT id FROM musteriler)
+        GROUP BY musteri_id
+        ON CONFLICT(musteri_id) DO UPDATE SET devir_borc = devir_borc + excluded.devir_borc""",
+     ("DELETE FROM main.satis_detaylari WHERE satis_id IN (SELECT id FROM {schema}.satislar WHERE id BETWEEN ? AND ?)",
+      "DELETE FROM main.satislar WHERE id IN (SELECT id FROM {schema}.satislar WHERE id BETWEEN ? AND ?)")),
+    ('odeme_gecmisi', """
+        INSERT INTO musteri_devir_bakiye (musteri_id, devir_borc, devir_alacak)
+        SELECT musteri_id, 0, SUM(tutar) FROM main.odeme_gecmisi
+        WHERE id IN (SELECT id FROM {schema}.odeme_gecmisi WHERE id BETWEEN ? AND ?) AND musteri_id IN (SELECT id FROM musteriler)
+        GROUP BY musteri_id
+        ON CONFLICT(musteri_id) DO UPDATE SET devir_alacak = devir_alacak + excluded.devir_alacak""",
+     ("DELETE FROM main.odeme_gecmisi WHERE id IN (SELECT id FROM {schema}.odeme_gecmisi WHERE id BETWEEN ? AND ?)",)),
+    ('stok_hareketleri', None,
+     ("DELETE FROM main.stok_hareketleri WHERE id IN (SELECT id FROM {schema}.stok_hareketleri WHERE id BETWEEN ? AND ?)",)),
+)
+
+def _delete_archived_rows(conn, year: int, path: str, progress=None, pause: float = ARCHIVE_STEP_PAUSE) -> int:
+    schema = archive_sources.archive_schema(year)
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (connection.database_uri(path, 'ro'),))
+    try:
+        ranges = [conn.execute(f"SELECT MIN(id), MAX(id), COUNT(*) FROM {schema}.{table}").fetchone() for table, _, _ in _DELETE_STEPS]
+        total, done, deleted = sum(row[2] for row in ranges), 0, 0
+        for (table, carry_sql, delete_sqls), (low, high, count) in zip(_DELETE_STEPS, ranges):
+            if low is None:
+                continue
+            for chunk_low in range(low, high + 1, ARCHIVE_DELETE_BATCH):
+                chunk = (chunk_low, min(chunk_low + ARCHIVE_DELETE_BATCH - 1, high))
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if carry_sql:
+                        conn.execute(carry_sql.format(schema=schema), chunk)
+                    for delete_sql in delete_sqls:
+                        deleted += conn.execute(delete_sql.format(schema=schema), chunk).rowcount
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                if progress:
+                    progress(done + min(chunk[1] - low + 1, count), total)
+                if pause:
+                    time.sleep(pause)
+            done += count
+        conn.execute("UPDATE arsiv_donemleri SET durum = 'tamam' WHERE yil = ?", (year,))
+        remaining = sum(count for count, _ in _fingerprint(conn, 'main', _bounds(year)).values())
+        if remaining:
+            logging.error(f"{year} yılına ait {remaining} kayıt arşivlendikten sonra eklendiği için canlı veritabanında kaldı; raporlarda görünmez.")
+    finally:
+        conn.execute(f"DETACH DATABASE {schema}")
+    return deleted
+
+def _resume_pending(conn, progress=None):
+    for row in conn.execute("SELECT yil, dosya_adi FROM arsiv_donemleri WHERE durum = 'siliniyor' ORDER BY yil").fetchall():
+        path = os.path.join(archive_sources.archive_directory(), row['dosya_adi'])
+        if not os.path.exists(path):
+            raise ArchiveError(f"{row['yil']} yılının arşiv dosyası bulunamadı ({path}); yarım kalan silme tamamlanamıyor.")
+        logging.info(f"{row['yil']} yılının yarım kalan arşiv silmesi sürdürülüyor.")
+        _delete_archived_rows(conn, row['yil'], path, progress)
+
+def archive_fiscal_year(year: int, progress=None) -> dict:
+    # progress(yapılan, toplam): silme aşamasının ilerlemesi. Boşalan alan için bkz. compact_database().
+    with _lock:
+        started = time.perf_counter()
+        bounds = _bounds(year)
+        path = _archive_path(year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = _connect()
+        try:
+            _resume_pending(conn, progress)
+            _check_preconditions(conn, year, bounds)
+            copied, sale_row = _build_archive(conn, path, bounds)
+            if not any(count for count, _ in copied.values()):
+                os.remove(path)
+                raise ValueError(f"{year} yılına ait arşivlenecek kayıt yok.")
+            _register(conn, year, path, bounds, copied, sale_row)
+            deleted = _delete_archived_rows(conn, year, path, progress)
+        finally:
+            conn.close()
+        info = {
+            'yil': year, 'dosya_yolu': os.path.abspath(path), 'boyut_bayt': os.path.getsize(path),
+            'satis_adedi': copied['satislar'][0], 'detay_adedi': copied['satis_detaylari'][0],
+            'odeme_adedi': copied['odeme_gecmisi'][0], 'hareket_adedi': copied['stok_hareketleri'][0],
+            'silinen': deleted, 'sure_ms': round((time.perf_counter() - started) * 1000),
+        }
+        logging.info(f"{year} mali yılı arşivlendi: {path} ({info['satis_adedi']} satış, {info['odeme_adedi']} ödeme, "
+                     f"{info['hareket_adedi']} stok hareketi, {info['sure_ms']} ms)")
+    return info
+
+def compact_database():
+    # Silinen sayfaları dosyadan atar. VACUUM süresince diğer bağlantılar yazamaz; kasa kapalıyken çalıştırın.
+    conn = sqlite3.connect(connection.DATABASE_PATH, timeout=connection.CONNECTION_TIMEOUT, isolation_level=None)
+    try:
+        before = os.path.getsize(connection.DATABASE_PATH)
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        after = os.path.getsize(connection.DATABASE_PATH)
+    finally:
+        conn.close()
+    logging.info(f"Veritabanı sıkıştırıldı: {before:,} -> {after:,} bayt.")
+    return before, after
+
+def get_archive_periods():
+    try:
+        with connection.get_db_connection() as conn:
+            return conn.execute("SELECT * FROM arsiv_donemleri ORDER BY yil").fetchall()
+    except sqlite3.Error as e:
+        logging.error(f"Arşiv dönemleri alınamadı: {e}")
+        return []
+
+def get_archivable_year():
+    # Canlı veritabanındaki en eski kaydın yılı; kapanmış bir yılsa arşivlenebilir, değilse None.
+    try:
+        with connection.get_db_connection() as conn:
+            year = conn.execute(_OLDEST_YEAR_SQL).fetchone()[0]
+    except sqlite3.Error as e:
+        logging.error(f"Arşivlenebilecek yıl belirlenemedi: {e}")
+        return None
+    return year if year is not None and year < datetime.now().year else None
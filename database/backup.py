@@ -0,0 +1,212 @@
+# dosya: database/backup.py
+# Canlı veritabanının çevrimiçi yedeği. Dosyayı shutil.copy ile kopyalamak yarım kalmış bir
+# işlemi (veya WAL dosyasındaki henüz aktarılmamış sayfaları) kaçırabilir; SQLite yedekleme
+# API'si ise tutarlı bir anlık görüntü üretir. Kopyalama BACKUP_PAGES_PER_STEP sayfalık
+# adımlarla yapılır, adımlar arasında kilit bırakıldığından kasa yazmaları beklemez.
+
+import os
+import time
+import shutil
+import sqlite3
+import logging
+from datetime import datetime
+
+from database import connection
+from database.migrations import get_schema_version, latest_version
+
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+# Başka bir bağlantı kaynağa yazdığında SQLite yedeği baştan başlatır. Yoğun yazmada sürekli
+# yeniden başlamamak için bu sınırdan sonra kalan kopya tek adımda (tek okuma işlemiyle) alınır;
+# WAL modunda bu adım da yazmaları engellemez.
+BACKUP_MAX_RESTARTS = 3
+# Geri yüklenecek dosyanın bu uygulamanın veritabanı olduğunu anlamak için aranan tablolar.
+REQUIRED_TABLES = ('ayarlar', 'urunler', 'musteriler', 'satislar', 'satis_detaylari')
+
+class BackupVerificationError(sqlite3.DatabaseError):
+    pass
+
+class _BackupRestarted(Exception):
+    pass
+
+def _copy(source, target, progress, pause):
+    state = {'remaining': None, 'restarts': 0}
+
+    def on_step(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        state['remaining'] = remaining
+        if progress:
+            progress(total - remaining, total)
+        if pause and remaining:
+            time.sleep(pause)
+
+    try:
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=on_step, sleep=BACKUP_STEP_SLEEP)
+    except _BackupRestarted:
+        logging.info(f"Yedekleme {BACKUP_MAX_RESTARTS} kez yeniden başladı; kalan kopya tek adımda alınıyor.")
+        source.backup(target, pages=-1, progress=on_step)
+    return state['restarts']
+
+def verify_database_file(path) -> str:
+    check = sqlite3.connect(connection.database_uri(path, 'ro'), uri=True)
+    try:
+        result = check.execute("PRAGMA quick_check").fetchall()
+    finally:
+        check.close()
+    messages = [row[0] for row in result]
+    if messages != ['ok']:
+        raise BackupVerificationError(f"Bütünlük kontrolü başarısız ({path}): {'; '.join(messages[:5])}")
+    return 'ok'
+
+def record_backup(info):
+    try:
+        with connection.get_db_connection() as conn:
+            conn.execute(
+                """INSERT INTO yedekler (olusturma_tarihi, dosya_yolu, tur, boyut_bayt, sayfa_sayisi, sure_ms, yeniden_baslama, sema_surumu, dogrulama)
+                   VALUES (:olusturma_tarihi, :dosya_yolu, :tur, :boyut_bayt, :sayfa_sayisi, :sure_ms, :yeniden_baslama, :sema_surumu, :dogrulama)""",
+                info
+            )
+    except sqlite3.Error as e:
+        logging.error(f"Yedek kaydı veritabanına yazılamadı: {e}")
+
+def snapshot_to_file(temp_path: str, progress=None, pause: float = 0.0) -> tuple:
+    # Canlı veritabanının doğrulanmış, tek dosyalık kopyasını temp_path'e alır.
+    # pause, zamanlanmış yedeklerde adımlar arasında bekleyerek diski ve kilidi kasaya bırakır.
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    source = sqlite3.connect(connection.DATABASE_PATH, timeout=connection.CONNECTION_TIMEOUT)
+    target = sqlite3.connect(temp_path)
+    try:
+        restarts = _copy(source, target, progress, pause)
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        schema_version = get_schema_version(target)
+        # Yedek tek dosya olarak taşınabilsin diye WAL yerine klasik günlük moduna alınır.
+        target.execute("PRAGMA journal_mode = DELETE")
+    except BaseException:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+    try:
+        dogrulama = verify_database_file(temp_path)
+    except sqlite3.DatabaseError:
+        os.remove(temp_path)
+        raise
+    return page_count, schema_version, restarts, dogrulama
+
+def backup_database(target_path: str, tur: str = 'Manuel', progress=None) -> dict:
+    # Yedek önce geçici dosyaya alınır, doğrulanır ve ancak sonra hedefin yerine taşınır;
+    # yarıda kalan veya bozuk bir yedek mevcut bir dosyanın üzerine yazılmaz.
+    started = time.perf_counter()
+    temp_path = f"{target_path}.tmp"
+    page_count, schema_version, restarts, dogrulama = snapshot_to_file(temp_path, progress)
+    os.replace(temp_path, target_path)
+
+    info = {
+        'olusturma_tarihi': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'dosya_yolu': os.path.abspath(target_path),
+        'tur': tur,
+        'boyut_bayt': os.path.getsize(target_path),
+        'sayfa_sayisi': page_count,
+        'sure_ms': round((time.perf_counter() - started) * 1000),
+        'yeniden_baslama': restarts,
+        'sema_surumu': schema_version,
+        'dogrulama': dogrulama,
+    }
+    record_backup(info)
+    logging.info(f"Veritabanı yedeklendi: {target_path} ({page_count} sayfa, {info['sure_ms']} ms, quick_check: {dogrulama})")
+    return info
+
+def validate_backup_file(path: str) -> int:
+    # Tam bütünlük kontrolü yapar; dosya bu uygulamanın veritabanı değilse veya programın bu
+    # sürümünden daha yeni bir şemaya sahipse geri yüklemeyi reddeder. Şema sürümünü döndürür.
+    try:
+        check = sqlite3.connect(connection.database_uri(path, 'ro'), uri=True)
+        try:
+            messages = [row[0] for row in check.execute("PRAGMA integrity_check").fetchall()]
+            tables = {row[0] for row in check.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            schema_version = get_schema_version(check)
+        finally:
+            check.close()
+    except sqlite3.DatabaseError as e:
+        raise BackupVerificationError(f"Dosya okunamadı, geçerli bir SQLite veritabanı değil: {e}") from e
+    if messages != ['ok']:
+        raise BackupVerificationError(f"Bütünlük kontrolü başarısız ({path}): {'; '.join(messages[:5])}")
+    if missing := [table for table in REQUIRED_TABLES if table not in tables]:
+        raise BackupVerificationError(f"Dosya bu programın veritabanı değil; eksik tablolar: {', '.join(missing)}")
+    if schema_version > latest_version():
+        raise BackupVerificationError(f"Yedek, programın daha yeni bir sürümüne ait (şema {schema_version} > {latest_version()}); önce programı güncelleyin.")
+    return schema_version
+
+def _keep_previous(live_path):
+    # Önceki veritabanı <ad>.onceki olarak saklanır. Sabit bağlantı (hard link) kullanıldığından canlı
+    # dosya yerinde kalır ve yeni dosya tek bir os.replace ile atomik olarak yerine geçer.
+    if not os.path.exists(live_path):
+        return None
+    previous_path = f"{live_path}.onceki"
+    if os.path.exists(previous_path):
+        os.remove(previous_path)
+    try:
+        os.link(live_path, previous_path)
+    except OSError:
+        shutil.copyfile(live_path, previous_path)
+    return previous_path
+
+def restore_database(source_path: str, progress=None, after_swap=None):
+    # 1) Yedek doğrulanır, 2) yedekleme API'siyle canlı dosyanın yanındaki geçici dosyaya adım adım
+    # kopyalanır (canlı veritabanı bu sırada kullanılmaya devam eder), 3) bağlantılar boşaltılıp
+    # kapatılır ve geçici dosya tek bir os.replace ile yerine taşınır. after_swap (ör. geçişler)
+    # diğer iş parçacıkları henüz beklerken çalışır; ardından havuz yeni dosyayla yeniden açılır.
+    validate_backup_file(source_path)
+    live_path = connection.DATABASE_PATH
+    temp_path = f"{live_path}.geri_yukleme"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    source = sqlite3.connect(connection.database_uri(source_path, 'ro'), uri=True)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=lambda status, remaining, total: progress and progress(total - remaining, total))
+        target.execute("PRAGMA journal_mode = DELETE")
+    except BaseException:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    try:
+        with connection.exclusive_access():
+            # Son bağlantı kapanınca SQLite WAL/SHM dosyalarını ana dosyaya aktarıp siler. Hâlâ duruyorlarsa
+            # veritabanı başka bir süreçte (ör. ikinci kasa) açıktır; dosyayı onun altından değiştirmek onu bozar.
+            if any(os.path.exists(live_path + suffix) for suffix in ('-wal', '-shm')):
+                raise sqlite3.OperationalError("Veritabanı başka bir program (ör. ikinci kasa) tarafından kullanılıyor; geri yüklemeden önce onu kapatın.")
+            previous_path = _keep_previous(live_path)
+            os.replace(temp_path, live_path)
+            try:
+                if after_swap:
+                    after_swap()
+            except BaseException:
+                # Geri yüklenen dosya hazırlanamadıysa (ör. geçiş hatası) önceki veritabanına dönülür.
+                logging.error("Geri yüklenen veritabanı hazırlanamadı; önceki veritabanına dönülüyor.")
+                connection.close_all_connections()
+                if previous_path:
+                    os.replace(previous_path, live_path)
+                raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    logging.info(f"Veritabanı yedekten geri yüklendi: {source_path} (önceki veritabanı: {live_path}.onceki)")
+
+def get_backup_history(limit: int = 20):
+    try:
+        with connection.get_db_connection() as conn:
+            return conn.execute("SELECT * FROM yedekler ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    except sqlite3.Error as e:
+        logging.error(f"Yedek geçmişi alınamadı: {e}")
+        return []
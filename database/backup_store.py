@@ -0,0 +1,332 @@
+# dosya: database/backup_store.py
+# Sıkıştırılmış, tekilleştirilmiş yedek deposu. Veritabanının çevrimiçi kopyası sayfa görüntülerine
+# (CHUNK_PAGES sayfalık parçalara) bölünür; her parça SHA-256 özetiyle bir kez, zlib ile sıkıştırılmış
+# olarak saklanır. SQLite değişmeyen sayfaları aynı konumda tuttuğundan sık alınan yedeklerde yalnızca
+# değişen sayfalar diske yazılır. Küçük parçalar tek tek dosya olmak yerine yedek başına tek bir paket
+# dosyasına eklenir; yedek noktası (manifest) yalnızca parça numaralarının listesini tutar.
+#
+#   backups/depo/paketler/<id>.pak     sıkıştırılmış parçalar art arda
+#   backups/depo/paketler/<id>.json    paket dizini: [parça_no, özet, konum, uzunluk]
+#   backups/depo/manifestler/<id>.json yedek noktası
+#
+# Kullanım: python -m database.backup_store liste
+#           python -m database.backup_store geri-yukle <yedek_id> <hedef.db>
+
+import os
+import sys
+import json
+import time
+import zlib
+import base64
+import hashlib
+import logging
+import threading
+from array import array
+from datetime import datetime
+
+from database import backup
+
+BACKUP_STORE_DIR = os.path.join("backups", "depo")
+CHUNK_PAGES = 1
+COMPRESSION_LEVEL = 6
+# Canlı verisi bu oranın altına düşen paketler temizlikte yeniden paketlenir.
+REPACK_THRESHOLD = 0.5
+# 'son': en yeni N yedek; diğerlerinde her dönemin en yeni yedeği korunur
+# (son 24 saatin her saati, son 14 günün her günü, son 12 ayın her ayı).
+RETENTION_POLICY = {'son': 6, 'saatlik': 24, 'gunluk': 14, 'aylik': 12}
+RETENTION_BUCKETS = {'son': None, 'saatlik': '%Y-%m-%d %H', 'gunluk': '%Y-%m-%d', 'aylik': '%Y-%m'}
+
+SCHEDULED_BACKUP_SETTING_KEY = 'zamanli_yedekleme'
+SCHEDULED_BACKUP_INTERVAL_SETTING_KEY = 'zamanli_yedekleme_araligi_dk'
+DEFAULT_SCHEDULED_BACKUP_INTERVAL = 60
+# Zamanlanmış yedeklerde her kopyalama adımından sonra beklenen süre (saniye).
+SCHEDULED_BACKUP_PAUSE = 0.02
+
+_lock = threading.Lock()
+
+def _paths(store_dir):
+    store_dir = store_dir or BACKUP_STORE_DIR
+    return store_dir, os.path.join(store_dir, "paketler"), os.path.join(store_dir, "manifestler")
+
+def _new_id():
+    return datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+
+def _write_atomic(path, data: bytes):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def _encode_ids(ids) -> str:
+    # Ardışık yedeklerde parça numaraları büyük ölçüde aynı ve sıralı olduğundan farkları sıkıştırılır.
+    deltas = array('q', (b - a for a, b in zip([0] + ids[:-1], ids)))
+    return base64.b64encode(zlib.compress(deltas.tobytes(), 9)).decode('ascii')
+
+def _decode_ids(encoded: str) -> list[int]:
+    deltas = array('q')
+    deltas.frombytes(zlib.decompress(base64.b64decode(encoded)))
+    ids, current = [], 0
+    for delta in deltas:
+        current += delta
+        ids.append(current)
+    return ids
+
+def _load_manifests(manifests_dir) -> list[dict]:
+    manifests = []
+    if not os.path.isdir(manifests_dir):
+        return manifests
+    for name in os.listdir(manifests_dir):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(manifests_dir, name), encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logging.error(f"Yedek manifesti okunamadı ({name}): {e}")
+    return sorted(manifests, key=lambda m: m['id'], reverse=True)
+
+def _load_index(packs_dir) -> dict:
+    # {parça_no: (özet, paket, konum, uzunluk)}
+    index = {}
+    if not os.path.isdir(packs_dir):
+        return index
+    for name in sorted(os.listdir(packs_dir)):
+        if not name.endswith(".json"):
+            continue
+        pack_id = name[:-len(".json")]
+        with open(os.path.join(packs_dir, name), encoding='utf-8') as f:
+            for chunk_id, digest, offset, length in json.load(f):
+                index[chunk_id] = (digest, pack_id, offset, length)
+    return index
+
+def _write_pack(packs_dir, pack_id, entries) -> int:
+    # entries: [(parça_no, özet, sıkıştırılmış_veri)]; önce paket, sonra dizini yazılır.
+    listing, data = [], bytearray()
+    for chunk_id, digest, compressed in entries:
+        listing.append([chunk_id, digest, len(data), len(compressed)])
+        data += compressed
+    _write_atomic(os.path.join(packs_dir, f"{pack_id}.pak"), bytes(data))
+    _write_atomic(os.path.join(packs_dir, f"{pack_id}.json"), json.dumps(listing).encode('utf-8'))
+    return len(data)
+
+def _remove_pack(packs_dir, pack_id):
+    os.remove(os.path.join(packs_dir, f"{pack_id}.json"))
+    os.remove(os.path.join(packs_dir, f"{pack_id}.pak"))
+
+def _store_chunks(snapshot_path, packs_dir, chunk_size) -> tuple:
+    index = _load_index(packs_dir)
+    by_digest = {entry[0]: chunk_id for chunk_id, entry in index.items()}
+    next_id = max(index, default=-1) + 1
+    ids, new_entries = [], []
+    file_hash = hashlib.sha256()
+    with open(snapshot_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            file_hash.update(chunk)
+            digest = hashlib.sha256(chunk).hexdigest()
+            if (chunk_id := by_digest.get(digest)) is None:
+                chunk_id = by_digest[digest] = next_id
+                next_id += 1
+                new_entries.append((chunk_id, digest, zlib.compress(chunk, COMPRESSION_LEVEL)))
+            ids.append(chunk_id)
+    return ids, file_hash.hexdigest(), new_entries
+
+def create_snapshot(tur: str = 'Zamanlanmış', store_dir: str = None, pause: float = 0.0, progress=None, policy: dict = None) -> dict:
+    # Veritabanı son yedek noktasından beri değişmediyse yeni yedek noktası yazılmaz.
+    store_dir, packs_dir, manifests_dir = _paths(store_dir)
+    with _lock:
+        started = time.perf_counter()
+        os.makedirs(packs_dir, exist_ok=True)
+        os.makedirs(manifests_dir, exist_ok=True)
+        temp_path = os.path.join(store_dir, "anlik_goruntu.tmp")
+        # Yedek bilgisi yedekler tablosuna değil manifeste yazılır; aksi hâlde her yedek veritabanını
+        # değiştirir ve boşta bekleyen bir veritabanı için de sürekli yeni yedek noktası oluşurdu.
+        page_count, schema_version, restarts, dogrulama = backup.snapshot_to_file(temp_path, progress, pause)
+        try:
+            size = os.path.getsize(temp_path)
+            page_size = size // page_count if page_count else 4096
+            ids, file_hash, new_entries = _store_chunks(temp_path, packs_dir, page_size * CHUNK_PAGES)
+        finally:
+            os.remove(temp_path)
+
+        manifests = _load_manifests(manifests_dir)
+        if manifests and manifests[0]['sha256'] == file_hash:
+            logging.info(f"Veritabanı son yedek noktasından ({manifests[0]['id']}) beri değişmedi; yeni yedek noktası yazılmadı.")
+            return dict(manifests[0], degisiklik_yok=True)
+
+        now = datetime.now()
+        snapshot_id = _new_id()
+        new_bytes = _write_pack(packs_dir, snapshot_id, new_entries) if new_entries else 0
+        manifest = {
+            'id': snapshot_id,
+            'olusturma_tarihi': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'tur': tur,
+            'boyut_bayt': size,
+            'sayfa_boyutu': page_size,
+            'sayfa_sayisi': page_count,
+            'parca_boyutu': page_size * CHUNK_PAGES,
+            'parca_sayisi': len(ids),
+            'sha256': file_hash,
+            'sema_surumu': schema_version,
+            'dogrulama': dogrulama,
+            'yeni_parca': len(new_entries),
+            'yeni_bayt': new_bytes,
+            'sure_ms': round((time.perf_counter() - started) * 1000),
+            'yeniden_baslama': restarts,
+            'parcalar': _encode_ids(ids),
+        }
+        manifest_path = os.path.join(manifests_dir, f"{snapshot_id}.json")
+        _write_atomic(manifest_path, json.dumps(manifest).encode('utf-8'))
+        _apply_retention(packs_dir, manifests_dir, policy or RETENTION_POLICY, now)
+
+    logging.info(f"Yedek noktası oluşturuldu: {snapshot_id} ({len(ids)} parça, {len(new_entries)} yeni, {new_bytes} bayt yazıldı)")
+    return manifest
+
+def _retained_ids(manifests, policy, now) -> set:
+    keep = {manifests[0]['id']} if manifests else set()
+    for bucket, limit in policy.items():
+        seen = set()
+        for manifest in manifests:
+            created = datetime.strptime(manifest['olusturma_tarihi'], '%Y-%m-%d %H:%M:%S')
+            if created > now:
+                keep.add(manifest['id'])
+                continue
+            key = manifest['id'] if RETENTION_BUCKETS[bucket] is None else created.strftime(RETENTION_BUCKETS[bucket])
+            if key in seen:
+                continue
+            if len(seen) == limit:
+                break
+            seen.add(key)
+            keep.add(manifest['id'])
+    return keep
+
+def _collect_garbage(packs_dir, referenced):
+    # Hiç kullanılmayan paketler silinir; canlı verisi REPACK_THRESHOLD altına düşen paketlerin canlı
+    # parçaları yeni bir pakete taşınır. Yeni paket yazılmadan eskiler silinmez; arada kesilirse
+    # yalnızca fazladan bir kopya kalır ve bir sonraki temizlikte ayıklanır.
+    by_pack = {}
+    for chunk_id, (digest, pack_id, offset, length) in _load_index(packs_dir).items():
+        by_pack.setdefault(pack_id, []).append((chunk_id, digest, offset, length))
+    obsolete, moved = [], []
+    for pack_id, entries in by_pack.items():
+        live = [entry for entry in entries if entry[0] in referenced]
+        live_bytes = sum(entry[3] for entry in live)
+        if live_bytes >= sum(entry[3] for entry in entries) * REPACK_THRESHOLD and live:
+            continue
+        if live:
+            with open(os.path.join(packs_dir, f"{pack_id}.pak"), 'rb') as f:
+                for chunk_id, digest, offset, length in live:
+                    f.seek(offset)
+                    moved.append((chunk_id, digest, f.read(length)))
+        obsolete.append(pack_id)
+    if moved:
+        _write_pack(packs_dir, _new_id(), moved)
+    for pack_id in obsolete:
+        _remove_pack(packs_dir, pack_id)
+    return len(obsolete)
+
+def _apply_retention(packs_dir, manifests_dir, policy, now) -> int:
+    manifests = _load_manifests(manifests_dir)
+    keep = _retained_ids(manifests, policy, now)
+    removed = 0
+    for manifest in manifests:
+        if manifest['id'] not in keep:
+            os.remove(os.path.join(manifests_dir, f"{manifest['id']}.json"))
+            removed += 1
+    if removed:
+        referenced = {chunk_id for manifest in manifests if manifest['id'] in keep for chunk_id in _decode_ids(manifest['parcalar'])}
+        packs = _collect_garbage(packs_dir, referenced)
+        logging.info(f"Saklama politikası: {removed} eski yedek noktası silindi, {packs} paket temizlendi.")
+    return removed
+
+def apply_retention(store_dir: str = None, policy: dict = None, now: datetime = None) -> int:
+    _, packs_dir, manifests_dir = _paths(store_dir)
+    with _lock:
+        return _apply_retention(packs_dir, manifests_dir, policy or RETENTION_POLICY, now or datetime.now())
+
+def list_snapshots(store_dir: str = None) -> list[dict]:
+    _, _, manifests_dir = _paths(store_dir)
+    return [{key: value for key, value in manifest.items() if key != 'parcalar'} for manifest in _load_manifests(manifests_dir)]
+
+def snapshot_due(interval_minutes: float, store_dir: str = None) -> bool:
+    # Zamanlayıcı her dakika çağırır; manifestleri ayrıştırmamak için zaman, dosya adındaki kimlikten okunur.
+    _, _, manifests_dir = _paths(store_dir)
+    names = [name for name in os.listdir(manifests_dir) if name.endswith(".json")] if os.path.isdir(manifests_dir) else []
+    if not names:
+        return True
+    last = datetime.strptime(max(names)[:-len(".json")], '%Y%m%d-%H%M%S-%f')
+    return (datetime.now() - last).total_seconds() >= interval_minutes * 60
+
+def get_store_stats(store_dir: str = None) -> dict:
+    store_dir, packs_dir, manifests_dir = _paths(store_dir)
+    stored_bytes = 0
+    for directory in (packs_dir, manifests_dir):
+        if os.path.isdir(directory):
+            stored_bytes += sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    snapshots = list_snapshots(store_dir)
+    return {
+        'yedek_sayisi': len(snapshots),
+        'parca_sayisi': len(_load_index(packs_dir)),
+        'depolanan_bayt': stored_bytes,
+        'mantiksal_bayt': sum(s['boyut_bayt'] for s in snapshots),
+    }
+
+def restore_snapshot(snapshot_id: str, target_path: str, store_dir: str = None) -> str:
+    # Yedek noktasını parçalarından tek bir veritabanı dosyası olarak yeniden kurar ve doğrular.
+    _, packs_dir, manifests_dir = _paths(store_dir)
+    with open(os.path.join(manifests_dir, f"{snapshot_id}.json"), encoding='utf-8') as f:
+        manifest = json.load(f)
+    index = _load_index(packs_dir)
+    temp_path = f"{target_path}.tmp"
+    file_hash = hashlib.sha256()
+    packs = {}
+    try:
+        with open(temp_path, 'wb') as out:
+            for chunk_id in _decode_ids(manifest['parcalar']):
+                if chunk_id not in index:
+                    raise backup.BackupVerificationError(f"Yedek noktası {snapshot_id} için {chunk_id} numaralı parça depoda yok.")
+                _, pack_id, offset, length = index[chunk_id]
+                if pack_id not in packs:
+                    packs[pack_id] = open(os.path.join(packs_dir, f"{pack_id}.pak"), 'rb')
+                packs[pack_id].seek(offset)
+                chunk = zlib.decompress(packs[pack_id].read(length))
+                file_hash.update(chunk)
+                out.write(chunk)
+        if file_hash.hexdigest() != manifest['sha256']:
+            raise backup.BackupVerificationError(f"Yedek noktası {snapshot_id} parçaları bozuk: özet uyuşmuyor.")
+        backup.verify_database_file(temp_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        for pack in packs.values():
+            pack.close()
+    os.replace(temp_path, target_path)
+    return target_path
+
+def restore_snapshot_to_live(snapshot_id: str, store_dir: str = None, progress=None, after_swap=None):
+    store_dir, _, _ = _paths(store_dir)
+    temp_path = os.path.join(store_dir, "geri_yukleme.db")
+    with _lock:
+        restore_snapshot(snapshot_id, temp_path, store_dir)
+        try:
+            backup.restore_database(temp_path, progress, after_swap)
+        finally:
+            os.remove(temp_path)
+    logging.info(f"Veritabanı {snapshot_id} yedek noktasına geri döndürüldü.")
+
+def _main(args):
+    if args[:1] == ['liste']:
+        for snapshot in list_snapshots():
+            print(f"{snapshot['id']}  {snapshot['olusturma_tarihi']}  {snapshot['tur']:<12} {snapshot['boyut_bayt'] / 1024 / 1024:>8.1f} MB  yeni: {snapshot['yeni_bayt'] / 1024:>8.1f} KB")
+        stats = get_store_stats()
+        print(f"{stats['yedek_sayisi']} yedek noktası, {stats['mantiksal_bayt'] / 1024 / 1024:.1f} MB veri için depoda {stats['depolanan_bayt'] / 1024 / 1024:.1f} MB kullanılıyor.")
+        return 0
+    if args[:1] == ['geri-yukle'] and len(args) == 3:
+        print(f"Geri yüklendi: {restore_snapshot(args[1], args[2])}")
+        return 0
+    print("Kullanım: python -m database.backup_store liste | geri-yukle <yedek_id> <hedef.db>")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
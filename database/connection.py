@@ -1,13 +1,506 @@
 # dosya: database/connection.py
 
 import os
+import queue
 import sqlite3
+import logging
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from urllib.request import pathname2url
 
 DATABASE_PATH = os.path.join('database', 'database.db')
+CONNECTION_TIMEOUT = 10
+WORKER_POOL_SIZE = 4
+# Geri yükleme gibi dosya değiştiren işlemlerin açık işlemlerin bitmesini bekleyeceği en uzun süre.
+DRAIN_TIMEOUT = 30
+# SQLite'ın bir bağlantıya eklenebilecek veritabanı sayısı için varsayılan sınırı (SQLITE_MAX_ATTACHED).
+MAX_ATTACHED_DATABASES = 10
 
-def get_db_connection():
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    conn = sqlite3.connect(DATABASE_PATH, timeout=10)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
\ No newline at end of file
+PERFORMANCE_PROFILE_SETTING_KEY = 'db_performans_profili'
+DEFAULT_PERFORMANCE_PROFILE = 'Dengeli'
+PERFORMANCE_PROFILES = {
+    'Güvenli': {
+        'journal_mode': 'DELETE', 'synchronous': 'FULL', 'cache_size': -8000,
+        'mmap_size': 0, 'temp_store': 'DEFAULT', 'busy_timeout': 10000,
+        'wal_autocheckpoint': 1000, 'journal_size_limit': -1,
+    },
+    'Dengeli': {
+        'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -32000,
+        'mmap_size': 128 * 1024 * 1024, 'temp_store': 'MEMORY', 'busy_timeout': 10000,
+        'wal_autocheckpoint': 1000, 'journal_size_limit': 64 * 1024 * 1024,
+    },
+    'Yüksek Performans': {
+        'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -128000,
+        'mmap_size': 512 * 1024 * 1024, 'temp_store': 'MEMORY', 'busy_timeout': 15000,
+        'wal_autocheckpoint': 4000, 'journal_size_limit': 256 * 1024 * 1024,
+    },
+}
+CONNECTION_PRAGMAS = ('synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'wal_autocheckpoint', 'journal_size_limit')
+
+def database_uri(path, mode=None) -> str:
+    # Bağlantılar URI ile açılır ki ATTACH edilen dosyalar da ?mode=ro ile salt okunur eklenebilsin.
+    uri = f"file:{pathname2url(os.path.abspath(path))}"
+    return f"{uri}?mode={mode}" if mode else uri
+
+class _ThreadLease:
+    def __init__(self, raw, is_worker, generation):
+        self.raw = raw
+        self.is_worker = is_worker
+        self.generation = generation
+        self.depth = 0
+
+class PooledConnection:
+    # `with get_db_connection() as conn` ve `conn = get_db_connection(); ...; conn.close()`
+    # kullanımlarının ikisini de destekleyen sarmalayıcı. Aynı iş parçacığında iç içe
+    # alınan bağlantılar aynı fiziksel bağlantıyı paylaşır; commit/rollback kararı en dıştakine aittir.
+    def __init__(self, manager, lease):
+        self._manager = manager
+        self._lease = lease
+        self._released = False
+        self._savepoint = None
+        # Açık bir işlemin içinde iç içe alınan bağlantı kendi kayıt noktasını açar. İç fonksiyon hatasını
+        # yakalayıp geri aldığında (ör. stok yetersiz satış) dıştaki işlemden yalnızca kendi yazdıkları silinir.
+        if lease.depth > 1 and lease.raw.in_transaction:
+            self._savepoint = f"ic_{lease.depth}"
+            lease.raw.execute(f"SAVEPOINT {self._savepoint}")
+
+    @property
+    def is_outermost(self):
+        return self._lease.depth == 1
+
+    def __getattr__(self, name):
+        return getattr(self._lease.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if not self._released and self.is_outermost:
+                if exc_type is None:
+                    self._lease.raw.commit()
+                else:
+                    self._lease.raw.rollback()
+            elif not self._released and exc_type is not None:
+                self._rollback_savepoint()
+        finally:
+            self.close()
+        return False
+
+    def commit(self):
+        if self.is_outermost:
+            self._lease.raw.commit()
+
+    def rollback(self):
+        if self.is_outermost:
+            self._lease.raw.rollback()
+        else:
+            self._rollback_savepoint()
+
+    def _rollback_savepoint(self):
+        name, self._savepoint = self._savepoint, None
+        if name is None or not self._lease.raw.in_transaction:
+            return
+        try:
+            self._lease.raw.execute(f"ROLLBACK TO {name}")
+            self._lease.raw.execute(f"RELEASE {name}")
+        except sqlite3.Error as e:
+            logging.error(f"Kayıt noktası ({name}) geri alınamadı: {e}")
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        name, self._savepoint = self._savepoint, None
+        try:
+            if name is not None and self._lease.raw.in_transaction:
+                self._lease.raw.execute(f"RELEASE {name}")
+        except sqlite3.Error as e:
+            logging.error(f"Kayıt noktası ({name}) bırakılamadı: {e}")
+        finally:
+            self._manager._release(self._lease)
+
+class ConnectionManager:
+    def __init__(self, database_path, pool_size=WORKER_POOL_SIZE, timeout=CONNECTION_TIMEOUT):
+        self.database_path = database_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._main_conn = None
+        self._main_lease = None
+        self._idle = queue.LifoQueue()
+        self._readonly_idle = queue.LifoQueue()
+        self._worker_count = 0
+        self._generation = 0
+        self._directory_ready = False
+        self.profile_name = DEFAULT_PERFORMANCE_PROFILE
+        # Açık her bağlantıya en son uygulanan profil; kapatılan bağlantı buradan silinir.
+        self._connection_profiles = {}
+        self.connection_factory = sqlite3.Connection
+        # Gerektiğinde bağlantılara salt okunur eklenen veritabanları: şema adı -> dosya yolu (ör. arşivlenmiş yıllar).
+        self.attached_databases = {}
+        self._stats = {'hits': 0, 'misses': 0, 'waits': 0, 'checkouts': 0, 'snapshots': 0}
+        # Dışarıdan tutulan (en dıştaki) kiralama sayısı ve boşaltma (drain) durumu.
+        self._gate = threading.Condition()
+        self._active_leases = 0
+        self._drain_owner = None
+
+    def _open(self, readonly=False):
+        if not self._directory_ready:
+            os.makedirs(os.path.dirname(self.database_path) or '.', exist_ok=True)
+            self._directory_ready = True
+        # mode=ro: bu bağlantı hiçbir koşulda yazamaz; rapor sorgusu yanlışlıkla yazmaya kalkarsa hata alır.
+        conn = sqlite3.connect(database_uri(self.database_path, 'ro' if readonly else None), uri=True, timeout=self.timeout, check_same_thread=False, factory=self.connection_factory)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        self._apply_profile(conn, change_journal_mode=not readonly)
+        self._connection_profiles[conn] = self.profile_name
+        return conn
+
+    def _close_connection(self, conn):
+        self._connection_profiles.pop(conn, None)
+        conn.close()
+
+    def attach(self, raw, schemas) -> set:
+        # İstenen şemaları bağlantıya ekler ve eklenmiş olanları döndürür. ATTACH işlem içinde
+        # yapılamaz; açık işlemdeki bağlantıda yalnızca önceden eklenmiş şemalar kullanılabilir.
+        current = {row[1]: row[2] for row in raw.execute("PRAGMA database_list")}
+        ready = set()
+        for schema in schemas:
+            path = self.attached_databases.get(schema)
+            if path is None:
+                continue
+            if schema in current and os.path.realpath(current[schema]) == os.path.realpath(path):
+                ready.add(schema)
+                continue
+            if raw.in_transaction:
+                continue
+            try:
+                if schema in current:
+                    # Aynı şema adı başka bir dosyayı gösteriyor (ör. geri yüklemeden sonra yeniden arşivlenen yıl).
+                    raw.execute(f"DETACH DATABASE {schema}")
+                    del current[schema]
+                attached = [name for name in current if name not in ('main', 'temp')]
+                unused = [name for name in attached if name not in schemas]
+                while unused and len(attached) >= MAX_ATTACHED_DATABASES:
+                    name = unused.pop()
+                    raw.execute(f"DETACH DATABASE {name}")
+                    attached.remove(name)
+                    del current[name]
+                raw.execute(f"ATTACH DATABASE ? AS {schema}", (database_uri(path, 'ro'),))
+                current[schema] = path
+                ready.add(schema)
+            except sqlite3.Error as e:
+                logging.error(f"Veritabanı eklenemedi ({schema}: {path}): {e}")
+        return ready
+
+    def _apply_profile(self, conn, change_journal_mode=True):
+        profile = PERFORMANCE_PROFILES[self.profile_name]
+        try:
+            # Şemasız journal_mode eklenmiş tüm veritabanlarına uygulanır; yalnızca ana dosya değiştirilir.
+            current_mode = conn.execute("PRAGMA main.journal_mode").fetchone()[0]
+            if change_journal_mode and current_mode.upper() != profile['journal_mode']:
+                conn.execute(f"PRAGMA main.journal_mode = {profile['journal_mode']}")
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Günlük modu '{profile['journal_mode']}' olarak değiştirilemedi: {e}")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma} = {profile[pragma]}")
+
+    def _ensure_profile(self, conn, change_journal_mode=True):
+        # Kullanımdaki bağlantının ayarları işlem ortasında değiştirilmez; profil değiştiyse
+        # bağlantı bir sonraki kiralanışında (en dıştaki acquire/snapshot) güncellenir.
+        if self._connection_profiles.get(conn) == self.profile_name:
+            return
+        profile_name = self.profile_name
+        try:
+            self._apply_profile(conn, change_journal_mode)
+        except sqlite3.Error as e:
+            logging.warning(f"Veritabanı performans profili bağlantıya uygulanamadı, sonraki kullanımda yeniden denenecek: {e}")
+            return
+        self._connection_profiles[conn] = profile_name
+
+    def set_profile(self, profile_name):
+        if profile_name not in PERFORMANCE_PROFILES:
+            logging.warning(f"Bilinmeyen veritabanı performans profili: '{profile_name}'. '{DEFAULT_PERFORMANCE_PROFILE}' kullanılacak.")
+            profile_name = DEFAULT_PERFORMANCE_PROFILE
+        if profile_name == self.profile_name:
+            return profile_name
+        self.profile_name = profile_name
+        # Boştaki bağlantılar kapatılır (günlük modu değişikliği diğer bağlantılar açıkken başarısız
+        # olabilir); ana bağlantı ve o an kiralanmış bağlantılar profili bir sonraki kiralanışta alır.
+        while True:
+            try:
+                idle_conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_connection(idle_conn)
+            with self._lock:
+                self._worker_count -= 1
+        while True:
+            try:
+                self._close_connection(self._readonly_idle.get_nowait())
+            except queue.Empty:
+                break
+        logging.info(f"Veritabanı performans profili uygulandı: {profile_name}")
+        return profile_name
+
+    def checkpoint(self, mode='PASSIVE'):
+        with self._lock:
+            main_conn = self._main_conn
+        if main_conn is None or main_conn.in_transaction:
+            return None
+        try:
+            return tuple(main_conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+        except sqlite3.Error as e:
+            logging.warning(f"WAL checkpoint ({mode}) yapılamadı: {e}")
+            return None
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def acquire(self) -> PooledConnection:
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None and lease.generation != self._generation:
+            lease = None
+        if lease is None:
+            self._enter_gate()
+            try:
+                if threading.current_thread() is threading.main_thread():
+                    lease = _ThreadLease(self._get_main_connection(), False, self._generation)
+                    self._main_lease = lease
+                else:
+                    lease = _ThreadLease(self._checkout_worker_connection(), True, self._generation)
+            except BaseException:
+                self._leave_gate()
+                raise
+            self._ensure_profile(lease.raw)
+            self._local.lease = lease
+        else:
+            self._count('hits')
+        lease.depth += 1
+        self._count('checkouts')
+        return PooledConnection(self, lease)
+
+    def _enter_gate(self):
+        with self._gate:
+            if self._drain_owner is not None and self._drain_owner != threading.get_ident():
+                if not self._gate.wait_for(lambda: self._drain_owner is None, timeout=DRAIN_TIMEOUT):
+                    raise sqlite3.OperationalError("Veritabanı şu anda geri yükleniyor: bağlantı beklenirken zaman aşımı oluştu.")
+            self._active_leases += 1
+
+    def _leave_gate(self):
+        with self._gate:
+            self._active_leases -= 1
+            self._gate.notify_all()
+
+    @contextmanager
+    def exclusive(self, timeout=DRAIN_TIMEOUT):
+        # Yeni bağlantı verilmesini durdurur, açık işlemlerin bitmesini bekler ve tüm bağlantıları
+        # kapatır; blok içinde veritabanı dosyası güvenle değiştirilebilir. Bloğu çalıştıran iş
+        # parçacığı bu sırada bağlantı alabilir (ör. geçişleri uygulamak için).
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None and lease.generation == self._generation:
+            # Çağıranın kendi bağlantısı hiç bırakılmayacağından boşaltma zaman aşımına kadar beklerdi.
+            raise sqlite3.OperationalError("Bu iş parçacığı hâlâ bir veritabanı bağlantısı tutuyor; özel işlemden önce bağlantıyı kapatın.")
+        with self._gate:
+            if self._drain_owner is not None:
+                raise sqlite3.OperationalError("Veritabanı üzerinde başka bir özel işlem sürüyor.")
+            self._drain_owner = threading.get_ident()
+            drained = self._gate.wait_for(lambda: self._active_leases == 0, timeout=timeout)
+        try:
+            if not drained:
+                raise sqlite3.OperationalError("Açık veritabanı işlemleri zamanında bitmedi; işlem iptal edildi.")
+            self.close_all()
+            yield
+        finally:
+            with self._gate:
+                self._drain_owner = None
+                self._gate.notify_all()
+
+    @contextmanager
+    def snapshot(self):
+        # Salt okunur bir bağlantıda okuma işlemi açılır ve ilk okumayla WAL anlık görüntüsü sabitlenir.
+        # Blok içinde bu iş parçacığındaki tüm get_db_connection() çağrıları aynı anlık görüntüyü görür;
+        # kasanın yazmaları bu sırada beklemez, rapor da yarım kalmış bir satışı görmez. Anlık görüntünün
+        # alındığı zaman ('%Y-%m-%d %H:%M:%S') döner.
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None and lease.generation == self._generation:
+            # İş parçacığı zaten bir bağlantı tutuyor; onun işlemi kullanılır.
+            yield datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return
+        self._enter_gate()
+        try:
+            try:
+                raw = self._readonly_idle.get_nowait()
+            except queue.Empty:
+                raw = self._open(readonly=True)
+            self._ensure_profile(raw, change_journal_mode=False)
+            lease = _ThreadLease(raw, True, self._generation)
+            lease.depth = 1
+            # İşlem açıldıktan sonra ATTACH yapılamadığından bilinen tüm ek veritabanları önceden eklenir.
+            self.attach(raw, list(self.attached_databases))
+            raw.execute("BEGIN")
+            raw.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            taken_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        except BaseException:
+            self._leave_gate()
+            raise
+        self._count('snapshots')
+        self._local.lease = lease
+        try:
+            yield taken_at
+        finally:
+            if getattr(self._local, 'lease', None) is lease:
+                self._local.lease = None
+            try:
+                if raw.in_transaction:
+                    raw.rollback()
+                if lease.generation == self._generation:
+                    self._readonly_idle.put(raw)
+                else:
+                    self._close_connection(raw)
+            finally:
+                self._leave_gate()
+
+    def _get_main_connection(self):
+        with self._lock:
+            if self._main_conn is not None:
+                self._stats['hits'] += 1
+                return self._main_conn
+            self._stats['misses'] += 1
+            self._main_conn = self._open()
+            return self._main_conn
+
+    def _checkout_worker_connection(self):
+        try:
+            conn = self._idle.get_nowait()
+            self._count('hits')
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._worker_count < self.pool_size
+            if can_open:
+                self._worker_count += 1
+                self._stats['misses'] += 1
+        if can_open:
+            try:
+                return self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._worker_count -= 1
+                raise
+
+        self._count('waits')
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Bağlantı havuzu dolu: boşta bağlantı beklenirken zaman aşımı oluştu.")
+
+    def _release(self, lease):
+        lease.depth -= 1
+        if lease.depth > 0:
+            return
+        try:
+            self._return_lease(lease)
+        finally:
+            self._leave_gate()
+
+    def _return_lease(self, lease):
+        if getattr(self._local, 'lease', None) is lease:
+            self._local.lease = None
+
+        raw = lease.raw
+        if raw.in_transaction:
+            try:
+                raw.rollback()
+            except sqlite3.Error as e:
+                logging.error(f"Havuza dönen bağlantıda açık işlem geri alınamadı: {e}")
+
+        if not lease.is_worker and self._main_lease is lease:
+            self._main_lease = None
+        if lease.generation != self._generation:
+            self._close_connection(raw)
+        elif lease.is_worker:
+            self._idle.put(raw)
+
+    def close_all(self):
+        if self._main_lease is None:
+            self.checkpoint('TRUNCATE')
+        with self._lock:
+            self._generation += 1
+            main_conn, self._main_conn = self._main_conn, None
+            main_in_use = self._main_lease is not None
+            self._worker_count = 0
+        if main_conn is not None and not main_in_use:
+            self._close_connection(main_conn)
+        for idle in (self._idle, self._readonly_idle):
+            while True:
+                try:
+                    self._close_connection(idle.get_nowait())
+                except queue.Empty:
+                    break
+        self._local = threading.local()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['worker_connections'] = self._worker_count
+            stats['main_connection_open'] = self._main_conn is not None
+            stats['profile'] = self.profile_name
+        stats['idle_worker_connections'] = self._idle.qsize()
+        stats['idle_readonly_connections'] = self._readonly_idle.qsize()
+        total = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / total, 4) if total else 0.0
+        return stats
+
+_manager = ConnectionManager(DATABASE_PATH)
+
+def get_db_connection() -> PooledConnection:
+    return _manager.acquire()
+
+def get_pool_stats() -> dict:
+    return _manager.get_stats()
+
+def close_all_connections():
+    _manager.close_all()
+
+def set_performance_profile(profile_name: str) -> str:
+    return _manager.set_profile(profile_name)
+
+def get_performance_profile() -> str:
+    return _manager.profile_name
+
+def read_snapshot():
+    return _manager.snapshot()
+
+def set_connection_factory(factory):
+    # Yeni sınıf (ör. SQL izleme) yalnızca yeni açılan bağlantılara uygulanabilir; havuz yeniden açılır.
+    _manager.connection_factory = factory
+    _manager.close_all()
+
+def set_attached_databases(databases: dict):
+    # Bağlantılar listeyi attach_databases() çağrıldığında, gerektiği kadarıyla uygular.
+    _manager.attached_databases = dict(databases)
+
+def attach_databases(conn, schemas) -> set:
+    return _manager.attach(conn._lease.raw if isinstance(conn, PooledConnection) else conn, schemas)
+
+def exclusive_access(timeout: float = DRAIN_TIMEOUT):
+    return _manager.exclusive(timeout)
+
+def checkpoint_database(mode: str = 'PASSIVE'):
+    return _manager.checkpoint(mode)
+
+def configure_database(path: str, pool_size: int = WORKER_POOL_SIZE):
+    global DATABASE_PATH, _manager
+    profile_name, factory = _manager.profile_name, _manager.connection_factory
+    _manager.close_all()
+    DATABASE_PATH = path
+    _manager = ConnectionManager(path, pool_size=pool_size)
+    _manager.profile_name = profile_name
+    _manager.connection_factory = factory
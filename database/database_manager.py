@@ -2,12 +2,21 @@
 
 import sqlite3
 import logging
-import os
-import shutil
-from datetime import datetime
 
-from .connection import get_db_connection
-from .queries import user_queries, product_queries, customer_queries, sale_queries, settings_queries
+from .connection import (
+    get_db_connection, get_pool_stats, close_all_connections,
+    set_performance_profile, get_performance_profile, checkpoint_database, read_snapshot,
+    PERFORMANCE_PROFILES, PERFORMANCE_PROFILE_SETTING_KEY, DEFAULT_PERFORMANCE_PROFILE
+)
+from .migrations import migration, apply_pending_migrations, get_schema_version, latest_version
+from . import backup, backup_store, writer, query_trace, archive
+from .queries.date_keys import DAY_KEY_SQL, EPOCH_KEY_SQL
+from .queries.text_search import FTS_TOKENIZE, TR_FOLD_SQL
+from .queries import user_queries, product_queries, customer_queries, sale_queries, settings_queries, reference_cache, money, archive_sources, sale_search
+
+to_kurus = money.to_kurus
+from_kurus = money.from_kurus
+to_tl = money.to_tl
 
 add_user = user_queries.add_user
 get_all_users = user_queries.get_all_users
@@ -28,13 +37,16 @@ save_product_with_variants = product_queries.save_product_with_variants
 add_product = product_queries.add_product
 update_product = product_queries.update_product
 get_product_by_id = product_queries.get_product_by_id
+get_product_by_code = product_queries.get_product_by_code
 get_products_by_stok_codes = product_queries.get_products_by_stok_codes
 get_variants_by_main_code = product_queries.get_variants_by_main_code
 get_products = product_queries.get_products
+search_products = product_queries.search_products
 check_product_in_use = product_queries.check_product_in_use
 archive_product = product_queries.archive_product
 delete_product = product_queries.delete_product
 add_stock_movement = product_queries.add_stock_movement
+InsufficientStockError = product_queries.InsufficientStockError
 get_low_stock_products = product_queries.get_low_stock_products
 get_inventory_report = product_queries.get_inventory_report
 archive_variant_group = product_queries.archive_variant_group
@@ -45,11 +57,15 @@ archive_customer = customer_queries.archive_customer
 add_payment = customer_queries.add_payment
 get_customer_by_id = customer_queries.get_customer_by_id
 search_customers = customer_queries.search_customers
+refresh_customer_search_keys = customer_queries.refresh_customer_search_keys
 get_customer_balance = customer_queries.get_customer_balance
+rebuild_customer_balances = customer_queries.rebuild_customer_balances
+verify_customer_balances = customer_queries.verify_customer_balances
 get_customer_transaction_history = customer_queries.get_customer_transaction_history
 get_customer_sales_report = customer_queries.get_customer_sales_report
 
 create_sale = sale_queries.create_sale
+commit_sale = sale_queries.commit_sale
 delete_sale_by_id = sale_queries.delete_sale_by_id
 get_sales_by_day_for_month = sale_queries.get_sales_by_day_for_month
 get_sales_by_category = sale_queries.get_sales_by_category
@@ -58,16 +74,60 @@ get_sale_details_for_report = sale_queries.get_sale_details_for_report
 get_sales_by_date_range = sale_queries.get_sales_by_date_range
 get_sales_with_profit_by_date_range = sale_queries.get_sales_with_profit_by_date_range
 get_all_sales_history = sale_queries.get_all_sales_history
+get_sales_history_page = sale_queries.get_sales_history_page
+SALES_HISTORY_PAGE_SIZE = sale_queries.SALES_HISTORY_PAGE_SIZE
 search_sales_history = sale_queries.search_sales_history
+validate_sales_query = sale_search.validate_sales_query
 get_product_sales_report = sale_queries.get_product_sales_report
 get_daily_sales_for_period = sale_queries.get_daily_sales_for_period
+get_sales_summary_for_period = sale_queries.get_sales_summary_for_period
+rebuild_daily_sales_summary = sale_queries.rebuild_daily_sales_summary
 add_suspended_sale = sale_queries.add_suspended_sale
 get_all_suspended_sales = sale_queries.get_all_suspended_sales
 get_suspended_sale_by_id = sale_queries.get_suspended_sale_by_id
 delete_suspended_sale = sale_queries.delete_suspended_sale
 
 get_setting = settings_queries.get_setting
+get_setting_float = settings_queries.get_setting_float
+get_setting_bool = settings_queries.get_setting_bool
 save_setting = settings_queries.save_setting
+save_settings = settings_queries.save_settings
+invalidate_reference_cache = reference_cache.invalidate
+
+backup_database = backup.backup_database
+verify_database_file = backup.verify_database_file
+validate_backup_file = backup.validate_backup_file
+get_backup_history = backup.get_backup_history
+BackupVerificationError = backup.BackupVerificationError
+
+create_backup_snapshot = backup_store.create_snapshot
+list_backup_snapshots = backup_store.list_snapshots
+restore_backup_snapshot = backup_store.restore_snapshot
+apply_backup_retention = backup_store.apply_retention
+backup_snapshot_due = backup_store.snapshot_due
+get_backup_store_stats = backup_store.get_store_stats
+SCHEDULED_BACKUP_SETTING_KEY = backup_store.SCHEDULED_BACKUP_SETTING_KEY
+SCHEDULED_BACKUP_INTERVAL_SETTING_KEY = backup_store.SCHEDULED_BACKUP_INTERVAL_SETTING_KEY
+DEFAULT_SCHEDULED_BACKUP_INTERVAL = backup_store.DEFAULT_SCHEDULED_BACKUP_INTERVAL
+SCHEDULED_BACKUP_PAUSE = backup_store.SCHEDULED_BACKUP_PAUSE
+
+submit_write = writer.submit_write
+stop_database_writer = writer.stop_writer
+get_writer_stats = writer.get_writer_stats
+
+archive_fiscal_year = archive.archive_fiscal_year
+get_archive_periods = archive.get_archive_periods
+get_archivable_year = archive.get_archivable_year
+compact_database = archive.compact_database
+ArchiveError = archive.ArchiveError
+
+get_query_stats = query_trace.get_query_stats
+reset_query_stats = query_trace.reset_query_stats
+export_query_stats = query_trace.export_query_stats
+is_query_trace_enabled = query_trace.is_enabled
+SQL_TRACE_SETTING_KEY = query_trace.TRACE_SETTING_KEY
+SLOW_QUERY_THRESHOLD_SETTING_KEY = query_trace.SLOW_QUERY_THRESHOLD_SETTING_KEY
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = query_trace.DEFAULT_SLOW_QUERY_THRESHOLD_MS
 get_all_settings = settings_queries.get_all_settings
 get_all_kategoriler = settings_queries.get_all_kategoriler
 add_kategori = settings_queries.add_kategori
@@ -187,26 +247,46 @@ def _create_utility_tables(cursor):
         FOREIGN KEY (musteri_id) REFERENCES musteriler(id) ON DELETE CASCADE
     )""")
 
-def _run_migrations(cursor):
-    try:
-        urun_columns = [c['name'] for c in cursor.execute("PRAGMA table_info(urunler)").fetchall()]
-        if 'vergi_id' not in urun_columns:
-            cursor.execute("ALTER TABLE urunler ADD COLUMN vergi_id INTEGER REFERENCES vergi_oranlari(id) ON DELETE SET NULL")
-        
-        musteri_columns = [c['name'] for c in cursor.execute("PRAGMA table_info(musteriler)").fetchall()]
-        if 'grup_id' not in musteri_columns:
-            cursor.execute("ALTER TABLE musteriler ADD COLUMN grup_id INTEGER REFERENCES musteri_gruplari(id) ON DELETE SET NULL")
-
-        if 'varyant_tipi_id' not in urun_columns:
-            cursor.execute("""
-                ALTER TABLE urunler 
-                ADD COLUMN varyant_tipi_id INTEGER 
-                REFERENCES varyant_tipleri(id) ON DELETE SET NULL
-            """)
-            logging.info("Veritabanı güncellendi: 'urunler' tablosuna 'varyant_tipi_id' sütunu eklendi.")
+def _create_indexes(cursor):
+    indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_satislar_tarih ON satislar (satis_tarihi, musteri_id, toplam_tutar)",
+        "CREATE INDEX IF NOT EXISTS idx_satislar_musteri ON satislar (musteri_id, satis_tarihi, toplam_tutar)",
+        "CREATE INDEX IF NOT EXISTS idx_satis_detaylari_satis ON satis_detaylari (satis_id, urun_id, miktar, birim_fiyat)",
+        "CREATE INDEX IF NOT EXISTS idx_satis_detaylari_urun ON satis_detaylari (urun_id, miktar)",
+        "CREATE INDEX IF NOT EXISTS idx_odeme_gecmisi_musteri ON odeme_gecmisi (musteri_id, tarih, tutar)",
+        "CREATE INDEX IF NOT EXISTS idx_stok_hareketleri_urun ON stok_hareketleri (urun_id, tarih)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_ana_urun_kodu ON urunler (ana_urun_kodu)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_kategori ON urunler (kategori_id, aktif_mi)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_vergi ON urunler (vergi_id, aktif_mi)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_varyant_tipi ON urunler (varyant_tipi_id, aktif_mi)",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_aktif_ad ON urunler (ad) WHERE aktif_mi = 1",
+        "CREATE INDEX IF NOT EXISTS idx_urunler_kritik_stok ON urunler (stok_miktari, min_stok_seviyesi) WHERE aktif_mi = 1 AND min_stok_seviyesi > 0",
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_grup ON musteriler (grup_id, aktif_mi)",
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_aktif_ad ON musteriler (ad, soyad) WHERE aktif_mi = 1",
+        "CREATE INDEX IF NOT EXISTS idx_askidaki_satislar_tarih ON askidaki_satislar (askiya_alinma_tarihi)",
+        "CREATE INDEX IF NOT EXISTS idx_askidaki_satislar_musteri ON askidaki_satislar (musteri_id)",
+        "CREATE INDEX IF NOT EXISTS idx_kullanicilar_rol ON kullanicilar (rol_id)",
+        "CREATE INDEX IF NOT EXISTS idx_mesaj_sablonlari_tip ON mesaj_sablonlari (tip, ad)",
+    ]
+    for statement in indexes:
+        cursor.execute(statement)
 
-    except sqlite3.Error as e:
-        logging.error(f"Veritabanı migration sırasında hata: {e}")
+def _upgrade_legacy_columns(cursor):
+    urun_columns = [c['name'] for c in cursor.execute("PRAGMA table_info(urunler)").fetchall()]
+    if 'vergi_id' not in urun_columns:
+        cursor.execute("ALTER TABLE urunler ADD COLUMN vergi_id INTEGER REFERENCES vergi_oranlari(id) ON DELETE SET NULL")
+
+    musteri_columns = [c['name'] for c in cursor.execute("PRAGMA table_info(musteriler)").fetchall()]
+    if 'grup_id' not in musteri_columns:
+        cursor.execute("ALTER TABLE musteriler ADD COLUMN grup_id INTEGER REFERENCES musteri_gruplari(id) ON DELETE SET NULL")
+
+    if 'varyant_tipi_id' not in urun_columns:
+        cursor.execute("""
+            ALTER TABLE urunler 
+            ADD COLUMN varyant_tipi_id INTEGER 
+            REFERENCES varyant_tipleri(id) ON DELETE SET NULL
+        """)
+        logging.info("Veritabanı güncellendi: 'urunler' tablosuna 'varyant_tipi_id' sütunu eklendi.")
 
 def _populate_initial_data(cursor):
     cursor.execute("INSERT OR IGNORE INTO roller (ad) VALUES ('Yönetici'), ('Standart Kullanıcı')")
@@ -240,25 +320,293 @@ def _populate_initial_data(cursor):
         logging.warning(f"-> Yönetici: admin / Şifre: {DEFAULT_ADMIN_PASSWORD}")
         logging.warning(f"-> Kullanıcı: kullanici / Şifre: {DEFAULT_USER_PASSWORD}")
 
+@migration(1, "Temel şema")
+def _migration_base_schema(cursor):
+    _create_user_and_role_tables(cursor)
+    _create_product_related_tables(cursor)
+    _create_customer_related_tables(cursor)
+    _create_sales_related_tables(cursor)
+    _create_utility_tables(cursor)
+    _upgrade_legacy_columns(cursor)
+
+@migration(2, "Sık kullanılan sorgular için indeksler")
+def _migration_hot_path_indexes(cursor):
+    _create_indexes(cursor)
+
+@migration(3, "Varsayılan roller, yetkiler ve kullanıcılar")
+def _migration_initial_data(cursor):
+    _populate_initial_data(cursor)
+
+# Para sütunları INTEGER kuruş olarak tutulur (bkz. database/queries/money.py).
+MONEY_TABLE_SCHEMAS = {
+    'urunler': ("""
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, stok_kodu TEXT NOT NULL UNIQUE,
+        ad TEXT NOT NULL, barkod TEXT, ana_urun_kodu TEXT, kategori_id INTEGER,
+        vergi_id INTEGER, alis_fiyati INTEGER NOT NULL, alis_para_birimi TEXT NOT NULL DEFAULT 'TL',
+        stok_miktari INTEGER NOT NULL, min_stok_seviyesi INTEGER DEFAULT 0,
+        gorsel_yolu TEXT, aktif_mi BOOLEAN NOT NULL DEFAULT 1, varyant_tipi_id INTEGER,
+        FOREIGN KEY (kategori_id) REFERENCES kategoriler(id) ON DELETE RESTRICT,
+        FOREIGN KEY (vergi_id) REFERENCES vergi_oranlari(id) ON DELETE SET NULL,
+        FOREIGN KEY (varyant_tipi_id) REFERENCES varyant_tipleri(id) ON DELETE SET NULL
+    )""", ('alis_fiyati',)),
+    'satislar': ("""
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, musteri_id INTEGER,
+        satis_tarihi TEXT NOT NULL, toplam_tutar INTEGER NOT NULL, odenen_tutar INTEGER NOT NULL,
+        FOREIGN KEY (musteri_id) REFERENCES musteriler(id)
+    )""", ('toplam_tutar', 'odenen_tutar')),
+    'satis_detaylari': ("""
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, satis_id INTEGER NOT NULL, urun_id INTEGER NOT NULL,
+        miktar INTEGER NOT NULL, birim_fiyat INTEGER NOT NULL,
+        FOREIGN KEY (satis_id) REFERENCES satislar(id) ON DELETE CASCADE,
+        FOREIGN KEY (urun_id) REFERENCES urunler(id) ON DELETE RESTRICT
+    )""", ('birim_fiyat',)),
+    'odeme_gecmisi': ("""
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, musteri_id INTEGER NOT NULL,
+        tarih TEXT NOT NULL, tutar INTEGER NOT NULL, aciklama TEXT,
+        FOREIGN KEY (musteri_id) REFERENCES musteriler(id)
+    )""", ('tutar',)),
+}
+
+def _rebuild_table(cursor, table, create_sql, money_columns):
+    new_table = f"{table}_yeni"
+    old_columns = {c['name'] for c in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+    dependents = [row['sql'] for row in cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL", (table,)).fetchall()]
+    sequence_row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+
+    cursor.execute(create_sql.format(table=new_table))
+    columns = [c['name'] for c in cursor.execute(f"PRAGMA table_info({new_table})").fetchall() if c['name'] in old_columns]
+    select_list = ", ".join(f"CAST(ROUND({c} * 100) AS INTEGER)" if c in money_columns else c for c in columns)
+    cursor.execute(f"INSERT INTO {new_table} ({', '.join(columns)}) SELECT {select_list} FROM {table}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    if sequence_row:
+        # Silinmiş son kayıtların ID'leri yeniden kullanılmasın diye AUTOINCREMENT sayacı korunur.
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence_row['seq'], table))
+    for sql in dependents:
+        cursor.execute(sql)
+
+@migration(4, "Para tutarlarını INTEGER kuruş olarak saklama", disable_foreign_keys=True)
+def _migration_money_as_kurus(cursor):
+    for table, (create_sql, money_columns) in MONEY_TABLE_SCHEMAS.items():
+        _rebuild_table(cursor, table, create_sql, money_columns)
+
+@migration(5, "Satışlar için tamsayı gün ve zaman anahtarları")
+def _migration_sale_date_keys(cursor):
+    day_sql = DAY_KEY_SQL.format(column='NEW.satis_tarihi')
+    epoch_sql = EPOCH_KEY_SQL.format(column='NEW.satis_tarihi')
+    cursor.execute("ALTER TABLE satislar ADD COLUMN satis_gunu INTEGER")
+    cursor.execute("ALTER TABLE satislar ADD COLUMN satis_zamani INTEGER")
+    cursor.execute(f"UPDATE satislar SET satis_gunu = {DAY_KEY_SQL.format(column='satis_tarihi')}, satis_zamani = {EPOCH_KEY_SQL.format(column='satis_tarihi')}")
+    # create_sale anahtarları kendisi yazar; tetikleyiciler doğrudan SQL ile eklenen ya da
+    # tarihi değiştirilen kayıtların anahtarlarını güncel tutar.
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_satislar_tarih_anahtari_ekle AFTER INSERT ON satislar
+    WHEN NEW.satis_gunu IS NULL OR NEW.satis_zamani IS NULL
+    BEGIN
+        UPDATE satislar SET satis_gunu = {day_sql}, satis_zamani = {epoch_sql} WHERE id = NEW.id;
+    END""")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_satislar_tarih_anahtari_guncelle AFTER UPDATE OF satis_tarihi ON satislar
+    BEGIN
+        UPDATE satislar SET satis_gunu = {day_sql}, satis_zamani = {epoch_sql} WHERE id = NEW.id;
+    END""")
+    cursor.execute("DROP INDEX IF EXISTS idx_satislar_tarih")
+    cursor.execute("DROP INDEX IF EXISTS idx_satislar_musteri")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_zaman ON satislar (satis_zamani, musteri_id, toplam_tutar, satis_tarihi)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_gun ON satislar (satis_gunu, musteri_id, toplam_tutar)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_musteri ON satislar (musteri_id, satis_zamani, toplam_tutar, satis_tarihi)")
+
+@migration(6, "Günlük satış özeti tablosu (gunluk_satis_ozet)")
+def _migration_daily_sales_summary(cursor):
+    # gun: YYYYMMDD, musteri_id: müşterisiz satışlar için 0. Kâr = ciro - maliyet.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS gunluk_satis_ozet (
+        gun INTEGER NOT NULL, musteri_id INTEGER NOT NULL,
+        ciro INTEGER NOT NULL DEFAULT 0, maliyet INTEGER NOT NULL DEFAULT 0,
+        satis_adedi INTEGER NOT NULL DEFAULT 0, urun_adedi INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (gun, musteri_id)
+    ) WITHOUT ROWID""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_gunluk_satis_ozet_musteri ON gunluk_satis_ozet (musteri_id, gun)")
+    # Bu sürümdeki şemaya göre doldurulur (maliyet: güncel alış fiyatı); 15. geçiş özeti yeniden oluşturur.
+    cursor.execute("DELETE FROM gunluk_satis_ozet")
+    cursor.execute("""
+    INSERT INTO gunluk_satis_ozet (gun, musteri_id, ciro, maliyet, satis_adedi, urun_adedi)
+    SELECT s.satis_gunu, COALESCE(s.musteri_id, 0), SUM(s.toplam_tutar),
+           SUM((SELECT COALESCE(SUM(sd.miktar * u.alis_fiyati), 0) FROM satis_detaylari sd
+                JOIN urunler u ON sd.urun_id = u.id WHERE sd.satis_id = s.id)),
+           COUNT(*),
+           SUM((SELECT COALESCE(SUM(sd.miktar), 0) FROM satis_detaylari sd WHERE sd.satis_id = s.id))
+    FROM satislar s GROUP BY s.satis_gunu, COALESCE(s.musteri_id, 0)""")
+
+@migration(7, "Müşteri bakiye özeti tablosu (musteri_bakiye_ozet)")
+def _migration_customer_balances(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS musteri_bakiye_ozet (
+        musteri_id INTEGER PRIMARY KEY,
+        toplam_borc INTEGER NOT NULL DEFAULT 0, toplam_alacak INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (musteri_id) REFERENCES musteriler(id) ON DELETE CASCADE
+    )""")
+    # Bu sürümdeki şemaya göre doldurulur; devreden bakiyeler 15. geçişteki yeniden hesaplamayla eklenir.
+    cursor.execute("DELETE FROM musteri_bakiye_ozet")
+    cursor.execute("""
+    INSERT INTO musteri_bakiye_ozet (musteri_id, toplam_borc, toplam_alacak)
+    SELECT m.id,
+           (SELECT COALESCE(SUM(toplam_tutar), 0) FROM satislar WHERE musteri_id = m.id),
+           (SELECT COALESCE(SUM(tutar), 0) FROM odeme_gecmisi WHERE musteri_id = m.id)
+    FROM musteriler m""")
+
+@migration(8, "Ürün araması için FTS5 indeksi (urunler_fts)")
+def _migration_product_search_index(cursor):
+    # Dış içerik tablosu yerine ı/İ dönüşümü uygulanmış kopya tutulur (bkz. queries/text_search.py).
+    folded = {column: TR_FOLD_SQL.format(column=f"NEW.{column}") for column in ('ad', 'stok_kodu', 'barkod')}
+    cursor.execute(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS urunler_fts USING fts5(
+        ad, stok_kodu, barkod, tokenize = '{FTS_TOKENIZE}', prefix = '2 3'
+    )""")
+    cursor.execute(f"""
+    INSERT INTO urunler_fts (rowid, ad, stok_kodu, barkod)
+    SELECT id, {TR_FOLD_SQL.format(column='ad')}, {TR_FOLD_SQL.format(column='stok_kodu')}, {TR_FOLD_SQL.format(column='barkod')} FROM urunler""")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_urunler_fts_ekle AFTER INSERT ON urunler
+    BEGIN
+        INSERT INTO urunler_fts (rowid, ad, stok_kodu, barkod) VALUES (NEW.id, {folded['ad']}, {folded['stok_kodu']}, {folded['barkod']});
+    END""")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_urunler_fts_guncelle AFTER UPDATE OF ad, stok_kodu, barkod ON urunler
+    BEGIN
+        UPDATE urunler_fts SET ad = {folded['ad']}, stok_kodu = {folded['stok_kodu']}, barkod = {folded['barkod']} WHERE rowid = NEW.id;
+    END""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_urunler_fts_sil AFTER DELETE ON urunler
+    BEGIN
+        DELETE FROM urunler_fts WHERE rowid = OLD.id;
+    END""")
+
+@migration(9, "Müşteri araması için normalleştirilmiş anahtar sütunları")
+def _migration_customer_search_keys(cursor):
+    for column in customer_queries.SEARCH_KEY_COLUMNS:
+        cursor.execute(f"ALTER TABLE musteriler ADD COLUMN {column} TEXT")
+    customer_queries.refresh_customer_search_keys(cursor.connection)
+    for column in customer_queries.SEARCH_KEY_COLUMNS:
+        # Kısmi (WHERE aktif_mi = 1) indeksler OR koşulunun her kolu için ayrı ayrı kullanılamadığından tam indeks.
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_musteriler_{column} ON musteriler ({column})")
+
+@migration(10, "Satış geçmişi aramasında tutar koşulu için indeks")
+def _migration_sale_amount_index(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satislar_tutar ON satislar (toplam_tutar)")
+
+@migration(11, "Referans veri önbelleği için değişiklik sayacı (referans_surum)")
+def _migration_reference_version(cursor):
+    # Başka süreçlerin ayar/kategori/vergi/grup değişikliklerini önbelleğe bildirir (bkz. queries/reference_cache.py).
+    cursor.execute("CREATE TABLE IF NOT EXISTS referans_surum (id INTEGER PRIMARY KEY CHECK (id = 1), surum INTEGER NOT NULL DEFAULT 0)")
+    cursor.execute("INSERT OR IGNORE INTO referans_surum (id, surum) VALUES (1, 0)")
+    for table in reference_cache.REFERENCE_TABLES:
+        for suffix, event in (('ekle', 'INSERT'), ('guncelle', 'UPDATE'), ('sil', 'DELETE')):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_surum_{suffix} AFTER {event} ON {table}
+            BEGIN
+                UPDATE referans_surum SET surum = surum + 1 WHERE id = 1;
+            END""")
+
+@migration(12, "Satış detaylarında satış anındaki birim maliyet ve KDV oranı")
+def _migration_sale_cost_snapshot(cursor):
+    cursor.execute("ALTER TABLE satis_detaylari ADD COLUMN birim_maliyet INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE satis_detaylari ADD COLUMN kdv_orani REAL")
+    # Geçmiş satışlar için gerçek alış fiyatı bilinmediğinden ürünün güncel fiyatı ve güncel kur kullanılır.
+    product_ids = [row['urun_id'] for row in cursor.execute("SELECT DISTINCT urun_id FROM satis_detaylari").fetchall()]
+    snapshots = sale_queries.get_cost_snapshots(cursor.connection, product_ids)
+    cursor.executemany(
+        "UPDATE satis_detaylari SET birim_maliyet = ?, kdv_orani = ? WHERE urun_id = ?",
+        [(cost, vat, product_id) for product_id, (cost, vat) in snapshots.items()]
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_satis_detaylari_satis")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_satis_detaylari_satis ON satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet)")
+
+@migration(13, "Yedekleme geçmişi (yedekler)")
+def _migration_backup_history(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS yedekler (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, olusturma_tarihi TEXT NOT NULL, dosya_yolu TEXT NOT NULL,
+        tur TEXT NOT NULL, boyut_bayt INTEGER NOT NULL, sayfa_sayisi INTEGER NOT NULL, sure_ms INTEGER NOT NULL,
+        yeniden_baslama INTEGER NOT NULL DEFAULT 0, sema_surumu INTEGER, dogrulama TEXT NOT NULL
+    )""")
+
+@migration(14, "Mali yıl arşivi (arsiv_donemleri) ve devreden müşteri bakiyeleri")
+def _migration_fiscal_year_archive(cursor):
+    # Zamanlar yarı açık aralıktır: baslangic_zamani <= satis_zamani < bitis_zamani (bkz. database/archive.py).
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS arsiv_donemleri (
+        yil INTEGER PRIMARY KEY, dosya_adi TEXT NOT NULL,
+        baslangic_zamani INTEGER NOT NULL, bitis_zamani INTEGER NOT NULL,
+        ilk_satis_id INTEGER, son_satis_id INTEGER, satis_adedi INTEGER NOT NULL DEFAULT 0, ciro INTEGER NOT NULL DEFAULT 0,
+        detay_adedi INTEGER NOT NULL DEFAULT 0, odeme_adedi INTEGER NOT NULL DEFAULT 0, hareket_adedi INTEGER NOT NULL DEFAULT 0,
+        sema_surumu INTEGER NOT NULL, durum TEXT NOT NULL, arsivlenme_tarihi TEXT NOT NULL
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS musteri_devir_bakiye (
+        musteri_id INTEGER PRIMARY KEY,
+        devir_borc INTEGER NOT NULL DEFAULT 0, devir_alacak INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (musteri_id) REFERENCES musteriler(id) ON DELETE CASCADE
+    )""")
+    # Arşiv listesi referans önbelleğinde tutulur; başka bir süreçte arşivlenen yıl sayaç üzerinden fark edilir.
+    for suffix, event in (('ekle', 'INSERT'), ('guncelle', 'UPDATE'), ('sil', 'DELETE')):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_arsiv_donemleri_surum_{suffix} AFTER {event} ON arsiv_donemleri
+        BEGIN
+            UPDATE referans_surum SET surum = surum + 1 WHERE id = 1;
+        END""")
+
+@migration(15, "Günlük satış özeti ve müşteri bakiyelerinin güncel şemayla yeniden hesaplanması")
+def _migration_rebuild_summaries(cursor):
+    # Özet maliyeti satis_detaylari.birim_maliyet'ten (12), bakiyeler devreden bakiyeleri de (14) okuyarak hesaplanır.
+    sale_queries.rebuild_daily_sales_summary(cursor.connection)
+    customer_queries.rebuild_customer_balances(cursor.connection)
+
 def create_tables():
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        _create_user_and_role_tables(cursor)
-        _create_product_related_tables(cursor)
-        _create_customer_related_tables(cursor)
-        _create_sales_related_tables(cursor)
-        _create_utility_tables(cursor)
-        _run_migrations(cursor)
-        _populate_initial_data(cursor)
-        conn.commit()
-
-BACKUP_DIR = "backups"
-BACKUP_PREFIX = "otomatik_yedek_"
-MAX_AUTO_BACKUPS = 5
+        apply_pending_migrations(conn)
+    reference_cache.invalidate()
+
+def apply_performance_profile():
+    try:
+        profile_name = settings_queries.get_setting(PERFORMANCE_PROFILE_SETTING_KEY, DEFAULT_PERFORMANCE_PROFILE)
+    except sqlite3.Error as e:
+        logging.error(f"Performans profili ayarı okunamadı: {e}")
+        profile_name = DEFAULT_PERFORMANCE_PROFILE
+    return set_performance_profile(profile_name)
+
+def run_in_snapshot(fn, *args, **kwargs):
+    # Rapor ve panel sorgularını salt okunur, tutarlı bir anlık görüntüde çalıştırır. Dönüş: (sonuç, anlık_görüntü_zamanı)
+    # Arşiv listesi önce tazelenir: anlık görüntü açıldıktan sonra yeni arşiv dosyası eklenemez.
+    archive_sources.refresh()
+    with read_snapshot() as taken_at:
+        return fn(*args, **kwargs), taken_at
+
+def apply_query_trace_settings():
+    try:
+        enabled = settings_queries.get_setting_bool(SQL_TRACE_SETTING_KEY)
+        threshold = settings_queries.get_setting_float(SLOW_QUERY_THRESHOLD_SETTING_KEY, DEFAULT_SLOW_QUERY_THRESHOLD_MS)
+    except sqlite3.Error as e:
+        logging.error(f"SQL izleme ayarları okunamadı: {e}")
+        enabled, threshold = False, DEFAULT_SLOW_QUERY_THRESHOLD_MS
+    query_trace.configure(enabled, threshold)
+
+def restore_database(source_path: str, progress=None):
+    # Dosya değiştirildikten sonra, diğer iş parçacıkları henüz beklerken eksik geçişler uygulanır.
+    backup.restore_database(source_path, progress, after_swap=create_tables)
+    apply_performance_profile()
+
+def restore_backup_snapshot_to_live(snapshot_id: str, progress=None):
+    backup_store.restore_snapshot_to_live(snapshot_id, progress=progress, after_swap=create_tables)
+    apply_performance_profile()
 
 def perform_automatic_backup():
     try:
-        if settings_queries.get_setting('auto_backup_on_exit', 'False') != 'True':
+        if not settings_queries.get_setting_bool('auto_backup_on_exit'):
             return
     except Exception as e:
         logging.error(f"Yedekleme ayarı okunurken hata oluştu: {e}")
@@ -266,25 +614,8 @@ def perform_automatic_backup():
 
     logging.info("Otomatik yedekleme işlemi başlatılıyor...")
     try:
-        os.makedirs(BACKUP_DIR, exist_ok=True)
-        
-        existing_backups = sorted([f for f in os.listdir(BACKUP_DIR) if f.startswith(BACKUP_PREFIX) and f.endswith(".db")])
-        
-        while len(existing_backups) >= MAX_AUTO_BACKUPS:
-            path_to_delete = os.path.join(BACKUP_DIR, existing_backups.pop(0))
-            try:
-                os.remove(path_to_delete)
-                logging.info(f"Eski otomatik yedek silindi: {path_to_delete}")
-            except Exception as e:
-                logging.error(f"Eski yedek ({path_to_delete}) silinirken hata: {e}")
-
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_filename = f"{BACKUP_PREFIX}{timestamp}.db"
-        save_path = os.path.join(BACKUP_DIR, backup_filename)
-        
-        from .connection import DATABASE_PATH
-        shutil.copy(DATABASE_PATH, save_path)
-        logging.info(f"Otomatik yedekleme başarıyla oluşturuldu: {save_path}")
+        snapshot = backup_store.create_snapshot(tur='Otomatik')
+        logging.info(f"Otomatik yedekleme başarıyla oluşturuldu: {snapshot['id']}")
 
     except Exception as e:
         logging.error(f"Otomatik yedekleme sırasında kritik bir hata oluştu: {e}", exc_info=True)
\ No newline at end of file
@@ -0,0 +1,66 @@
+# dosya: database/migrations.py
+
+import sqlite3
+import logging
+from collections import namedtuple
+
+Migration = namedtuple('Migration', ['version', 'description', 'apply', 'disable_foreign_keys'])
+
+_MIGRATIONS: dict[int, Migration] = {}
+
+def migration(version: int, description: str, disable_foreign_keys: bool = False):
+    def register(fn):
+        if version in _MIGRATIONS:
+            raise ValueError(f"Migration sürümü {version} iki kez tanımlanmış: {fn.__name__}")
+        _MIGRATIONS[version] = Migration(version, description, fn, disable_foreign_keys)
+        return fn
+    return register
+
+def get_registered_migrations() -> list[Migration]:
+    return [_MIGRATIONS[v] for v in sorted(_MIGRATIONS)]
+
+def latest_version() -> int:
+    return max(_MIGRATIONS, default=0)
+
+def get_schema_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _warn_foreign_key_violations(conn, step):
+    try:
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+    except sqlite3.Error as e:
+        logging.warning(f"Migration #{step.version} sonrası yabancı anahtar kontrolü yapılamadı: {e}")
+        return
+    if violations:
+        tables = sorted({row[0] for row in violations})
+        logging.warning(f"Migration #{step.version} sonrası {len(violations)} yabancı anahtar ihlali bulundu (mevcut veriden): {', '.join(tables)}")
+
+def apply_pending_migrations(conn) -> int:
+    current_version = get_schema_version(conn)
+    pending = [m for m in get_registered_migrations() if m.version > current_version]
+    if not pending:
+        return current_version
+
+    for step in pending:
+        logging.info(f"Veritabanı migration #{step.version} uygulanıyor: {step.description}")
+        # Tablo yeniden oluşturan adımlarda DROP TABLE'ın bağlı kayıtları silmemesi için yabancı
+        # anahtarlar işlem dışında kapatılır (SQLite ALTER TABLE belgesindeki prosedür).
+        if step.disable_foreign_keys:
+            conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.execute("BEGIN")
+            step.apply(conn.cursor())
+            if step.disable_foreign_keys:
+                _warn_foreign_key_violations(conn, step)
+            conn.execute(f"PRAGMA user_version = {step.version}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Veritabanı migration #{step.version} başarısız oldu, geri alındı: {e}", exc_info=True)
+            raise
+        finally:
+            if step.disable_foreign_keys:
+                conn.execute("PRAGMA foreign_keys = ON")
+        current_version = step.version
+    logging.info(f"Veritabanı şeması güncel: sürüm {current_version}")
+    return current_version
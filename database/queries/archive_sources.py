@@ -0,0 +1,89 @@
+# dosya: database/queries/archive_sources.py
+# Arşivlenmiş mali yıllar (bkz. database/archive.py) ayrı dosyalarda durur. Tarih aralığı alan
+# rapor sorguları tablolarını {db} önekiyle yazar; for_range() aralığın uzandığı kaynakları
+# (önek, başlangıç, bitiş) döndürür ve gereken arşivleri bağlantıya arsiv_YYYY adıyla salt okunur
+# ekler (ATTACH). union_all() sorguyu her kaynak için tekrarlayıp UNION ALL ile birleştirir.
+# Aralık yalnızca canlı veriyi kapsıyorsa tek kaynak ('' öneki) döner ve hiçbir dosya eklenmez.
+# Canlı veritabanının kolu arşiv sınırından başlar; silinmesi henüz bitmemiş arşivlenmiş satırlar
+# iki kez sayılmaz. Arşiv listesi referans önbelleğinde tutulur; başka bir süreçte arşivlenen yıl
+# referans_surum sayacı üzerinden fark edilir.
+
+import os
+import sqlite3
+import logging
+
+from database import connection
+from database.connection import get_db_connection
+from . import reference_cache
+from .date_keys import epoch_key
+
+ARCHIVE_DIR_NAME = 'arsiv'
+ARCHIVE_SCHEMA_PREFIX = 'arsiv_'
+
+def archive_directory() -> str:
+    return os.path.join(os.path.dirname(connection.DATABASE_PATH), ARCHIVE_DIR_NAME)
+
+def archive_schema(year: int) -> str:
+    return f"{ARCHIVE_SCHEMA_PREFIX}{year}"
+
+def _load_registry() -> dict:
+    try:
+        with get_db_connection() as conn:
+            rows = conn.execute("SELECT yil, dosya_adi, baslangic_zamani, bitis_zamani FROM arsiv_donemleri ORDER BY yil").fetchall()
+    except sqlite3.OperationalError:
+        # 14. geçişten önce arşiv tablosu yoktur.
+        rows = []
+    databases, periods = {}, []
+    for row in rows:
+        path = os.path.join(archive_directory(), row['dosya_adi'])
+        if not os.path.exists(path):
+            logging.error(f"{row['yil']} yılının arşiv dosyası bulunamadı: {path}. Bu yılın kayıtları raporlara eklenmeyecek.")
+            continue
+        databases[archive_schema(row['yil'])] = path
+        periods.append((archive_schema(row['yil']), row['baslangic_zamani'], row['bitis_zamani']))
+    connection.set_attached_databases(databases)
+
+    first_live_year = rows[-1]['yil'] + 1 if rows else None
+    live_start_text = f"{first_live_year:04d}-01-01 00:00:00" if first_live_year else ''
+    return {
+        'periods': tuple(periods), 'first_live_year': first_live_year, 'live_start_text': live_start_text,
+        'live_start_epoch': epoch_key(live_start_text) if first_live_year else 0,
+        'live_start_day': first_live_year * 10000 + 101 if first_live_year else 0,
+    }
+
+def registry() -> dict:
+    return reference_cache.cached('arsiv_donemleri', _load_registry)
+
+def refresh() -> dict:
+    # Anlık görüntü açılmadan önce çağrılır: işlem başladıktan sonra yeni arşiv eklenemez.
+    reference_cache.expire()
+    return registry()
+
+def first_live_year():
+    return registry()['first_live_year']
+
+def live_start_day() -> int:
+    return registry()['live_start_day']
+
+def live_start_text() -> str:
+    return registry()['live_start_text']
+
+def for_range(conn, start_epoch: int, end_epoch: int) -> list[tuple[str, int, int]]:
+    state = registry()
+    live = ('', max(start_epoch, state['live_start_epoch']), end_epoch)
+    wanted = [(schema, max(start_epoch, period_start), min(end_epoch, period_end - 1))
+              for schema, period_start, period_end in state['periods'] if start_epoch < period_end and end_epoch >= period_start]
+    if not wanted:
+        return [live]
+    attached = connection.attach_databases(conn, [schema for schema, _, _ in wanted])
+    if any(schema not in attached for schema, _, _ in wanted):
+        # Anlık görüntü açıldıktan sonra kaydedilen arşiv eklenemez; o görüntüde satırlar henüz canlı veritabanındadır.
+        logging.warning("Rapor aralığındaki arşiv dosyaları bağlantıya eklenemedi; yalnızca canlı veritabanı okunuyor.")
+        return [('', start_epoch, end_epoch)]
+    return [live] + [(f"{schema}.", start, end) for schema, start, end in wanted]
+
+def union_all(arm: str, sources, params_for) -> tuple[str, list]:
+    # params_for(başlangıç, bitiş): kolun parametreleri, sorgudaki sırasıyla.
+    sql = " UNION ALL ".join(arm.format(db=prefix) for prefix, _, _ in sources)
+    params = [param for _, start, end in sources for param in params_for(start, end)]
+    return sql, params
@@ -5,14 +5,50 @@ from database.connection import get_db_connection
 import sqlite3
 import logging
 
+from . import archive_sources
+from .money import to_kurus
+from .date_keys import epoch_key
+from .text_search import fold_search_key, phone_key, glob_prefix, search_tokens
+
 GENERAL_CUSTOMER_ID = 1
 
+# Arama anahtarları: Türkçe harfleri sadeleştirilmiş ad/soyad, yalnızca rakamlardan oluşan telefon
+# (sonek araması için ters çevrilmiş hâli de) ve küçük harfli e-posta. Müşteri eklenirken ve
+# güncellenirken yeniden hesaplanır.
+SEARCH_KEY_COLUMNS = ('arama_ad', 'arama_soyad', 'arama_telefon', 'arama_telefon_ters', 'arama_eposta')
+
+def customer_search_keys(data) -> dict:
+    telefon = phone_key(data.get('telefon'))
+    return {
+        'arama_ad': fold_search_key(data.get('ad')), 'arama_soyad': fold_search_key(data.get('soyad')),
+        'arama_telefon': telefon, 'arama_telefon_ters': telefon[::-1],
+        'arama_eposta': str(data.get('eposta') or '').strip().lower(),
+    }
+
+def refresh_customer_search_keys(conn=None) -> int:
+    db_conn = conn or get_db_connection()
+    try:
+        rows = db_conn.execute("SELECT id, ad, soyad, telefon, eposta FROM musteriler").fetchall()
+        assignments = ", ".join(f"{column} = :{column}" for column in SEARCH_KEY_COLUMNS)
+        db_conn.executemany(f"UPDATE musteriler SET {assignments} WHERE id = :id", [customer_search_keys(dict(row)) | {'id': row['id']} for row in rows])
+        if not conn: db_conn.commit()
+        return len(rows)
+    except sqlite3.Error as e:
+        logging.error(f"Müşteri arama anahtarları güncellenemedi: {e}", exc_info=True)
+        if not conn: db_conn.rollback()
+        if conn: raise
+        return -1
+    finally:
+        if not conn: db_conn.close()
+
 def add_customer(data):
     with get_db_connection() as conn:
         cursor = conn.execute("""
-            INSERT INTO musteriler (ad, soyad, telefon, ikinci_telefon, eposta, tc_no, vergi_no, il, ilce, mahalle, acik_adres, notlar, grup_id) 
-            VALUES (:ad, :soyad, :telefon, :ikinci_telefon, :eposta, :tc_no, :vergi_no, :il, :ilce, :mahalle, :acik_adres, :notlar, :grup_id)
-            """, data)
+            INSERT INTO musteriler (ad, soyad, telefon, ikinci_telefon, eposta, tc_no, vergi_no, il, ilce, mahalle, acik_adres, notlar, grup_id,
+                                    arama_ad, arama_soyad, arama_telefon, arama_telefon_ters, arama_eposta) 
+            VALUES (:ad, :soyad, :telefon, :ikinci_telefon, :eposta, :tc_no, :vergi_no, :il, :ilce, :mahalle, :acik_adres, :notlar, :grup_id,
+                    :arama_ad, :arama_soyad, :arama_telefon, :arama_telefon_ters, :arama_eposta)
+            """, data | customer_search_keys(data))
         return cursor.lastrowid
 
 def update_customer(customer_id, data):
@@ -22,19 +58,73 @@ def update_customer(customer_id, data):
             UPDATE musteriler SET 
             ad=:ad, soyad=:soyad, telefon=:telefon, ikinci_telefon=:ikinci_telefon, eposta=:eposta, 
             tc_no=:tc_no, vergi_no=:vergi_no, il=:il, ilce=:ilce, mahalle=:mahalle, 
-            acik_adres=:acik_adres, notlar=:notlar, grup_id=:grup_id 
+            acik_adres=:acik_adres, notlar=:notlar, grup_id=:grup_id,
+            arama_ad=:arama_ad, arama_soyad=:arama_soyad, arama_telefon=:arama_telefon,
+            arama_telefon_ters=:arama_telefon_ters, arama_eposta=:arama_eposta
             WHERE id=:id
-            """, data)
+            """, data | customer_search_keys(data))
 
 def archive_customer(customer_id: int):
     with get_db_connection() as conn:
         conn.execute("UPDATE musteriler SET aktif_mi = 0 WHERE id = ?", (customer_id,))
 
+# Müşteri bakiyesi (musteri_bakiye_ozet): satış toplamı (borç) ve ödeme toplamı (alacak) kuruş olarak
+# tutulur. Satış/ödeme ekleyip silen fonksiyonlar farkı aynı işlem içinde uygular; bakiye = borç - alacak.
+# Arşivlenen yılların toplamları musteri_devir_bakiye tablosuna devredilir (bkz. database/archive.py).
+BALANCE_CHANGE_SQL = """
+    INSERT INTO musteri_bakiye_ozet (musteri_id, toplam_borc, toplam_alacak) VALUES (?, ?, ?)
+    ON CONFLICT(musteri_id) DO UPDATE SET
+        toplam_borc = toplam_borc + excluded.toplam_borc,
+        toplam_alacak = toplam_alacak + excluded.toplam_alacak
+"""
+BALANCE_SOURCE_SQL = """
+    SELECT m.id AS musteri_id,
+           (SELECT COALESCE(SUM(toplam_tutar), 0) FROM satislar WHERE musteri_id = m.id) + COALESCE(d.devir_borc, 0) AS toplam_borc,
+           (SELECT COALESCE(SUM(tutar), 0) FROM odeme_gecmisi WHERE musteri_id = m.id) + COALESCE(d.devir_alacak, 0) AS toplam_alacak
+    FROM musteriler m LEFT JOIN musteri_devir_bakiye d ON d.musteri_id = m.id
+"""
+
+def apply_balance_change(conn, musteri_id, borc_kurus=0, alacak_kurus=0):
+    if musteri_id is None: return
+    conn.execute(BALANCE_CHANGE_SQL, (musteri_id, borc_kurus, alacak_kurus))
+
+def rebuild_customer_balances(conn=None) -> int:
+    db_conn = conn or get_db_connection()
+    try:
+        db_conn.execute("DELETE FROM musteri_bakiye_ozet")
+        db_conn.execute(f"INSERT INTO musteri_bakiye_ozet (musteri_id, toplam_borc, toplam_alacak) {BALANCE_SOURCE_SQL}")
+        row_count = db_conn.execute("SELECT COUNT(*) FROM musteri_bakiye_ozet").fetchone()[0]
+        if not conn: db_conn.commit()
+        logging.info(f"Müşteri bakiyeleri yeniden hesaplandı: {row_count} müşteri.")
+        return row_count
+    except sqlite3.Error as e:
+        logging.error(f"Müşteri bakiyeleri yeniden hesaplanamadı: {e}", exc_info=True)
+        if not conn: db_conn.rollback()
+        if conn: raise
+        return -1
+    finally:
+        if not conn: db_conn.close()
+
+def verify_customer_balances() -> list[dict]:
+    # Kayıtlı bakiyeyi ham satış/ödeme toplamlarıyla karşılaştırır; uyuşmayan müşterileri döndürür.
+    with get_db_connection() as conn:
+        query = f"""
+            SELECT g.musteri_id, COALESCE(b.toplam_borc, 0) AS kayitli_borc, g.toplam_borc AS gercek_borc,
+                   COALESCE(b.toplam_alacak, 0) AS kayitli_alacak, g.toplam_alacak AS gercek_alacak
+            FROM ({BALANCE_SOURCE_SQL}) g
+            LEFT JOIN musteri_bakiye_ozet b ON b.musteri_id = g.musteri_id
+            WHERE COALESCE(b.toplam_borc, 0) != g.toplam_borc OR COALESCE(b.toplam_alacak, 0) != g.toplam_alacak
+            ORDER BY g.musteri_id
+        """
+        return [dict(row) for row in conn.execute(query).fetchall()]
+
 def add_payment(musteri_id, tutar, aciklama, conn=None):
     db_conn = conn or get_db_connection()
     try:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        db_conn.execute("INSERT INTO odeme_gecmisi (musteri_id, tarih, tutar, aciklama) VALUES (?, ?, ?, ?)", (musteri_id, now, tutar, aciklama))
+        tutar_kurus = to_kurus(tutar)
+        db_conn.execute("INSERT INTO odeme_gecmisi (musteri_id, tarih, tutar, aciklama) VALUES (?, ?, ?, ?)", (musteri_id, now, tutar_kurus, aciklama))
+        apply_balance_change(db_conn, musteri_id, alacak_kurus=tutar_kurus)
         if not conn: db_conn.commit()
     except Exception as e:
         logging.error(f"Ödeme eklenirken hata: {e}")
@@ -47,14 +137,43 @@ def get_customer_by_id(customer_id):
     with get_db_connection() as conn:
         return conn.execute("SELECT * FROM musteriler WHERE id = ?", (customer_id,)).fetchone()
 
+def _customer_search_conditions(query, params) -> list[str]:
+    # "@" içeren girdi e-posta öneki, harf içermeyen girdi telefon öneki/soneki olarak aranır;
+    # diğerlerinde her kelime ad, soyad ya da e-postanın başıyla, yalnızca rakamdan oluşan
+    # kelimeler ise telefonun başı ya da sonuyla eşleşmelidir ("ali 532").
+    query = query.strip()
+    if '@' in query:
+        params['eposta'] = glob_prefix(query.lower())
+        return ["m.arama_eposta GLOB :eposta"]
+    if not any(ch.isalpha() for ch in query):
+        digits = phone_key(query)
+        if not digits: return []
+        params['telefon'], params['telefon_ters'] = glob_prefix(digits), glob_prefix(digits[::-1])
+        return ["(m.arama_telefon GLOB :telefon OR m.arama_telefon_ters GLOB :telefon_ters)"]
+    conditions = []
+    for i, token in enumerate(search_tokens(query)):
+        if token.isdigit():
+            digits = phone_key(token)
+            if not digits: continue
+            params[f'telefon{i}'], params[f'telefon_ters{i}'] = glob_prefix(digits), glob_prefix(digits[::-1])
+            conditions.append(f"(m.arama_telefon GLOB :telefon{i} OR m.arama_telefon_ters GLOB :telefon_ters{i})")
+            continue
+        params[f'kelime{i}'] = glob_prefix(token)
+        conditions.append(f"(m.arama_ad GLOB :kelime{i} OR m.arama_soyad GLOB :kelime{i} OR m.arama_eposta GLOB :kelime{i})")
+    return conditions
+
 def search_customers(query, group_id=None):
     with get_db_connection() as conn:
-        base_query = "SELECT m.id, m.ad, m.soyad, m.telefon, m.eposta, g.ad as grup_adi FROM musteriler m LEFT JOIN musteri_gruplari g ON m.grup_id = g.id"
+        base_query = """
+            SELECT m.id, m.ad, m.soyad, m.telefon, m.eposta, g.ad as grup_adi,
+                   COALESCE(b.toplam_borc - b.toplam_alacak, 0) / 100.0 as bakiye
+            FROM musteriler m LEFT JOIN musteri_gruplari g ON m.grup_id = g.id
+            LEFT JOIN musteri_bakiye_ozet b ON b.musteri_id = m.id
+        """
         conditions = ["m.aktif_mi = 1", "m.id != :general_customer_id"]
         params = {'general_customer_id': GENERAL_CUSTOMER_ID}
         if query:
-            conditions.append("(m.ad LIKE :query OR m.soyad LIKE :query OR m.telefon LIKE :query OR m.eposta LIKE :query)")
-            params['query'] = f"%{query}%"
+            conditions.extend(_customer_search_conditions(query, params))
         if group_id and group_id > 0:
             conditions.append("m.grup_id = :group_id")
             params['group_id'] = group_id
@@ -64,42 +183,42 @@ def search_customers(query, group_id=None):
         return conn.execute(base_query, params).fetchall()
 
 def get_customer_balance(musteri_id):
-    query = """
-    SELECT
-        (SELECT COALESCE(SUM(toplam_tutar), 0) FROM satislar WHERE musteri_id = :id) -
-        (SELECT COALESCE(SUM(tutar), 0) FROM odeme_gecmisi WHERE musteri_id = :id)
-    AS balance
-    """
     with get_db_connection() as conn:
-        result = conn.execute(query, {"id": musteri_id}).fetchone()
-        return {"balance": result['balance']}
+        result = conn.execute("SELECT (toplam_borc - toplam_alacak) / 100.0 AS balance FROM musteri_bakiye_ozet WHERE musteri_id = ?", (musteri_id,)).fetchone()
+        return {"balance": result['balance'] if result else 0.0}
 
 def get_customer_transaction_history(customer_id: int):
     with get_db_connection() as conn:
+        # Arşivlenen yılların hareketleri tek bir devir satırı olarak, canlı dönemin başında gösterilir.
         query = """
+        SELECT :devir_tarihi AS tarih, 'Devir' AS islem_tipi, 'Arşivlenen yıllardan devreden bakiye' AS aciklama,
+               devir_borc / 100.0 AS borc, devir_alacak / 100.0 AS alacak
+        FROM musteri_devir_bakiye WHERE musteri_id = :id
+        UNION ALL
         SELECT satis_tarihi AS tarih, 'Satış' AS islem_tipi, '#' || id || ' Nolu Satış' AS aciklama,
-               toplam_tutar AS borc, 0 AS alacak
+               toplam_tutar / 100.0 AS borc, 0 AS alacak
         FROM satislar WHERE musteri_id = :id
         UNION ALL
-        SELECT tarih, 'Ödeme' AS islem_tipi, aciklama, 0 AS borc, tutar AS alacak
+        SELECT tarih, 'Ödeme' AS islem_tipi, aciklama, 0 AS borc, tutar / 100.0 AS alacak
         FROM odeme_gecmisi WHERE musteri_id = :id
         ORDER BY tarih ASC;
         """
-        return conn.execute(query, {"id": customer_id}).fetchall()
+        return conn.execute(query, {"id": customer_id, "devir_tarihi": archive_sources.live_start_text()}).fetchall()
 
 def get_customer_sales_report(start_date, end_date):
     with get_db_connection() as conn:
-        query = """
+        sources = archive_sources.for_range(conn, epoch_key(start_date), epoch_key(end_date))
+        totals_sql, params = archive_sources.union_all("""
+            SELECT s.musteri_id, sd.miktar * sd.birim_fiyat as ciro, sd.miktar * sd.birim_maliyet as maliyet
+            FROM {db}satislar s JOIN {db}satis_detaylari sd ON s.id = sd.satis_id
+            WHERE s.satis_zamani BETWEEN ? AND ? AND s.musteri_id != ?
+        """, sources, lambda start, end: [start, end, GENERAL_CUSTOMER_ID])
+        query = f"""
             SELECT m.id as musteri_id, m.ad || ' ' || m.soyad as musteri_adi,
-                   SUM(sd.miktar * sd.birim_fiyat) as toplam_ciro,
-                   SUM(sd.miktar * u.alis_fiyati) as toplam_maliyet,
-                   (SUM(sd.miktar * sd.birim_fiyat) - SUM(sd.miktar * u.alis_fiyati)) as toplam_kar
-            FROM musteriler m
-            JOIN satislar s ON m.id = s.musteri_id
-            JOIN satis_detaylari sd ON s.id = sd.satis_id
-            JOIN urunler u ON sd.urun_id = u.id
-            WHERE s.satis_tarihi BETWEEN ? AND ? AND m.id != ?
+                   SUM(t.ciro) / 100.0 as toplam_ciro, SUM(t.maliyet) / 100.0 as toplam_maliyet,
+                   (SUM(t.ciro) - SUM(t.maliyet)) / 100.0 as toplam_kar
+            FROM ({totals_sql}) t JOIN musteriler m ON m.id = t.musteri_id
             GROUP BY m.id, musteri_adi HAVING toplam_ciro > 0
             ORDER BY toplam_kar DESC;
         """
-        return conn.execute(query, (start_date, end_date, GENERAL_CUSTOMER_ID)).fetchall()
\ No newline at end of file
+        return conn.execute(query, params).fetchall()
\ No newline at end of file
@@ -0,0 +1,26 @@
+# dosya: database/queries/date_keys.py
+# satislar tablosundaki tamsayı tarih anahtarları: satis_gunu (YYYYMMDD) ve satis_zamani
+# (saniye). Tarihler yerel saat olarak saklandığından epoch değeri de duvar saati UTC kabul
+# edilerek hesaplanır; böylece SQLite'taki strftime('%s', satis_tarihi) ile birebir aynıdır.
+
+import calendar
+from datetime import date, datetime
+
+DAY_KEY_SQL = "CAST(strftime('%Y%m%d', {column}) AS INTEGER)"
+EPOCH_KEY_SQL = "CAST(strftime('%s', {column}) AS INTEGER)"
+DAY_LABEL_SQL = "printf('%04d-%02d-%02d', {column} / 10000, {column} / 100 % 100, {column} % 100)"
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime): return value
+    if isinstance(value, date): return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value).strip())
+
+def day_key(value) -> int:
+    dt = _as_datetime(value)
+    return dt.year * 10000 + dt.month * 100 + dt.day
+
+def epoch_key(value) -> int:
+    return calendar.timegm(_as_datetime(value).timetuple())
+
+def day_label(key: int) -> str:
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
@@ -0,0 +1,36 @@
+# dosya: database/queries/money.py
+# Para tutarları (toplam_tutar, odenen_tutar, birim_fiyat, alis_fiyati, tutar) veritabanında
+# INTEGER kuruş olarak saklanır. Sorgu fonksiyonları dışarıya TL (float) verir; yazarken
+# to_kurus, okurken SQL içinde "/ 100.0" ya da from_kurus kullanılır. SUM gibi toplamlar
+# tamsayı üzerinden yapıldığı için kuruş kaybı olmaz.
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+KURUS_PER_TL = 100
+
+def parse_amount(text) -> Decimal:
+    # "1234,56", "1.234,56", "1,234.56" ve "1234.56" biçimlerini kabul eder.
+    if isinstance(text, Decimal): return text
+    if isinstance(text, (int, float)): return Decimal(str(text))
+    cleaned = str(text or '').replace('TL', '').replace(' ', '').strip()
+    if not cleaned: return Decimal(0)
+    if ',' in cleaned and '.' in cleaned:
+        thousands, decimal = ('.', ',') if cleaned.rfind(',') > cleaned.rfind('.') else (',', '.')
+        cleaned = cleaned.replace(thousands, '').replace(decimal, '.')
+    else:
+        cleaned = cleaned.replace(',', '.')
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation:
+        raise ValueError(f"Geçersiz tutar: '{text}'")
+
+def to_kurus(amount) -> int:
+    if amount is None: return 0
+    return int((parse_amount(amount) * KURUS_PER_TL).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def from_kurus(kurus) -> float:
+    return (kurus or 0) / KURUS_PER_TL
+
+def to_tl(amount) -> float:
+    # Metin ya da sayı olarak gelen tutarı kuruşa yuvarlanmış TL değerine çevirir.
+    return from_kurus(to_kurus(amount))
@@ -1,10 +1,18 @@
 # dosya: database/queries/product_queries.py
 
+import json
 import sqlite3
 from datetime import datetime
 import logging
 
 from database.connection import get_db_connection
+from .money import to_kurus
+from .text_search import build_match_query
+
+# alis_fiyati kuruş olarak saklanır; ürün okuyan sorgular TL'ye çevrilmiş bu sütun listesini kullanır.
+PRODUCT_COLUMNS = """u.id, u.stok_kodu, u.ad, u.barkod, u.ana_urun_kodu, u.kategori_id, u.vergi_id,
+    u.alis_fiyati / 100.0 AS alis_fiyati, u.alis_para_birimi, u.stok_miktari, u.min_stok_seviyesi,
+    u.gorsel_yolu, u.aktif_mi, u.varyant_tipi_id"""
 
 def add_product(data: dict, conn=None) -> int | None:
     sql = """
@@ -22,7 +30,7 @@ def add_product(data: dict, conn=None) -> int | None:
 
         if not data.get('barkod'): data['barkod'] = None
         
-        cursor = db_conn.execute(sql, data)
+        cursor = db_conn.execute(sql, data | {'alis_fiyati': to_kurus(data.get('alis_fiyati'))})
         if not conn: db_conn.commit()
         return cursor.lastrowid
     except sqlite3.IntegrityError as e:
@@ -46,7 +54,7 @@ def update_product(product_id: int, data: dict, conn=None) -> bool:
     try:
         data.setdefault('varyant_tipi_id', None)
         if 'barkod' in data and not data['barkod']: data['barkod'] = None
-        db_conn.execute(sql, data)
+        db_conn.execute(sql, data | {'alis_fiyati': to_kurus(data.get('alis_fiyati'))})
         if not conn: db_conn.commit()
         return True
     except sqlite3.IntegrityError as e:
@@ -89,25 +97,38 @@ def check_varyant_tipi_in_use(tip_id: int) -> bool:
 
 def get_product_by_id(product_id):
     with get_db_connection() as conn:
-        return conn.execute("SELECT * FROM urunler WHERE id = ?", (product_id,)).fetchone()
+        return conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM urunler u WHERE u.id = ?", (product_id,)).fetchone()
+
+def get_product_by_code(code):
+    # Barkod okuyucu için tam eşleşme: önce barkod (idx_urunler_barkod), yoksa stok kodu (UNIQUE).
+    code = str(code or '').strip()
+    if not code: return None
+    with get_db_connection() as conn:
+        product = conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM urunler u WHERE u.barkod = ? AND u.barkod != '' AND u.aktif_mi = 1", (code,)).fetchone()
+        return product or conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM urunler u WHERE u.stok_kodu = ? AND u.aktif_mi = 1", (code,)).fetchone()
 
 def get_products_by_stok_codes(codes: list):
     if not codes: return []
     with get_db_connection() as conn:
         placeholders = ','.join('?' for _ in codes)
-        return conn.execute(f"SELECT * FROM urunler WHERE stok_kodu IN ({placeholders})", codes).fetchall()
+        return conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM urunler u WHERE u.stok_kodu IN ({placeholders})", codes).fetchall()
 
 def get_variants_by_main_code(main_code):
     with get_db_connection() as conn:
-        return conn.execute("SELECT * FROM urunler WHERE ana_urun_kodu = ? AND aktif_mi = 1", (main_code,)).fetchall()
+        return conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM urunler u WHERE u.ana_urun_kodu = ? AND u.aktif_mi = 1", (main_code,)).fetchall()
 
 def get_products(search_query=None, category_id=None, stock_status=None, sort_by='ad', sort_order='ASC'):
     with get_db_connection() as conn:
-        query = "SELECT u.*, k.ad as kategori_ad FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id"
+        query = f"SELECT {PRODUCT_COLUMNS}, k.ad as kategori_ad FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id"
         conditions, params = ["u.aktif_mi = 1"], []
         if search_query:
-            conditions.append("(u.ad LIKE ? OR u.stok_kodu LIKE ? OR u.barkod LIKE ?)")
-            params.extend([f"%{search_query}%"] * 3)
+            match_query = build_match_query(search_query)
+            if match_query:
+                conditions.append("u.id IN (SELECT rowid FROM urunler_fts WHERE urunler_fts MATCH ?)")
+                params.append(match_query)
+            else:
+                conditions.append("(u.ad LIKE ? OR u.stok_kodu LIKE ? OR u.barkod LIKE ?)")
+                params.extend([f"%{search_query}%"] * 3)
         if category_id is not None:
             conditions.append("u.kategori_id = ?")
             params.append(category_id)
@@ -118,6 +139,35 @@ def get_products(search_query=None, category_id=None, stock_status=None, sort_by
         query += " ORDER BY u.ad"
         return conn.execute(query, params).fetchall()
 
+# Satış ekranındaki açılır liste için: en alakalı ilk `limit` ürün. Ad eşleşmesi, stok kodu ve
+# barkod eşleşmesinden daha ağır basar (bm25 sütun ağırlıkları). bm25 her eşleşme için ayrı
+# hesaplandığından "8" gibi neredeyse tüm ürünlere uyan kısa girdilerde sıralama ada göre yapılır.
+PRODUCT_SEARCH_LIMIT = 50
+PRODUCT_SEARCH_RANK_CAP = 5000
+PRODUCT_SEARCH_RANK_SQL = "bm25(urunler_fts, 10.0, 4.0, 4.0)"
+
+def search_products(search_query, limit=PRODUCT_SEARCH_LIMIT):
+    match_query = build_match_query(search_query)
+    with get_db_connection() as conn:
+        if not match_query:
+            if search_query: return get_products(search_query)[:limit]
+            return conn.execute(
+                f"SELECT {PRODUCT_COLUMNS}, k.ad as kategori_ad FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id WHERE u.aktif_mi = 1 ORDER BY u.ad LIMIT ?",
+                (limit,)
+            ).fetchall()
+        match_count = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM urunler_fts WHERE urunler_fts MATCH ? LIMIT ?)",
+            (match_query, PRODUCT_SEARCH_RANK_CAP + 1)
+        ).fetchone()[0]
+        order_by = f"{PRODUCT_SEARCH_RANK_SQL}, u.ad" if match_count <= PRODUCT_SEARCH_RANK_CAP else "u.ad"
+        query = f"""
+            SELECT {PRODUCT_COLUMNS}, k.ad as kategori_ad
+            FROM urunler_fts f JOIN urunler u ON u.id = f.rowid LEFT JOIN kategoriler k ON u.kategori_id = k.id
+            WHERE urunler_fts MATCH ? AND u.aktif_mi = 1
+            ORDER BY {order_by} LIMIT ?
+        """
+        return conn.execute(query, (match_query, limit)).fetchall()
+
 def check_product_in_use(product_id):
     with get_db_connection() as conn:
         return conn.execute("SELECT 1 FROM satis_detaylari WHERE urun_id = ? LIMIT 1", (product_id,)).fetchone() is not None
@@ -136,15 +186,67 @@ def delete_product(product_id):
         logging.error(f"Ürün silinirken veritabanı hatası: {e}")
         return False
 
+class InsufficientStockError(ValueError):
+    def __init__(self, shortages: list[dict]):
+        self.shortages = shortages
+        details = ", ".join(f"{item['ad']} (istenen {item['istenen']}, stok {item['mevcut']})" for item in shortages)
+        super().__init__(f"Yetersiz stok: {details}")
+
+# Sepet satırları tek parametre (JSON dizisi) olarak gönderilir; SQL metni sabit kaldığı
+# için sepet boyutundan bağımsız olarak deyim önbelleğinden yeniden kullanılır.
+BULK_STOCK_UPDATE_SQL = """
+    WITH degisim AS (
+        SELECT json_extract(value, '$[0]') AS urun_id, json_extract(value, '$[1]') AS miktar
+        FROM json_each(?)
+    )
+    UPDATE urunler SET stok_miktari = stok_miktari + degisim.miktar
+    FROM degisim WHERE urunler.id = degisim.urun_id
+    RETURNING urunler.id, urunler.stok_miktari
+"""
+
+# Düşüşler yalnızca stok yetiyorsa uygulanır (stok_miktari >= istenen). Kontrol ve güncelleme
+# aynı ifadede yapıldığından aynı veritabanını paylaşan kasalar son ürünü iki kez satamaz.
+GUARDED_STOCK_UPDATE_SQL = """
+    WITH degisim AS (
+        SELECT json_extract(value, '$[0]') AS urun_id, json_extract(value, '$[1]') AS miktar
+        FROM json_each(?)
+    )
+    UPDATE urunler SET stok_miktari = stok_miktari + degisim.miktar
+    FROM degisim WHERE urunler.id = degisim.urun_id
+      AND (degisim.miktar > 0 OR urunler.stok_miktari >= -degisim.miktar)
+    RETURNING urunler.id, urunler.stok_miktari
+"""
+
+def _find_stock_shortages(conn, changes: dict, skipped_ids: list) -> list[dict]:
+    placeholders = ", ".join("?" for _ in skipped_ids)
+    rows = conn.execute(f"SELECT id, ad, stok_miktari FROM urunler WHERE id IN ({placeholders})", skipped_ids).fetchall()
+    return [{'urun_id': row['id'], 'ad': row['ad'], 'istenen': -changes[row['id']], 'mevcut': row['stok_miktari']} for row in rows]
+
+def apply_stock_changes(conn, changes: dict, hareket_tipi: str, aciklama: str, enforce_stock: bool = False) -> dict:
+    changes = {urun_id: miktar for urun_id, miktar in changes.items() if miktar != 0}
+    if not changes: return {}
+    sql = GUARDED_STOCK_UPDATE_SQL if enforce_stock else BULK_STOCK_UPDATE_SQL
+    rows = conn.execute(sql, (json.dumps(list(changes.items())),)).fetchall()
+    new_stocks = {row[0]: row[1] for row in rows}
+
+    if skipped := [urun_id for urun_id in changes if urun_id not in new_stocks]:
+        shortages = _find_stock_shortages(conn, changes, skipped) if enforce_stock else []
+        if missing := sorted(set(skipped) - {item['urun_id'] for item in shortages}):
+            raise ValueError(f"Stok hareketi için ürün bulunamadı: ID {', '.join(map(str, missing))}")
+        raise InsufficientStockError(shortages)
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn.executemany(
+        "INSERT INTO stok_hareketleri (urun_id, tarih, hareket_tipi, miktar, aciklama, son_stok) VALUES (?, ?, ?, ?, ?, ?)",
+        [(urun_id, now, hareket_tipi, miktar, aciklama, new_stocks[urun_id]) for urun_id, miktar in changes.items()]
+    )
+    return new_stocks
+
 def add_stock_movement(urun_id: int, hareket_tipi: str, miktar: int, aciklama: str, conn=None):
     if miktar == 0: return True
     db_conn = conn or get_db_connection()
     try:
-        cursor = db_conn.execute("UPDATE urunler SET stok_miktari = stok_miktari + ? WHERE id = ?", (miktar, urun_id))
-        if cursor.rowcount == 0: raise ValueError(f"Stok hareketi için ürün bulunamadı: ID {urun_id}")
-        new_stock = db_conn.execute("SELECT stok_miktari FROM urunler WHERE id = ?", (urun_id,)).fetchone()[0]
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        db_conn.execute("INSERT INTO stok_hareketleri (urun_id, tarih, hareket_tipi, miktar, aciklama, son_stok) VALUES (?, ?, ?, ?, ?, ?)", (urun_id, now, hareket_tipi, miktar, aciklama, new_stock))
+        apply_stock_changes(db_conn, {urun_id: miktar}, hareket_tipi, aciklama)
         if not conn: db_conn.commit()
         return True
     except (sqlite3.Error, ValueError) as e:
@@ -163,11 +265,11 @@ def archive_variant_group(main_product_code: str):
 
 def get_inventory_report(category_id=None):
     with get_db_connection() as conn:
-        base_query = "SELECT u.stok_kodu, u.ad, k.ad as kategori_ad, u.stok_miktari, u.alis_fiyati, (u.stok_miktari * u.alis_fiyati) as toplam_maliyet FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id"
+        base_query = "SELECT u.stok_kodu, u.ad, k.ad as kategori_ad, u.stok_miktari, u.alis_fiyati / 100.0 as alis_fiyati, (u.stok_miktari * u.alis_fiyati) / 100.0 as toplam_maliyet FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id"
         conditions, params = ["u.aktif_mi = 1"], []
         if category_id:
             conditions.append("u.kategori_id = ?"); params.append(category_id)
-        query = base_query + " WHERE " + " AND ".join(conditions)
-        report_data = conn.execute(query, params).fetchall()
-        total_value = sum(item['toplam_maliyet'] for item in report_data)
+        where_clause = " WHERE " + " AND ".join(conditions)
+        report_data = conn.execute(base_query + where_clause, params).fetchall()
+        total_value = conn.execute("SELECT COALESCE(SUM(u.stok_miktari * u.alis_fiyati), 0) / 100.0 FROM urunler u" + where_clause, params).fetchone()[0]
         return report_data, total_value
\ No newline at end of file
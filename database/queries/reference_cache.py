@@ -0,0 +1,60 @@
+# dosya: database/queries/reference_cache.py
+# ayarlar, kategoriler, vergi_oranlari ve musteri_gruplari nadiren değişir ama satış ekranı,
+# fiyat hesaplama, PDF ve panel tarafından sürekli okunur; bu yüzden süreç içinde önbellekte
+# tutulur. Bu süreçteki yazma fonksiyonları invalidate() ile önbelleği hemen boşaltır. Başka
+# bir süreçten (ikinci kasa, bakım betiği) yapılan değişiklikler, tetikleyicilerle artırılan
+# referans_surum sayacı üzerinden en geç REFERENCE_CACHE_CHECK_INTERVAL saniye içinde fark edilir.
+
+import time
+import sqlite3
+import threading
+
+from database import connection
+
+REFERENCE_TABLES = ('ayarlar', 'kategoriler', 'vergi_oranlari', 'musteri_gruplari')
+REFERENCE_CACHE_CHECK_INTERVAL = 2.0
+
+_lock = threading.RLock()
+_entries = {}
+_state = {'database_path': None, 'surum': None, 'checked_at': None}
+
+def _read_version():
+    try:
+        with connection.get_db_connection() as conn:
+            row = conn.execute("SELECT surum FROM referans_surum WHERE id = 1").fetchone()
+            return row['surum'] if row else None
+    except sqlite3.OperationalError:
+        # Geçişler henüz uygulanmadıysa sayaç yoktur; yalnızca yerel geçersiz kılma çalışır.
+        return None
+
+def _validate():
+    if _state['database_path'] != connection.DATABASE_PATH:
+        _entries.clear()
+        _state.update(database_path=connection.DATABASE_PATH, surum=None, checked_at=None)
+    now = time.monotonic()
+    if _state['checked_at'] is not None and now - _state['checked_at'] < REFERENCE_CACHE_CHECK_INTERVAL:
+        return
+    version = _read_version()
+    if version != _state['surum']:
+        _entries.clear()
+        _state['surum'] = version
+    _state['checked_at'] = now
+
+def cached(name, loader):
+    with _lock:
+        _validate()
+        if name not in _entries:
+            _entries[name] = loader()
+        return _entries[name]
+
+def invalidate():
+    with _lock:
+        _entries.clear()
+        _state['checked_at'] = None
+
+def expire():
+    # Önbelleği boşaltmadan sürüm sayacının bir sonraki okumada yeniden kontrol edilmesini sağlar.
+    # Yazıcı iş parçacığı her toplu işlemden sonra çağırır: işlem içinde yapılan invalidate()
+    # commit'ten önce çalıştığından arada eski değer yeniden önbelleğe alınmış olabilir.
+    with _lock:
+        _state['checked_at'] = None
@@ -2,75 +2,174 @@
 
 import sqlite3
 import logging
+from collections import defaultdict
 from datetime import datetime
 
 from database.connection import get_db_connection
-from . import product_queries 
+from . import product_queries, customer_queries, settings_queries, archive_sources
+from .money import to_kurus, from_kurus
+from .date_keys import day_key, epoch_key, DAY_LABEL_SQL
+from .sale_search import sales_search_conditions
 
-def create_sale(sale_data, sale_details, sale_date_str=None):
+def _aggregate_quantities(details, sign: int) -> dict:
+    quantities = defaultdict(int)
+    for detail in details:
+        quantities[detail['urun_id']] += sign * detail['miktar']
+    return quantities
+
+# satis_detaylari.birim_maliyet (kuruş) ve kdv_orani satış anında yazılır; kâr raporları
+# ürünün güncel alış fiyatını değil bu anlık değerleri kullanır.
+def unit_cost_kurus(alis_kurus: int, currency) -> int:
+    if not currency or currency == 'TL': return alis_kurus
+    rate = settings_queries.get_setting_float(f"{currency.lower()}_tl_kuru", 0.0)
+    # Kur tanımsızsa maliyet dönüştürülmeden alınır (anlık değerlerden önceki raporlarla aynı).
+    return to_kurus(from_kurus(alis_kurus) * rate) if rate > 0 else alis_kurus
+
+def get_cost_snapshots(conn, product_ids) -> dict:
+    # urun_id -> (TL birim maliyet kuruş, KDV oranı)
+    product_ids = list(product_ids)
+    if not product_ids: return {}
+    rows = conn.execute(
+        f"SELECT id, alis_fiyati, alis_para_birimi, vergi_id FROM urunler WHERE id IN ({','.join('?' for _ in product_ids)})", product_ids
+    ).fetchall()
+    default_vat = settings_queries.get_setting_float('kdv_orani', 20.0)
+    snapshots = {}
+    for row in rows:
+        tax_row = settings_queries.get_vergi_orani_by_id(row['vergi_id'])
+        snapshots[row['id']] = (unit_cost_kurus(row['alis_fiyati'], row['alis_para_birimi']), tax_row['oran'] if tax_row else default_vat)
+    return snapshots
+
+# Günlük özet (gunluk_satis_ozet): gün + müşteri başına ciro, maliyet, satış ve ürün adedi.
+# Satış eklenip silindikçe yalnızca etkilenen gün/müşteri satırı ham veriden yeniden hesaplanır.
+DAILY_SUMMARY_SELECT_SQL = """
+    SELECT s.satis_gunu, COALESCE(s.musteri_id, 0), SUM(s.toplam_tutar),
+           SUM((SELECT COALESCE(SUM(sd.miktar * sd.birim_maliyet), 0) FROM satis_detaylari sd WHERE sd.satis_id = s.id)),
+           COUNT(*),
+           SUM((SELECT COALESCE(SUM(sd.miktar), 0) FROM satis_detaylari sd WHERE sd.satis_id = s.id))
+    FROM satislar s
+"""
+DAILY_SUMMARY_INSERT_SQL = "INSERT INTO gunluk_satis_ozet (gun, musteri_id, ciro, maliyet, satis_adedi, urun_adedi)"
+
+def refresh_daily_summary(conn, gun: int, musteri_id):
+    conn.execute("DELETE FROM gunluk_satis_ozet WHERE gun = ? AND musteri_id = ?", (gun, musteri_id or 0))
+    conn.execute(
+        f"{DAILY_SUMMARY_INSERT_SQL} {DAILY_SUMMARY_SELECT_SQL} WHERE s.satis_gunu = ? AND s.musteri_id IS ? GROUP BY s.satis_gunu",
+        (gun, musteri_id)
+    )
+
+def rebuild_daily_sales_summary(conn=None) -> int:
+    db_conn = conn or get_db_connection()
+    try:
+        # Arşivlenmiş yılların satırları canlı veritabanında olmadığından özetleri olduğu gibi korunur.
+        live_start_day = archive_sources.live_start_day()
+        db_conn.execute("DELETE FROM gunluk_satis_ozet WHERE gun >= ?", (live_start_day,))
+        db_conn.execute(f"{DAILY_SUMMARY_INSERT_SQL} {DAILY_SUMMARY_SELECT_SQL} WHERE s.satis_gunu >= ? GROUP BY s.satis_gunu, COALESCE(s.musteri_id, 0)", (live_start_day,))
+        row_count = db_conn.execute("SELECT COUNT(*) FROM gunluk_satis_ozet").fetchone()[0]
+        if not conn: db_conn.commit()
+        logging.info(f"Günlük satış özeti yeniden oluşturuldu: {row_count} satır.")
+        return row_count
+    except sqlite3.Error as e:
+        logging.error(f"Günlük satış özeti yeniden oluşturulamadı: {e}", exc_info=True)
+        if not conn: db_conn.rollback()
+        if conn: raise
+        return -1
+    finally:
+        if not conn: db_conn.close()
+
+def commit_sale(sale_data, sale_details, sale_date_str=None, replaces_sale_id=None) -> tuple[int | None, list]:
+    # Satışı stok kontrolüyle tek işlemde kaydeder. Dönüş: (satis_id, []) başarılı,
+    # (None, yetersiz_satirlar) stok yetmedi, (None, []) veritabanı hatası.
     try:
         with get_db_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            previous_snapshots = {}
+            if replaces_sale_id:
+                # Düzenlenen satışta önceden satılmış ürünlerin maliyeti ilk satıştaki gibi kalır.
+                previous_snapshots = {row['urun_id']: (row['birim_maliyet'], row['kdv_orani']) for row in conn.execute(
+                    "SELECT urun_id, birim_maliyet, kdv_orani FROM satis_detaylari WHERE satis_id = ?", (replaces_sale_id,))}
+                success, message = delete_sale_by_id(replaces_sale_id)
+                if not success: raise ValueError(message)
+
             satis_tarihi = sale_date_str or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
+            if day_key(satis_tarihi) < archive_sources.live_start_day():
+                raise ValueError(f"{satis_tarihi[:4]} yılı arşivlendi; bu tarihe satış eklenemez.")
+            toplam_kurus, odenen_kurus = to_kurus(sale_data['toplam_tutar']), to_kurus(sale_data['odenen_tutar'])
             cursor = conn.execute(
-                "INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar) VALUES (?, ?, ?, ?)",
-                (sale_data['musteri_id'], satis_tarihi, sale_data['toplam_tutar'], sale_data['odenen_tutar'])
+                "INSERT INTO satislar (musteri_id, satis_tarihi, toplam_tutar, odenen_tutar, satis_gunu, satis_zamani) VALUES (?, ?, ?, ?, ?, ?)",
+                (sale_data['musteri_id'], satis_tarihi, toplam_kurus, odenen_kurus, day_key(satis_tarihi), epoch_key(satis_tarihi))
             )
             satis_id = cursor.lastrowid
             
-            for detail in sale_details:
-                conn.execute(
-                    "INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat) VALUES (?, ?, ?, ?)",
-                    (satis_id, detail['urun_id'], detail['miktar'], detail['birim_fiyat'])
-                )
-                product_queries.add_stock_movement(
-                    urun_id=detail['urun_id'], hareket_tipi="Satış", 
-                    miktar=-detail['miktar'], aciklama=f"Satış No: {satis_id}", conn=conn
-                )
+            snapshots = get_cost_snapshots(conn, {detail['urun_id'] for detail in sale_details} - previous_snapshots.keys()) | previous_snapshots
+            conn.executemany(
+                "INSERT INTO satis_detaylari (satis_id, urun_id, miktar, birim_fiyat, birim_maliyet, kdv_orani) VALUES (?, ?, ?, ?, ?, ?)",
+                [(satis_id, detail['urun_id'], detail['miktar'], to_kurus(detail['birim_fiyat'])) + snapshots.get(detail['urun_id'], (0, None)) for detail in sale_details]
+            )
+            product_queries.apply_stock_changes(
+                conn, _aggregate_quantities(sale_details, sign=-1),
+                hareket_tipi="Satış", aciklama=f"Satış No: {satis_id}", enforce_stock=True
+            )
             
-            if sale_data['odenen_tutar'] > 0:
+            if odenen_kurus > 0:
                 payment_description = f"#{satis_id} Nolu Satış İçin Ödeme"
                 conn.execute(
                     "INSERT INTO odeme_gecmisi (musteri_id, tarih, tutar, aciklama) VALUES (?, ?, ?, ?)",
-                    (sale_data['musteri_id'], satis_tarihi, sale_data['odenen_tutar'], payment_description)
+                    (sale_data['musteri_id'], satis_tarihi, odenen_kurus, payment_description)
                 )
-        return satis_id
+            customer_queries.apply_balance_change(conn, sale_data['musteri_id'], borc_kurus=toplam_kurus, alacak_kurus=max(odenen_kurus, 0))
+            refresh_daily_summary(conn, day_key(satis_tarihi), sale_data['musteri_id'])
+        return satis_id, []
+    except product_queries.InsufficientStockError as e:
+        logging.warning(f"Satış stok yetersizliği nedeniyle geri alındı: {e}")
+        return None, e.shortages
     except (sqlite3.Error, ValueError) as e:
         logging.error(f"Satış oluşturma sırasında veritabanı hatası: {e}", exc_info=True)
-        return None
+        return None, []
+
+def create_sale(sale_data, sale_details, sale_date_str=None):
+    satis_id, _ = commit_sale(sale_data, sale_details, sale_date_str)
+    return satis_id
 
 def delete_sale_by_id(sale_id: int):
     try:
         with get_db_connection() as conn:
+            sale_row = conn.execute("SELECT satis_gunu, musteri_id, toplam_tutar FROM satislar WHERE id = ?", (sale_id,)).fetchone()
+            if sale_row and sale_row['satis_gunu'] < archive_sources.live_start_day():
+                return False, "Arşivlenmiş bir mali yıla ait satış silinemez."
             sale_details = conn.execute("SELECT urun_id, miktar FROM satis_detaylari WHERE satis_id = ?", (sale_id,)).fetchall()
             if not sale_details:
                 conn.execute("DELETE FROM satislar WHERE id = ?", (sale_id,))
+                if sale_row:
+                    refresh_daily_summary(conn, sale_row['satis_gunu'], sale_row['musteri_id'])
+                    customer_queries.apply_balance_change(conn, sale_row['musteri_id'], borc_kurus=-sale_row['toplam_tutar'])
                 return True, "Satış detayı bulunamasa da ana kayıt silindi."
 
-            for detail in sale_details:
-                product_queries.add_stock_movement(
-                    urun_id=detail['urun_id'], hareket_tipi='Satış İptali', 
-                    miktar=detail['miktar'], aciklama=f"İptal Edilen Satış No: {sale_id}", conn=conn
-                )
+            product_queries.apply_stock_changes(
+                conn, _aggregate_quantities(sale_details, sign=1),
+                hareket_tipi='Satış İptali', aciklama=f"İptal Edilen Satış No: {sale_id}"
+            )
             
             conn.execute("DELETE FROM satislar WHERE id = ?", (sale_id,))
+            refresh_daily_summary(conn, sale_row['satis_gunu'], sale_row['musteri_id'])
+            customer_queries.apply_balance_change(conn, sale_row['musteri_id'], borc_kurus=-sale_row['toplam_tutar'])
         return True, f"#{sale_id} numaralı satış başarıyla iptal edildi ve stoklar iade edildi."
     except (sqlite3.Error, ValueError) as e:
         logging.error(f"Satış silinirken veritabanı hatası oluştu: {e}", exc_info=True)
         return False, f"Satış silinemedi: {e}"
 
 def get_sales_by_day_for_month():
-    start_of_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    query = """
-        SELECT strftime('%Y-%m-%d', satis_tarihi) as gun, SUM(toplam_tutar) as toplam_satis
-        FROM satislar WHERE satis_tarihi >= ? GROUP BY gun ORDER BY gun ASC
+    start_of_month = datetime.now().replace(day=1)
+    query = f"""
+        SELECT {DAY_LABEL_SQL.format(column='gun')} as gun, SUM(ciro) / 100.0 as toplam_satis
+        FROM gunluk_satis_ozet WHERE gun >= ? GROUP BY gunluk_satis_ozet.gun ORDER BY gunluk_satis_ozet.gun ASC
     """
     with get_db_connection() as conn:
-        return conn.execute(query, (start_of_month,)).fetchall()
+        return conn.execute(query, (day_key(start_of_month),)).fetchall()
 
 def get_sales_by_category():
     query = """
-        SELECT COALESCE(k.ad, 'Kategorisiz') as kategori_adi, SUM(sd.miktar * sd.birim_fiyat) as toplam_ciro
+        SELECT COALESCE(k.ad, 'Kategorisiz') as kategori_adi, SUM(sd.miktar * sd.birim_fiyat) / 100.0 as toplam_ciro
         FROM satis_detaylari sd
         JOIN urunler u ON sd.urun_id = u.id LEFT JOIN kategoriler k ON u.kategori_id = k.id
         WHERE u.aktif_mi = 1 GROUP BY kategori_adi ORDER BY toplam_ciro DESC
@@ -81,93 +180,145 @@ def get_sales_by_category():
 def get_recent_sales():
     with get_db_connection() as conn:
         return conn.execute("""
-            SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar 
+            SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar
             FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id 
             ORDER BY s.id DESC LIMIT 5
         """).fetchall()
 
 def get_sale_details_for_report(sale_id):
     with get_db_connection() as conn:
-        sale_info = conn.execute("SELECT s.*, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, m.telefon, m.id as musteri_id FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id WHERE s.id = ?", (sale_id,)).fetchone()
+        sale_info = conn.execute("SELECT s.id, s.satis_tarihi, s.toplam_tutar / 100.0 as toplam_tutar, s.odenen_tutar / 100.0 as odenen_tutar, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, m.telefon, m.id as musteri_id FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id WHERE s.id = ?", (sale_id,)).fetchone()
         if not sale_info: return None
         
-        details = conn.execute("SELECT sd.urun_id, sd.miktar, sd.birim_fiyat, u.ad as urun_ad, u.stok_kodu FROM satis_detaylari sd JOIN urunler u ON sd.urun_id = u.id WHERE sd.satis_id = ?", (sale_id,)).fetchall()
+        details = conn.execute("SELECT sd.urun_id, sd.miktar, sd.birim_fiyat / 100.0 as birim_fiyat, u.ad as urun_ad, u.stok_kodu FROM satis_detaylari sd JOIN urunler u ON sd.urun_id = u.id WHERE sd.satis_id = ?", (sale_id,)).fetchall()
         return {"sale_info": sale_info, "details": details}
 
+def _range_where(customer_id) -> str:
+    return " WHERE s.satis_zamani BETWEEN ? AND ?" + (" AND s.musteri_id = ?" if customer_id else "")
+
+def _range_params(customer_id):
+    return lambda start, end: [start, end] + ([customer_id] if customer_id else [])
+
 def get_sales_by_date_range(start_date, end_date, customer_id=None):
     with get_db_connection() as conn:
-        query = "SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id"
-        conditions, params = ["s.satis_tarihi BETWEEN ? AND ?"], [start_date, end_date]
-        if customer_id:
-            conditions.append("s.musteri_id = ?")
-            params.append(customer_id)
-        query += " WHERE " + " AND ".join(conditions) + " ORDER BY s.satis_tarihi DESC;"
-        sales = conn.execute(query, params).fetchall()
-        total = sum(s['toplam_tutar'] for s in sales)
+        # Aralık arşivlenmiş bir yıla uzanıyorsa o yılın dosyası da okunur (bkz. archive_sources).
+        sources = archive_sources.for_range(conn, epoch_key(start_date), epoch_key(end_date))
+        where_clause = _range_where(customer_id)
+        sales_sql, params = archive_sources.union_all(
+            "SELECT s.id, s.satis_tarihi, s.satis_zamani, s.musteri_id, s.toplam_tutar FROM {db}satislar s" + where_clause, sources, _range_params(customer_id))
+        sales = conn.execute(f"""
+            SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar
+            FROM ({sales_sql}) s LEFT JOIN musteriler m ON s.musteri_id = m.id ORDER BY s.satis_zamani DESC
+        """, params).fetchall()
+        total_sql, params = archive_sources.union_all("SELECT COALESCE(SUM(s.toplam_tutar), 0) AS tutar FROM {db}satislar s" + where_clause, sources, _range_params(customer_id))
+        total = conn.execute(f"SELECT SUM(tutar) / 100.0 FROM ({total_sql})", params).fetchone()[0]
         return sales, total
 
 def get_sales_with_profit_by_date_range(start_date, end_date, customer_id=None):
     with get_db_connection() as conn:
-        query = """
-        WITH SaleCosts AS (
-            SELECT sd.satis_id, SUM(sd.miktar * u.alis_fiyati) as toplam_maliyet
-            FROM satis_detaylari sd JOIN urunler u ON sd.urun_id = u.id
-            GROUP BY sd.satis_id
-        )
-        SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi,
-               s.toplam_tutar, COALESCE(sc.toplam_maliyet, 0) as toplam_maliyet,
-               (s.toplam_tutar - COALESCE(sc.toplam_maliyet, 0)) as kar
-        FROM satislar s
-        LEFT JOIN SaleCosts sc ON s.id = sc.satis_id
-        LEFT JOIN musteriler m ON s.musteri_id = m.id
+        # Maliyet yalnızca aralıktaki satışlar için (satış başına indeksli alt sorgu) hesaplanır.
+        sources = archive_sources.for_range(conn, epoch_key(start_date), epoch_key(end_date))
+        where_clause = _range_where(customer_id)
+        sale_costs_sql, params = archive_sources.union_all("""
+            SELECT s.id, s.satis_tarihi, s.satis_zamani, s.musteri_id, s.toplam_tutar,
+                   (SELECT COALESCE(SUM(sd.miktar * sd.birim_maliyet), 0) FROM {db}satis_detaylari sd WHERE sd.satis_id = s.id) as toplam_maliyet
+            FROM {db}satislar s""" + where_clause, sources, _range_params(customer_id))
+        query = f"""
+        WITH SaleCosts AS ({sale_costs_sql})
+        SELECT sc.id, sc.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi,
+               sc.toplam_tutar / 100.0 as toplam_tutar, sc.toplam_maliyet / 100.0 as toplam_maliyet,
+               (sc.toplam_tutar - sc.toplam_maliyet) / 100.0 as kar
+        FROM SaleCosts sc
+        LEFT JOIN musteriler m ON sc.musteri_id = m.id
+        ORDER BY sc.satis_zamani DESC
         """
-        conditions, params = ["s.satis_tarihi BETWEEN ? AND ?"], [start_date, end_date]
-        if customer_id:
-            conditions.append("s.musteri_id = ?")
-            params.append(customer_id)
-        query += " WHERE " + " AND ".join(conditions) + " ORDER BY s.satis_tarihi DESC;"
-        
         sales_data = conn.execute(query, params).fetchall()
-        total_revenue = sum(s['toplam_tutar'] for s in sales_data)
-        total_cost = sum(s['toplam_maliyet'] for s in sales_data)
-        totals = {'total_revenue': total_revenue, 'total_cost': total_cost, 'total_profit': total_revenue - total_cost}
+        range_params = _range_params(customer_id)
+        totals_sql, params = archive_sources.union_all(f"""
+            SELECT (SELECT COALESCE(SUM(s.toplam_tutar), 0) FROM {{db}}satislar s {where_clause}) AS ciro,
+                   (SELECT COALESCE(SUM(sd.miktar * sd.birim_maliyet), 0) FROM {{db}}satislar s
+                    JOIN {{db}}satis_detaylari sd ON sd.satis_id = s.id {where_clause}) AS maliyet
+        """, sources, lambda start, end: range_params(start, end) * 2)
+        revenue_kurus, cost_kurus = conn.execute(f"SELECT SUM(ciro), SUM(maliyet) FROM ({totals_sql})", params).fetchone()
+        totals = {'total_revenue': from_kurus(revenue_kurus), 'total_cost': from_kurus(cost_kurus), 'total_profit': from_kurus(revenue_kurus - cost_kurus)}
         return sales_data, totals
 
 def get_all_sales_history():
     with get_db_connection() as conn:
-        return conn.execute("SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id ORDER BY s.id DESC").fetchall()
+        return conn.execute("SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id ORDER BY s.id DESC").fetchall()
+
+SALES_HISTORY_PAGE_SIZE = 200
+
+def get_sales_history_page(before_id=None, limit=SALES_HISTORY_PAGE_SIZE, query=None):
+    # Anahtar tabanlı sayfalama: bir sonraki sayfa, önceki sayfanın son satış id'sinden devam eder.
+    with get_db_connection() as conn:
+        sql = "SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id"
+        conditions, params = [], []
+        if before_id is not None:
+            conditions.append("s.id < ?")
+            params.append(before_id)
+        if query:
+            search_conditions, search_params = sales_search_conditions(query)
+            conditions.extend(search_conditions)
+            params.extend(search_params)
+        if conditions: sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY s.id DESC LIMIT ?"
+        params.append(limit)
+        return conn.execute(sql, params).fetchall()
 
 def search_sales_history(query):
     with get_db_connection() as conn:
-        search_term = f"%{query}%"
-        return conn.execute("SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id WHERE musteri_adi LIKE ? OR s.id LIKE ? ORDER BY s.id DESC", (search_term, search_term)).fetchall()
+        conditions, params = sales_search_conditions(query)
+        sql = "SELECT s.id, s.satis_tarihi, COALESCE(m.ad || ' ' || m.soyad, 'Genel Müşteri') as musteri_adi, s.toplam_tutar / 100.0 as toplam_tutar FROM satislar s LEFT JOIN musteriler m ON s.musteri_id = m.id"
+        if conditions: sql += " WHERE " + " AND ".join(conditions)
+        return conn.execute(sql + " ORDER BY s.id DESC", params).fetchall()
 
 def get_product_sales_report(start_date, end_date, category_id=None):
     with get_db_connection() as conn:
-        query = """
-        SELECT u.id as urun_id, u.stok_kodu, u.ad as urun_adi, SUM(sd.miktar) as toplam_satilan_adet,
-               SUM(sd.miktar * sd.birim_fiyat) as toplam_ciro, SUM(sd.miktar * u.alis_fiyati) as toplam_maliyet,
-               (SUM(sd.miktar * sd.birim_fiyat) - SUM(sd.miktar * u.alis_fiyati)) as toplam_kar
-        FROM satis_detaylari sd
-        JOIN urunler u ON sd.urun_id = u.id JOIN satislar s ON sd.satis_id = s.id
+        # Toplamlar önce ürün başına satış detaylarından alınır; urunler yalnızca ad/stok kodu
+        # ve kategori filtresi için ürün başına bir kez okunur.
+        # Arşivlenmiş yıllara uzanan aralıkta her kaynağın ürün toplamları ayrıca hesaplanıp birleştirilir.
+        sources = archive_sources.for_range(conn, epoch_key(start_date), epoch_key(end_date))
+        totals_sql, params = archive_sources.union_all("""
+            SELECT sd.urun_id, SUM(sd.miktar) as toplam_satilan_adet,
+                   SUM(sd.miktar * sd.birim_fiyat) as ciro, SUM(sd.miktar * sd.birim_maliyet) as maliyet
+            FROM {db}satislar s JOIN {db}satis_detaylari sd ON sd.satis_id = s.id
+            WHERE s.satis_zamani BETWEEN ? AND ? GROUP BY sd.urun_id
+        """, sources, lambda start, end: [start, end])
+        query = f"""
+        SELECT u.id as urun_id, u.stok_kodu, u.ad as urun_adi, SUM(t.toplam_satilan_adet) as toplam_satilan_adet,
+               SUM(t.ciro) / 100.0 as toplam_ciro, SUM(t.maliyet) / 100.0 as toplam_maliyet, (SUM(t.ciro) - SUM(t.maliyet)) / 100.0 as toplam_kar
+        FROM ({totals_sql}) t JOIN urunler u ON u.id = t.urun_id
         """
-        conditions, params = ["s.satis_tarihi BETWEEN ? AND ?"], [start_date, end_date]
         if category_id:
-            conditions.append("u.kategori_id = ?")
+            query += " WHERE u.kategori_id = ?"
             params.append(category_id)
-        query += " WHERE " + " AND ".join(conditions) + " GROUP BY u.id, u.ad, u.stok_kodu ORDER BY toplam_ciro DESC;"
-        return conn.execute(query, params).fetchall()
+        return conn.execute(query + " GROUP BY u.id ORDER BY toplam_ciro DESC;", params).fetchall()
 
 def get_daily_sales_for_period(start_date, end_date, customer_id=None):
     with get_db_connection() as conn:
-        query = "SELECT strftime('%Y-%m-%d', satis_tarihi) as gun, SUM(toplam_tutar) as toplam_satis FROM satislar"
-        conditions, params = ["satis_tarihi BETWEEN ? AND ?"], [start_date, end_date]
+        query = f"SELECT {DAY_LABEL_SQL.format(column='o.gun')} as gun, SUM(o.ciro) / 100.0 as toplam_satis FROM gunluk_satis_ozet o"
+        conditions, params = ["o.gun BETWEEN ? AND ?"], [day_key(start_date), day_key(end_date)]
         if customer_id:
-            conditions.append("musteri_id = ?")
+            conditions.append("o.musteri_id = ?")
             params.append(customer_id)
-        query += " WHERE " + " AND ".join(conditions) + " GROUP BY gun ORDER BY gun ASC;"
+        query += " WHERE " + " AND ".join(conditions) + " GROUP BY o.gun ORDER BY o.gun ASC;"
         return conn.execute(query, params).fetchall()
 
+def get_sales_summary_for_period(start_date, end_date, customer_id=None) -> dict:
+    with get_db_connection() as conn:
+        query = """
+            SELECT COALESCE(SUM(ciro), 0) / 100.0 as ciro, COALESCE(SUM(maliyet), 0) / 100.0 as maliyet,
+                   COALESCE(SUM(ciro - maliyet), 0) / 100.0 as kar,
+                   COALESCE(SUM(satis_adedi), 0) as satis_adedi, COALESCE(SUM(urun_adedi), 0) as urun_adedi
+            FROM gunluk_satis_ozet
+        """
+        conditions, params = ["gun BETWEEN ? AND ?"], [day_key(start_date), day_key(end_date)]
+        if customer_id:
+            conditions.append("musteri_id = ?")
+            params.append(customer_id)
+        return dict(conn.execute(query + " WHERE " + " AND ".join(conditions), params).fetchone())
+
 def add_suspended_sale(musteri_id, sepet_json, not_str):
     with get_db_connection() as conn:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
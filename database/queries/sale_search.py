@@ -0,0 +1,144 @@
+# dosya: database/queries/sale_search.py
+# Satış geçmişi arama kutusundaki metni yapılandırılmış ölçütlere ayırır ve her ölçütü
+# indeksli bir koşula çevirir. Desteklenen girdiler (birlikte kullanılabilir):
+#   #125 / 125                      -> satış no (birincil anahtar)
+#   17.10.2026 / 2026-10-17         -> o gün (satis_zamani aralığı)
+#   10.2026 / 2026-10               -> o ay
+#   1.10.2026 - 15.10.2026          -> tarih aralığı
+#   250 TL / 250,50 / 250.50        -> tutar (idx_satislar_tutar)
+#   100-500 TL / 100-500 / >1000    -> tutar aralığı
+#   ahmet yıl                       -> müşteri adı/soyadı öneki (musteriler arama anahtarları)
+# Hiçbir biçime uymayan sayısal terim (ör. 1.500) ya da takvimde olmayan tarih hata olarak bildirilir;
+# atlanırsa arama süzülmemiş tüm satışları döndürürdü.
+
+import re
+import calendar
+from datetime import datetime
+
+from .money import to_kurus, parse_amount, KURUS_PER_TL
+from .date_keys import epoch_key
+from .text_search import glob_prefix, search_tokens
+
+_DATE = r"(?:\d{1,2}[./]\d{1,2}[./]\d{4}|\d{4}-\d{1,2}-\d{1,2})"
+_AMOUNT = r"\d+(?:[.,]\d+)*"
+_CURRENCY = r"(?:tl|₺)"
+
+_DATE_RANGE_PATTERN = re.compile(rf"({_DATE})\s*(?:-|–|\.\.)\s*({_DATE})")
+_DATE_PATTERN = re.compile(_DATE)
+_MONTH_PATTERN = re.compile(r"(?<![\d.,/-])(?:(\d{1,2})[./](\d{4})|(\d{4})-(\d{1,2}))(?![\d.,/-])")
+_AMOUNT_COMPARISON_PATTERN = re.compile(rf"([<>]=?)\s*({_AMOUNT})\s*{_CURRENCY}?", re.IGNORECASE)
+_AMOUNT_RANGE_PATTERN = re.compile(rf"(?<![\w#.,-])({_AMOUNT})\s*(?:-|–|\.\.)\s*({_AMOUNT})(?:\s*{_CURRENCY})?(?![\w.,-])", re.IGNORECASE)
+# Para birimi yazılmamışsa kuruşlu tutar: 250,50 / 250.50 / 1.250,50 (noktalı yazımda en çok iki ondalık).
+_AMOUNT_PATTERN = re.compile(
+    rf"(?<![\w#])({_AMOUNT})\s*{_CURRENCY}(?!\w)|(?<![\w#.,-])(\d{{1,3}}(?:\.\d{{3}})+,\d{{1,2}}|\d+[.,]\d{{1,2}})(?![\w.,-])",
+    re.IGNORECASE
+)
+_SALE_ID_PATTERN = re.compile(r"(?<!\S)#?(\d+)(?!\S)")
+# SQLite INTEGER sınırı: daha büyük id terimleri hiçbir satışa karşılık gelmez, tutarlar bu aralığa kırpılır.
+SQLITE_MAX_INTEGER = 2**63 - 1
+SQLITE_MIN_INTEGER = -2**63
+
+def _parse_date(text) -> datetime:
+    if '-' in text: return datetime.strptime(text, "%Y-%m-%d")
+    return datetime.strptime(text.replace('/', '.'), "%d.%m.%Y")
+
+def _day_bounds(start: datetime, end: datetime) -> tuple[int, int]:
+    return epoch_key(start.replace(hour=0, minute=0, second=0)), epoch_key(end.replace(hour=23, minute=59, second=59))
+
+def _clamp(kurus: int) -> int:
+    return max(SQLITE_MIN_INTEGER, min(kurus, SQLITE_MAX_INTEGER))
+
+def _amount_kurus(text) -> int:
+    # Decimal hassasiyetini aşan uzun rakam dizileri yuvarlamada hata verir; sınırın üstü zaten kırpılacaktır.
+    amount = parse_amount(text)
+    if amount * KURUS_PER_TL >= SQLITE_MAX_INTEGER: return SQLITE_MAX_INTEGER
+    return to_kurus(amount)
+
+def parse_sales_query(text) -> dict:
+    # gecersiz_tarihler: tarih biçimindeki ama takvimde olmayan terimler (ör. 31.02.2026).
+    # gecersiz_sayilar: hiçbir ölçüte uymayan, harf içermeyen sayısal terimler (ör. 1.500, 12:30).
+    criteria = {'ids': [], 'zaman': None, 'min_kurus': None, 'max_kurus': None, 'musteri': [], 'gecersiz_tarihler': [], 'gecersiz_sayilar': []}
+    remaining = str(text or '')
+
+    def consume(pattern, handler, invalid=None):
+        nonlocal remaining
+        def replace(match):
+            try:
+                handler(match)
+            except ValueError:
+                if invalid is None: return match.group(0)
+                invalid.append(match.group(0).strip())
+            return " "
+        remaining = pattern.sub(replace, remaining)
+
+    def date_range(match):
+        start, end = sorted((_parse_date(match.group(1)), _parse_date(match.group(2))))
+        criteria['zaman'] = _day_bounds(start, end)
+
+    def single_date(match):
+        day = _parse_date(match.group(0))
+        criteria['zaman'] = _day_bounds(day, day)
+
+    def month(match):
+        month_no, year = (int(match.group(1)), int(match.group(2))) if match.group(1) else (int(match.group(4)), int(match.group(3)))
+        first = datetime(year, month_no, 1)
+        criteria['zaman'] = _day_bounds(first, first.replace(day=calendar.monthrange(year, month_no)[1]))
+
+    def comparison(match):
+        amount = _amount_kurus(match.group(2))
+        if match.group(1).startswith('>'): criteria['min_kurus'] = _clamp(amount + (0 if match.group(1) == '>=' else 1))
+        else: criteria['max_kurus'] = _clamp(amount - (0 if match.group(1) == '<=' else 1))
+
+    def amount_range(match):
+        criteria['min_kurus'], criteria['max_kurus'] = sorted((_amount_kurus(match.group(1)), _amount_kurus(match.group(2))))
+
+    def amount(match):
+        criteria['min_kurus'] = criteria['max_kurus'] = _amount_kurus(match.group(1) or match.group(2))
+
+    def sale_id(match):
+        value = int(match.group(1))
+        if value <= SQLITE_MAX_INTEGER: criteria['ids'].append(value)
+
+    consume(_DATE_RANGE_PATTERN, date_range, criteria['gecersiz_tarihler'])
+    consume(_DATE_PATTERN, single_date, criteria['gecersiz_tarihler'])
+    consume(_MONTH_PATTERN, month, criteria['gecersiz_tarihler'])
+    consume(_AMOUNT_COMPARISON_PATTERN, comparison)
+    consume(_AMOUNT_RANGE_PATTERN, amount_range)
+    consume(_AMOUNT_PATTERN, amount)
+    consume(_SALE_ID_PATTERN, sale_id)
+    criteria['gecersiz_sayilar'] = [term for term in remaining.split() if any(ch.isdigit() for ch in term) and not any(ch.isalpha() for ch in term)]
+    criteria['musteri'] = [token for token in search_tokens(remaining) if not token.isdigit()]
+    return criteria
+
+def validate_sales_query(text) -> dict:
+    criteria = parse_sales_query(text)
+    problems = []
+    if criteria['gecersiz_tarihler']:
+        problems.append(f"Geçersiz tarih: {', '.join(criteria['gecersiz_tarihler'])} (ör. 17.10.2026 ya da 2026-10-17)")
+    if criteria['gecersiz_sayilar']:
+        problems.append(f"Anlaşılamayan sayı: {', '.join(criteria['gecersiz_sayilar'])} (tutar için 250,50 TL, satış no için #125)")
+    if problems:
+        raise ValueError(". ".join(problems))
+    return criteria
+
+def sales_search_conditions(text) -> tuple[list[str], list]:
+    criteria = validate_sales_query(text)
+    conditions, params = [], []
+    if criteria['ids']:
+        conditions.append(f"s.id IN ({','.join('?' for _ in criteria['ids'])})")
+        params.extend(criteria['ids'])
+    if criteria['zaman']:
+        conditions.append("s.satis_zamani BETWEEN ? AND ?")
+        params.extend(criteria['zaman'])
+    if criteria['min_kurus'] is not None:
+        conditions.append("s.toplam_tutar >= ?")
+        params.append(criteria['min_kurus'])
+    if criteria['max_kurus'] is not None:
+        conditions.append("s.toplam_tutar <= ?")
+        params.append(criteria['max_kurus'])
+    if criteria['musteri']:
+        name_conditions = " AND ".join("(arama_ad GLOB ? OR arama_soyad GLOB ?)" for _ in criteria['musteri'])
+        conditions.append(f"s.musteri_id IN (SELECT id FROM musteriler WHERE {name_conditions})")
+        for token in criteria['musteri']:
+            params.extend([glob_prefix(token)] * 2)
+    return conditions, params
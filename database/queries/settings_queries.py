@@ -1,24 +1,75 @@
 # dosya: database/queries/settings_queries.py
 
 import sqlite3
+import logging
 from database.connection import get_db_connection
+from . import reference_cache
+from .money import parse_amount
 
-def get_setting(anahtar, varsayilan=None):
+# Okumalar reference_cache üzerinden yapılır; bu tablolara yazan her fonksiyon
+# işlem tamamlandıktan sonra reference_cache.invalidate() çağırmalıdır.
+KATEGORILER_SQL = "SELECT * FROM kategoriler ORDER BY ad"
+VERGI_ORANLARI_SQL = "SELECT * FROM vergi_oranlari ORDER BY ad"
+MUSTERI_GRUPLARI_SQL = "SELECT id, ad FROM musteri_gruplari ORDER BY ad"
+
+def _load_settings():
     with get_db_connection() as conn:
-        row = conn.execute("SELECT deger FROM ayarlar WHERE anahtar = ?", (anahtar,)).fetchone()
-        return row['deger'] if row else varsayilan
+        return {row['anahtar']: row['deger'] for row in conn.execute("SELECT anahtar, deger FROM ayarlar")}
+
+def _load_rows(query):
+    def load():
+        with get_db_connection() as conn:
+            return conn.execute(query).fetchall()
+    return load
+
+def _rows_by_id(name, query):
+    return reference_cache.cached(f"{name}_id", lambda: {row['id']: row for row in reference_cache.cached(name, _load_rows(query))})
+
+def get_setting(anahtar, varsayilan=None):
+    return reference_cache.cached('ayarlar', _load_settings).get(anahtar, varsayilan)
+
+def get_setting_float(anahtar, varsayilan=0.0) -> float:
+    # "20,5" / "34.1234" gibi metin ayarları bir kez sayıya çevrilir; boş ya da geçersizse varsayılan.
+    parsed = reference_cache.cached('ayarlar_sayisal', dict)
+    if (anahtar, varsayilan) not in parsed:
+        deger = get_setting(anahtar)
+        try:
+            parsed[(anahtar, varsayilan)] = float(parse_amount(deger)) if deger not in (None, '') else float(varsayilan)
+        except ValueError:
+            logging.warning(f"'{anahtar}' ayarı sayıya çevrilemedi: '{deger}'. Varsayılan ({varsayilan}) kullanılacak.")
+            parsed[(anahtar, varsayilan)] = float(varsayilan)
+    return parsed[(anahtar, varsayilan)]
+
+def get_setting_bool(anahtar, varsayilan=False) -> bool:
+    deger = get_setting(anahtar)
+    return varsayilan if deger is None else deger == 'True'
 
 def save_setting(anahtar, deger):
     with get_db_connection() as conn:
         conn.execute("INSERT OR REPLACE INTO ayarlar (anahtar, deger) VALUES (?, ?)", (anahtar, str(deger)))
+    reference_cache.invalidate()
+
+def save_settings(ayarlar: dict, conn=None) -> bool:
+    # Birden fazla ayarı tek işlemde yazar; ya hepsi kaydedilir ya hiçbiri.
+    db_conn = conn or get_db_connection()
+    try:
+        db_conn.executemany("INSERT OR REPLACE INTO ayarlar (anahtar, deger) VALUES (?, ?)", [(anahtar, str(deger)) for anahtar, deger in ayarlar.items()])
+        if not conn: db_conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"Ayarlar kaydedilemedi: {e}", exc_info=True)
+        if not conn: db_conn.rollback()
+        if conn: raise
+        return False
+    finally:
+        if not conn: db_conn.close()
+        reference_cache.invalidate()
 
 def get_all_settings():
-    with get_db_connection() as conn:
-        return {row['anahtar']: row['deger'] for row in conn.execute("SELECT anahtar, deger FROM ayarlar")}
+    return dict(reference_cache.cached('ayarlar', _load_settings))
 
 def get_all_kategoriler():
-    with get_db_connection() as conn:
-        return conn.execute("SELECT id, ad FROM kategoriler ORDER BY ad").fetchall()
+    return list(reference_cache.cached('kategoriler', _load_rows(KATEGORILER_SQL)))
 
 def add_kategori(ad):
     if not ad: return
@@ -27,10 +78,12 @@ def add_kategori(ad):
             conn.execute("INSERT INTO kategoriler (ad) VALUES (?)", (ad,))
     except sqlite3.IntegrityError:
         pass
+    reference_cache.invalidate()
 
 def update_kategori(kategori_id, yeni_ad):
     with get_db_connection() as conn:
         conn.execute("UPDATE kategoriler SET ad = ? WHERE id = ?", (yeni_ad, kategori_id))
+    reference_cache.invalidate()
 
 def check_kategori_in_use(kategori_id):
     with get_db_connection() as conn:
@@ -41,6 +94,7 @@ def delete_kategori(kategori_id):
         return False, "Bu kategori bir veya daha fazla ürüne atanmış olduğu için silinemez."
     with get_db_connection() as conn:
         conn.execute("DELETE FROM kategoriler WHERE id = ?", (kategori_id,))
+    reference_cache.invalidate()
     return True, "Kategori başarıyla silindi."
 
 def get_all_varyant_tipleri():
@@ -74,8 +128,7 @@ def delete_varyant_tipi(tip_id):
     return True, "Varyant tipi başarıyla silindi."
 
 def get_all_musteri_gruplari():
-    with get_db_connection() as conn:
-        return conn.execute("SELECT id, ad FROM musteri_gruplari ORDER BY ad").fetchall()
+    return list(reference_cache.cached('musteri_gruplari', _load_rows(MUSTERI_GRUPLARI_SQL)))
 
 def add_musteri_grup(ad):
     if not ad: return
@@ -84,10 +137,12 @@ def add_musteri_grup(ad):
             conn.execute("INSERT INTO musteri_gruplari (ad) VALUES (?)", (ad,))
     except sqlite3.IntegrityError:
         pass
+    reference_cache.invalidate()
 
 def update_musteri_grup(grup_id, yeni_ad):
     with get_db_connection() as conn:
         conn.execute("UPDATE musteri_gruplari SET ad = ? WHERE id = ?", (yeni_ad, grup_id))
+    reference_cache.invalidate()
 
 def check_musteri_grup_in_use(grup_id):
     with get_db_connection() as conn:
@@ -98,24 +153,25 @@ def delete_musteri_grup(grup_id):
         return False, "Bu grup bir veya daha fazla müşteriye atanmış olduğu için silinemez."
     with get_db_connection() as conn:
         conn.execute("DELETE FROM musteri_gruplari WHERE id = ?", (grup_id,))
+    reference_cache.invalidate()
     return True, "Müşteri grubu başarıyla silindi."
 
 def get_category_details(category_id: int):
-    with get_db_connection() as conn:
-        return conn.execute("SELECT * FROM kategoriler WHERE id = ?", (category_id,)).fetchone()
+    return _rows_by_id('kategoriler', KATEGORILER_SQL).get(category_id)
 
 def update_category_profit(category_id: int, profit_type: str, profit_value: float):
     with get_db_connection() as conn:
         conn.execute("UPDATE kategoriler SET kar_tipi = ?, kar_degeri = ? WHERE id = ?", (profit_type, profit_value, category_id))
+    reference_cache.invalidate()
 
 def get_all_vergi_oranlari():
-    with get_db_connection() as conn:
-        return conn.execute("SELECT * FROM vergi_oranlari ORDER BY ad").fetchall()
+    return list(reference_cache.cached('vergi_oranlari', _load_rows(VERGI_ORANLARI_SQL)))
 
 def add_vergi_orani(ad, oran):
     try:
         with get_db_connection() as conn:
             conn.execute("INSERT INTO vergi_oranlari (ad, oran) VALUES (?, ?)", (ad, oran))
+        reference_cache.invalidate()
         return True, "Vergi oranı başarıyla eklendi."
     except sqlite3.IntegrityError:
         return False, "Bu vergi adı zaten mevcut."
@@ -129,12 +185,12 @@ def delete_vergi_orani(vergi_id):
         return False, "Bu vergi oranı bir veya daha fazla üründe kullanıldığı için silinemez."
     with get_db_connection() as conn:
         conn.execute("DELETE FROM vergi_oranlari WHERE id = ?", (vergi_id,))
+    reference_cache.invalidate()
     return True, "Vergi oranı başarıyla silindi."
 
 def get_vergi_orani_by_id(vergi_id: int):
     if not vergi_id: return None
-    with get_db_connection() as conn:
-        return conn.execute("SELECT * FROM vergi_oranlari WHERE id = ?", (vergi_id,)).fetchone()
+    return _rows_by_id('vergi_oranlari', VERGI_ORANLARI_SQL).get(vergi_id)
 
 def get_message_templates(template_type: str):
     with get_db_connection() as conn:
@@ -155,7 +211,7 @@ def delete_message_template(template_id: int):
 def get_inventory_value_by_category():
     with get_db_connection() as conn:
         return conn.execute("""
-            SELECT COALESCE(k.ad, 'Kategorisiz') as kategori_adi, SUM(u.stok_miktari * u.alis_fiyati) as toplam_deger
+            SELECT COALESCE(k.ad, 'Kategorisiz') as kategori_adi, SUM(u.stok_miktari * u.alis_fiyati) / 100.0 as toplam_deger
             FROM urunler u LEFT JOIN kategoriler k ON u.kategori_id = k.id
             WHERE u.aktif_mi = 1 AND u.stok_miktari > 0 GROUP BY kategori_adi
             HAVING toplam_deger > 0 ORDER BY toplam_deger DESC;
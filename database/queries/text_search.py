@@ -0,0 +1,43 @@
+# dosya: database/queries/text_search.py
+# FTS5 tam metin araması için Türkçe uyumlu normalleştirme. unicode61 tokenizer'ı
+# (remove_diacritics 2) büyük/küçük harf ile ç/ğ/ö/ş/ü ayrımını kendisi kaldırır; yalnızca
+# ı/İ harflerini tanımaz. Bu yüzden indekslenen metin de arama metni de önce ı/İ -> i
+# dönüşümünden geçirilir: "IŞIK", "ışık" ve "isik" aynı terime ("isik") düşer.
+# Müşteri aramasında FTS yerine önceden hesaplanmış, indeksli anahtar sütunları kullanılır
+# (fold_search_key, phone_key); bu sütunlarda önek araması GLOB 'önek*' ile yapılır.
+
+import re
+
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+TR_FOLD_SQL = "replace(replace(COALESCE({column}, ''), 'ı', 'i'), 'İ', 'i')"
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+_TR_TO_ASCII = str.maketrans("çğıöşüâîûÇĞIİÖŞÜÂÎÛ", "cgiosuaiucgiiosuaiu")
+_GLOB_SPECIAL = re.compile(r"([*?\[])")
+
+def fold_turkish(text) -> str:
+    return str(text or '').replace('ı', 'i').replace('İ', 'i')
+
+def build_match_query(text):
+    # Kullanıcı girdisini güvenli bir FTS5 MATCH ifadesine çevirir: her kelime tırnak içinde
+    # ve önek araması (*) olarak aranır, kelimeler AND ile birleşir. Kelime yoksa None döner.
+    tokens = _TOKEN_PATTERN.findall(fold_turkish(text))
+    if not tokens: return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def search_tokens(text) -> list[str]:
+    return _TOKEN_PATTERN.findall(fold_search_key(text))
+
+def fold_search_key(text) -> str:
+    # Türkçe harfleri ASCII karşılığına indirip küçük harfe çevirir: "Şükrü IŞIK" -> "sukru isik"
+    return " ".join(str(text or '').translate(_TR_TO_ASCII).lower().split())
+
+def phone_key(text) -> str:
+    # Yalnızca rakamlar; ülke kodu (90) ve baştaki 0 atılır: "0 (532) 123 45 67" -> "5321234567"
+    text = str(text or '').strip()
+    digits = "".join(ch for ch in text if ch.isdigit())
+    if digits.startswith('90') and (len(digits) == 12 or text.startswith('+')): digits = digits[2:]
+    return digits.lstrip('0')
+
+def glob_prefix(text) -> str:
+    return _GLOB_SPECIAL.sub(r"[\1]", text) + "*"
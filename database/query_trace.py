@@ -0,0 +1,271 @@
+# dosya: database/query_trace.py
+# İsteğe bağlı SQL izleme. Açıldığında havuz yeni bağlantıları TracingConnection sınıfıyla açar:
+# her ifadenin normalleştirilmiş metni, bağlı parametre sayısı, toplam süresi (okunan satırlar
+# dahil), döndürdüğü/etkilediği satır sayısı ve ifadeyi çalıştıran fonksiyon, (fonksiyon, sorgu)
+# başına bir gecikme histogramında toplanır. Eşiği aşan ifadeler ayrı, dönen bir log dosyasına yazılır.
+# set_trace_callback yalnızca ifade başladığında metni verir; süre ve satır sayısı ölçülemediğinden
+# imleç alt sınıfı kullanılır. Kapalıyken bağlantılar düz sqlite3.Connection olarak açılır, ek yük yoktur.
+
+import re
+import sys
+import csv
+import time
+import bisect
+import logging
+import sqlite3
+import threading
+from logging.handlers import RotatingFileHandler
+
+from database import connection
+
+TRACE_SETTING_KEY = 'sql_izleme'
+SLOW_QUERY_THRESHOLD_SETTING_KEY = 'yavas_sorgu_esigi_ms'
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG_PATH = 'yavas_sorgular.log'
+SLOW_QUERY_LOG_MAX_BYTES = 2 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUP_COUNT = 3
+# Histogram kova üst sınırları (ms); son kova bunların üzerindeki her şeyi toplar.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+MAX_SQL_LENGTH = 500
+NORMALIZED_CACHE_SIZE = 4096
+
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_stats = {}
+_normalized = {}
+_state = {'enabled': False, 'threshold_ms': DEFAULT_SLOW_QUERY_THRESHOLD_MS, 'log_path': SLOW_QUERY_LOG_PATH, 'started_at': None}
+_slow_logger = logging.getLogger('yavas_sorgular')
+_slow_logger.propagate = False
+_SKIPPED_FILES = {__file__, connection.__file__}
+
+def normalize_sql(sql: str) -> str:
+    # Değişmezler ve IN (?, ?, ...) listeleri tek biçime indirilir; aynı sorgunun farklı
+    # parametrelerle çalışmaları tek satırda toplanır.
+    normalized = _normalized.get(sql)
+    if normalized is None:
+        normalized = _SPACE_PATTERN.sub(' ', sql).strip()
+        normalized = _IN_LIST_PATTERN.sub('(?, ...)', _LITERAL_PATTERN.sub('?', normalized))[:MAX_SQL_LENGTH]
+        if len(_normalized) >= NORMALIZED_CACHE_SIZE:
+            _normalized.clear()
+        _normalized[sql] = normalized
+    return normalized
+
+def _caller() -> str:
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _SKIPPED_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    return f"{frame.f_globals.get('__name__', '?').rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+
+class _QueryStat:
+    __slots__ = ('count', 'total', 'max', 'rows', 'params', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.params = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, fraction):
+        # Kova üst sınırı döner; en üst kovada gerçek en uzun süre kullanılır.
+        target = self.count * fraction
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                return min(LATENCY_BUCKETS_MS[index], self.max) if index < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+def _slow_query_handler():
+    if not _slow_logger.handlers:
+        handler = RotatingFileHandler(_state['log_path'], maxBytes=SLOW_QUERY_LOG_MAX_BYTES, backupCount=SLOW_QUERY_LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        _slow_logger.addHandler(handler)
+        _slow_logger.setLevel(logging.INFO)
+    return _slow_logger
+
+def _record(caller, sql, params, elapsed, rows):
+    normalized = normalize_sql(sql)
+    elapsed_ms = elapsed * 1000
+    with _lock:
+        stat = _stats.get((caller, normalized))
+        if stat is None:
+            stat = _stats[(caller, normalized)] = _QueryStat()
+        stat.count += 1
+        stat.total += elapsed_ms
+        stat.rows += rows
+        stat.params += params
+        if elapsed_ms > stat.max:
+            stat.max = elapsed_ms
+        stat.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+    if elapsed_ms >= _state['threshold_ms']:
+        _slow_query_handler().info(f"{elapsed_ms:.1f} ms | {caller} | {rows} satır | {params} parametre | {normalized}")
+
+class TracingCursor(sqlite3.Cursor):
+    # Süre execute ile başlar, satırlar okundukça büyür; ifade sonuç tükenince, imleç yeniden
+    # kullanılınca, kapatılınca veya çöp toplanınca kaydedilir (ör. tek satırlık fetchone sonrası).
+    _trace = None
+
+    def _start(self, sql, params, start, caller):
+        self._trace = [caller, sql, params, time.perf_counter() - start, 0]
+
+    def _add(self, start, rows, done):
+        trace = self._trace
+        if trace is not None:
+            trace[3] += time.perf_counter() - start
+            trace[4] += rows
+            if done:
+                self._finish()
+
+    def _finish(self):
+        trace, self._trace = self._trace, None
+        if trace is not None:
+            caller, sql, params, elapsed, rows = trace
+            if not rows and self.rowcount > 0:
+                rows = self.rowcount
+            _record(caller, sql, params, elapsed, rows)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        caller = _caller()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._start(sql, len(parameters), start, caller)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        caller = _caller()
+        seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._start(sql, sum(len(parameters) for parameters in seq_of_parameters), start, caller)
+            self._finish()
+
+    def executescript(self, sql_script):
+        self._finish()
+        caller = _caller()
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._start(sql_script, 0, start, caller)
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._add(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add(start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._add(start, 0, True)
+            raise
+        self._add(start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            # Yorumlayıcı kapanırken modül nesneleri silinmiş olabilir; ölçüm kaybı önemsizdir.
+            pass
+
+class TracingConnection(sqlite3.Connection):
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        if not self.in_transaction:
+            return super().commit()
+        caller = _caller()
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            _record(caller, 'COMMIT', 0, time.perf_counter() - start, 0)
+
+def configure(enabled: bool, threshold_ms: float = None, log_path: str = None):
+    if threshold_ms is not None:
+        _state['threshold_ms'] = max(float(threshold_ms), 0.0)
+    if log_path is not None and log_path != _state['log_path']:
+        _state['log_path'] = log_path
+        for handler in list(_slow_logger.handlers):
+            _slow_logger.removeHandler(handler)
+            handler.close()
+    if bool(enabled) == _state['enabled']:
+        return
+    _state['enabled'] = bool(enabled)
+    if enabled:
+        _state['started_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    # Açık bağlantıların sınıfı değiştirilemez; havuz kapatılıp yeni sınıfla yeniden açılır.
+    connection.set_connection_factory(TracingConnection if enabled else sqlite3.Connection)
+    logging.info(f"SQL izleme {'açıldı' if enabled else 'kapatıldı'} (yavaş sorgu eşiği: {_state['threshold_ms']:.0f} ms).")
+
+def is_enabled() -> bool:
+    return _state['enabled']
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
+    _state['started_at'] = time.strftime('%Y-%m-%d %H:%M:%S') if _state['enabled'] else None
+
+def get_query_stats(limit: int = None) -> list:
+    # Toplam süreye göre sıralı özet; en çok zaman harcayan sorgular en üsttedir.
+    with _lock:
+        items = [(caller, sql, stat.count, stat.total, stat.max, stat.rows, stat.params, stat.percentile(0.5), stat.percentile(0.95))
+                 for (caller, sql), stat in _stats.items()]
+    items.sort(key=lambda item: item[3], reverse=True)
+    return [
+        {'cagiran': caller, 'sorgu': sql, 'adet': count, 'toplam_ms': round(total, 2), 'ort_ms': round(total / count, 3),
+         'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'en_uzun_ms': round(longest, 2),
+         'ort_satir': round(rows / count, 1), 'ort_parametre': round(params / count, 1)}
+        for caller, sql, count, total, longest, rows, params, p50, p95 in items[:limit]
+    ]
+
+def export_query_stats(path: str) -> int:
+    stats = get_query_stats()
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=['cagiran', 'sorgu', 'adet', 'toplam_ms', 'ort_ms', 'p50_ms', 'p95_ms', 'en_uzun_ms', 'ort_satir', 'ort_parametre'], delimiter=';')
+        writer.writeheader()
+        writer.writerows(stats)
+    return len(stats)
@@ -0,0 +1,164 @@
+# dosya: database/writer.py
+# Tek yazıcı iş parçacığı. Yazma fonksiyonları (commit_sale, add_stock_movement, save_setting...)
+# arayüz iş parçacığında çalıştığında kilit beklemesi ekranı CONNECTION_TIMEOUT süresine kadar
+# dondurabilir. submit() komutu kuyruğa koyar ve hemen bir Future döndürür; yazıcı kuyrukta biriken
+# komutları tek bir BEGIN IMMEDIATE işleminde, her birini kendi kayıt noktasında çalıştırır. Hata
+# veren komut yalnızca kendi değişikliklerini geri alır; sonuçlar ancak işlem commit edildikten sonra verilir.
+# Yazıcı bağlantıyı her toplu işlem için havuzdan alır, bu yüzden geri yükleme (exclusive_access)
+# yazıcının elindeki işlemin bitmesini bekleyip dosyayı güvenle değiştirebilir.
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from database import connection
+from database.queries import reference_cache
+
+WRITER_MAX_BATCH = 64
+WRITER_STOP_TIMEOUT = 30
+# Metrikler için saklanan son toplu işlem sayısı.
+WRITER_LATENCY_SAMPLES = 1000
+
+class _Command:
+    __slots__ = ('fn', 'args', 'kwargs', 'future', 'submitted')
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+_STOP = object()
+
+class DatabaseWriter:
+    def __init__(self, max_batch=WRITER_MAX_BATCH):
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._commit_times = deque(maxlen=WRITER_LATENCY_SAMPLES)
+        self._wait_times = deque(maxlen=WRITER_LATENCY_SAMPLES)
+        self._stats = {'commands': 0, 'batches': 0, 'failed_commands': 0, 'failed_batches': 0, 'max_queue_depth': 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="VeritabaniYazici", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=WRITER_STOP_TIMEOUT):
+        # Kuyrukta bekleyen komutlar işlendikten sonra iş parçacığı durur.
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logging.error(f"Veritabanı yazıcısı {timeout} sn içinde durmadı; bekleyen yazmalar olabilir.")
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        command = _Command(fn, args, kwargs)
+        if threading.current_thread() is self._thread:
+            # Yazıcı içinden gönderilen komut beklenirse kilitlenir; mevcut işlemin içinde hemen çalıştırılır.
+            self._run_command(command)
+            return command.future
+        self.start()
+        self._queue.put(command)
+        depth = self._queue.qsize()
+        with self._lock:
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+        return command.future
+
+    def _run(self):
+        while True:
+            command = self._queue.get()
+            if command is _STOP:
+                return
+            batch = [command]
+            stop_after = False
+            while len(batch) < self.max_batch:
+                try:
+                    command = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if command is _STOP:
+                    stop_after = True
+                    break
+                batch.append(command)
+            self._execute_batch(batch)
+            if stop_after:
+                return
+
+    def _run_command(self, command):
+        try:
+            command.future.set_result(command.fn(*command.args, **command.kwargs))
+        except Exception as e:
+            command.future.set_exception(e)
+
+    def _execute_batch(self, batch):
+        started = time.perf_counter()
+        outcomes = []
+        try:
+            with connection.get_db_connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                for command in batch:
+                    conn.execute("SAVEPOINT yazici_komut")
+                    try:
+                        outcomes.append((command.fn(*command.args, **command.kwargs), None))
+                    except Exception as e:
+                        logging.error(f"Yazıcı komutu başarısız ({getattr(command.fn, '__name__', command.fn)}): {e}")
+                        conn.execute("ROLLBACK TO yazici_komut")
+                        outcomes.append((None, e))
+                    conn.execute("RELEASE yazici_komut")
+        except Exception as e:
+            logging.error(f"Yazıcı toplu işlemi ({len(batch)} komut) commit edilemedi: {e}", exc_info=True)
+            outcomes = [(None, e)] * len(batch)
+            with self._lock:
+                self._stats['failed_batches'] += 1
+        finished = time.perf_counter()
+        reference_cache.expire()
+
+        failed = 0
+        for command, (result, error) in zip(batch, outcomes):
+            if error is None:
+                command.future.set_result(result)
+            else:
+                failed += 1
+                command.future.set_exception(error)
+        with self._lock:
+            self._stats['commands'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['failed_commands'] += failed
+            self._commit_times.append(finished - started)
+            self._wait_times.extend(finished - command.submitted for command in batch)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            commit_times = sorted(self._commit_times)
+            wait_times = sorted(self._wait_times)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        stats['avg_batch_size'] = round(stats['commands'] / stats['batches'], 2) if stats['batches'] else 0.0
+        for name, samples in (('commit', commit_times), ('wait', wait_times)):
+            stats[f'{name}_p50_ms'] = round(samples[len(samples) // 2] * 1000, 2) if samples else 0.0
+            stats[f'{name}_p95_ms'] = round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2) if samples else 0.0
+        return stats
+
+_writer = DatabaseWriter()
+
+def submit_write(fn, *args, **kwargs) -> Future:
+    return _writer.submit(fn, *args, **kwargs)
+
+def stop_writer(timeout: float = WRITER_STOP_TIMEOUT):
+    _writer.stop(timeout)
+
+def get_writer_stats() -> dict:
+    return _writer.get_stats()
@@ -0,0 +1,96 @@
+# dosya: db_maintenance.py
+# Kullanım: python db_maintenance.py {ozet-yenile | bakiye-dogrula | bakiye-yenile | arsiv-liste | arsivle <yil> [--sikistir]}
+
+import sys
+import sqlite3
+import argparse
+import logging
+
+from database import database_manager as db
+
+def rebuild_summary(args):
+    print("--- Günlük Satış Özeti Yeniden Oluşturuluyor ---")
+    row_count = db.rebuild_daily_sales_summary()
+    if row_count < 0:
+        print("[HATA] Günlük satış özeti oluşturulamadı. Ayrıntılar için app.log dosyasına bakın.")
+        return 1
+    print(f"[OK] Günlük satış özeti {row_count} satır olarak yeniden oluşturuldu.")
+    return 0
+
+def verify_balances(args):
+    print("--- Müşteri Bakiyeleri Doğrulanıyor ---")
+    mismatches = db.verify_customer_balances()
+    if not mismatches:
+        print("[OK] Tüm müşteri bakiyeleri satış ve ödeme kayıtlarıyla tutarlı.")
+        return 0
+    for row in mismatches:
+        print(f"[HATA] Müşteri #{row['musteri_id']}: borç {db.from_kurus(row['kayitli_borc']):,.2f} / gerçek {db.from_kurus(row['gercek_borc']):,.2f} TL, "
+              f"alacak {db.from_kurus(row['kayitli_alacak']):,.2f} / gerçek {db.from_kurus(row['gercek_alacak']):,.2f} TL")
+    print(f"{len(mismatches)} müşterinin bakiyesi tutarsız. Düzeltmek için: python db_maintenance.py bakiye-yenile")
+    return 1
+
+def rebuild_balances(args):
+    print("--- Müşteri Bakiyeleri Yeniden Hesaplanıyor ---")
+    row_count = db.rebuild_customer_balances()
+    if row_count < 0:
+        print("[HATA] Müşteri bakiyeleri hesaplanamadı. Ayrıntılar için app.log dosyasına bakın.")
+        return 1
+    print(f"[OK] {row_count} müşterinin bakiyesi yeniden hesaplandı.")
+    return 0
+
+def list_archives(args):
+    print("--- Arşivlenmiş Mali Yıllar ---")
+    periods = db.get_archive_periods()
+    for row in periods:
+        print(f"{row['yil']}: {row['dosya_adi']}  {row['satis_adedi']:,} satış, {db.from_kurus(row['ciro']):,.2f} TL ciro, "
+              f"{row['odeme_adedi']:,} ödeme, {row['hareket_adedi']:,} stok hareketi  [{row['durum']}, {row['arsivlenme_tarihi']}]")
+    if not periods:
+        print("Henüz arşivlenmiş mali yıl yok.")
+    year = db.get_archivable_year()
+    if year:
+        print(f"Arşivlenebilecek en eski yıl: {year}  (python db_maintenance.py arsivle {year})")
+    return 0
+
+def archive_year(args):
+    print(f"--- {args.yil} Mali Yılı Arşivleniyor ---")
+
+    def progress(done, total):
+        print(f"\rCanlı veritabanından siliniyor: {done:,}/{total:,}", end="", flush=True)
+
+    try:
+        info = db.archive_fiscal_year(args.yil, progress=progress)
+    except ValueError as e:
+        print(f"[HATA] {e}")
+        return 1
+    except sqlite3.Error as e:
+        print(f"\n[HATA] Arşivleme başarısız: {e}. Ayrıntılar için app.log dosyasına bakın.")
+        return 1
+    print(f"\n[OK] {info['satis_adedi']:,} satış, {info['odeme_adedi']:,} ödeme ve {info['hareket_adedi']:,} stok hareketi "
+          f"{info['dosya_yolu']} dosyasına taşındı ({info['boyut_bayt'] / 1024 / 1024:.1f} MB, {info['sure_ms'] / 1000:.1f} s).")
+    if not args.sikistir:
+        print("Boşalan alan dosyaya geri verilmedi; kasa kapalıyken --sikistir ile sıkıştırabilirsiniz.")
+        return 0
+    before, after = db.compact_database()
+    print(f"[OK] Veritabanı sıkıştırıldı: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veritabanı bakım komutları")
+    subparsers = parser.add_subparsers(dest="komut", required=True)
+    subparsers.add_parser("ozet-yenile", help="gunluk_satis_ozet tablosunu satışlardan yeniden hesaplar").set_defaults(func=rebuild_summary)
+    subparsers.add_parser("bakiye-dogrula", help="musteri_bakiye_ozet tablosunu satış ve ödemelerle karşılaştırır").set_defaults(func=verify_balances)
+    subparsers.add_parser("bakiye-yenile", help="musteri_bakiye_ozet tablosunu satış ve ödemelerden yeniden hesaplar").set_defaults(func=rebuild_balances)
+    subparsers.add_parser("arsiv-liste", help="arşivlenmiş mali yılları listeler").set_defaults(func=list_archives)
+    archive_parser = subparsers.add_parser("arsivle", help="kapanmış bir mali yılı ayrı arşiv dosyasına taşır")
+    archive_parser.add_argument("yil", type=int)
+    archive_parser.add_argument("--sikistir", action="store_true", help="sonunda VACUUM ile boşalan alanı geri verir (yazmaları bekletir)")
+    archive_parser.set_defaults(func=archive_year)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db.create_tables()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ ROW_COLORS = [colors.HexColor("#F8F9FA"), colors.HexColor("#FFFFFF")]
 GRID_COLOR = colors.HexColor("#BDC3C7")
 
 class GenericReportGenerator(BasePdfGenerator):
-    def __init__(self, report_title: str, headers: list, data: list, file_prefix: str, summary_line: str = None):
+    def __init__(self, report_title: str, headers: list, data: list, file_prefix: str, summary_line: str = None, snapshot_time: str = None):
         mock_data_for_base = {'sale_info': {'musteri_adi': 'Rapor'}}
         super().__init__(sale_id=0, data=mock_data_for_base, settings={}, output_dir_name="Raporlar", file_prefix=file_prefix)
 
@@ -20,6 +20,7 @@ class GenericReportGenerator(BasePdfGenerator):
         self.headers = headers
         self.data = data
         self.summary_line = summary_line
+        self.snapshot_time = snapshot_time
         
         self.file_path = self._setup_filepath()
 
@@ -49,6 +50,9 @@ class GenericReportGenerator(BasePdfGenerator):
         self.c.setFont(self.font_name, 9)
         date_str = datetime.now().strftime('%d.%m.%Y %H:%M')
         self.c.drawString(2 * cm, self.height - 2.5 * cm, f"Rapor Tarihi: {date_str}")
+        if self.snapshot_time:
+            snapshot_str = datetime.strptime(self.snapshot_time, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M:%S')
+            self.c.drawRightString(self.width - 2 * cm, self.height - 2.5 * cm, f"Veri Anı: {snapshot_str}")
         self.c.line(2 * cm, self.height - 2.8 * cm, self.width - 2 * cm, self.height - 2.8 * cm)
         
     def _draw_table(self):
@@ -14,8 +14,12 @@ def main():
         setup_logging()
         sys.excepthook = handle_exception
         db.create_tables()
+        db.apply_performance_profile()
+        db.apply_query_trace_settings()
         
+        app_signals.app_closed.connect(db.stop_database_writer)
         app_signals.app_closed.connect(db.perform_automatic_backup)
+        app_signals.app_closed.connect(db.close_all_connections)
         
         app = QApplication(sys.argv)
         
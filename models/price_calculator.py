@@ -1,61 +1,90 @@
 # dosya: models/price_calculator.py
 
 from database import database_manager as db
+from database.queries import reference_cache
 
-def calculate_prices(product_data: dict, settings: dict) -> dict:
+PROFIT_PERCENT = 'Yüzdesel Kâr (%)'
+PROFIT_FIXED = 'Sabit Tutar (TL)'
+
+def _setting_float(settings, key, default) -> float:
+    # settings verilmezse önbellekteki, bir kez ayrıştırılmış ayar değeri kullanılır.
+    if settings is None:
+        return db.get_setting_float(key, default)
+    return float((settings.get(key) or str(default)).replace(',', '.'))
+
+class PricingContext:
+    # Ayarlar, kategori kâr kuralları ve vergi oranları bir kez derlenir. Aynı (para birimi,
+    # kategori, vergi) grubundaki her ürünün fiyatı alış fiyatının doğrusal bir fonksiyonu
+    # olduğundan grup katsayıları bir kez hesaplanıp tüm ürünlerde yeniden kullanılır.
+    def __init__(self, settings: dict | None = None):
+        self.settings = settings
+        kar_yontemi = db.get_setting('kar_yontemi', PROFIT_PERCENT) if settings is None else settings.get('kar_yontemi', PROFIT_PERCENT)
+        self.default_profit = (kar_yontemi, _setting_float(settings, 'kar_degeri', 50.0))
+        self.vat_percent = _setting_float(settings, 'kdv_orani', 20.0)
+        self.cc_commission_percent = _setting_float(settings, 'kk_komisyonu', 2.5)
+        self.category_profits = {row['id']: (row['kar_tipi'], row['kar_degeri']) for row in db.get_all_kategoriler()
+                                 if row['kar_tipi'] is not None and row['kar_degeri'] is not None}
+        self.tax_rates = {row['id']: row['oran'] for row in db.get_all_vergi_oranlari()}
+        self._currency_rates = {'TL': 1.0}
+        self._coefficients = {}
+
+    def currency_rate(self, currency) -> float:
+        # Kuru tanımsız (0) olan dövizli ürünlerin TL alış fiyatı 0 kabul edilir.
+        if currency not in self._currency_rates:
+            rate = _setting_float(self.settings, f"{currency.lower()}_tl_kuru", 0.0)
+            self._currency_rates[currency] = rate if rate > 0 else 0.0
+        return self._currency_rates[currency]
+
+    def coefficients(self, currency, category_id, tax_id) -> tuple:
+        key = (currency, category_id, tax_id)
+        if (found := self._coefficients.get(key)) is None:
+            kar_yontemi, kar_degeri = self.category_profits.get(category_id, self.default_profit)
+            vat_percent = self.tax_rates.get(tax_id, self.vat_percent)
+            found = self._coefficients[key] = (
+                self.currency_rate(currency),
+                kar_degeri / 100 if kar_yontemi == PROFIT_PERCENT else 0.0,
+                kar_degeri if kar_yontemi == PROFIT_FIXED else 0.0,
+                1 + vat_percent / 100,
+                1 + self.cc_commission_percent / 100,
+            )
+        return found
+
+    def price(self, product_data) -> dict:
+        if not product_data:
+            return {}
+        get = product_data.get if isinstance(product_data, dict) else dict(product_data).get
+        try:
+            purchase_price = get('alis_fiyati', 0)
+            if not isinstance(purchase_price, float):
+                purchase_price = float(str(purchase_price).replace(',', '.'))
+            rate, profit_percent, profit_fixed, vat_factor, cc_factor = self.coefficients(get('alis_para_birimi') or 'TL', get('kategori_id'), get('vergi_id'))
+        except (ValueError, TypeError):
+            return {}
+        purchase_price_tl = purchase_price * rate
+        price_with_profit_no_vat = purchase_price_tl + purchase_price_tl * profit_percent + profit_fixed
+        return {
+            "karli_fiyat_kdv_haric": round(price_with_profit_no_vat, 2),
+            "kdvli_fiyat": round(price_with_profit_no_vat * vat_factor, 2),
+            "kkli_fiyat": round(price_with_profit_no_vat * cc_factor * vat_factor, 2)
+        }
+
+def get_pricing_context() -> PricingContext:
+    # Güncel ayarlarla derlenmiş bağlam; ayar/kategori/vergi değişince yeniden derlenir.
+    return reference_cache.cached('fiyat_baglami', PricingContext)
+
+def calculate_prices(product_data: dict, settings: dict | None = None) -> dict:
     if not product_data:
         return {}
-        
     try:
-        purchase_price = float(str(product_data.get('alis_fiyati', 0)).replace(',', '.'))
-        currency = product_data.get('alis_para_birimi', 'TL')
-
-        purchase_price_tl = purchase_price
-        if currency != 'TL':
-            rate_str = (settings.get(f"{currency.lower()}_tl_kuru") or '0').replace(',', '.')
-            rate = float(rate_str)
-            if rate > 0:
-                purchase_price_tl *= rate
-            else:
-                purchase_price_tl = 0
-    except (ValueError, TypeError):
+        context = get_pricing_context() if settings is None else PricingContext(settings)
+    except ValueError:
         return {}
+    return context.price(product_data)
 
-    kar_yontemi = settings.get('kar_yontemi', 'Yüzdesel Kâr (%)')
-    kar_degeri_str = (settings.get('kar_degeri') or '50.0').replace(',', '.')
-    kar_degeri = float(kar_degeri_str)
-    
-    if category_id := product_data.get('kategori_id'):
-        category_details = db.get_category_details(category_id)
-        
-        if category_details and category_details['kar_tipi'] is not None and category_details['kar_degeri'] is not None:
-            kar_yontemi = category_details['kar_tipi']
-            kar_degeri = category_details['kar_degeri']
-
-    vat_percent_str = (settings.get('kdv_orani') or '20.0').replace(',', '.')
-    vat_percent = float(vat_percent_str)
-    
-    if tax_id := product_data.get('vergi_id'):
-        if tax_rate_row := db.get_vergi_orani_by_id(tax_id):
-            vat_percent = tax_rate_row['oran']
-
-    cc_commission_str = (settings.get('kk_komisyonu') or '2.5').replace(',', '.')
-    cc_commission_percent = float(cc_commission_str)
-
-    profit_amount = 0.0
-    if kar_yontemi == 'Yüzdesel Kâr (%)':
-        profit_amount = purchase_price_tl * (kar_degeri / 100)
-    elif kar_yontemi == 'Sabit Tutar (TL)':
-        profit_amount = kar_degeri
-    
-    price_with_profit_no_vat = purchase_price_tl + profit_amount
-    price_with_vat = price_with_profit_no_vat * (1 + vat_percent / 100)
-    
-    price_with_cc_commission = price_with_profit_no_vat * (1 + cc_commission_percent / 100)
-    price_with_cc = price_with_cc_commission * (1 + vat_percent / 100)
-
-    return {
-        "karli_fiyat_kdv_haric": round(price_with_profit_no_vat, 2),
-        "kdvli_fiyat": round(price_with_vat, 2),
-        "kkli_fiyat": round(price_with_cc, 2)
-    }
\ No newline at end of file
+def calculate_prices_batch(products, settings: dict | None = None) -> list[dict]:
+    # Fiyat listesi ve ürün arama listesi gibi toplu kullanım için: bağlam bir kez kurulur.
+    try:
+        context = get_pricing_context() if settings is None else PricingContext(settings)
+    except ValueError:
+        return [{} for _ in products]
+    return [context.price(product_data) for product_data in products]
@@ -2,10 +2,13 @@
 
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
 
+from database import database_manager as db
+
 class WorkerSignals(QObject):
     finished = Signal()
     error = Signal(tuple)
     result = Signal(object)
+    progress = Signal(int, int)
 
 class BackgroundWorker(QRunnable):
     def __init__(self, fn, *args, **kwargs):
@@ -24,4 +27,29 @@ class BackgroundWorker(QRunnable):
         else:
             self.signals.result.emit(result)
         finally:
-            self.signals.finished.emit()
\ No newline at end of file
+            self.signals.finished.emit()
+
+
+class DatabaseWriteTask:
+    # Yazma komutunu veritabanı yazıcı iş parçacığına gönderir; sonuç BackgroundWorker ile aynı
+    # sinyallerle, işlem commit edildikten sonra döner. Arayüz iş parçacığı beklemez.
+    def __init__(self, fn, *args, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def start(self):
+        future = db.submit_write(self.fn, *self.args, **self.kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            self.signals.error.emit((type(e), e, e.__traceback__))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
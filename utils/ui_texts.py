@@ -79,13 +79,17 @@ SALE_MSG_PRICE_CANNOT_BE_ZERO = "Fiyat 0 olamaz. Lütfen ürünün alış fiyat
 SALE_MSG_INSUFFICIENT_STOCK = "Yetersiz Stok"
 SALE_MSG_INSUFFICIENT_STOCK_DETAIL = "Stokta sadece {stock_amount} adet var."
 SALE_MSG_PRODUCT_NOT_FOUND = "Ürün veritabanında bulunamadı."
+SALE_MSG_BARCODE_NOT_FOUND = "'{code}' barkodlu ürün bulunamadı."
 SALE_MSG_INVALID_PRICE_INPUT = "Lütfen özel fiyat alanına geçerli bir sayı girin."
 SALE_MSG_SELECT_ITEM_TO_REMOVE = "Lütfen sepetten çıkarmak için bir ürün seçin."
 SALE_MSG_CLEAR_CART_TITLE = "Sepeti Temizle"
 SALE_MSG_CLEAR_CART_TEXT = "Sepetteki tüm ürünleri silmek istediğinizden emin misiniz?"
 SALE_MSG_EMPTY_CART = "Boş Sepet"
 SALE_MSG_ADD_ITEM_FIRST = "Önce sepete ürün eklemelisiniz."
+SALE_MSG_SAVING = "Satış kaydediliyor..."
 SALE_MSG_SAVE_ERROR = "Satış kaydedilirken bir veritabanı hatası oluştu."
+SALE_MSG_STOCK_SHORTAGE = "Satış kaydedilemedi, aşağıdaki ürünlerin stoğu yetersiz (başka bir kasadan satılmış olabilir). Sepeti güncelleyip tekrar deneyin:\n\n{lines}"
+SALE_MSG_STOCK_SHORTAGE_LINE = "• {ad}: istenen {istenen}, stokta {mevcut}"
 SALE_MSG_SAVE_SUCCESS = "#{sale_id} numaralı satış başarıyla kaydedildi."
 SALE_MSG_UPDATE_SUCCESS = "#{old_sale_id} numaralı satış başarıyla güncellendi (Yeni ID: #{new_sale_id})."
 SALE_MSG_SUSPEND_TITLE = "Sepeti Askıya Al"
@@ -136,6 +140,7 @@ SETTINGS_MSG_CANNOT_DELETE_DEFAULT_ROLE = "Varsayılan 'Yönetici' rolü silinem
 SETTINGS_MSG_CONFIRM_DELETE_ROLE_TEXT = "'{role_name}' rolünü silmek istediğinizden emin misiniz?\nBu role sahip kullanıcılar 'Rol Atanmamış' olarak görünecektir."
 SETTINGS_MSG_PERMISSIONS_UPDATE_SUCCESS = "Seçili rolün yetkileri güncellendi."
 SETTINGS_MSG_PROFILE_SAVE_SUCCESS = "Firma bilgileri kaydedildi."
+SETTINGS_MSG_SAVE_ERROR = "Ayarlar kaydedilemedi. Hiçbir değişiklik uygulanmadı; ayrıntılar için app.log dosyasına bakın."
 SETTINGS_MSG_LOGO_COPY_ERROR = "Logo kopyalanamadı: {error}"
 SETTINGS_MSG_LOGO_REMOVE_SUCCESS = "Logo kaldırıldı. Değişikliği kalıcı yapmak için 'Kaydet' butonuna basın."
 SETTINGS_MSG_CATEGORY_DELETE_ERROR = "Bu kategori bir veya daha fazla ürüne atanmış olduğu için silinemez."
@@ -148,13 +153,30 @@ SETTINGS_MSG_RATES_UNEXPECTED_ERROR = "Kur güncelleme sırasında beklenmedik b
 SETTINGS_MSG_COMM_SAVE_SUCCESS = "İletişim servis ayarları kaydedildi."
 SETTINGS_MSG_BACKUP_SUCCESS = "Veritabanı başarıyla şuraya yedeklendi:\n{path}"
 SETTINGS_MSG_BACKUP_ERROR = "Yedekleme sırasında bir hata oluştu:\n{error}"
+SETTINGS_MSG_BACKUP_STARTED = "Veritabanı yedekleniyor..."
+SETTINGS_MSG_BACKUP_PROGRESS = "Veritabanı yedekleniyor... %{percent}"
+SETTINGS_MSG_BACKUP_DONE = "Yedekleme tamamlandı ve doğrulandı."
+SETTINGS_MSG_BACKUP_FAILED = "Yedekleme başarısız!"
+SETTINGS_LAST_BACKUP_INFO = "<i>Son yedek: {tarih} ({tur}, {boyut:.1f} MB, bütünlük kontrolü: {dogrulama})</i>"
+SETTINGS_LAST_BACKUP_NONE = "<i>Henüz kayıtlı bir yedek yok.</i>"
 SETTINGS_MSG_RESTORE_CONFIRM_TITLE = "Geri Yükleme Onayı"
 SETTINGS_MSG_RESTORE_CONFIRM_TEXT = "<b>DİKKAT!</b> Bu işlem mevcut tüm verilerinizi silecek ve seçtiğiniz yedekle değiştirecektir."
 SETTINGS_MSG_RESTORE_CONFIRM_INFO = "Bu işlem geri alınamaz. Devam etmek istediğinizden emin misiniz?"
 SETTINGS_MSG_RESTORE_CONFIRM_BTN = "Evet, Geri Yükle"
 SETTINGS_MSG_RESTORE_SELECT_FILE = "Geri Yüklenecek Yedek Dosyasını Seç"
-SETTINGS_MSG_RESTORE_SUCCESS = "Veritabanı başarıyla geri yüklendi.\nDeğişikliklerin tam olarak etkili olması için program yeniden başlatılacak."
+SETTINGS_MSG_RESTORE_SUCCESS = "Veritabanı başarıyla geri yüklendi.\nÖnceki veritabanı, aynı klasörde '.onceki' uzantısıyla saklandı."
+SETTINGS_MSG_RESTORE_STARTED = "Yedek dosyası doğrulanıyor..."
+SETTINGS_MSG_RESTORE_PROGRESS = "Yedek geri yükleniyor... %{percent}"
+SETTINGS_MSG_RESTORE_DONE = "Geri yükleme tamamlandı."
+SETTINGS_MSG_RESTORE_FAILED = "Geri yükleme başarısız! Mevcut veritabanı değiştirilmedi."
 SETTINGS_MSG_RESTORE_ERROR = "Geri yükleme sırasında bir hata oluştu:\n{error}"
+SETTINGS_QUERY_STATS_INFO = "{adet} farklı sorgu ölçüldü (SQL izleme şu anda {durum}). Sorgular toplam süreye göre sıralanmıştır; süreler satırların okunmasını da içerir."
+SETTINGS_MSG_QUERY_STATS_EXPORTED = "{adet} sorgunun özeti dışa aktarıldı:\n{path}"
+SETTINGS_MSG_QUERY_STATS_EXPORT_ERROR = "Sorgu özeti dışa aktarılamadı:\n{error}"
+SETTINGS_MSG_RESTORE_POINT_TITLE = "Yedek Noktasına Dön"
+SETTINGS_MSG_RESTORE_POINT_PROMPT = "Dönülecek yedek noktasını seçin:"
+SETTINGS_RESTORE_POINT_ITEM = "{tarih} - {tur} ({boyut:.1f} MB)"
+SETTINGS_MSG_NO_RESTORE_POINTS = "Henüz oluşturulmuş bir yedek noktası yok."
 SETTINGS_MSG_CATEGORY_PROFIT_SAVE_SUCCESS = "Kategori kâr ayarları kaydedildi."
 SETTINGS_MSG_INVALID_PROFIT_VALUE = "Lütfen Kâr Değeri alanına geçerli bir sayı girin."
 SETTINGS_MSG_TEST_SMS_PROMPT_TITLE = "Test SMS'i Gönder"
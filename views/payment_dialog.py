@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout, QWidget
 )
 from PySide6.QtGui import QDoubleValidator
+from database.queries.money import parse_amount, to_tl
 from utils import ui_texts as texts
 from utils.themed_widgets import SuccessButton, NeutralButton
 
@@ -59,8 +60,7 @@ class PaymentDialog(QDialog):
 
     def _update_save_button_state(self):
         try:
-            amount = float(self.amount_input.text().replace(',', '.'))
-            is_valid = amount > 0
+            is_valid = parse_amount(self.amount_input.text()) > 0
         except ValueError:
             is_valid = False
         
@@ -68,7 +68,7 @@ class PaymentDialog(QDialog):
 
     def get_data(self) -> dict:
         try:
-            tutar = float(self.amount_input.text().replace(',', '.'))
+            tutar = to_tl(self.amount_input.text())
         except ValueError:
             tutar = 0.0
             
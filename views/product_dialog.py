@@ -9,6 +9,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QDoubleValidator, QIntValidator, QPixmap
 from PySide6.QtCore import Qt, Signal
 
+from database.queries.money import to_tl
+
 from utils.themed_widgets import (
     CardWidget, SuccessButton, NeutralButton, DangerButton, OutlineButton, PrimaryButton
 )
@@ -83,7 +85,7 @@ class VariantDetailEditDialog(QDialog):
 
     def get_data(self):
         return {
-            "alis_fiyati": float(self.price_input.text().replace(',', '.') or 0),
+            "alis_fiyati": to_tl(self.price_input.text()),
             "stok_miktari": int(self.stock_input.text() or 0),
             "barkod": self.barcode_input.text().strip()
         }
@@ -294,7 +296,7 @@ class SingleProductDialog(QDialog):
             "kategori_id": self.kategori_combo.currentData(),
             "vergi_id": self.vergi_combo.currentData(),
             "alis_para_birimi": self.para_birimi_combo.currentText(),
-            "alis_fiyati": float(self.alis_fiyati_input.text().replace(',', '.') or 0),
+            "alis_fiyati": to_tl(self.alis_fiyati_input.text()),
             "stok_miktari": int(self.stok_miktari_input.text() or 0),
             "min_stok_seviyesi": int(self.min_stok_input.text() or 0),
             "ana_urun_kodu": None, 
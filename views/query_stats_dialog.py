@@ -0,0 +1,52 @@
+# dosya: views/query_stats_dialog.py
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView,
+    QHeaderView, QAbstractItemView, QWidget, QLabel
+)
+from PySide6.QtCore import Qt
+from utils.themed_widgets import DangerButton, NeutralButton, OutlineButton
+
+class QueryStatsDialog(QDialog):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("SQL Sorgu Özeti")
+        self.resize(1100, 600)
+        self.setModal(True)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        self.info_label = QLabel()
+        self.info_label.setObjectName("SubtleInfoLabel")
+        self.info_label.setWordWrap(True)
+        main_layout.addWidget(self.info_label)
+
+        self.stats_table = QTableView()
+        self.stats_table.setModel(model)
+        self.stats_table.setAlternatingRowColors(True)
+        self.stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.stats_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stats_table.setWordWrap(False)
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.stats_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.stats_table.verticalHeader().setVisible(False)
+        main_layout.addWidget(self.stats_table, 1)
+
+        button_container = QWidget()
+        button_layout = QHBoxLayout(button_container)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.reset_button = DangerButton("Ölçümleri Sıfırla")
+        self.export_button = OutlineButton("CSV Olarak Dışa Aktar", icon_name='fa5s.file-csv')
+        self.close_button = NeutralButton("Kapat")
+
+        button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button, 0, Qt.AlignRight)
+        main_layout.addWidget(button_container)
+
+        self.close_button.clicked.connect(self.reject)
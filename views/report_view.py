@@ -46,10 +46,12 @@ class ReportView(QWidget):
         self.generate_product_report_button = OutlineButton("Ürün Bazlı Satış Raporu")
         self.generate_customer_report_button = OutlineButton("Müşteri Bazlı Satış Raporu")
         self.generate_inventory_report_button = OutlineButton("Stok Durum Raporu")
+        self.generate_price_list_button = OutlineButton("Fiyat Listesi")
         report_type_layout.addWidget(self.generate_sales_report_button)
         report_type_layout.addWidget(self.generate_product_report_button)
         report_type_layout.addWidget(self.generate_customer_report_button)
         report_type_layout.addWidget(self.generate_inventory_report_button)
+        report_type_layout.addWidget(self.generate_price_list_button)
         top_section_layout.addWidget(report_type_group, 1)
 
         main_layout.addLayout(top_section_layout)
@@ -93,12 +95,16 @@ class ReportView(QWidget):
         bottom_panel_layout = QHBoxLayout()
         self.totals_label = QLabel("")
         self.totals_label.setObjectName("SummaryLabel")
+        self.snapshot_label = QLabel("")
+        self.snapshot_label.setObjectName("SubtleInfoLabel")
+        self.snapshot_label.setToolTip("Rapor, bu andaki verinin tutarlı bir kopyasından hazırlandı; sonrasında yapılan satışlar rapora dahil değildir.")
         
         self.export_excel_button = SuccessButton("Excel'e Aktar", icon_name='fa5s.file-excel')
         self.export_pdf_button = DangerButton("PDF Olarak Kaydet", icon_name='fa5s.file-pdf')
         
         bottom_panel_layout.addWidget(self.totals_label)
         bottom_panel_layout.addStretch()
+        bottom_panel_layout.addWidget(self.snapshot_label)
         bottom_panel_layout.addWidget(self.export_excel_button)
         bottom_panel_layout.addWidget(self.export_pdf_button)
         results_layout.addLayout(bottom_panel_layout)
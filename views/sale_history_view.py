@@ -26,13 +26,19 @@ class SaleHistoryView(QWidget):
         # Sonra yeni QHBoxLayout oluşturulup içine widget'lar ekleniyor.
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Satış ID veya Müşteri Adı ile ara...")
+        self.search_input.setPlaceholderText("Ara: #125, müşteri adı, 17.10.2026, 10.2026, 100-500 TL, >1000...")
         
         search_layout.addWidget(QLabel("Arama:"))
         search_layout.addWidget(self.search_input)
         
         # En son olarak, hazırlanan bu yeni layout, CardWidget'ın ana layout'una ekleniyor.
         card_main_layout.addLayout(search_layout)
+
+        # Aramadaki geçersiz tarih gibi hatalar burada gösterilir; tablo önceki sonuçları korur.
+        self.search_error_label = QLabel()
+        self.search_error_label.setStyleSheet("color: #E03131;")
+        self.search_error_label.hide()
+        card_main_layout.addWidget(self.search_error_label)
         # --- DEĞİŞİKLİK SONU ---
 
         self.history_table = QTableView()
@@ -333,28 +333,69 @@ class SettingsView(QWidget):
         backup_label = QLabel("Olası veri kayıplarına karşı programın veritabanını düzenli olarak yedeklemeniz önemlidir.")
         backup_label.setWordWrap(True)
         self.auto_backup_checkbox = QCheckBox("Programdan çıkarken veritabanını otomatik olarak yedekle")
-        auto_backup_info = QLabel("<i>(Yedekler, programın ana klasöründeki 'backups' dizinine kaydedilir.)</i>")
+        self.scheduled_backup_checkbox = QCheckBox("Program açıkken düzenli olarak yedek al")
+        self.backup_interval_combo = QComboBox()
+        interval_layout = QHBoxLayout()
+        interval_layout.addWidget(self.scheduled_backup_checkbox)
+        interval_layout.addStretch()
+        interval_layout.addWidget(QLabel("Aralık:"))
+        interval_layout.addWidget(self.backup_interval_combo)
+        auto_backup_info = QLabel("<i>(Yedekler, programın ana klasöründeki 'backups/depo' dizininde sıkıştırılarak saklanır; yalnızca değişen kısımlar yeniden yazılır. Son 24 saatin saatlik, son 14 günün günlük ve son 12 ayın aylık yedekleri tutulur.)</i>")
         auto_backup_info.setObjectName("SubtleInfoLabel")
+        auto_backup_info.setWordWrap(True)
+        self.last_backup_label = QLabel()
+        self.last_backup_label.setObjectName("SubtleInfoLabel")
         self.backup_button = OutlineButton("Şimdi Manuel Yedekle", icon_name='fa5s.download')
         backup_layout.addWidget(backup_label)
         backup_layout.addSpacing(10)
         backup_layout.addWidget(self.auto_backup_checkbox)
+        backup_layout.addLayout(interval_layout)
         backup_layout.addWidget(auto_backup_info)
         backup_layout.addSpacing(15)
+        backup_layout.addWidget(self.last_backup_label)
         backup_layout.addWidget(self.backup_button)
         
         restore_card = CardWidget("Yedekten Geri Yükleme")
         restore_layout = restore_card.layout()
-        restore_warning_label = QLabel("<b>DİKKAT:</b> Bu işlem mevcut tüm verilerinizi, seçeceğiniz yedek dosyasıyla tamamen değiştirecektir. Bu işlem geri alınamaz. Geri yükleme sonrası program yeniden başlatılacaktır.")
+        restore_warning_label = QLabel("<b>DİKKAT:</b> Bu işlem mevcut tüm verilerinizi, seçeceğiniz yedek dosyasıyla tamamen değiştirecektir. Yedek dosyası önce bütünlük kontrolünden geçirilir; önceki veritabanı '.onceki' uzantısıyla saklanır.")
         restore_warning_label.setObjectName("WarningTextLabel")
         restore_warning_label.setWordWrap(True)
         self.restore_button = DangerButton("Yedekten Geri Yükle", icon_name='fa5s.upload')
+        self.restore_point_button = DangerButton("Yedek Noktasına Dön", icon_name='fa5s.history')
+        restore_buttons_layout = QHBoxLayout()
+        restore_buttons_layout.addWidget(self.restore_button)
+        restore_buttons_layout.addWidget(self.restore_point_button)
         restore_layout.addWidget(restore_warning_label)
         restore_layout.addSpacing(10)
-        restore_layout.addWidget(self.restore_button)
+        restore_layout.addLayout(restore_buttons_layout)
+
+        performance_card = CardWidget("Veritabanı Performansı")
+        performance_layout = QFormLayout()
+        performance_card.layout().addLayout(performance_layout)
+        self.db_profile_combo = QComboBox()
+        performance_info = QLabel("<i>(Güvenli: her işlemde diske tam yazma. Dengeli: WAL günlüğü ile okuma ve yazma birbirini beklemez. Yüksek Performans: daha büyük önbellek ve bellek eşleme.)</i>")
+        performance_info.setObjectName("SubtleInfoLabel")
+        performance_info.setWordWrap(True)
+        performance_layout.addRow("Performans Profili:", self.db_profile_combo)
+        performance_layout.addRow(performance_info)
+        self.sql_trace_checkbox = QCheckBox("SQL izlemeyi aç")
+        self.slow_query_threshold_combo = QComboBox()
+        trace_layout = QHBoxLayout()
+        trace_layout.addWidget(self.sql_trace_checkbox)
+        trace_layout.addStretch()
+        trace_layout.addWidget(QLabel("Yavaş sorgu eşiği:"))
+        trace_layout.addWidget(self.slow_query_threshold_combo)
+        trace_info = QLabel("<i>(Açıkken her sorgunun süresi ölçülür ve eşiği aşan sorgular programın klasöründeki 'yavas_sorgular.log' dosyasına yazılır. Yalnızca sorun incelerken açın; sorgulara küçük bir ek yük getirir.)</i>")
+        trace_info.setObjectName("SubtleInfoLabel")
+        trace_info.setWordWrap(True)
+        self.query_stats_button = OutlineButton("Sorgu Özetini Göster", icon_name='fa5s.chart-bar')
+        performance_layout.addRow(trace_layout)
+        performance_layout.addRow(trace_info)
+        performance_layout.addRow(self.query_stats_button)
 
         layout.addWidget(backup_card)
         layout.addWidget(restore_card)
+        layout.addWidget(performance_card)
         layout.addStretch()
         return tab
 
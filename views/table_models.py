@@ -1,4 +1,4 @@
-from PySide6.QtCore import QAbstractTableModel, Qt, Signal
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
 
 class GenericTableModel(QAbstractTableModel):
     header_check_state_changed = Signal()
@@ -125,4 +125,35 @@ class GenericTableModel(QAbstractTableModel):
         top_left_index = self.index(0, 0)
         bottom_right_index = self.index(self.rowCount() - 1, 0)
         self.dataChanged.emit(top_left_index, bottom_right_index, [Qt.CheckStateRole])
-        self.header_check_state_changed.emit()
\ No newline at end of file
+        self.header_check_state_changed.emit()
+
+class PagedTableModel(GenericTableModel):
+    # Satırları sayfa sayfa yükler: görünüm en alta kaydırıldığında Qt canFetchMore/fetchMore
+    # çağırır. fetch_page(son_satir, limit) son yüklenen satırı (ilk sayfada None) alır ve bir
+    # sonraki sayfayı döndürür; sayfalama anahtar (keyset) tabanlı olduğundan her sayfa aynı maliyettedir.
+    def __init__(self, headers, column_keys, fetch_page, page_size=200, parent=None):
+        super().__init__(headers, column_keys, parent)
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.has_more = False
+
+    def reload(self):
+        self.beginResetModel()
+        self.table_data = [dict(row) for row in self.fetch_page(None, self.page_size)]
+        self.has_more = len(self.table_data) == self.page_size
+        self.endResetModel()
+
+    def canFetchMore(self, parent=None):
+        return self.has_more
+
+    def fetchMore(self, parent=None):
+        if not self.has_more:
+            return
+        rows = self.fetch_page(self.table_data[-1] if self.table_data else None, self.page_size)
+        self.has_more = len(rows) == self.page_size
+        if not rows:
+            return
+        first_row = len(self.table_data)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(rows) - 1)
+        self.table_data.extend(dict(row) for row in rows)
+        self.endInsertRows()